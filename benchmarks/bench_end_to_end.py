@@ -0,0 +1,352 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+端到端基准测试
+
+在合成语料（见 generate_corpus.py）上对爬虫报告流水线和 MCP 工具计时，
+覆盖 1 / 7 / 30 / 365 天的时间窗口，结果可写入 JSON 用于回归跟踪。
+
+main.py 报告流水线（以语料目录为工作目录）：
+- parse_file_titles：解析最新的一个快照文件
+- read_all_today_titles：读取并合并今天的全部快照
+- read_window_titles：按 read_all_today_titles 的方式合并最近 N 天的快照
+  （main.py 只处理今天，这一步用于得到 N 天的数据规模）
+- count_word_frequency / prepare_report_data / render_html_content /
+  split_content_into_batches：基于 N 天的数据生成报告和推送分批
+
+MCP 工具（以语料目录为 project_root，date_range 为最近 N 天）：
+- search_news（keyword / fuzzy）、analyze_topic_trend、analyze_data_insights
+  （keyword_cooccur / platform_activity）、generate_summary_report
+- get_latest_news、get_trending_topics（只针对今天，计入 1 天窗口）
+
+每个场景记录首次调用耗时和后续重复调用的中位数。MCP 工具开始前会删除语料目录中
+已持久化的索引，各工具共用索引，首次调用耗时包含按执行顺序尚未建立的那部分索引。
+
+默认参数下 365 天语料约 480 MB（生成只需几秒），完整运行需要十几分钟；
+日常回归可以只跑较小的窗口。
+
+用法：
+    python benchmarks/bench_end_to_end.py
+    python benchmarks/bench_end_to_end.py --windows 1,7 --repeat 5
+    python benchmarks/bench_end_to_end.py --windows 1,7,30,365 --json bench_output.json
+    python benchmarks/bench_end_to_end.py --root /tmp/trendradar_corpus --regenerate
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, List
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, PROJECT_ROOT)
+sys.path.insert(0, BENCH_DIR)
+
+from generate_corpus import add_corpus_arguments, generate_corpus, load_manifest
+
+# 语料目录中由 MCP Server 持久化的索引
+DERIVED_DIRS = [".search_index", ".rollups", ".timeseries", ".tracking_index"]
+DEFAULT_TOPIC = "华为"
+
+
+def measure(func: Callable, repeat: int) -> Dict:
+    """首次调用耗时 + 重复调用的中位数"""
+    start = time.perf_counter()
+    result = func()
+    first = time.perf_counter() - start
+    warm = []
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        func()
+        warm.append(time.perf_counter() - start)
+    return {
+        "result": result,
+        "first_ms": round(first * 1000, 2),
+        "warm_ms": round(statistics.median(warm) * 1000, 2) if warm else None,
+    }
+
+
+def _quiet(func: Callable) -> Callable:
+    def wrapper():
+        with contextlib.redirect_stdout(io.StringIO()):
+            return func()
+    return wrapper
+
+
+class Recorder:
+    """收集场景结果"""
+
+    def __init__(self, repeat: int):
+        self.repeat = repeat
+        self.results: List[Dict] = []
+
+    def run(self, group: str, scenario: str, days: int, func: Callable, describe: Callable = None):
+        if group == "main":
+            # main.py 的函数会打印处理日志，计时时丢弃
+            func = _quiet(func)
+        try:
+            timing = measure(func, self.repeat)
+        except Exception as e:
+            self.results.append({
+                "group": group, "scenario": scenario, "days": days,
+                "ok": False, "error": f"{type(e).__name__}: {e}",
+            })
+            print(f"  ✗ {group}/{scenario} [{days}天] 失败: {e}")
+            return None
+
+        result = timing.pop("result")
+        entry = {"group": group, "scenario": scenario, "days": days, "ok": True, **timing}
+        if isinstance(result, dict) and result.get("success") is False:
+            entry["ok"] = False
+            entry["error"] = json.dumps(result.get("error"), ensure_ascii=False)
+        if entry["ok"] and describe is not None:
+            entry["size"] = describe(result)
+        self.results.append(entry)
+        warm = f"{entry['warm_ms']:.1f}ms" if entry.get("warm_ms") is not None else "-"
+        status = "✓" if entry["ok"] else "✗"
+        print(f"  {status} {group}/{scenario} [{days}天] 首次 {entry['first_ms']:.1f}ms，重复 {warm}")
+        return result
+
+
+# ==================== main.py 报告流水线 ====================
+
+def read_window_titles(crawler, date_folders: List[str]):
+    """按 read_all_today_titles 的合并方式读取多天的快照"""
+    all_results, id_to_name, title_info = {}, {}, {}
+    for date_folder in date_folders:
+        txt_dir = Path("output") / date_folder / "txt"
+        for file_path in sorted(f for f in txt_dir.iterdir() if f.suffix == ".txt"):
+            titles_by_id, file_id_to_name = crawler.parse_file_titles(file_path)
+            id_to_name.update(file_id_to_name)
+            for source_id, title_data in titles_by_id.items():
+                crawler.process_source_data(source_id, title_data, file_path.stem, all_results, title_info)
+    return all_results, id_to_name, title_info
+
+
+def bench_crawler(recorder: Recorder, root: Path, date_folders: List[str], windows: List[int]) -> None:
+    os.environ["CONFIG_PATH"] = str(root / "config" / "config.yaml")
+    os.environ["FREQUENCY_WORDS_PATH"] = str(root / "config" / "frequency_words.txt")
+    os.chdir(root)
+    import main as crawler
+
+    today_folder = crawler.format_date_folder()
+    today_dir = Path("output") / today_folder / "txt"
+    latest_file = sorted(f for f in today_dir.iterdir() if f.suffix == ".txt")[-1]
+    word_groups, filter_words, global_filters = crawler.load_frequency_words()
+
+    def count_titles(results):
+        return sum(len(titles) for titles in results.values())
+
+    recorder.run(
+        "main", "parse_file_titles", 1,
+        lambda: crawler.parse_file_titles(latest_file),
+        lambda result: count_titles(result[0]),
+    )
+    recorder.run(
+        "main", "read_all_today_titles", 1,
+        lambda: crawler.read_all_today_titles(),
+        lambda result: count_titles(result[0]),
+    )
+
+    for days in windows:
+        folders = date_folders[-days:]
+        window = recorder.run(
+            "main", "read_window_titles", days,
+            lambda: read_window_titles(crawler, folders),
+            lambda result: count_titles(result[0]),
+        )
+        if window is None:
+            continue
+        results, id_to_name, title_info = window
+
+        counted = recorder.run(
+            "main", "count_word_frequency", days,
+            lambda: crawler.count_word_frequency(
+                results, word_groups, filter_words, id_to_name, title_info,
+                new_titles={}, mode="daily", global_filters=global_filters,
+            ),
+            lambda result: result[1],
+        )
+        if counted is None:
+            continue
+        stats, total_titles = counted
+
+        report_data = recorder.run(
+            "main", "prepare_report_data", days,
+            lambda: crawler.prepare_report_data(stats, [], {}, id_to_name, "daily"),
+            lambda result: sum(len(stat["titles"]) for stat in result["stats"]),
+        )
+        if report_data is None:
+            continue
+        recorder.run(
+            "main", "render_html_content", days,
+            lambda: crawler.render_html_content(report_data, total_titles, mode="daily"),
+            len,
+        )
+        recorder.run(
+            "main", "split_content_into_batches", days,
+            lambda: crawler.split_content_into_batches(report_data, "feishu", mode="daily"),
+            len,
+        )
+
+
+# ==================== MCP 工具 ====================
+
+def bench_mcp_tools(recorder: Recorder, root: Path, windows: List[int], topic: str) -> None:
+    from mcp_server.tools.analytics import AnalyticsTools
+    from mcp_server.tools.data_query import DataQueryTools
+    from mcp_server.tools.search_tools import SearchTools
+
+    for name in DERIVED_DIRS:
+        shutil.rmtree(root / "output" / name, ignore_errors=True)
+
+    data_tools = DataQueryTools(str(root))
+    search_tools = SearchTools(str(root))
+    analytics_tools = AnalyticsTools(str(root))
+
+    def result_count(result):
+        return result.get("summary", {}).get("total_found", result.get("total", len(result.get("results", []) or [])))
+
+    recorder.run(
+        "mcp", "get_latest_news", 1,
+        lambda: data_tools.get_latest_news(limit=50),
+        lambda result: len(result.get("news", [])),
+    )
+    recorder.run(
+        "mcp", "get_trending_topics", 1,
+        lambda: data_tools.get_trending_topics(top_n=10),
+        lambda result: len(result.get("topics", [])),
+    )
+
+    today = datetime.now().date()
+    for days in windows:
+        date_range = {
+            "start": (today - timedelta(days=days - 1)).isoformat(),
+            "end": today.isoformat(),
+        }
+        recorder.run(
+            "mcp", "search_news:keyword", days,
+            lambda: search_tools.search_news_unified(query=topic, search_mode="keyword", date_range=date_range),
+            result_count,
+        )
+        recorder.run(
+            "mcp", "search_news:fuzzy", days,
+            lambda: search_tools.search_news_unified(query=f"{topic}发布新产品", search_mode="fuzzy", date_range=date_range),
+            result_count,
+        )
+        recorder.run(
+            "mcp", "analyze_topic_trend", days,
+            lambda: analytics_tools.analyze_topic_trend_unified(topic=topic, analysis_type="trend", date_range=date_range),
+        )
+        recorder.run(
+            "mcp", "analyze_data_insights:keyword_cooccur", days,
+            lambda: analytics_tools.analyze_data_insights_unified(insight_type="keyword_cooccur", date_range=date_range),
+        )
+        recorder.run(
+            "mcp", "analyze_data_insights:platform_activity", days,
+            lambda: analytics_tools.analyze_data_insights_unified(insight_type="platform_activity", date_range=date_range),
+        )
+        recorder.run(
+            "mcp", "generate_summary_report", days,
+            lambda: analytics_tools.generate_summary_report(report_type="weekly", date_range=date_range),
+        )
+
+
+# ==================== 入口 ====================
+
+def ensure_corpus(args, max_window: int) -> Dict:
+    """复用参数一致的语料，否则重新生成"""
+    params = {
+        "days": max(args.days, max_window),
+        "snapshots": args.snapshots,
+        "platforms": args.platforms,
+        "titles": args.titles,
+        "churn": args.churn,
+        "seed": args.seed,
+    }
+    manifest = load_manifest(args.root)
+    today_folder = (Path(args.root) / "output" / datetime.now().strftime("%Y年%m月%d日"))
+    if args.regenerate or manifest is None or manifest["params"] != params or not today_folder.exists():
+        print(f"生成语料: {params} -> {args.root}")
+        manifest = generate_corpus(args.root, **params)
+    return manifest
+
+
+def print_report(report: Dict) -> None:
+    print("\n" + "=" * 96)
+    print("  端到端基准测试结果")
+    print("=" * 96)
+    corpus = report["corpus"]
+    print(
+        f"语料: {corpus['date_folders']} 天，{corpus['files']} 个快照，"
+        f"{corpus['title_lines']} 行标题，{corpus['bytes'] / 1024 / 1024:.1f} MB；"
+        f"重复次数: {report['params']['repeat']}"
+    )
+    print(f"\n{'分组':<6}{'场景':<42}{'天数':>6}{'首次(ms)':>12}{'重复(ms)':>12}{'规模':>10}  状态")
+    for entry in report["results"]:
+        warm = f"{entry['warm_ms']:.1f}" if entry.get("warm_ms") is not None else "-"
+        first = f"{entry['first_ms']:.1f}" if "first_ms" in entry else "-"
+        size = entry.get("size", "")
+        status = "ok" if entry["ok"] else f"失败: {entry.get('error', '')[:40]}"
+        print(f"{entry['group']:<6}{entry['scenario']:<42}{entry['days']:>6}{first:>12}{warm:>12}{size!s:>10}  {status}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="TrendRadar 端到端基准测试")
+    add_corpus_arguments(parser, days_default=365)
+    parser.add_argument("--windows", default="1,7,30,365", help="逗号分隔的时间窗口（天）")
+    parser.add_argument("--repeat", type=int, default=3, help="每个场景的调用次数（第一次单独计时）")
+    parser.add_argument("--topic", default=DEFAULT_TOPIC, help="MCP 工具使用的话题关键词")
+    parser.add_argument("--skip-main", action="store_true", help="跳过 main.py 报告流水线")
+    parser.add_argument("--skip-mcp", action="store_true", help="跳过 MCP 工具")
+    parser.add_argument("--regenerate", action="store_true", help="强制重新生成语料")
+    parser.add_argument("--json", dest="json_path", help="将结果写入 JSON 文件")
+    args = parser.parse_args()
+
+    windows = sorted({int(w) for w in args.windows.split(",") if w.strip()})
+    json_path = os.path.abspath(args.json_path) if args.json_path else None
+    root = Path(args.root).resolve()
+    manifest = ensure_corpus(args, max(windows))
+    date_folders = sorted(p.name for p in (root / "output").iterdir() if p.is_dir() and not p.name.startswith("."))
+
+    recorder = Recorder(max(1, args.repeat))
+    if not args.skip_mcp:
+        print("\nMCP 工具:")
+        bench_mcp_tools(recorder, root, windows, args.topic)
+    if not args.skip_main:
+        print("\nmain.py 报告流水线:")
+        bench_crawler(recorder, root, date_folders, windows)
+
+    report = {
+        "params": {"windows": windows, "repeat": recorder.repeat, "topic": args.topic},
+        "corpus": manifest,
+        "environment": {
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+        },
+        "results": recorder.results,
+    }
+    print_report(report)
+
+    if json_path:
+        with open(json_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"\n结果已写入: {json_path}")
+
+    if not all(entry["ok"] for entry in recorder.results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
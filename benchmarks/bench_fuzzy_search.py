@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+模糊搜索 / 相似新闻基准测试
+
+对比两种实现在 output 目录真实数据上的耗时，并校验结果完全一致：
+
+- 全量扫描：对每天的每条标题计算 SequenceMatcher（改造前的实现）
+- 索引预筛选：先用字符级 Dice 上界和子串索引排除不可能匹配的标题，
+  只对候选计算 SequenceMatcher（当前实现）
+
+覆盖 SearchTools 的 fuzzy 模式和 AnalyticsTools.find_similar_news 的相似度计算。
+查询取自语料中的真实标题（截取不同长度）以及若干固定短查询。
+
+用法：
+    python benchmarks/bench_fuzzy_search.py
+    python benchmarks/bench_fuzzy_search.py --days 30 --queries 20 --thresholds 0.3,0.6
+    python benchmarks/bench_fuzzy_search.py --json bench_output.json
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from datetime import timedelta
+from typing import Dict, List
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, PROJECT_ROOT)
+
+from mcp_server.services.index_service import get_search_index
+from mcp_server.tools.analytics import AnalyticsTools
+from mcp_server.tools.search_tools import SearchTools
+from mcp_server.utils.errors import DataNotFoundError
+
+FIXED_QUERIES = ["人工智能", "特斯拉降价", "美国 关税", "iPhone 16 发布", "春节"]
+
+
+def baseline_fuzzy(tools: SearchTools, query: str, all_titles: Dict, threshold: float) -> List:
+    """改造前的 fuzzy 模式：逐条计算 _fuzzy_match"""
+    matches = []
+    for platform_id, titles in all_titles.items():
+        for title, info in titles.items():
+            is_match, similarity = tools._fuzzy_match(query, title, threshold)
+            if is_match:
+                matches.append((platform_id, title, round(similarity, 4)))
+    return matches
+
+
+def indexed_fuzzy(tools: SearchTools, query: str, date, threshold: float) -> List:
+    matches = tools._search_by_fuzzy_mode(query, None, date, threshold, False)
+    return [(m["platform"], m["title"], m["similarity_score"]) for m in matches]
+
+
+def baseline_similar(tools: AnalyticsTools, reference: str, all_titles: Dict, threshold: float) -> List:
+    """改造前的 find_similar_news：逐条计算 SequenceMatcher"""
+    items = []
+    for platform_id, titles in all_titles.items():
+        for title in titles:
+            if title == reference:
+                continue
+            similarity = tools._calculate_similarity(reference, title)
+            if similarity >= threshold:
+                items.append((platform_id, title, round(similarity, 3)))
+    return items
+
+
+def indexed_similar(tools: AnalyticsTools, index, reference: str, date, threshold: float) -> List:
+    """当前 find_similar_news 的计算方式（按指定日期执行）"""
+    candidates, _ = index.similar_candidates(reference, date, threshold, case_sensitive=True)
+    items = []
+    for info in candidates:
+        title = info["title"]
+        if title == reference:
+            continue
+        similarity = tools._calculate_similarity(reference, title)
+        if similarity >= threshold:
+            items.append((info["platform_id"], title, round(similarity, 3)))
+    return items
+
+
+def pick_queries(parser, dates, count: int, seed: int) -> List[str]:
+    """从语料中抽取标题作为查询，截取不同长度模拟用户输入"""
+    rng = random.Random(seed)
+    titles = []
+    for date in dates:
+        all_titles, _, _ = parser.read_all_titles_for_date(date=date)
+        for platform_titles in all_titles.values():
+            titles.extend(platform_titles)
+    rng.shuffle(titles)
+    queries = list(FIXED_QUERIES)
+    for title in titles[:count]:
+        cut = rng.choice([len(title), max(4, len(title) // 2), 6])
+        queries.append(title[:cut])
+    return queries
+
+
+def run_benchmark(args) -> Dict:
+    search_tools = SearchTools()
+    analytics_tools = AnalyticsTools()
+    parser = search_tools.data_service.parser
+    index = get_search_index(parser.project_root)
+
+    _, latest = search_tools.data_service.get_available_date_range()
+    if latest is None:
+        raise SystemExit("output 目录下没有可用的新闻数据")
+
+    dates = []
+    for offset in range(args.days):
+        date = latest - timedelta(days=offset)
+        try:
+            parser.read_all_titles_for_date(date=date)
+            dates.append(date)
+        except DataNotFoundError:
+            pass
+    dates.reverse()
+
+    total_titles = sum(
+        sum(len(t) for t in parser.read_all_titles_for_date(date=d)[0].values()) for d in dates
+    )
+
+    # 预热索引（首次构建或从磁盘加载），单独计时
+    started = time.perf_counter()
+    for date in dates:
+        index.search("预热", date)
+    index_seconds = time.perf_counter() - started
+
+    queries = pick_queries(parser, dates, args.queries, args.seed)
+    thresholds = [float(t) for t in args.thresholds.split(",") if t.strip()]
+
+    results = {
+        "params": {
+            "days": len(dates),
+            "titles": total_titles,
+            "queries": len(queries),
+            "thresholds": thresholds,
+        },
+        "index_warmup_seconds": round(index_seconds, 3),
+        "cases": [],
+    }
+
+    for threshold in thresholds:
+        for name in ("search_fuzzy", "find_similar"):
+            baseline_seconds = 0.0
+            indexed_seconds = 0.0
+            mismatches = 0
+            matched = 0
+
+            for query in queries:
+                for date in dates:
+                    all_titles, _, _ = parser.read_all_titles_for_date(date=date)
+
+                    started = time.perf_counter()
+                    if name == "search_fuzzy":
+                        expected = baseline_fuzzy(search_tools, query, all_titles, threshold)
+                    else:
+                        expected = baseline_similar(analytics_tools, query, all_titles, threshold)
+                    baseline_seconds += time.perf_counter() - started
+
+                    started = time.perf_counter()
+                    if name == "search_fuzzy":
+                        actual = indexed_fuzzy(search_tools, query, date, threshold)
+                    else:
+                        actual = indexed_similar(analytics_tools, index, query, date, threshold)
+                    indexed_seconds += time.perf_counter() - started
+
+                    matched += len(expected)
+                    if actual != expected:
+                        mismatches += 1
+
+            results["cases"].append({
+                "tool": name,
+                "threshold": threshold,
+                "matched": matched,
+                "mismatches": mismatches,
+                "baseline_seconds": round(baseline_seconds, 3),
+                "indexed_seconds": round(indexed_seconds, 3),
+                "speedup": round(baseline_seconds / indexed_seconds, 1) if indexed_seconds else 0,
+            })
+
+    results["index_stats"] = index.get_stats()
+    return results
+
+
+def print_report(results: Dict) -> None:
+    print("\n" + "=" * 72)
+    print("  模糊搜索 / 相似新闻基准测试结果")
+    print("=" * 72)
+    params = results["params"]
+    print(
+        f"数据: {params['days']} 天，{params['titles']} 条标题；查询数: {params['queries']}；"
+        f"索引预热: {results['index_warmup_seconds']:.3f}s"
+    )
+    print(f"\n{'工具':<14}{'阈值':>6}{'匹配数':>8}{'不一致':>8}{'全量扫描(s)':>14}{'索引(s)':>10}{'加速比':>8}")
+    for case in results["cases"]:
+        print(
+            f"{case['tool']:<14}{case['threshold']:>6.2f}{case['matched']:>8}{case['mismatches']:>8}"
+            f"{case['baseline_seconds']:>14.3f}{case['indexed_seconds']:>10.3f}{case['speedup']:>8.1f}"
+        )
+    stats = results["index_stats"]
+    print(f"\n候选比例（需要计算相似度的标题占比）: {stats['similar_candidate_rate']:.2%}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="TrendRadar 模糊搜索基准测试")
+    parser.add_argument("--days", type=int, default=7, help="使用最近多少天的数据")
+    parser.add_argument("--queries", type=int, default=10, help="从语料中抽取的查询数（另有固定查询）")
+    parser.add_argument("--thresholds", default="0.3,0.6", help="逗号分隔的相似度阈值")
+    parser.add_argument("--seed", type=int, default=42, help="随机种子")
+    parser.add_argument("--json", dest="json_path", help="将结果写入 JSON 文件")
+    args = parser.parse_args()
+
+    results = run_benchmark(args)
+    print_report(results)
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"\n结果已写入: {args.json_path}")
+
+    if any(case["mismatches"] for case in results["cases"]):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
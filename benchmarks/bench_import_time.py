@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+导入耗时基准测试
+
+在全新的子进程中多次导入模块，统计启动成本：
+
+- main：导入 main.py（不应读取配置文件、不应输出日志）
+- main + 配置：导入后访问 CONFIG（相当于改造前导入时的成本）
+- mcp_server.server：导入 MCP Server（注册全部工具）
+
+每个场景记录子进程总耗时（含解释器启动）和进程内导入耗时，
+以及导入期间的标准输出行数（用于确认导入没有副作用）。
+可选 --top 输出 `python -X importtime` 中累计耗时最多的模块。
+
+用法：
+    python benchmarks/bench_import_time.py
+    python benchmarks/bench_import_time.py --runs 10 --top 15
+    python benchmarks/bench_import_time.py --json bench_output.json
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(BENCH_DIR)
+
+# 场景名称 -> 子进程中执行的导入语句
+SCENARIOS = {
+    "python": "pass",
+    "main": "import main",
+    "main + 配置": "import main; main.CONFIG.load()",
+    "mcp_server.server": "import mcp_server.server",
+}
+
+PROBE = """
+import io, json, sys, time, contextlib
+buffer = io.StringIO()
+start = time.perf_counter()
+with contextlib.redirect_stdout(buffer):
+    {statement}
+elapsed = time.perf_counter() - start
+lines = [line for line in buffer.getvalue().splitlines() if line.strip()]
+sys.stdout.write(json.dumps({{"import_seconds": elapsed, "stdout_lines": len(lines)}}))
+"""
+
+
+def run_once(statement: str) -> Dict:
+    """在新进程中执行一次导入"""
+    code = PROBE.format(statement=statement)
+    start = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    wall_seconds = time.perf_counter() - start
+    result = json.loads(completed.stdout.strip().splitlines()[-1])
+    result["wall_seconds"] = wall_seconds
+    return result
+
+
+def import_time_top(module: str, top: int) -> List[Dict]:
+    """解析 -X importtime 输出，返回累计耗时最多的模块"""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    entries = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        # 格式: "import time:  self_us | cumulative_us | [缩进]模块名"
+        self_us, cumulative_us, name = line.split(":", 1)[1].split("|", 2)
+        entries.append({
+            "module": name.strip(),
+            "self_ms": int(self_us) / 1000,
+            "cumulative_ms": int(cumulative_us) / 1000,
+        })
+    entries.sort(key=lambda entry: entry["cumulative_ms"], reverse=True)
+    return entries[:top]
+
+
+def run_benchmark(args) -> Dict:
+    results = {"params": {"runs": args.runs, "python": sys.version.split()[0]}, "scenarios": []}
+
+    for name, statement in SCENARIOS.items():
+        run_once(statement)  # 预热文件系统缓存和 .pyc
+        runs = [run_once(statement) for _ in range(args.runs)]
+        results["scenarios"].append({
+            "name": name,
+            "statement": statement,
+            "wall_ms_median": round(statistics.median(r["wall_seconds"] for r in runs) * 1000, 1),
+            "wall_ms_min": round(min(r["wall_seconds"] for r in runs) * 1000, 1),
+            "import_ms_median": round(statistics.median(r["import_seconds"] for r in runs) * 1000, 1),
+            "stdout_lines": max(r["stdout_lines"] for r in runs),
+        })
+
+    if args.top:
+        results["importtime_top"] = {
+            module: import_time_top(module, args.top)
+            for module in ("main", "mcp_server.server")
+        }
+    return results
+
+
+def print_report(results: Dict) -> None:
+    print("\n" + "=" * 72)
+    print("  导入耗时基准测试结果")
+    print("=" * 72)
+    params = results["params"]
+    print(f"Python {params['python']}，每个场景 {params['runs']} 次（新进程）")
+    print(f"\n{'场景':<20}{'进程总耗时中位数(ms)':>22}{'最小(ms)':>10}{'导入耗时(ms)':>14}{'输出行数':>10}")
+    for scenario in results["scenarios"]:
+        print(
+            f"{scenario['name']:<20}{scenario['wall_ms_median']:>22.1f}{scenario['wall_ms_min']:>10.1f}"
+            f"{scenario['import_ms_median']:>14.1f}{scenario['stdout_lines']:>10}"
+        )
+
+    for module, entries in results.get("importtime_top", {}).items():
+        print(f"\n{module} 累计导入耗时最多的模块:")
+        for entry in entries:
+            print(f"  {entry['cumulative_ms']:>9.1f} ms  {entry['module']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="TrendRadar 导入耗时基准测试")
+    parser.add_argument("--runs", type=int, default=5, help="每个场景的导入次数")
+    parser.add_argument("--top", type=int, default=0, help="输出 -X importtime 中耗时最多的 N 个模块")
+    parser.add_argument("--json", dest="json_path", help="将结果写入 JSON 文件")
+    args = parser.parse_args()
+
+    results = run_benchmark(args)
+    print_report(results)
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"\n结果已写入: {args.json_path}")
+
+    # 导入 main.py 不应有输出
+    if any(s["name"] == "main" and s["stdout_lines"] for s in results["scenarios"]):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+关键词提取基准测试
+
+在 output 目录的全部历史数据上对比关键词提取的吞吐量和分词质量：
+
+- 旧实现：按空格和标点切分（改造前 AnalyticsTools._extract_keywords 的逻辑）
+- 分词器（冷）：词典 Trie 最大匹配 + bigram 退化，缓存为空
+- 分词器（热）：同一批标题再提取一遍，全部命中 LRU 缓存
+
+标题按天遍历（与分析工具的访问方式一致），同一标题在不同日期重复出现时会重复计算。
+质量指标"整标题占比"是提取结果恰好只有一个词且等于整条标题的比例。
+
+用法：
+    python benchmarks/bench_keyword_extractor.py
+    python benchmarks/bench_keyword_extractor.py --days 30
+    python benchmarks/bench_keyword_extractor.py --json bench_output.json
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from datetime import timedelta
+from typing import Callable, Dict, List
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, PROJECT_ROOT)
+
+from mcp_server.services.parser_service import ParserService
+from mcp_server.services.data_service import DataService
+from mcp_server.utils.errors import DataNotFoundError
+from mcp_server.utils.keywords import (
+    STOPWORDS,
+    DEFAULT_DICTIONARY_PATH,
+    KeywordTokenizer,
+    load_dictionary_words,
+)
+
+
+def baseline_extract(title: str, min_length: int = 2) -> List[str]:
+    """改造前的关键词提取：按空格和标点切分"""
+    title = re.sub(r'http[s]?://\S+', '', title)
+    title = re.sub(r'[^\w\s]', ' ', title)
+    words = re.split(r'[\s，。！？、]+', title)
+    return [w.strip() for w in words if w.strip() and len(w.strip()) >= min_length and w.strip() not in STOPWORDS]
+
+
+def load_corpus(parser: ParserService, data_service: DataService, days: int) -> List[str]:
+    """按天读取标题（0 表示全部历史数据）"""
+    earliest, latest = data_service.get_available_date_range()
+    if latest is None:
+        raise SystemExit("output 目录下没有可用的新闻数据")
+
+    start = earliest if days <= 0 else max(earliest, latest - timedelta(days=days - 1))
+    titles = []
+    date = start
+    while date <= latest:
+        try:
+            all_titles, _, _ = parser.read_all_titles_for_date(date=date)
+            for platform_titles in all_titles.values():
+                titles.extend(platform_titles.keys())
+        except DataNotFoundError:
+            pass
+        date += timedelta(days=1)
+    return titles
+
+
+def measure(name: str, extract: Callable[[str], List[str]], titles: List[str]) -> Dict:
+    keyword_total = 0
+    whole_title = 0
+    started = time.perf_counter()
+    for title in titles:
+        keywords = extract(title)
+        keyword_total += len(keywords)
+        if len(keywords) == 1 and keywords[0] == title:
+            whole_title += 1
+    seconds = time.perf_counter() - started
+    return {
+        "extractor": name,
+        "seconds": round(seconds, 4),
+        "titles_per_second": round(len(titles) / seconds) if seconds else 0,
+        "avg_keywords": round(keyword_total / len(titles), 2) if titles else 0,
+        "whole_title_rate": round(whole_title / len(titles), 4) if titles else 0,
+    }
+
+
+def run_benchmark(args) -> Dict:
+    parser = ParserService()
+    data_service = DataService()
+    titles = load_corpus(parser, data_service, args.days)
+    if not titles:
+        raise SystemExit("没有可用的标题")
+
+    words = load_dictionary_words(DEFAULT_DICTIONARY_PATH) if DEFAULT_DICTIONARY_PATH.exists() else []
+    tokenizer = KeywordTokenizer(words)
+
+    cases = [
+        measure("baseline", baseline_extract, titles),
+        measure("tokenizer_cold", tokenizer.tokenize, titles),
+        measure("tokenizer_warm", tokenizer.tokenize, titles),
+    ]
+    baseline_seconds = cases[0]["seconds"]
+    for case in cases:
+        case["speedup"] = round(baseline_seconds / case["seconds"], 2) if case["seconds"] else 0
+
+    return {
+        "params": {
+            "days": args.days,
+            "titles": len(titles),
+            "unique_titles": len(set(titles)),
+            "dictionary_words": len(words),
+        },
+        "cases": cases,
+        "tokenizer_stats": tokenizer.get_stats(),
+    }
+
+
+def print_report(results: Dict) -> None:
+    print("\n" + "=" * 72)
+    print("  关键词提取基准测试结果")
+    print("=" * 72)
+    params = results["params"]
+    print(
+        f"标题: {params['titles']} 条（去重 {params['unique_titles']} 条）；"
+        f"词典: {params['dictionary_words']} 个词"
+    )
+    print(f"\n{'实现':<16}{'耗时(s)':>10}{'标题/秒':>12}{'平均词数':>10}{'整标题占比':>12}{'相对旧实现':>12}")
+    for case in results["cases"]:
+        print(
+            f"{case['extractor']:<16}{case['seconds']:>10.3f}{case['titles_per_second']:>12}"
+            f"{case['avg_keywords']:>10.2f}{case['whole_title_rate']:>12.2%}{case['speedup']:>12.2f}"
+        )
+    stats = results["tokenizer_stats"]
+    print(f"\n缓存: {stats['cache_size']} 条，命中率 {stats['cache_hit_rate']:.2%}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="TrendRadar 关键词提取基准测试")
+    parser.add_argument("--days", type=int, default=0, help="使用最近多少天的数据（0 表示全部历史数据）")
+    parser.add_argument("--json", dest="json_path", help="将结果写入 JSON 文件")
+    args = parser.parse_args()
+
+    results = run_benchmark(args)
+    print_report(results)
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"\n结果已写入: {args.json_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+通知推送吞吐基准测试
+
+启动本地模拟 Webhook 服务（mock_webhook_server.py），将所有推送渠道指向它，
+用合成的大型报告执行完整的 send_to_notifications 流程，统计每个渠道的
+批次数、消息数/秒和耗时。
+
+用法：
+    python benchmarks/bench_notifications.py
+    python benchmarks/bench_notifications.py --keywords 40 --titles 30 --batch-interval 0 --no-rate-limit
+    python benchmarks/bench_notifications.py --channels feishu,telegram --json bench_output.json
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from typing import Dict, List
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, PROJECT_ROOT)
+sys.path.insert(0, BENCH_DIR)
+
+from mock_webhook_server import CHANNEL_PROFILES, MockWebhookServer
+
+# 渠道 -> 需要写入 CONFIG 的配置项
+CHANNEL_CONFIG_KEYS = {
+    "feishu": ["FEISHU_WEBHOOK_URL"],
+    "dingtalk": ["DINGTALK_WEBHOOK_URL"],
+    "wework": ["WEWORK_WEBHOOK_URL"],
+    "telegram": ["TELEGRAM_BOT_TOKEN", "TELEGRAM_CHAT_ID", "TELEGRAM_API_BASE"],
+    "ntfy": ["NTFY_SERVER_URL", "NTFY_TOPIC"],
+    "bark": ["BARK_URL"],
+    "slack": ["SLACK_WEBHOOK_URL"],
+}
+
+PLATFORM_NAMES = ["今日头条", "百度热搜", "华尔街见闻", "澎湃新闻", "bilibili 热搜", "财联社热门", "微博", "知乎"]
+
+
+def build_synthetic_stats(keyword_count: int, titles_per_keyword: int, rank_threshold: int) -> List[Dict]:
+    """生成与 count_word_frequency 输出结构一致的合成统计数据"""
+    stats = []
+    total = keyword_count * titles_per_keyword
+    for k in range(keyword_count):
+        titles = []
+        for t in range(titles_per_keyword):
+            first = f"{(t % 12) + 8:02d}时{(t * 7) % 60:02d}分"
+            last = f"{(t % 12) + 9:02d}时{(t * 11) % 60:02d}分"
+            titles.append(
+                {
+                    "title": f"关键词{k}相关热点新闻标题第{t}条：这是一条用于压测推送分批的较长新闻标题",
+                    "source_name": PLATFORM_NAMES[(k + t) % len(PLATFORM_NAMES)],
+                    "time_display": f"[{first} ~ {last}]",
+                    "count": (t % 5) + 1,
+                    "ranks": [(t % 20) + 1, (t % 20) + 2],
+                    "rank_threshold": rank_threshold,
+                    "url": f"https://example.com/news/{k}/{t}",
+                    "mobileUrl": f"https://m.example.com/news/{k}/{t}",
+                    "is_new": t % 4 == 0,
+                }
+            )
+        stats.append(
+            {
+                "word": f"关键词{k}",
+                "count": titles_per_keyword,
+                "position": k,
+                "titles": titles,
+                "percentage": round(titles_per_keyword / total * 100, 2),
+            }
+        )
+    return stats
+
+
+def configure_channels(main_module, server: MockWebhookServer, channels: List[str], accounts: int) -> None:
+    """清空所有通知配置，只把选中的渠道指向模拟服务"""
+    config = main_module.CONFIG
+    for keys in CHANNEL_CONFIG_KEYS.values():
+        for key in keys:
+            config[key] = ""
+    for key in ("EMAIL_FROM", "EMAIL_PASSWORD", "EMAIL_TO"):
+        config[key] = ""
+    config["NTFY_TOKEN"] = ""
+
+    urls = server.channel_urls(accounts)
+    for channel in channels:
+        for key in CHANNEL_CONFIG_KEYS[channel]:
+            config[key] = urls[key]
+
+
+def run_benchmark(args) -> Dict:
+    os.chdir(PROJECT_ROOT)
+    import main as trendradar
+
+    channels = [c.strip() for c in args.channels.split(",") if c.strip()]
+    unknown = [c for c in channels if c not in CHANNEL_CONFIG_KEYS]
+    if unknown:
+        raise SystemExit(f"未知渠道: {', '.join(unknown)}，可选: {', '.join(CHANNEL_CONFIG_KEYS)}")
+
+    config = trendradar.CONFIG
+    config["BATCH_SEND_INTERVAL"] = args.batch_interval
+    config["MAX_ACCOUNTS_PER_CHANNEL"] = max(config["MAX_ACCOUNTS_PER_CHANNEL"], args.accounts)
+    config["PUSH_WINDOW"]["ENABLED"] = False
+    config["SHOW_VERSION_UPDATE"] = False
+
+    stats = build_synthetic_stats(args.keywords, args.titles, config["RANK_THRESHOLD"])
+
+    server = MockWebhookServer(
+        latency_scale=args.latency_scale,
+        enable_rate_limit=not args.no_rate_limit,
+        failure_rate=args.failure_rate,
+    ).start()
+
+    results = {
+        "params": {
+            "channels": channels,
+            "accounts": args.accounts,
+            "keywords": args.keywords,
+            "titles_per_keyword": args.titles,
+            "batch_interval": args.batch_interval,
+            "latency_scale": args.latency_scale,
+            "rate_limit": not args.no_rate_limit,
+            "failure_rate": args.failure_rate,
+        },
+        "channels": {},
+    }
+
+    try:
+        # 逐个渠道单独执行完整通知流程，得到每个渠道的独立耗时
+        for channel in channels:
+            configure_channels(trendradar, server, [channel], args.accounts)
+            server.reset_stats()
+            started = time.perf_counter()
+            send_results = trendradar.send_to_notifications(stats, report_type="当日汇总", mode="daily")
+            elapsed = time.perf_counter() - started
+
+            server_stats = server.get_stats().get(channel, {})
+            requests = server_stats.get("requests", 0)
+            results["channels"][channel] = {
+                "success": bool(send_results.get(channel)),
+                "batches": requests,
+                "wall_seconds": round(elapsed, 3),
+                "msgs_per_sec": round(requests / elapsed, 2) if elapsed > 0 else 0,
+                "server": server_stats,
+            }
+
+        # 所有渠道一起执行，得到通知阶段总耗时
+        configure_channels(trendradar, server, channels, args.accounts)
+        server.reset_stats()
+        started = time.perf_counter()
+        trendradar.send_to_notifications(stats, report_type="当日汇总", mode="daily")
+        total_elapsed = time.perf_counter() - started
+        total_requests = sum(s["requests"] for s in server.get_stats().values())
+        results["total"] = {
+            "batches": total_requests,
+            "wall_seconds": round(total_elapsed, 3),
+            "msgs_per_sec": round(total_requests / total_elapsed, 2) if total_elapsed > 0 else 0,
+        }
+    finally:
+        server.stop()
+
+    return results
+
+
+def print_report(results: Dict) -> None:
+    print("\n" + "=" * 72)
+    print("  通知推送基准测试结果")
+    print("=" * 72)
+    params = results["params"]
+    print(
+        f"报告规模: {params['keywords']} 个关键词 × {params['titles_per_keyword']} 条标题，"
+        f"账号数: {params['accounts']}，批次间隔: {params['batch_interval']}s，"
+        f"延迟倍率: {params['latency_scale']}，限流: {'开' if params['rate_limit'] else '关'}"
+    )
+    print(f"\n{'渠道':<10}{'结果':<6}{'批次':>6}{'限流':>6}{'耗时(s)':>10}{'消息/秒':>10}{'字节':>12}")
+    for channel, data in results["channels"].items():
+        server = data["server"]
+        print(
+            f"{channel:<10}{'OK' if data['success'] else 'FAIL':<6}{data['batches']:>6}"
+            f"{server.get('rate_limited', 0):>6}{data['wall_seconds']:>10.3f}"
+            f"{data['msgs_per_sec']:>10.2f}{server.get('bytes_received', 0):>12}"
+        )
+    total = results["total"]
+    print(
+        f"\n全部渠道: {total['batches']} 批次，总耗时 {total['wall_seconds']:.3f}s，"
+        f"{total['msgs_per_sec']:.2f} 消息/秒"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="TrendRadar 通知推送吞吐基准测试")
+    parser.add_argument("--channels", default=",".join(CHANNEL_PROFILES), help="逗号分隔的渠道列表")
+    parser.add_argument("--accounts", type=int, default=1, help="每个渠道的账号数")
+    parser.add_argument("--keywords", type=int, default=30, help="合成报告的关键词数")
+    parser.add_argument("--titles", type=int, default=20, help="每个关键词的标题数")
+    parser.add_argument("--batch-interval", type=float, default=None, help="批次间隔（秒），默认使用配置值")
+    parser.add_argument("--latency-scale", type=float, default=1.0, help="模拟延迟倍率，0 表示无延迟")
+    parser.add_argument("--no-rate-limit", action="store_true", help="关闭模拟限流")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="随机失败概率（0~1）")
+    parser.add_argument("--json", dest="json_path", help="将结果写入 JSON 文件")
+    args = parser.parse_args()
+
+    if args.batch_interval is None:
+        os.chdir(PROJECT_ROOT)
+        import main as trendradar
+
+        args.batch_interval = trendradar.CONFIG["BATCH_SEND_INTERVAL"]
+
+    results = run_benchmark(args)
+    print_report(results)
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"\n结果已写入: {args.json_path}")
+
+
+if __name__ == "__main__":
+    main()
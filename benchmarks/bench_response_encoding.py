@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+工具响应编码基准测试
+
+用 output 目录的真实数据生成几组大结果集（每组最多 1000 条，带 URL），对比各输出格式的
+序列化耗时和响应体积：
+
+- pretty：缩进 2 格（原先所有工具的输出方式）
+- compact：无缩进
+- table：列式表格（字段列表 + 行）
+- 以上格式再分别叠加"省略默认值字段"
+
+体积同时给出 UTF-8 字节数和字符数（字符数更接近客户端的 token 消耗）。
+
+用法：
+    python benchmarks/bench_response_encoding.py
+    python benchmarks/bench_response_encoding.py --days 30 --repeat 20
+    python benchmarks/bench_response_encoding.py --json bench_output.json
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from datetime import timedelta
+from typing import Dict, List
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, PROJECT_ROOT)
+
+from mcp_server.tools.analytics import AnalyticsTools
+from mcp_server.tools.data_query import DataQueryTools
+from mcp_server.tools.search_tools import SearchTools
+from mcp_server.utils.response import OUTPUT_FORMATS, encode_response
+
+
+def build_result_sets(days: int) -> Dict[str, Dict]:
+    """调用真实工具生成大结果集"""
+    search_tools = SearchTools()
+    data_tools = DataQueryTools()
+    analytics_tools = AnalyticsTools()
+
+    _, latest = search_tools.data_service.get_available_date_range()
+    if latest is None:
+        raise SystemExit("output 目录下没有可用的新闻数据")
+    start = latest - timedelta(days=days - 1)
+    date_range = {"start": start.strftime("%Y-%m-%d"), "end": latest.strftime("%Y-%m-%d")}
+
+    result_sets = {
+        "get_news_by_date": data_tools.get_news_by_date(
+            date_query=latest.strftime("%Y-%m-%d"), limit=1000, include_url=True
+        ),
+        "search_news": search_tools.search_news_unified(
+            query="美国", date_range=date_range, limit=1000, include_url=True
+        ),
+        "analyze_sentiment": analytics_tools.analyze_sentiment(
+            date_range=date_range, limit=1000, include_url=True
+        ),
+    }
+    for name, result in result_sets.items():
+        if not result.get("success"):
+            raise SystemExit(f"{name} 调用失败: {result.get('error')}")
+    return result_sets
+
+
+def count_items(result: Dict) -> int:
+    for key in ("news", "results", "news_sample"):
+        if key in result:
+            return len(result[key])
+    return 0
+
+
+def measure(result: Dict, output_format: str, omit_defaults: bool, repeat: int) -> Dict:
+    timings: List[float] = []
+    payload = ""
+    for _ in range(repeat):
+        started = time.perf_counter()
+        payload = encode_response(result, output_format, omit_defaults)
+        timings.append(time.perf_counter() - started)
+    return {
+        "format": output_format,
+        "omit_defaults": omit_defaults,
+        "median_ms": round(statistics.median(timings) * 1000, 3),
+        "bytes": len(payload.encode("utf-8")),
+        "chars": len(payload),
+    }
+
+
+def run_benchmark(args) -> Dict:
+    result_sets = build_result_sets(args.days)
+    results = {"params": {"days": args.days, "repeat": args.repeat}, "cases": []}
+
+    for name, result in result_sets.items():
+        baseline = None
+        for output_format in OUTPUT_FORMATS:
+            for omit_defaults in (False, True):
+                case = measure(result, output_format, omit_defaults, args.repeat)
+                case["tool"] = name
+                case["items"] = count_items(result)
+                if baseline is None:
+                    baseline = case
+                case["size_ratio"] = round(case["bytes"] / baseline["bytes"], 3)
+                case["time_ratio"] = round(case["median_ms"] / baseline["median_ms"], 3) if baseline["median_ms"] else 0
+                results["cases"].append(case)
+
+    return results
+
+
+def print_report(results: Dict) -> None:
+    print("\n" + "=" * 80)
+    print("  工具响应编码基准测试结果")
+    print("=" * 80)
+    print(f"数据: 最近 {results['params']['days']} 天；每种格式重复 {results['params']['repeat']} 次取中位数")
+    print(
+        f"\n{'工具':<20}{'条数':>6}{'格式':>9}{'省略默认':>10}{'耗时(ms)':>10}"
+        f"{'字节':>10}{'字符':>10}{'体积比':>8}{'耗时比':>8}"
+    )
+    for case in results["cases"]:
+        print(
+            f"{case['tool']:<20}{case['items']:>6}{case['format']:>9}{'是' if case['omit_defaults'] else '否':>10}"
+            f"{case['median_ms']:>10.2f}{case['bytes']:>10}{case['chars']:>10}"
+            f"{case['size_ratio']:>8.2f}{case['time_ratio']:>8.2f}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="TrendRadar 工具响应编码基准测试")
+    parser.add_argument("--days", type=int, default=7, help="search_news / analyze_sentiment 使用最近多少天的数据")
+    parser.add_argument("--repeat", type=int, default=10, help="每种格式重复序列化的次数")
+    parser.add_argument("--json", dest="json_path", help="将结果写入 JSON 文件")
+    args = parser.parse_args()
+
+    results = run_benchmark(args)
+    print_report(results)
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"\n结果已写入: {args.json_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+MCP Server 冷启动基准测试
+
+每轮启动一个全新的服务器进程，记录从启动进程开始到以下时刻的耗时：
+
+- initialize：收到 initialize 响应（客户端可以开始使用服务器）
+- tools/list：收到工具列表
+- 首次工具调用：第一次调用数据工具（get_latest_news）返回，包含加载工具模块的时间
+- 第二次工具调用：再次调用同一工具的耗时（工具模块已加载）
+
+stdio 模式通过标准输入输出交互（跳过服务器输出的非 JSON 启动信息），
+HTTP 模式轮询 /mcp 直到 initialize 成功。
+
+每种模式分别测试两种配置：默认配置（开启后台预热）和 --no-warmup（关闭后台预热），
+用于确认预热不会拖慢服务器启动和会话中的工具调用。
+
+用法：
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py --runs 5 --modes stdio
+    python benchmarks/bench_startup.py --configs default
+    python benchmarks/bench_startup.py --port 3399 --json bench_output.json
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from typing import Dict, List, Optional
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(BENCH_DIR)
+
+PROTOCOL_VERSION = "2025-06-18"
+FIRST_TOOL = ("get_latest_news", {"limit": 5})
+STAGES = ["initialize", "tools_list", "first_tool_call", "second_tool_call"]
+CONFIGS = ["default", "no-warmup"]
+STAGE_LABELS = {
+    "initialize": "initialize",
+    "tools_list": "tools/list",
+    "first_tool_call": "首次工具调用",
+    "second_tool_call": "第二次工具调用",
+}
+
+
+def _request(request_id: int, method: str, params: Optional[Dict] = None) -> Dict:
+    message = {"jsonrpc": "2.0", "id": request_id, "method": method}
+    if params is not None:
+        message["params"] = params
+    return message
+
+
+INITIALIZE_PARAMS = {
+    "protocolVersion": PROTOCOL_VERSION,
+    "capabilities": {},
+    "clientInfo": {"name": "bench_startup", "version": "1.0"},
+}
+
+
+def _server_command(transport: str, port: int, config: str) -> List[str]:
+    command = [sys.executable, "-m", "mcp_server.server", "--transport", transport]
+    if config == "no-warmup":
+        command.append("--no-warmup")
+    if transport == "http":
+        command += ["--host", "127.0.0.1", "--port", str(port)]
+    return command
+
+
+def _check_tool_result(response: Dict) -> None:
+    if "error" in response or response.get("result", {}).get("isError"):
+        raise RuntimeError(f"工具调用失败: {json.dumps(response, ensure_ascii=False)[:300]}")
+
+
+# ==================== stdio ====================
+
+def _read_response(process: subprocess.Popen, request_id: int) -> Dict:
+    """读取指定 id 的 JSON-RPC 响应，跳过启动信息和通知"""
+    while True:
+        line = process.stdout.readline()
+        if not line:
+            raise RuntimeError("服务器进程已退出")
+        try:
+            message = json.loads(line)
+        except ValueError:
+            continue
+        if isinstance(message, dict) and message.get("id") == request_id:
+            return message
+
+
+def run_stdio_once(args, config: str) -> Dict:
+    timings = {}
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        _server_command("stdio", args.port, config),
+        cwd=PROJECT_ROOT,
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        text=True,
+        bufsize=1,
+    )
+
+    def send(message: Dict) -> None:
+        process.stdin.write(json.dumps(message) + "\n")
+        process.stdin.flush()
+
+    try:
+        send(_request(1, "initialize", INITIALIZE_PARAMS))
+        _read_response(process, 1)
+        timings["initialize"] = time.perf_counter() - start
+        send({"jsonrpc": "2.0", "method": "notifications/initialized"})
+
+        send(_request(2, "tools/list"))
+        _read_response(process, 2)
+        timings["tools_list"] = time.perf_counter() - start
+
+        name, arguments = FIRST_TOOL
+        send(_request(3, "tools/call", {"name": name, "arguments": arguments}))
+        _check_tool_result(_read_response(process, 3))
+        timings["first_tool_call"] = time.perf_counter() - start
+
+        call_start = time.perf_counter()
+        send(_request(4, "tools/call", {"name": name, "arguments": arguments}))
+        _check_tool_result(_read_response(process, 4))
+        timings["second_tool_call"] = time.perf_counter() - call_start
+    finally:
+        process.kill()
+        process.wait()
+    return timings
+
+
+# ==================== HTTP ====================
+
+def _post(url: str, message: Dict, session_id: Optional[str]) -> (Dict, Optional[str]):
+    headers = {
+        "Content-Type": "application/json",
+        "Accept": "application/json, text/event-stream",
+        "MCP-Protocol-Version": PROTOCOL_VERSION,
+    }
+    if session_id:
+        headers["Mcp-Session-Id"] = session_id
+    request = urllib.request.Request(url, data=json.dumps(message).encode("utf-8"), headers=headers)
+    with urllib.request.urlopen(request, timeout=60) as response:
+        body = response.read().decode("utf-8")
+        session_id = response.headers.get("Mcp-Session-Id") or session_id
+    if not body.strip():
+        return {}, session_id
+    # 流式 HTTP 可能以 SSE 返回
+    for line in body.splitlines():
+        if line.startswith("data:"):
+            return json.loads(line[5:].strip()), session_id
+    return json.loads(body), session_id
+
+
+def run_http_once(args, config: str) -> Dict:
+    timings = {}
+    url = f"http://127.0.0.1:{args.port}/mcp"
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        _server_command("http", args.port, config),
+        cwd=PROJECT_ROOT,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        deadline = start + args.timeout
+        while True:
+            try:
+                _, session_id = _post(url, _request(1, "initialize", INITIALIZE_PARAMS), None)
+                break
+            except (urllib.error.URLError, ConnectionError):
+                if process.poll() is not None or time.perf_counter() > deadline:
+                    raise RuntimeError("HTTP 服务器未能启动")
+                time.sleep(0.01)
+        timings["initialize"] = time.perf_counter() - start
+        _post(url, {"jsonrpc": "2.0", "method": "notifications/initialized"}, session_id)
+
+        _post(url, _request(2, "tools/list"), session_id)
+        timings["tools_list"] = time.perf_counter() - start
+
+        name, arguments = FIRST_TOOL
+        response, _ = _post(url, _request(3, "tools/call", {"name": name, "arguments": arguments}), session_id)
+        _check_tool_result(response)
+        timings["first_tool_call"] = time.perf_counter() - start
+
+        call_start = time.perf_counter()
+        response, _ = _post(url, _request(4, "tools/call", {"name": name, "arguments": arguments}), session_id)
+        _check_tool_result(response)
+        timings["second_tool_call"] = time.perf_counter() - call_start
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+    return timings
+
+
+RUNNERS = {"stdio": run_stdio_once, "http": run_http_once}
+
+
+def run_benchmark(args) -> Dict:
+    modes = [mode.strip() for mode in args.modes.split(",") if mode.strip()]
+    configs = [config.strip() for config in args.configs.split(",") if config.strip()]
+    results = {
+        "params": {"runs": args.runs, "modes": modes, "configs": configs, "tool": FIRST_TOOL[0]},
+        "modes": {},
+    }
+    for mode in modes:
+        results["modes"][mode] = {}
+        # 各配置按轮交替运行，避免机器负载变化只影响其中一种配置
+        runs = {config: [] for config in configs}
+        for _ in range(args.runs):
+            for config in configs:
+                runs[config].append(RUNNERS[mode](args, config))
+        for config in configs:
+            results["modes"][mode][config] = {
+                stage: {
+                    "median_ms": round(statistics.median(run[stage] for run in runs[config]) * 1000, 1),
+                    "min_ms": round(min(run[stage] for run in runs[config]) * 1000, 1),
+                    "max_ms": round(max(run[stage] for run in runs[config]) * 1000, 1),
+                }
+                for stage in STAGES
+            }
+    return results
+
+
+def print_report(results: Dict) -> None:
+    print("\n" + "=" * 72)
+    print("  MCP Server 冷启动基准测试结果")
+    print("=" * 72)
+    params = results["params"]
+    print(f"每种模式和配置 {params['runs']} 轮（每轮新进程）；首次调用工具: {params['tool']}")
+    print("initialize / tools/list / 首次工具调用为从启动进程起的累计耗时")
+    print(f"\n{'模式':<8}{'配置':<12}{'阶段':<16}{'中位数(ms)':>12}{'最小(ms)':>10}{'最大(ms)':>10}")
+    for mode, configs in results["modes"].items():
+        for config, stages in configs.items():
+            for stage in STAGES:
+                timing = stages[stage]
+                print(
+                    f"{mode:<8}{config:<12}{STAGE_LABELS[stage]:<16}{timing['median_ms']:>12.1f}"
+                    f"{timing['min_ms']:>10.1f}{timing['max_ms']:>10.1f}"
+                )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="TrendRadar MCP Server 冷启动基准测试")
+    parser.add_argument("--runs", type=int, default=3, help="每种模式启动服务器的次数")
+    parser.add_argument("--modes", default="stdio,http", help="逗号分隔的传输模式（stdio/http）")
+    parser.add_argument(
+        "--configs", default=",".join(CONFIGS),
+        help="逗号分隔的服务器配置（default：开启后台预热；no-warmup：关闭后台预热）",
+    )
+    parser.add_argument("--port", type=int, default=3399, help="HTTP 模式使用的端口")
+    parser.add_argument("--timeout", type=float, default=60, help="等待 HTTP 服务器启动的秒数")
+    parser.add_argument("--json", dest="json_path", help="将结果写入 JSON 文件")
+    args = parser.parse_args()
+
+    results = run_benchmark(args)
+    print_report(results)
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"\n结果已写入: {args.json_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+合成语料生成器
+
+生成与爬虫输出格式一致的 output/<日期>/txt/<时间>.txt 语料，用于基准测试：
+
+- 日期以北京时间的今天结尾（main.py 按北京时间找今天的目录，MCP Server 按本地日期，
+  两者不同时会多生成一天，保证两边的“最近 N 天”都有数据）
+- 每天按固定间隔生成若干个快照，每个快照包含所有平台的热榜
+- 每个平台维护一份当前榜单，每个快照按流失率替换部分标题并轻微调整排名，
+  新的一天开始时流失更多，模拟真实热榜的延续和更替
+- 标题由主语、关键词（取自 frequency_words.txt，使部分标题命中关注词）、
+  动作和宾语组合而成，带 URL 和移动端 URL
+- 复制项目的 config/ 目录，生成的目录可以直接作为 MCP Server 的 project_root，
+  也可以作为 main.py 的工作目录
+
+目标目录下写入 corpus.json 记录生成参数；只会覆盖带有 corpus.json 的目录。
+
+用法：
+    python benchmarks/generate_corpus.py --root /tmp/trendradar_corpus
+    python benchmarks/generate_corpus.py --root /tmp/trendradar_corpus --days 30 --snapshots 24 --titles 50 --churn 0.1
+"""
+
+import argparse
+import json
+import os
+import random
+import shutil
+import sys
+import time
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, PROJECT_ROOT)
+
+from mcp_server.services.config_service import get_config_service
+
+BEIJING = timezone(timedelta(hours=8))
+MANIFEST_NAME = "corpus.json"
+
+SUBJECTS = [
+    "国务院", "央行", "教育部", "外交部", "多地", "专家", "网友", "记者", "官方", "媒体",
+    "研究团队", "消费者", "多家车企", "科技公司", "美联储", "欧盟", "日本", "俄罗斯", "港股", "A股",
+]
+ACTIONS = [
+    "发布", "回应", "宣布", "曝光", "暴涨", "下跌", "启动", "暂停", "升级", "推出",
+    "调查", "热议", "突破", "刷新纪录", "紧急通知", "辟谣", "确认", "否认", "上线", "召回",
+]
+OBJECTS = [
+    "新政策", "年度报告", "最新进展", "重要讲话", "新产品", "价格调整", "安全隐患", "合作协议",
+    "财报数据", "人事变动", "技术路线", "出口管制", "补贴方案", "发布会细节", "销量榜单",
+    "系列措施", "调查结果", "应急预案", "路线图", "官方声明",
+]
+SUFFIXES = ["", "", "", "！", "？", "：背后原因曝光", "，网友吵翻了", "，专家解读", "（附全文）", "，影响几何"]
+
+
+def load_topics(config_dir: Path) -> List[str]:
+    """从 frequency_words.txt 取出普通关键词（去掉 +、!、@ 等语法和分组标记）"""
+    topics = []
+    words_file = config_dir / "frequency_words.txt"
+    if words_file.exists():
+        for line in words_file.read_text(encoding="utf-8").splitlines():
+            word = line.strip()
+            if not word or word.startswith(("[", "#", "!", "@")):
+                continue
+            topics.append(word.lstrip("+"))
+    return topics or ["人工智能", "新能源", "芯片", "航天", "房地产"]
+
+
+def load_platforms(config_dir: Path, count: int) -> List[Tuple[str, str]]:
+    """取 config.yaml 中的前 count 个平台，不够时补充合成平台"""
+    snapshot = get_config_service().load(config_dir / "config.yaml")
+    platforms = [(p.id, p.name) for p in snapshot.platforms][:count]
+    for index in range(len(platforms), count):
+        platforms.append((f"synthetic-{index + 1}", f"合成平台{index + 1}"))
+    return platforms
+
+
+class TitleFactory:
+    """按固定随机种子生成标题，保证同一参数生成的语料完全相同"""
+
+    def __init__(self, rng: random.Random, topics: List[str], topic_rate: float = 0.3):
+        self.rng = rng
+        self.topics = topics
+        self.topic_rate = topic_rate
+        self.serial = 0
+
+    def new_title(self) -> str:
+        rng = self.rng
+        self.serial += 1
+        subject = rng.choice(SUBJECTS)
+        if rng.random() < self.topic_rate:
+            subject = f"{subject}{rng.choice(self.topics)}"
+        title = f"{subject}{rng.choice(ACTIONS)}{rng.choice(OBJECTS)}{rng.choice(SUFFIXES)}"
+        # 少量标题带编号，避免同一天内大量完全重复的标题
+        if rng.random() < 0.5:
+            title = f"{title} 第{self.serial % 997}期"
+        return title
+
+
+def snapshot_times(snapshots: int) -> List[str]:
+    """在 06:00-23:59 之间均匀分布的快照时间（HH时MM分）"""
+    start, end = 6 * 60, 24 * 60 - 1
+    step = (end - start) / max(snapshots, 1)
+    return [
+        f"{int(start + i * step) // 60:02d}时{int(start + i * step) % 60:02d}分"
+        for i in range(snapshots)
+    ]
+
+
+def _churn(board: List[Tuple[str, str]], count: int, factory: TitleFactory, platform_id: str) -> None:
+    """替换榜单中的 count 个标题，并随机交换相邻排名"""
+    rng = factory.rng
+    for position in rng.sample(range(len(board)), min(count, len(board))):
+        board[position] = _new_entry(factory, platform_id)
+    if len(board) > 1:
+        for _ in range(len(board) // 5):
+            i = rng.randrange(len(board) - 1)
+            board[i], board[i + 1] = board[i + 1], board[i]
+
+
+def _new_entry(factory: TitleFactory, platform_id: str) -> Tuple[str, str]:
+    title = factory.new_title()
+    return title, f"https://example.com/{platform_id}/{factory.serial}"
+
+
+def write_snapshot(path: Path, boards: Dict[str, List[Tuple[str, str]]], names: Dict[str, str]) -> int:
+    """按 save_titles_to_file 的格式写入一个快照，返回写入的字节数"""
+    sections = []
+    for platform_id, board in boards.items():
+        lines = [f"{platform_id} | {names[platform_id]}"]
+        for rank, (title, url) in enumerate(board, 1):
+            lines.append(f"{rank}. {title} [URL:{url}] [MOBILE:{url}?m=1]")
+        sections.append("\n".join(lines))
+    content = "\n\n".join(sections) + "\n"
+    data = content.encode("utf-8")
+    path.write_bytes(data)
+    return len(data)
+
+
+def corpus_dates(days: int, end_date: Optional[date] = None) -> List[date]:
+    """语料覆盖的日期（升序）"""
+    beijing_today = end_date or datetime.now(BEIJING).date()
+    local_today = end_date or datetime.now().date()
+    start = min(beijing_today, local_today) - timedelta(days=days - 1)
+    return [start + timedelta(days=i) for i in range((beijing_today - start).days + 1)]
+
+
+def prepare_root(root: Path) -> None:
+    """清理目标目录（只处理由本工具生成的目录）"""
+    root = root.resolve()
+    if root == Path(PROJECT_ROOT).resolve():
+        raise SystemExit("不能在项目根目录生成语料，请指定其他 --root")
+    if root.exists() and any(root.iterdir()):
+        if not (root / MANIFEST_NAME).exists():
+            raise SystemExit(f"{root} 不为空且不是生成的语料目录，拒绝覆盖")
+        shutil.rmtree(root / "output", ignore_errors=True)
+        shutil.rmtree(root / "config", ignore_errors=True)
+    root.mkdir(parents=True, exist_ok=True)
+
+
+def generate_corpus(
+    root: str,
+    days: int = 30,
+    snapshots: int = 12,
+    platforms: int = 11,
+    titles: int = 50,
+    churn: float = 0.1,
+    seed: int = 42,
+    end_date: Optional[date] = None,
+) -> Dict:
+    """
+    生成合成语料
+
+    Args:
+        root: 目标目录（生成 output/ 和 config/）
+        days: 天数
+        snapshots: 每天的快照数
+        platforms: 平台数
+        titles: 每个平台每个快照的标题数
+        churn: 每个快照被替换的标题比例（新的一天为 3 倍）
+        seed: 随机种子
+        end_date: 最后一天，默认北京时间的今天
+
+    Returns:
+        语料清单（参数和统计）
+    """
+    started = time.perf_counter()
+    root_path = Path(root)
+    prepare_root(root_path)
+    shutil.copytree(Path(PROJECT_ROOT) / "config", root_path / "config")
+
+    rng = random.Random(seed)
+    factory = TitleFactory(rng, load_topics(root_path / "config"))
+    platform_list = load_platforms(root_path / "config", platforms)
+    names = dict(platform_list)
+    boards = {
+        platform_id: [_new_entry(factory, platform_id) for _ in range(titles)]
+        for platform_id, _ in platform_list
+    }
+    per_snapshot = max(1, round(titles * churn)) if churn > 0 else 0
+
+    dates = corpus_dates(days, end_date)
+    times = snapshot_times(snapshots)
+    files = 0
+    total_bytes = 0
+    for day_index, day in enumerate(dates):
+        txt_dir = root_path / "output" / day.strftime("%Y年%m月%d日") / "txt"
+        txt_dir.mkdir(parents=True, exist_ok=True)
+        for snapshot_index, time_name in enumerate(times):
+            if day_index or snapshot_index:
+                count = per_snapshot * (3 if snapshot_index == 0 else 1)
+                for platform_id, board in boards.items():
+                    _churn(board, count, factory, platform_id)
+            total_bytes += write_snapshot(txt_dir / f"{time_name}.txt", boards, names)
+            files += 1
+
+    manifest = {
+        "params": {
+            "days": days,
+            "snapshots": snapshots,
+            "platforms": platforms,
+            "titles": titles,
+            "churn": churn,
+            "seed": seed,
+        },
+        "first_date": dates[0].isoformat(),
+        "last_date": dates[-1].isoformat(),
+        "date_folders": len(dates),
+        "files": files,
+        "title_lines": files * platforms * titles,
+        "unique_titles_generated": factory.serial,
+        "bytes": total_bytes,
+        "generation_seconds": round(time.perf_counter() - started, 3),
+    }
+    with open(root_path / MANIFEST_NAME, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    return manifest
+
+
+def load_manifest(root: str) -> Optional[Dict]:
+    """读取已生成语料的清单，不存在时返回 None"""
+    path = Path(root) / MANIFEST_NAME
+    if not path.exists():
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def add_corpus_arguments(parser: argparse.ArgumentParser, days_default: int = 30) -> None:
+    """语料参数（生成器和基准测试共用）"""
+    parser.add_argument("--root", default="/tmp/trendradar_corpus", help="语料目录")
+    parser.add_argument("--days", type=int, default=days_default, help="天数")
+    parser.add_argument("--snapshots", type=int, default=12, help="每天的快照数")
+    parser.add_argument("--platforms", type=int, default=11, help="平台数（超过配置的平台时补充合成平台）")
+    parser.add_argument("--titles", type=int, default=50, help="每个平台每个快照的标题数")
+    parser.add_argument("--churn", type=float, default=0.1, help="每个快照被替换的标题比例")
+    parser.add_argument("--seed", type=int, default=42, help="随机种子")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="TrendRadar 合成语料生成器")
+    add_corpus_arguments(parser)
+    args = parser.parse_args()
+
+    manifest = generate_corpus(
+        args.root,
+        days=args.days,
+        snapshots=args.snapshots,
+        platforms=args.platforms,
+        titles=args.titles,
+        churn=args.churn,
+        seed=args.seed,
+    )
+    print(
+        f"已生成 {manifest['date_folders']} 天（{manifest['first_date']} ~ {manifest['last_date']}），"
+        f"{manifest['files']} 个快照，{manifest['title_lines']} 行标题，"
+        f"{manifest['bytes'] / 1024 / 1024:.1f} MB，耗时 {manifest['generation_seconds']:.1f}s"
+    )
+    print(f"语料目录: {Path(args.root).resolve()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+本地模拟 Webhook 服务
+
+模拟飞书、钉钉、企业微信、Telegram、ntfy、Bark、Slack 的成功/失败响应格式、
+限流规则和网络延迟，用于在不访问真实推送服务的情况下测量通知阶段耗时。
+
+路由（均为 POST）：
+    /feishu/<key>                     飞书机器人
+    /dingtalk/<key>                   钉钉机器人
+    /wework/<key>                     企业微信机器人
+    /telegram/bot<token>/sendMessage  Telegram Bot API
+    /ntfy/<topic>                     ntfy（请求体为纯文本）
+    /push                             Bark（device_key 在请求体中）
+    /slack/<key>                      Slack Incoming Webhook
+
+单独运行：
+    python benchmarks/mock_webhook_server.py --port 18080
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+from collections import defaultdict, deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+
+
+# 各渠道模拟参数：latency_ms 为平均响应延迟，rate_limits 为 (窗口内最大请求数, 窗口秒数)
+CHANNEL_PROFILES = {
+    "feishu": {"latency_ms": 120, "rate_limits": [(5, 1), (100, 60)]},
+    "dingtalk": {"latency_ms": 80, "rate_limits": [(20, 60)]},
+    "wework": {"latency_ms": 80, "rate_limits": [(20, 60)]},
+    "telegram": {"latency_ms": 150, "rate_limits": [(1, 1), (20, 60)]},
+    "ntfy": {"latency_ms": 60, "rate_limits": [(60, 60)]},
+    "bark": {"latency_ms": 100, "rate_limits": [(10, 1)]},
+    "slack": {"latency_ms": 90, "rate_limits": [(1, 1)]},
+}
+
+NTFY_MAX_BODY = 4096
+
+
+class RateLimiter:
+    """按 (渠道, 账号) 的滑动窗口限流"""
+
+    def __init__(self):
+        self._history: Dict[Tuple[str, str], deque] = defaultdict(deque)
+        self._lock = threading.Lock()
+
+    def allow(self, channel: str, key: str, limits: List[Tuple[int, float]]) -> bool:
+        if not limits:
+            return True
+        now = time.time()
+        longest = max(window for _, window in limits)
+        with self._lock:
+            history = self._history[(channel, key)]
+            while history and now - history[0] > longest:
+                history.popleft()
+            for max_count, window in limits:
+                recent = sum(1 for t in history if now - t <= window)
+                if recent >= max_count:
+                    return False
+            history.append(now)
+            return True
+
+
+class ChannelStats:
+    """单个渠道的服务端统计"""
+
+    def __init__(self):
+        self.requests = 0
+        self.succeeded = 0
+        self.rate_limited = 0
+        self.failed = 0
+        self.bytes_received = 0
+        self.first_request_at: Optional[float] = None
+        self.last_response_at: Optional[float] = None
+
+    def to_dict(self) -> Dict:
+        window = 0.0
+        if self.first_request_at is not None and self.last_response_at is not None:
+            window = self.last_response_at - self.first_request_at
+        return {
+            "requests": self.requests,
+            "succeeded": self.succeeded,
+            "rate_limited": self.rate_limited,
+            "failed": self.failed,
+            "bytes_received": self.bytes_received,
+            "window_seconds": round(window, 3),
+        }
+
+
+class MockWebhookServer(ThreadingHTTPServer):
+    """模拟 Webhook 服务"""
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency_scale: float = 1.0,
+        enable_rate_limit: bool = True,
+        failure_rate: float = 0.0,
+    ):
+        super().__init__((host, port), MockWebhookHandler)
+        self.latency_scale = latency_scale
+        self.enable_rate_limit = enable_rate_limit
+        self.failure_rate = failure_rate
+        self.rate_limiter = RateLimiter()
+        self.stats: Dict[str, ChannelStats] = defaultdict(ChannelStats)
+        self.stats_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "MockWebhookServer":
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.shutdown()
+        self.server_close()
+
+    def reset_stats(self) -> None:
+        with self.stats_lock:
+            self.stats = defaultdict(ChannelStats)
+
+    def get_stats(self) -> Dict[str, Dict]:
+        with self.stats_lock:
+            return {channel: stats.to_dict() for channel, stats in self.stats.items()}
+
+    def channel_urls(self, accounts: int = 1) -> Dict[str, str]:
+        """生成可直接写入 CONFIG 的各渠道地址（多账号用 ; 分隔）"""
+        base = self.base_url
+        keys = [f"acc{i + 1}" for i in range(accounts)]
+        return {
+            "FEISHU_WEBHOOK_URL": ";".join(f"{base}/feishu/{k}" for k in keys),
+            "DINGTALK_WEBHOOK_URL": ";".join(f"{base}/dingtalk/{k}" for k in keys),
+            "WEWORK_WEBHOOK_URL": ";".join(f"{base}/wework/{k}" for k in keys),
+            "TELEGRAM_BOT_TOKEN": ";".join(f"token-{k}" for k in keys),
+            "TELEGRAM_CHAT_ID": ";".join(f"chat-{k}" for k in keys),
+            "NTFY_SERVER_URL": f"{base}/ntfy",
+            "NTFY_TOPIC": ";".join(f"topic-{k}" for k in keys),
+            "TELEGRAM_API_BASE": f"{base}/telegram",
+            "BARK_URL": ";".join(f"{base}/{k}" for k in keys),
+            "SLACK_WEBHOOK_URL": ";".join(f"{base}/slack/{k}" for k in keys),
+        }
+
+
+class MockWebhookHandler(BaseHTTPRequestHandler):
+    server: MockWebhookServer
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status: int, body, content_type: str = "application/json", headers=None):
+        if isinstance(body, (dict, list)):
+            payload = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        else:
+            payload = str(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(payload)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _route(self) -> Tuple[Optional[str], str]:
+        """解析渠道和账号标识"""
+        parts = [p for p in self.path.split("?")[0].split("/") if p]
+        # Bark 客户端固定请求 <host>/push
+        if parts == ["push"]:
+            return "bark", "default"
+        if not parts or parts[0] not in CHANNEL_PROFILES:
+            return None, ""
+        channel = parts[0]
+        key = parts[1] if len(parts) > 1 else "default"
+        return channel, key
+
+    def do_POST(self):
+        started = time.time()
+        length = int(self.headers.get("Content-Length", 0) or 0)
+        raw_body = self.rfile.read(length) if length else b""
+
+        channel, key = self._route()
+        if channel is None:
+            self._send(404, {"error": "unknown channel"})
+            return
+
+        server = self.server
+        with server.stats_lock:
+            stats = server.stats[channel]
+            stats.requests += 1
+            stats.bytes_received += len(raw_body)
+            if stats.first_request_at is None:
+                stats.first_request_at = started
+
+        profile = CHANNEL_PROFILES[channel]
+        latency = profile["latency_ms"] / 1000 * server.latency_scale
+        if latency > 0:
+            time.sleep(random.uniform(latency * 0.5, latency * 1.5))
+
+        if channel == "bark":
+            try:
+                key = json.loads(raw_body or b"{}").get("device_key", key)
+            except ValueError:
+                pass
+
+        if server.enable_rate_limit and not server.rate_limiter.allow(
+            channel, key, profile["rate_limits"]
+        ):
+            outcome = "rate_limited"
+            self._rate_limited(channel)
+        elif server.failure_rate and random.random() < server.failure_rate:
+            outcome = "failed"
+            self._failure(channel)
+        elif channel == "ntfy" and len(raw_body) > NTFY_MAX_BODY:
+            outcome = "failed"
+            self._send(413, {"code": 41301, "http": 413, "error": "limit reached: message too large"})
+        else:
+            outcome = "succeeded"
+            self._success(channel, key)
+
+        with server.stats_lock:
+            stats = server.stats[channel]
+            setattr(stats, outcome, getattr(stats, outcome) + 1)
+            stats.last_response_at = time.time()
+
+    def _success(self, channel: str, key: str):
+        now = int(time.time())
+        if channel == "feishu":
+            self._send(200, {"StatusCode": 0, "StatusMessage": "success", "code": 0, "data": {}, "msg": "success"})
+        elif channel in ("dingtalk", "wework"):
+            self._send(200, {"errcode": 0, "errmsg": "ok"})
+        elif channel == "telegram":
+            self._send(200, {"ok": True, "result": {"message_id": random.randint(1, 10**6), "date": now}})
+        elif channel == "ntfy":
+            self._send(200, {"id": f"{now:x}", "time": now, "event": "message", "topic": key})
+        elif channel == "bark":
+            self._send(200, {"code": 200, "message": "success", "timestamp": now})
+        elif channel == "slack":
+            self._send(200, "ok", content_type="text/html")
+
+    def _rate_limited(self, channel: str):
+        if channel == "feishu":
+            self._send(200, {"code": 9499, "msg": "too many request", "data": {}})
+        elif channel == "dingtalk":
+            self._send(200, {"errcode": 130101, "errmsg": "send too fast, exceed 20 times per minute"})
+        elif channel == "wework":
+            self._send(200, {"errcode": 45009, "errmsg": "api freq out of limit"})
+        elif channel == "telegram":
+            self._send(
+                429,
+                {"ok": False, "error_code": 429, "description": "Too Many Requests: retry after 1", "parameters": {"retry_after": 1}},
+                headers={"Retry-After": "1"},
+            )
+        elif channel == "ntfy":
+            self._send(429, {"code": 42901, "http": 429, "error": "limit reached: too many requests"})
+        elif channel == "bark":
+            self._send(429, {"code": 429, "message": "too many requests", "timestamp": int(time.time())})
+        elif channel == "slack":
+            self._send(429, "rate_limited", content_type="text/html", headers={"Retry-After": "1"})
+
+    def _failure(self, channel: str):
+        if channel == "feishu":
+            self._send(200, {"code": 19021, "msg": "sign match fail or timestamp is not within one hour from current time"})
+        elif channel in ("dingtalk", "wework"):
+            self._send(200, {"errcode": -1, "errmsg": "system busy"})
+        elif channel == "telegram":
+            self._send(400, {"ok": False, "error_code": 400, "description": "Bad Request: chat not found"})
+        elif channel == "ntfy":
+            self._send(500, {"code": 50001, "http": 500, "error": "internal server error"})
+        elif channel == "bark":
+            self._send(200, {"code": 400, "message": "failed to push", "timestamp": int(time.time())})
+        elif channel == "slack":
+            self._send(500, "internal_error", content_type="text/html")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="TrendRadar 本地模拟 Webhook 服务")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=18080)
+    parser.add_argument("--latency-scale", type=float, default=1.0, help="延迟倍率，0 表示无延迟")
+    parser.add_argument("--no-rate-limit", action="store_true", help="关闭限流模拟")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="随机失败概率（0~1）")
+    args = parser.parse_args()
+
+    server = MockWebhookServer(
+        args.host,
+        args.port,
+        latency_scale=args.latency_scale,
+        enable_rate_limit=not args.no_rate_limit,
+        failure_rate=args.failure_rate,
+    )
+    print(f"模拟 Webhook 服务已启动: {server.base_url}")
+    for name, value in server.channel_urls().items():
+        print(f"  {name}={value}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print(json.dumps(server.get_stats(), ensure_ascii=False, indent=2))
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
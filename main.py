@@ -1,9 +1,11 @@
 # coding=utf-8
 
+import hashlib
 import json
 import os
 import random
 import re
+import threading
 import time
 import webbrowser
 import smtplib
@@ -11,13 +13,16 @@ from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from email.header import Header
 from email.utils import formataddr, formatdate, make_msgid
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Tuple, Optional, Union
 
 import pytz
 import requests
-import yaml
+
+from mcp_server.services.config_service import get_config_service
 
 
 VERSION = "3.5.0"
@@ -166,8 +171,8 @@ def load_config():
     if not Path(config_path).exists():
         raise FileNotFoundError(f"配置文件 {config_path} 不存在")
 
-    with open(config_path, "r", encoding="utf-8") as f:
-        config_data = yaml.safe_load(f)
+    # 与 MCP Server 共用配置服务（按 mtime/size 缓存解析结果），复制一份可修改的字典
+    config_data = get_config_service().load(config_path).to_dict()
 
     print(f"配置文件加载成功: {config_path}")
 
@@ -249,6 +254,57 @@ def load_config():
             .get("push_window", {})
             .get("push_record_retention_days", 7),
         },
+        "OUTBOX": {
+            "ENABLED": os.environ.get("OUTBOX_ENABLED", "").strip().lower()
+            in ("true", "1")
+            if os.environ.get("OUTBOX_ENABLED", "").strip()
+            else config_data["notification"]
+            .get("outbox", {})
+            .get("enabled", False),
+            "MAX_ATTEMPTS": config_data["notification"]
+            .get("outbox", {})
+            .get("max_attempts", 5),
+            "RETRY_BACKOFF": config_data["notification"]
+            .get("outbox", {})
+            .get("retry_backoff", 5),
+            "MAX_BACKOFF": config_data["notification"]
+            .get("outbox", {})
+            .get("max_backoff", 300),
+            "DRAIN_TIMEOUT": int(
+                os.environ.get("OUTBOX_DRAIN_TIMEOUT", "").strip() or "0"
+            )
+            or config_data["notification"]
+            .get("outbox", {})
+            .get("drain_timeout", 120),
+            "FAILED_RETENTION_DAYS": config_data["notification"]
+            .get("outbox", {})
+            .get("failed_retention_days", 7),
+        },
+        "PUSH_DEDUP": {
+            "ENABLED": os.environ.get("PUSH_DEDUP_ENABLED", "").strip().lower()
+            in ("true", "1")
+            if os.environ.get("PUSH_DEDUP_ENABLED", "").strip()
+            else config_data["notification"]
+            .get("dedup", {})
+            .get("enabled", False),
+            "WINDOW_MINUTES": int(
+                os.environ.get("PUSH_DEDUP_WINDOW_MINUTES", "").strip() or "0"
+            )
+            or config_data["notification"]
+            .get("dedup", {})
+            .get("window_minutes", 360),
+        },
+        "EMAIL_DELIVERY": {
+            "PER_RECIPIENT": os.environ.get("EMAIL_PER_RECIPIENT", "").strip().lower()
+            in ("true", "1")
+            if os.environ.get("EMAIL_PER_RECIPIENT", "").strip()
+            else config_data["notification"]
+            .get("email", {})
+            .get("per_recipient", False),
+            "MAX_WORKERS": config_data["notification"]
+            .get("email", {})
+            .get("max_workers", 3),
+        },
         "WEIGHT_CONFIG": {
             "RANK_WEIGHT": config_data["weight"]["rank_weight"],
             "FREQUENCY_WEIGHT": config_data["weight"]["frequency_weight"],
@@ -279,6 +335,11 @@ def load_config():
     config["TELEGRAM_CHAT_ID"] = os.environ.get(
         "TELEGRAM_CHAT_ID", ""
     ).strip() or webhooks.get("telegram_chat_id", "")
+    config["TELEGRAM_API_BASE"] = (
+        os.environ.get("TELEGRAM_API_BASE", "").strip()
+        or webhooks.get("telegram_api_base")
+        or "https://api.telegram.org"
+    )
 
     # 邮件配置
     config["EMAIL_FROM"] = os.environ.get("EMAIL_FROM", "").strip() or webhooks.get(
@@ -395,10 +456,50 @@ def load_config():
     return config
 
 
-print("正在加载配置...")
-CONFIG = load_config()
-print(f"TrendRadar v{VERSION} 配置加载完成")
-print(f"监控平台数量: {len(CONFIG['PLATFORMS'])}")
+class LazyConfig(Mapping):
+    """
+    延迟加载的全局配置
+
+    导入 main.py 时不读取配置文件，也不输出日志，第一次访问 CONFIG 时才调用
+    load_config()。这样 MCP Server 等调用方可以直接导入爬虫、解析、匹配、
+    评分和渲染函数，只有真正用到配置的代码才需要配置文件。
+    """
+
+    def __init__(self):
+        self._config: Optional[Dict] = None
+        self._lock = threading.Lock()
+
+    def load(self) -> Dict:
+        """加载配置（只加载一次）"""
+        if self._config is None:
+            with self._lock:
+                if self._config is None:
+                    print("正在加载配置...")
+                    config = load_config()
+                    print(f"TrendRadar v{VERSION} 配置加载完成")
+                    print(f"监控平台数量: {len(config['PLATFORMS'])}")
+                    self._config = config
+        return self._config
+
+    @property
+    def loaded(self) -> bool:
+        return self._config is not None
+
+    def __getitem__(self, key):
+        return self.load()[key]
+
+    def __setitem__(self, key, value):
+        # 测试和基准脚本会直接覆盖配置项，先加载再写入，避免被随后的加载覆盖
+        self.load()[key] = value
+
+    def __iter__(self):
+        return iter(self.load())
+
+    def __len__(self) -> int:
+        return len(self.load())
+
+
+CONFIG = LazyConfig()
 
 
 # === 工具函数 ===
@@ -613,6 +714,644 @@ class PushRecordManager:
         return result
 
 
+class PushContentDeduplicator:
+    """
+    推送内容去重器
+
+    对每个渠道/账号/报告类型的渲染批次计算规范化指纹（忽略更新时间等易变部分），
+    与 output/.push_records/content_fingerprints.json 中的上次推送记录比较，
+    去重窗口内内容相同则跳过推送。只有全部批次推送成功后才记录指纹，
+    启用发件箱时由发件箱在整组批次投递成功后记录。
+    """
+
+    # 完整时间戳：更新时间页脚、钉钉头部时间、飞书 payload 时间等
+    DATETIME_PATTERN = re.compile(r"\d{4}-\d{2}-\d{2} \d{2}:\d{2}(:\d{2})?")
+    # 标题出现时间范围 [首次 ~ 最后]，最后出现时间每次抓取都会后移
+    TIME_RANGE_PATTERN = re.compile(r"\[(\d{2}时\d{2}分) ~ \d{2}时\d{2}分\]")
+
+    def __init__(self):
+        self.record_dir = Path("output") / ".push_records"
+        self.record_dir.mkdir(parents=True, exist_ok=True)
+        self.record_file = self.record_dir / "content_fingerprints.json"
+        self.window_minutes = CONFIG["PUSH_DEDUP"]["WINDOW_MINUTES"]
+        self._lock = threading.Lock()
+
+    @classmethod
+    def normalize(cls, content: str) -> str:
+        """去除内容中的易变部分"""
+        content = cls.DATETIME_PATTERN.sub("", content)
+        content = cls.TIME_RANGE_PATTERN.sub(r"[\1 ~ ]", content)
+        return content.strip()
+
+    @classmethod
+    def fingerprint(cls, batches: List[str]) -> str:
+        """计算一组批次的内容指纹"""
+        digest = hashlib.sha256()
+        for batch in batches:
+            digest.update(cls.normalize(batch).encode("utf-8"))
+            digest.update(b"\x00")
+        return digest.hexdigest()
+
+    def _load_records(self) -> Dict:
+        if not self.record_file.exists():
+            return {}
+        try:
+            with open(self.record_file, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except Exception as e:
+            print(f"读取推送指纹记录失败: {e}")
+            return {}
+
+    @staticmethod
+    def _key(channel: str, account_label: str, report_type: str) -> str:
+        """记录按渠道、账号和报告类型区分，实时报告不会抑制同内容的汇总报告"""
+        return f"{channel}:{account_label or 'default'}:{report_type}"
+
+    def is_duplicate(
+        self, channel: str, account_label: str, fingerprint: str, report_type: str
+    ) -> bool:
+        """判断去重窗口内是否已推送过相同内容"""
+        key = self._key(channel, account_label, report_type)
+        with self._lock:
+            record = self._load_records().get(key)
+        if not record or record.get("fingerprint") != fingerprint:
+            return False
+        elapsed_minutes = (time.time() - record.get("timestamp", 0)) / 60
+        return elapsed_minutes < self.window_minutes
+
+    def record(
+        self, channel: str, account_label: str, fingerprint: str, report_type: str
+    ) -> None:
+        """记录本次推送的内容指纹"""
+        key = self._key(channel, account_label, report_type)
+        now = get_beijing_time()
+        with self._lock:
+            records = self._load_records()
+            records[key] = {
+                "fingerprint": fingerprint,
+                "timestamp": time.time(),
+                "push_time": now.strftime("%Y-%m-%d %H:%M:%S"),
+                "report_type": report_type,
+            }
+            try:
+                with open(self.record_file, "w", encoding="utf-8") as f:
+                    json.dump(records, f, ensure_ascii=False, indent=2)
+            except Exception as e:
+                print(f"保存推送指纹记录失败: {e}")
+
+
+_push_deduplicator: Optional[PushContentDeduplicator] = None
+
+
+def get_push_deduplicator() -> Optional[PushContentDeduplicator]:
+    """获取全局推送去重器，未启用时返回 None"""
+    global _push_deduplicator
+    if not CONFIG["PUSH_DEDUP"]["ENABLED"]:
+        return None
+    if _push_deduplicator is None:
+        _push_deduplicator = PushContentDeduplicator()
+    return _push_deduplicator
+
+
+def check_push_duplicate(
+    channel: str, account_label: str, batches: List[str], report_type: str, log_prefix: str
+) -> Tuple[bool, str]:
+    """
+    推送前的内容去重检查：与去重窗口内的上次推送内容相同（忽略时间等易变部分）则跳过
+
+    Returns:
+        (是否跳过本次推送, 内容指纹)，未启用去重时指纹为空
+    """
+    dedup = get_push_deduplicator()
+    if dedup is None:
+        return False, ""
+    fingerprint = dedup.fingerprint(batches)
+    if dedup.is_duplicate(channel, account_label, fingerprint, report_type):
+        print(f"{log_prefix}内容与上次推送相同，跳过本次推送 [{report_type}]")
+        return True, fingerprint
+    return False, fingerprint
+
+
+def record_push_fingerprint(
+    channel: str, account_label: str, fingerprint: str, report_type: str
+) -> None:
+    """所有批次推送成功后记录内容指纹（未启用去重时不做任何事）"""
+    dedup = get_push_deduplicator()
+    if dedup is not None and fingerprint:
+        dedup.record(channel, account_label, fingerprint, report_type)
+
+
+# === 通知发件箱 ===
+def check_delivery_response(channel: str, response) -> Tuple[bool, str]:
+    """按渠道判断 webhook 响应是否表示投递成功，返回 (是否成功, 错误信息)"""
+    if response.status_code != 200:
+        return False, f"状态码：{response.status_code}"
+
+    # Slack Incoming Webhooks 成功时返回 "ok" 文本，ntfy 只看状态码
+    if channel == "slack":
+        return response.text == "ok", response.text or ""
+    if channel == "ntfy":
+        return True, ""
+
+    try:
+        result = response.json()
+    except ValueError:
+        return False, f"响应解析失败：{response.text[:200]}"
+
+    if channel == "feishu":
+        if result.get("StatusCode") == 0 or result.get("code") == 0:
+            return True, ""
+        return False, result.get("msg") or result.get("StatusMessage", "未知错误")
+    if channel in ("dingtalk", "wework"):
+        if result.get("errcode") == 0:
+            return True, ""
+        return False, str(result.get("errmsg"))
+    if channel == "telegram":
+        if result.get("ok"):
+            return True, ""
+        return False, str(result.get("description"))
+    if channel == "bark":
+        if result.get("code") == 200:
+            return True, ""
+        return False, result.get("message", "未知错误")
+    return True, ""
+
+
+def _account_index(account_label: str) -> int:
+    """由账号标签（"" 或 "账号N"）得到账号在配置中的下标"""
+    digits = account_label[len("账号"):] if account_label.startswith("账号") else ""
+    return int(digits) - 1 if digits.isdigit() and int(digits) > 0 else 0
+
+
+def resolve_delivery_target(
+    channel: str, account_label: str = ""
+) -> Optional[Tuple[str, Dict, Dict]]:
+    """
+    按渠道和账号从当前配置重建投递目标
+
+    发件箱只持久化消息内容，webhook 地址、bot token、ntfy 鉴权头、Bark device_key
+    等凭据都在投递时从 CONFIG 读取，不会写入 output/ 目录。
+
+    Returns:
+        (请求地址, 需要附加的请求头, 需要写入 JSON 请求体的字段)，
+        账号已从配置中移除时返回 None
+    """
+    index = _account_index(account_label)
+    max_accounts = CONFIG["MAX_ACCOUNTS_PER_CHANNEL"]
+
+    def account(key: str) -> str:
+        accounts = parse_multi_account_config(CONFIG[key])[:max_accounts]
+        return get_account_at_index(accounts, index, "")
+
+    if channel in ("feishu", "dingtalk", "wework", "slack"):
+        url = account(f"{channel.upper()}_WEBHOOK_URL")
+        return (url, {}, {}) if url else None
+
+    if channel == "telegram":
+        token = account("TELEGRAM_BOT_TOKEN")
+        chat_id = account("TELEGRAM_CHAT_ID")
+        if not token or not chat_id:
+            return None
+        api_base = CONFIG.get("TELEGRAM_API_BASE", "https://api.telegram.org").rstrip("/")
+        return f"{api_base}/bot{token}/sendMessage", {}, {"chat_id": chat_id}
+
+    if channel == "ntfy":
+        server_url = CONFIG["NTFY_SERVER_URL"]
+        topic = account("NTFY_TOPIC")
+        if not server_url or not topic:
+            return None
+        base_url = server_url.rstrip("/")
+        if not base_url.startswith(("http://", "https://")):
+            base_url = f"https://{base_url}"
+        token = account("NTFY_TOKEN")
+        headers = {"Authorization": f"Bearer {token}"} if token else {}
+        return f"{base_url}/{topic}", headers, {}
+
+    if channel == "bark":
+        from urllib.parse import urlparse
+
+        parsed_url = urlparse(account("BARK_URL"))
+        device_key = parsed_url.path.strip("/").split("/")[0] if parsed_url.path else ""
+        if not device_key:
+            return None
+        return (
+            f"{parsed_url.scheme}://{parsed_url.netloc}/push",
+            {},
+            {"device_key": device_key},
+        )
+
+    return None
+
+
+class NotificationOutbox:
+    """
+    通知发件箱
+
+    每个渲染好的批次作为一条独立消息持久化到 output/.outbox/pending，
+    由后台线程按 (渠道, 账号, 序号) 顺序投递，失败时按指数退避重试。
+    进程退出时未投递完的消息保留在磁盘上，下次运行启动时继续投递。
+
+    消息文件只保存渠道、账号标签、批次信息和消息内容，投递地址和凭据在投递时
+    由 resolve_delivery_target() 从配置重建。failed 目录按保留天数和数量清理。
+    """
+
+    # 被限流（HTTP 429）时的最短重试等待（秒），ntfy 公共服务器限流较严格
+    RATE_LIMIT_BACKOFF = {"ntfy": 10}
+    MAX_FAILED_ITEMS = 500
+
+    def __init__(self, outbox_dir: Optional[Path] = None):
+        self.outbox_dir = outbox_dir or Path("output") / ".outbox"
+        self.pending_dir = self.outbox_dir / "pending"
+        self.failed_dir = self.outbox_dir / "failed"
+        self.lock_file = self.outbox_dir / "dispatcher.lock"
+        self.pending_dir.mkdir(parents=True, exist_ok=True)
+        self.failed_dir.mkdir(parents=True, exist_ok=True)
+
+        self.max_attempts = CONFIG["OUTBOX"]["MAX_ATTEMPTS"]
+        self.retry_backoff = CONFIG["OUTBOX"]["RETRY_BACKOFF"]
+        self.max_backoff = CONFIG["OUTBOX"]["MAX_BACKOFF"]
+        self.failed_retention_days = CONFIG["OUTBOX"]["FAILED_RETENTION_DAYS"]
+
+        self._seq_lock = threading.Lock()
+        self._counter = 0
+        self._wakeup = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._deadline: Optional[float] = None
+        self._has_lock = False
+        self.stats = {"enqueued": 0, "delivered": 0, "retried": 0, "failed": 0}
+
+    # --- 入队 ---
+    def new_group(self, channel: str, account_label: str = "") -> str:
+        """为一次推送（同一渠道同一账号的一组批次）生成分组ID"""
+        with self._seq_lock:
+            self._counter += 1
+            counter = self._counter
+        account = account_label or "default"
+        return f"{int(time.time() * 1000):013d}_{counter:04d}_{channel}_{account}"
+
+    def enqueue(
+        self,
+        group: str,
+        channel: str,
+        seq: int,
+        total: int,
+        report_type: str,
+        headers: Optional[Dict] = None,
+        json_payload: Optional[Dict] = None,
+        data: Optional[str] = None,
+        use_proxy: bool = False,
+        interval: float = 0,
+        account_label: str = "",
+        batch_label: str = "",
+        fingerprint: str = "",
+    ) -> str:
+        """
+        将一个批次写入发件箱
+
+        Args:
+            group: new_group() 生成的分组ID，同组消息按 seq 顺序投递
+            seq: 组内投递顺序（从 1 开始）
+            headers: 不含凭据的请求头（如 ntfy 的批次标题）
+            data: 非 JSON 请求体（如 ntfy 的纯文本），与 json_payload 二选一
+            use_proxy: 投递时是否使用配置中的代理
+            interval: 该批次投递成功后，距离同组下一批次的最小间隔（秒）
+            batch_label: 日志中显示的批次编号（ntfy/Bark 反向推送时与 seq 不同）
+            fingerprint: 推送去重的内容指纹，整组批次投递成功后才记录
+
+        Returns:
+            消息ID
+        """
+        item_id = f"{group}_{seq:03d}"
+        item = {
+            "id": item_id,
+            "group": group,
+            "channel": channel,
+            "account": account_label,
+            "seq": seq,
+            "total": total,
+            "batch_label": batch_label or f"{seq}/{total}",
+            "report_type": report_type,
+            "payload": {
+                "headers": headers or {},
+                "json": json_payload,
+                "data": data,
+            },
+            "use_proxy": use_proxy,
+            "interval": interval,
+            "fingerprint": fingerprint,
+            "attempts": 0,
+            "next_attempt_at": time.time(),
+            "created_at": get_beijing_time().strftime("%Y-%m-%d %H:%M:%S"),
+            "last_error": "",
+        }
+        self._write_item(self.pending_dir / f"{item_id}.json", item)
+        self.stats["enqueued"] += 1
+        self._wakeup.set()
+        return item_id
+
+    def _write_item(self, path: Path, item: Dict) -> None:
+        """原子写入消息文件，避免进程中断时留下半个 JSON"""
+        tmp_path = path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(item, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    def pending_count(self) -> int:
+        """发件箱中待投递的消息数"""
+        return len(list(self.pending_dir.glob("*.json")))
+
+    def _load_pending(self) -> List[Tuple[Path, Dict]]:
+        """按文件名（创建时间 + 分组 + 序号）顺序加载待投递消息"""
+        items = []
+        for path in sorted(self.pending_dir.glob("*.json")):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    item = json.load(f)
+            except Exception as e:
+                print(f"发件箱消息读取失败 {path.name}: {e}")
+                continue
+            if "request" in item:
+                item = self._strip_credentials(item)
+                self._write_item(path, item)
+            items.append((path, item))
+        return items
+
+    @staticmethod
+    def _strip_credentials(item: Dict) -> Dict:
+        """把旧格式（保存了完整请求）的消息改写为只含消息内容的格式"""
+        request = item.pop("request")
+        headers = {
+            key: value
+            for key, value in (request.get("headers") or {}).items()
+            if key.lower() != "authorization"
+        }
+        item["payload"] = {
+            "headers": headers,
+            "json": request.get("json"),
+            "data": request.get("data"),
+        }
+        item["use_proxy"] = bool(item.pop("proxy_url", None))
+        return item
+
+    def _record_group(self, item: Dict) -> None:
+        """组内最后一个批次投递成功后记录去重指纹（组内有批次失败时不记录，下次运行可重新推送）"""
+        if not item.get("fingerprint"):
+            return
+        if any(self.failed_dir.glob(f"{item['group']}_*.json")):
+            return
+        record_push_fingerprint(
+            item["channel"], item.get("account", ""), item["fingerprint"], item["report_type"]
+        )
+
+    def _move_to_failed(self, path: Path, item: Dict) -> None:
+        self._write_item(self.failed_dir / path.name, item)
+        path.unlink(missing_ok=True)
+        self.stats["failed"] += 1
+        self._prune_failed()
+
+    def _prune_failed(self) -> None:
+        """清理超过保留天数的失败消息，并限制 failed 目录的消息数量"""
+        cutoff = time.time() - self.failed_retention_days * 86400
+        kept = []
+        for path in sorted(self.failed_dir.glob("*.json")):
+            try:
+                if path.stat().st_mtime < cutoff:
+                    path.unlink(missing_ok=True)
+                    continue
+            except FileNotFoundError:
+                continue
+            kept.append(path)
+        # 文件名以创建时间开头，超出数量时删除最早的
+        for path in kept[: max(0, len(kept) - self.MAX_FAILED_ITEMS)]:
+            path.unlink(missing_ok=True)
+
+    # --- 投递 ---
+    def _deliver(self, path: Path, item: Dict) -> bool:
+        """投递单条消息，成功删除文件，失败更新重试信息"""
+        payload = item["payload"]
+        channel = item["channel"]
+        log_prefix = f"[发件箱] {channel}{item.get('account', '')}"
+
+        target = resolve_delivery_target(channel, item.get("account", ""))
+        if target is None:
+            item["last_error"] = "配置中已没有该渠道账号"
+            self._move_to_failed(path, item)
+            print(f"{log_prefix}第 {item['batch_label']} 批次无法投递，已移入 failed：配置中已没有该渠道账号")
+            return False
+        url, auth_headers, payload_fields = target
+
+        proxies = None
+        proxy_url = CONFIG["DEFAULT_PROXY"] if item.get("use_proxy") else None
+        if proxy_url:
+            proxies = {"http": proxy_url, "https": proxy_url}
+        headers = {**payload["headers"], **auth_headers}
+
+        item["attempts"] += 1
+        status_code = None
+        retry_after = None
+        try:
+            if payload.get("data") is not None:
+                response = requests.post(
+                    url,
+                    headers=headers,
+                    data=payload["data"].encode("utf-8"),
+                    proxies=proxies,
+                    timeout=30,
+                )
+            else:
+                response = requests.post(
+                    url,
+                    headers=headers,
+                    json={**payload["json"], **payload_fields},
+                    proxies=proxies,
+                    timeout=30,
+                )
+            status_code = response.status_code
+            retry_after = response.headers.get("Retry-After")
+            success, error = check_delivery_response(channel, response)
+        except Exception as e:
+            success, error = False, str(e)
+
+        if success:
+            path.unlink(missing_ok=True)
+            self.stats["delivered"] += 1
+            print(
+                f"{log_prefix}第 {item['batch_label']} 批次投递成功 [{item['report_type']}]"
+            )
+            if item["seq"] == item["total"]:
+                self._record_group(item)
+            return True
+
+        item["last_error"] = error
+        if item["attempts"] >= self.max_attempts:
+            self._move_to_failed(path, item)
+            print(
+                f"{log_prefix}第 {item['batch_label']} 批次投递失败 {item['attempts']} 次，已移入 failed：{error}"
+            )
+            return False
+
+        backoff = min(
+            self.max_backoff, self.retry_backoff * (2 ** (item["attempts"] - 1))
+        )
+        if status_code == 429:
+            # 限流时至少等待渠道要求的时间（优先使用 Retry-After）
+            min_wait = self.RATE_LIMIT_BACKOFF.get(channel, 0)
+            if retry_after and retry_after.isdigit():
+                min_wait = max(min_wait, int(retry_after))
+            backoff = max(backoff, min_wait)
+            print(f"{log_prefix}第 {item['batch_label']} 批次速率限制 [{item['report_type']}]，等待后重试")
+        item["next_attempt_at"] = time.time() + backoff
+        self._write_item(path, item)
+        self.stats["retried"] += 1
+        print(
+            f"{log_prefix}第 {item['batch_label']} 批次投递失败（第 {item['attempts']} 次），{backoff} 秒后重试：{error}"
+        )
+        return False
+
+    def drain_once(self) -> Tuple[int, Optional[float]]:
+        """
+        扫描一遍发件箱并投递所有已到重试时间的消息
+
+        同一分组内前一条消息未成功（或仍在退避中）时，后续消息本轮不投递，保证组内顺序。
+
+        Returns:
+            (剩余待投递数量, 最近一次可重试的时间戳)
+        """
+        items = self._load_pending()
+        blocked_groups = set()
+        next_wake = None
+        remaining = 0
+
+        for path, item in items:
+            if self._deadline is not None and time.time() >= self._deadline:
+                remaining += 1
+                continue
+
+            group = item["group"]
+            if group in blocked_groups:
+                remaining += 1
+                continue
+
+            if item["next_attempt_at"] > time.time():
+                blocked_groups.add(group)
+                remaining += 1
+                next_wake = (
+                    item["next_attempt_at"]
+                    if next_wake is None
+                    else min(next_wake, item["next_attempt_at"])
+                )
+                continue
+
+            if self._deliver(path, item):
+                if item["seq"] < item["total"] and item.get("interval"):
+                    time.sleep(item["interval"])
+            else:
+                blocked_groups.add(group)
+                if path.exists():
+                    remaining += 1
+
+        return remaining, next_wake
+
+    # --- 后台调度 ---
+    def _acquire_lock(self) -> bool:
+        """获取调度锁，避免多个进程同时投递同一批消息"""
+        stale_seconds = CONFIG["OUTBOX"]["DRAIN_TIMEOUT"] + 600
+        for _ in range(2):
+            try:
+                fd = os.open(str(self.lock_file), os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+                with os.fdopen(fd, "w") as f:
+                    f.write(f"{os.getpid()} {time.time()}")
+                self._has_lock = True
+                return True
+            except FileExistsError:
+                try:
+                    if time.time() - self.lock_file.stat().st_mtime > stale_seconds:
+                        print("发件箱调度锁已过期，重新获取")
+                        self.lock_file.unlink(missing_ok=True)
+                        continue
+                except FileNotFoundError:
+                    continue
+                return False
+        return False
+
+    def _release_lock(self) -> None:
+        if self._has_lock:
+            self.lock_file.unlink(missing_ok=True)
+            self._has_lock = False
+
+    def start(self) -> bool:
+        """启动后台投递线程，启动时会先续投上次运行遗留的消息"""
+        if self._thread and self._thread.is_alive():
+            return True
+
+        if not self._acquire_lock():
+            print("发件箱：其他进程正在投递，本次只入队不投递")
+            return False
+
+        self._prune_failed()
+        leftover = self.pending_count()
+        if leftover:
+            print(f"发件箱：发现 {leftover} 条未投递消息，继续投递")
+
+        self._deadline = None
+        self._thread = threading.Thread(
+            target=self._run, name="notification-outbox", daemon=True
+        )
+        self._thread.start()
+        return True
+
+    def _run(self) -> None:
+        while True:
+            self._wakeup.clear()
+            try:
+                remaining, next_wake = self.drain_once()
+            except Exception as e:
+                print(f"发件箱投递出错: {e}")
+                remaining, next_wake = self.pending_count(), time.time() + 1
+
+            if self._deadline is not None:
+                if remaining == 0 or time.time() >= self._deadline:
+                    return
+                timeout = self._deadline - time.time()
+            else:
+                timeout = 1.0
+            if next_wake is not None:
+                timeout = min(timeout, max(0.0, next_wake - time.time()))
+            self._wakeup.wait(max(0.05, timeout))
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """等待发件箱清空（最多 timeout 秒），剩余消息留给下次运行"""
+        if timeout is None:
+            timeout = CONFIG["OUTBOX"]["DRAIN_TIMEOUT"]
+
+        if self._thread and self._thread.is_alive():
+            self._deadline = time.time() + timeout
+            self._wakeup.set()
+            # 正在进行的单次请求最多 30 秒超时
+            self._thread.join(timeout + 35)
+        self._thread = None
+        self._release_lock()
+
+        left = self.pending_count()
+        print(
+            f"发件箱：入队 {self.stats['enqueued']}，投递成功 {self.stats['delivered']}，"
+            f"重试 {self.stats['retried']}，失败 {self.stats['failed']}，剩余 {left}"
+        )
+
+
+_notification_outbox: Optional[NotificationOutbox] = None
+
+
+def get_notification_outbox() -> Optional[NotificationOutbox]:
+    """获取全局发件箱实例，未启用时返回 None"""
+    global _notification_outbox
+    if not CONFIG["OUTBOX"]["ENABLED"]:
+        return None
+    if _notification_outbox is None:
+        _notification_outbox = NotificationOutbox()
+    return _notification_outbox
+
+
 # === 数据获取 ===
 class DataFetcher:
     """数据获取器"""
@@ -683,9 +1422,11 @@ class DataFetcher:
     def crawl_websites(
         self,
         ids_list: List[Union[str, Tuple[str, str]]],
-        request_interval: int = CONFIG["REQUEST_INTERVAL"],
+        request_interval: Optional[int] = None,
     ) -> Tuple[Dict, Dict, List]:
-        """爬取多个网站数据"""
+        """爬取多个网站数据（request_interval 默认使用配置中的请求间隔）"""
+        if request_interval is None:
+            request_interval = CONFIG["REQUEST_INTERVAL"]
         results = {}
         id_to_name = {}
         failed_ids = []
@@ -740,9 +1481,12 @@ class DataFetcher:
 
 
 # === 数据处理 ===
-def save_titles_to_file(results: Dict, id_to_name: Dict, failed_ids: List) -> str:
-    """保存标题到文件"""
-    file_path = get_output_path("txt", f"{format_time_filename()}.txt")
+def save_titles_to_file(
+    results: Dict, id_to_name: Dict, failed_ids: List, file_path: Optional[str] = None
+) -> str:
+    """保存标题到文件（file_path 为空时写入当前目录 output 下今天的 txt 目录）"""
+    if file_path is None:
+        file_path = get_output_path("txt", f"{format_time_filename()}.txt")
 
     with open(file_path, "w", encoding="utf-8") as f:
         for id_value, title_data in results.items():
@@ -1135,15 +1879,20 @@ def detect_latest_new_titles(current_platform_ids: Optional[List[str]] = None) -
 
 # === 统计和分析 ===
 def calculate_news_weight(
-    title_data: Dict, rank_threshold: int = CONFIG["RANK_THRESHOLD"]
+    title_data: Dict,
+    rank_threshold: Optional[int] = None,
+    weight_config: Optional[Dict] = None,
 ) -> float:
-    """计算新闻权重，用于排序"""
+    """计算新闻权重，用于排序（rank_threshold、weight_config 默认使用配置中的值）"""
+    if rank_threshold is None:
+        rank_threshold = CONFIG["RANK_THRESHOLD"]
     ranks = title_data.get("ranks", [])
     if not ranks:
         return 0.0
 
     count = title_data.get("count", len(ranks))
-    weight_config = CONFIG["WEIGHT_CONFIG"]
+    if weight_config is None:
+        weight_config = CONFIG["WEIGHT_CONFIG"]
 
     # 排名权重：Σ(11 - min(rank, 10)) / 出现次数
     rank_scores = []
@@ -1280,12 +2029,14 @@ def count_word_frequency(
     filter_words: List[str],
     id_to_name: Dict,
     title_info: Optional[Dict] = None,
-    rank_threshold: int = CONFIG["RANK_THRESHOLD"],
+    rank_threshold: Optional[int] = None,
     new_titles: Optional[Dict] = None,
     mode: str = "daily",
     global_filters: Optional[List[str]] = None,
 ) -> Tuple[List[Dict], int]:
     """统计词频，支持必须词、频率词、过滤词、全局过滤词，并标记新增标题"""
+    if rank_threshold is None:
+        rank_threshold = CONFIG["RANK_THRESHOLD"]
 
     # 如果没有配置词组，创建一个包含所有新闻的虚拟词组
     if not word_groups:
@@ -3836,6 +4587,11 @@ def send_to_notifications(
 
     update_info_to_send = update_info if CONFIG["SHOW_VERSION_UPDATE"] else None
 
+    # 发件箱（启用时各渠道只负责渲染入队，投递由后台线程完成）
+    outbox = get_notification_outbox()
+    if outbox is not None:
+        outbox.start()
+
     # 发送到飞书（多账号）
     feishu_urls = parse_multi_account_config(CONFIG["FEISHU_WEBHOOK_URL"])
     if feishu_urls:
@@ -3845,7 +4601,7 @@ def send_to_notifications(
             if url:  # 跳过空值
                 account_label = f"账号{i+1}" if len(feishu_urls) > 1 else ""
                 result = send_to_feishu(
-                    url, report_data, report_type, update_info_to_send, proxy_url, mode, account_label
+                    url, report_data, report_type, update_info_to_send, proxy_url, mode, account_label, outbox
                 )
                 feishu_results.append(result)
         results["feishu"] = any(feishu_results) if feishu_results else False
@@ -3859,7 +4615,7 @@ def send_to_notifications(
             if url:
                 account_label = f"账号{i+1}" if len(dingtalk_urls) > 1 else ""
                 result = send_to_dingtalk(
-                    url, report_data, report_type, update_info_to_send, proxy_url, mode, account_label
+                    url, report_data, report_type, update_info_to_send, proxy_url, mode, account_label, outbox
                 )
                 dingtalk_results.append(result)
         results["dingtalk"] = any(dingtalk_results) if dingtalk_results else False
@@ -3873,7 +4629,7 @@ def send_to_notifications(
             if url:
                 account_label = f"账号{i+1}" if len(wework_urls) > 1 else ""
                 result = send_to_wework(
-                    url, report_data, report_type, update_info_to_send, proxy_url, mode, account_label
+                    url, report_data, report_type, update_info_to_send, proxy_url, mode, account_label, outbox
                 )
                 wework_results.append(result)
         results["wework"] = any(wework_results) if wework_results else False
@@ -3898,7 +4654,7 @@ def send_to_notifications(
                     account_label = f"账号{i+1}" if len(telegram_tokens) > 1 else ""
                     result = send_to_telegram(
                         token, chat_id, report_data, report_type,
-                        update_info_to_send, proxy_url, mode, account_label
+                        update_info_to_send, proxy_url, mode, account_label, outbox
                     )
                     telegram_results.append(result)
             results["telegram"] = any(telegram_results) if telegram_results else False
@@ -3922,7 +4678,7 @@ def send_to_notifications(
                     account_label = f"账号{i+1}" if len(ntfy_topics) > 1 else ""
                     result = send_to_ntfy(
                         ntfy_server_url, topic, token, report_data, report_type,
-                        update_info_to_send, proxy_url, mode, account_label
+                        update_info_to_send, proxy_url, mode, account_label, outbox
                     )
                     ntfy_results.append(result)
             results["ntfy"] = any(ntfy_results) if ntfy_results else False
@@ -3936,7 +4692,7 @@ def send_to_notifications(
             if url:
                 account_label = f"账号{i+1}" if len(bark_urls) > 1 else ""
                 result = send_to_bark(
-                    url, report_data, report_type, update_info_to_send, proxy_url, mode, account_label
+                    url, report_data, report_type, update_info_to_send, proxy_url, mode, account_label, outbox
                 )
                 bark_results.append(result)
         results["bark"] = any(bark_results) if bark_results else False
@@ -3950,7 +4706,7 @@ def send_to_notifications(
             if url:
                 account_label = f"账号{i+1}" if len(slack_urls) > 1 else ""
                 result = send_to_slack(
-                    url, report_data, report_type, update_info_to_send, proxy_url, mode, account_label
+                    url, report_data, report_type, update_info_to_send, proxy_url, mode, account_label, outbox
                 )
                 slack_results.append(result)
         results["slack"] = any(slack_results) if slack_results else False
@@ -3995,6 +4751,7 @@ def send_to_feishu(
     proxy_url: Optional[str] = None,
     mode: str = "daily",
     account_label: str = "",
+    outbox: Optional["NotificationOutbox"] = None,
 ) -> bool:
     """发送到飞书（支持分批发送）"""
     headers = {"Content-Type": "application/json"}
@@ -4022,6 +4779,16 @@ def send_to_feishu(
 
     print(f"{log_prefix}消息分为 {len(batches)} 批次发送 [{report_type}]")
 
+    # 内容去重
+    duplicate, fingerprint = check_push_duplicate(
+        "feishu", account_label, batches, report_type, log_prefix
+    )
+    if duplicate:
+        return True
+
+    # 启用发件箱时只入队，由后台线程负责投递和重试
+    group = outbox.new_group("feishu", account_label) if outbox is not None else ""
+
     # 逐批发送
     for i, batch_content in enumerate(batches, 1):
         batch_size = len(batch_content.encode("utf-8"))
@@ -4044,6 +4811,15 @@ def send_to_feishu(
             },
         }
 
+        if outbox is not None:
+            outbox.enqueue(
+                group, "feishu", i, len(batches), report_type,
+                headers=headers, json_payload=payload, use_proxy=bool(proxy_url),
+                interval=CONFIG["BATCH_SEND_INTERVAL"], account_label=account_label,
+                fingerprint=fingerprint,
+            )
+            continue
+
         try:
             response = requests.post(
                 webhook_url, headers=headers, json=payload, proxies=proxies, timeout=30
@@ -4071,6 +4847,11 @@ def send_to_feishu(
             print(f"{log_prefix}第 {i}/{len(batches)} 批次发送出错 [{report_type}]：{e}")
             return False
 
+    if outbox is not None:
+        print(f"{log_prefix}{len(batches)} 个批次已写入发件箱 [{report_type}]")
+        return True
+
+    record_push_fingerprint("feishu", account_label, fingerprint, report_type)
     print(f"{log_prefix}所有 {len(batches)} 批次发送完成 [{report_type}]")
     return True
 
@@ -4083,6 +4864,7 @@ def send_to_dingtalk(
     proxy_url: Optional[str] = None,
     mode: str = "daily",
     account_label: str = "",
+    outbox: Optional["NotificationOutbox"] = None,
 ) -> bool:
     """发送到钉钉（支持分批发送）"""
     headers = {"Content-Type": "application/json"}
@@ -4110,6 +4892,16 @@ def send_to_dingtalk(
 
     print(f"{log_prefix}消息分为 {len(batches)} 批次发送 [{report_type}]")
 
+    # 内容去重
+    duplicate, fingerprint = check_push_duplicate(
+        "dingtalk", account_label, batches, report_type, log_prefix
+    )
+    if duplicate:
+        return True
+
+    # 启用发件箱时只入队，由后台线程负责投递和重试
+    group = outbox.new_group("dingtalk", account_label) if outbox is not None else ""
+
     # 逐批发送
     for i, batch_content in enumerate(batches, 1):
         batch_size = len(batch_content.encode("utf-8"))
@@ -4125,6 +4917,15 @@ def send_to_dingtalk(
             },
         }
 
+        if outbox is not None:
+            outbox.enqueue(
+                group, "dingtalk", i, len(batches), report_type,
+                headers=headers, json_payload=payload, use_proxy=bool(proxy_url),
+                interval=CONFIG["BATCH_SEND_INTERVAL"], account_label=account_label,
+                fingerprint=fingerprint,
+            )
+            continue
+
         try:
             response = requests.post(
                 webhook_url, headers=headers, json=payload, proxies=proxies, timeout=30
@@ -4150,6 +4951,11 @@ def send_to_dingtalk(
             print(f"{log_prefix}第 {i}/{len(batches)} 批次发送出错 [{report_type}]：{e}")
             return False
 
+    if outbox is not None:
+        print(f"{log_prefix}{len(batches)} 个批次已写入发件箱 [{report_type}]")
+        return True
+
+    record_push_fingerprint("dingtalk", account_label, fingerprint, report_type)
     print(f"{log_prefix}所有 {len(batches)} 批次发送完成 [{report_type}]")
     return True
 
@@ -4206,6 +5012,7 @@ def send_to_wework(
     proxy_url: Optional[str] = None,
     mode: str = "daily",
     account_label: str = "",
+    outbox: Optional["NotificationOutbox"] = None,
 ) -> bool:
     """发送到企业微信（支持分批发送，支持 markdown 和 text 两种格式）"""
     headers = {"Content-Type": "application/json"}
@@ -4240,6 +5047,16 @@ def send_to_wework(
 
     print(f"{log_prefix}消息分为 {len(batches)} 批次发送 [{report_type}]")
 
+    # 内容去重
+    duplicate, fingerprint = check_push_duplicate(
+        "wework", account_label, batches, report_type, log_prefix
+    )
+    if duplicate:
+        return True
+
+    # 启用发件箱时只入队，由后台线程负责投递和重试
+    group = outbox.new_group("wework", account_label) if outbox is not None else ""
+
     # 逐批发送
     for i, batch_content in enumerate(batches, 1):
         # 根据消息类型构建 payload
@@ -4257,6 +5074,15 @@ def send_to_wework(
             f"发送{log_prefix}第 {i}/{len(batches)} 批次，大小：{batch_size} 字节 [{report_type}]"
         )
 
+        if outbox is not None:
+            outbox.enqueue(
+                group, "wework", i, len(batches), report_type,
+                headers=headers, json_payload=payload, use_proxy=bool(proxy_url),
+                interval=CONFIG["BATCH_SEND_INTERVAL"], account_label=account_label,
+                fingerprint=fingerprint,
+            )
+            continue
+
         try:
             response = requests.post(
                 webhook_url, headers=headers, json=payload, proxies=proxies, timeout=30
@@ -4282,6 +5108,11 @@ def send_to_wework(
             print(f"{log_prefix}第 {i}/{len(batches)} 批次发送出错 [{report_type}]：{e}")
             return False
 
+    if outbox is not None:
+        print(f"{log_prefix}{len(batches)} 个批次已写入发件箱 [{report_type}]")
+        return True
+
+    record_push_fingerprint("wework", account_label, fingerprint, report_type)
     print(f"{log_prefix}所有 {len(batches)} 批次发送完成 [{report_type}]")
     return True
 
@@ -4295,10 +5126,12 @@ def send_to_telegram(
     proxy_url: Optional[str] = None,
     mode: str = "daily",
     account_label: str = "",
+    outbox: Optional["NotificationOutbox"] = None,
 ) -> bool:
     """发送到Telegram（支持分批发送）"""
     headers = {"Content-Type": "application/json"}
-    url = f"https://api.telegram.org/bot{bot_token}/sendMessage"
+    api_base = CONFIG.get("TELEGRAM_API_BASE", "https://api.telegram.org").rstrip("/")
+    url = f"{api_base}/bot{bot_token}/sendMessage"
 
     proxies = None
     if proxy_url:
@@ -4319,6 +5152,16 @@ def send_to_telegram(
 
     print(f"{log_prefix}消息分为 {len(batches)} 批次发送 [{report_type}]")
 
+    # 内容去重
+    duplicate, fingerprint = check_push_duplicate(
+        "telegram", account_label, batches, report_type, log_prefix
+    )
+    if duplicate:
+        return True
+
+    # 启用发件箱时只入队，由后台线程负责投递和重试
+    group = outbox.new_group("telegram", account_label) if outbox is not None else ""
+
     # 逐批发送
     for i, batch_content in enumerate(batches, 1):
         batch_size = len(batch_content.encode("utf-8"))
@@ -4333,6 +5176,16 @@ def send_to_telegram(
             "disable_web_page_preview": True,
         }
 
+        if outbox is not None:
+            outbox.enqueue(
+                group, "telegram", i, len(batches), report_type,
+                headers=headers, json_payload={k: v for k, v in payload.items() if k != "chat_id"},
+                use_proxy=bool(proxy_url),
+                interval=CONFIG["BATCH_SEND_INTERVAL"], account_label=account_label,
+                fingerprint=fingerprint,
+            )
+            continue
+
         try:
             response = requests.post(
                 url, headers=headers, json=payload, proxies=proxies, timeout=30
@@ -4358,10 +5211,144 @@ def send_to_telegram(
             print(f"{log_prefix}第 {i}/{len(batches)} 批次发送出错 [{report_type}]：{e}")
             return False
 
+    if outbox is not None:
+        print(f"{log_prefix}{len(batches)} 个批次已写入发件箱 [{report_type}]")
+        return True
+
+    record_push_fingerprint("telegram", account_label, fingerprint, report_type)
     print(f"{log_prefix}所有 {len(batches)} 批次发送完成 [{report_type}]")
     return True
 
 
+class SMTPSessionManager:
+    """
+    SMTP 会话管理器
+
+    按 (服务器, 端口, 发件账号) 维护已登录的连接，同一次运行内的实时报告和
+    汇总报告复用同一条连接，连接失效时自动重连。并发发送时每个线程各借用
+    一条连接，用完放回空闲池，串行发送时始终只有一条连接。
+    """
+
+    def __init__(self, timeout: int = 30):
+        self.timeout = timeout
+        self._idle: Dict[Tuple, List[smtplib.SMTP]] = {}
+        self._lock = threading.Lock()
+        self.connect_count = 0
+
+    def _connect(
+        self, server: str, port: int, encryption: str, username: str, password: str
+    ) -> smtplib.SMTP:
+        """建立连接并登录，encryption 取值 SSL / TLS / NONE"""
+        if encryption == "SSL":
+            conn = smtplib.SMTP_SSL(server, port, timeout=self.timeout)
+            conn.set_debuglevel(0)
+            conn.ehlo()
+        else:
+            conn = smtplib.SMTP(server, port, timeout=self.timeout)
+            conn.set_debuglevel(0)  # 设为1可以查看详细调试信息
+            conn.ehlo()
+            if encryption == "TLS":
+                conn.starttls()
+                conn.ehlo()
+
+        try:
+            conn.login(username, password)
+        except Exception:
+            self._close_quietly(conn)
+            raise
+
+        with self._lock:
+            self.connect_count += 1
+        return conn
+
+    @staticmethod
+    def _close_quietly(conn: smtplib.SMTP) -> None:
+        try:
+            conn.quit()
+        except Exception:
+            try:
+                conn.close()
+            except Exception:
+                pass
+
+    def _checkout(
+        self, key: Tuple, server: str, port: int, encryption: str, username: str, password: str
+    ) -> smtplib.SMTP:
+        """借出一条可用连接，空闲连接先用 NOOP 探活"""
+        with self._lock:
+            idle = self._idle.get(key)
+            conn = idle.pop() if idle else None
+
+        if conn is not None:
+            try:
+                if conn.noop()[0] == 250:
+                    return conn
+            except (smtplib.SMTPException, OSError):
+                pass
+            self._close_quietly(conn)
+
+        return self._connect(server, port, encryption, username, password)
+
+    def _checkin(self, key: Tuple, conn: smtplib.SMTP) -> None:
+        with self._lock:
+            self._idle.setdefault(key, []).append(conn)
+
+    def send_message(
+        self,
+        server: str,
+        port: int,
+        encryption: str,
+        username: str,
+        password: str,
+        msg,
+        to_addrs: Optional[List[str]] = None,
+    ) -> None:
+        """通过复用的连接发送邮件，连接中途断开时重连并重试一次"""
+        key = (server, port, username)
+        conn = self._checkout(key, server, port, encryption, username, password)
+
+        try:
+            conn.send_message(msg, to_addrs=to_addrs)
+        except smtplib.SMTPServerDisconnected:
+            self._close_quietly(conn)
+            print(f"SMTP 连接已断开，正在重连 {server}:{port}")
+            conn = self._connect(server, port, encryption, username, password)
+            try:
+                conn.send_message(msg, to_addrs=to_addrs)
+            except Exception:
+                self._close_quietly(conn)
+                raise
+        except Exception:
+            # 收件人被拒等错误不影响连接本身，重置会话后放回
+            try:
+                conn.rset()
+                self._checkin(key, conn)
+            except Exception:
+                self._close_quietly(conn)
+            raise
+
+        self._checkin(key, conn)
+
+    def close_all(self) -> None:
+        """关闭所有空闲连接"""
+        with self._lock:
+            conns = [conn for idle in self._idle.values() for conn in idle]
+            self._idle.clear()
+        for conn in conns:
+            self._close_quietly(conn)
+
+
+_smtp_session_manager: Optional[SMTPSessionManager] = None
+
+
+def get_smtp_session_manager() -> SMTPSessionManager:
+    """获取全局 SMTP 会话管理器"""
+    global _smtp_session_manager
+    if _smtp_session_manager is None:
+        _smtp_session_manager = SMTPSessionManager()
+    return _smtp_session_manager
+
+
 def send_to_email(
     from_email: str,
     password: str,
@@ -4407,68 +5394,82 @@ def send_to_email(
             smtp_port = 587
             use_tls = True
 
-        msg = MIMEMultipart("alternative")
+        recipients = [addr.strip() for addr in to_email.split(",") if addr.strip()]
+        now = get_beijing_time()
 
-        # 严格按照 RFC 标准设置 From header
-        sender_name = "TrendRadar"
-        msg["From"] = formataddr((sender_name, from_email))
+        def build_message(to_header: str) -> MIMEMultipart:
+            msg = MIMEMultipart("alternative")
 
-        # 设置收件人
-        recipients = [addr.strip() for addr in to_email.split(",")]
-        if len(recipients) == 1:
-            msg["To"] = recipients[0]
-        else:
-            msg["To"] = ", ".join(recipients)
+            # 严格按照 RFC 标准设置 From header
+            sender_name = "TrendRadar"
+            msg["From"] = formataddr((sender_name, from_email))
+            msg["To"] = to_header
 
-        # 设置邮件主题
-        now = get_beijing_time()
-        subject = f"TrendRadar 热点分析报告 - {report_type} - {now.strftime('%m月%d日 %H:%M')}"
-        msg["Subject"] = Header(subject, "utf-8")
+            # 设置邮件主题
+            subject = f"TrendRadar 热点分析报告 - {report_type} - {now.strftime('%m月%d日 %H:%M')}"
+            msg["Subject"] = Header(subject, "utf-8")
 
-        # 设置其他标准 header
-        msg["MIME-Version"] = "1.0"
-        msg["Date"] = formatdate(localtime=True)
-        msg["Message-ID"] = make_msgid()
+            # 设置其他标准 header
+            msg["MIME-Version"] = "1.0"
+            msg["Date"] = formatdate(localtime=True)
+            msg["Message-ID"] = make_msgid()
 
-        # 添加纯文本部分（作为备选）
-        text_content = f"""
+            # 添加纯文本部分（作为备选）
+            text_content = f"""
 TrendRadar 热点分析报告
 ========================
 报告类型：{report_type}
 生成时间：{now.strftime('%Y-%m-%d %H:%M:%S')}
 
 请使用支持HTML的邮件客户端查看完整报告内容。
-        """
-        text_part = MIMEText(text_content, "plain", "utf-8")
-        msg.attach(text_part)
+            """
+            text_part = MIMEText(text_content, "plain", "utf-8")
+            msg.attach(text_part)
 
-        html_part = MIMEText(html_content, "html", "utf-8")
-        msg.attach(html_part)
+            html_part = MIMEText(html_content, "html", "utf-8")
+            msg.attach(html_part)
+            return msg
 
         print(f"正在发送邮件到 {to_email}...")
         print(f"SMTP 服务器: {smtp_server}:{smtp_port}")
         print(f"发件人: {from_email}")
 
-        try:
-            if use_tls:
-                # TLS 模式
-                server = smtplib.SMTP(smtp_server, smtp_port, timeout=30)
-                server.set_debuglevel(0)  # 设为1可以查看详细调试信息
-                server.ehlo()
-                server.starttls()
-                server.ehlo()
-            else:
-                # SSL 模式
-                server = smtplib.SMTP_SSL(smtp_server, smtp_port, timeout=30)
-                server.set_debuglevel(0)
-                server.ehlo()
+        # 复用本次运行内已登录的 SMTP 连接，断线时自动重连
+        session_manager = get_smtp_session_manager()
+        encryption = "TLS" if use_tls else "SSL"
+
+        if CONFIG["EMAIL_DELIVERY"]["PER_RECIPIENT"] and len(recipients) > 1:
+            # 逐个收件人单独发送（收件人互相不可见），可并发
+            max_workers = max(1, min(CONFIG["EMAIL_DELIVERY"]["MAX_WORKERS"], len(recipients)))
+
+            def send_one(recipient: str) -> Tuple[str, Optional[str]]:
+                try:
+                    session_manager.send_message(
+                        smtp_server, smtp_port, encryption, from_email, password,
+                        build_message(recipient), to_addrs=[recipient],
+                    )
+                    return recipient, None
+                except Exception as e:
+                    return recipient, str(e)
+
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                outcomes = list(executor.map(send_one, recipients))
+
+            failed = [(r, err) for r, err in outcomes if err is not None]
+            for recipient, err in failed:
+                print(f"邮件发送失败 [{report_type}] -> {recipient}：{err}")
+            if failed:
+                print(f"邮件部分发送成功：{len(recipients) - len(failed)}/{len(recipients)} 个收件人 [{report_type}]")
+                return False
 
-            # 登录
-            server.login(from_email, password)
+            print(f"邮件发送成功 [{report_type}] -> {len(recipients)} 个收件人（逐个发送）")
+            return True
 
-            # 发送邮件
-            server.send_message(msg)
-            server.quit()
+        try:
+            session_manager.send_message(
+                smtp_server, smtp_port, encryption, from_email, password,
+                build_message(", ".join(recipients)), to_addrs=recipients,
+            )
 
             print(f"邮件发送成功 [{report_type}] -> {to_email}")
             return True
@@ -4512,6 +5513,7 @@ def send_to_ntfy(
     proxy_url: Optional[str] = None,
     mode: str = "daily",
     account_label: str = "",
+    outbox: Optional["NotificationOutbox"] = None,
 ) -> bool:
     """发送到ntfy（支持分批发送，严格遵守4KB限制）"""
     # 日志前缀
@@ -4561,12 +5563,24 @@ def send_to_ntfy(
     total_batches = len(batches)
     print(f"{log_prefix}消息分为 {total_batches} 批次发送 [{report_type}]")
 
+    # 内容去重
+    duplicate, fingerprint = check_push_duplicate(
+        "ntfy", account_label, batches, report_type, log_prefix
+    )
+    if duplicate:
+        return True
+
     # 反转批次顺序，使得在ntfy客户端显示时顺序正确
     # ntfy显示最新消息在上面，所以我们从最后一批开始推送
     reversed_batches = list(reversed(batches))
 
     print(f"{log_prefix}将按反向顺序推送（最后批次先推送），确保客户端显示顺序正确")
 
+    # 启用发件箱时只入队，由后台线程负责投递和重试
+    group = outbox.new_group("ntfy", account_label) if outbox is not None else ""
+    # 公共服务器建议 2-3 秒，自托管可以更短
+    interval = 2 if "ntfy.sh" in server_url else 1
+
     # 逐批发送（反向顺序）
     success_count = 0
     for idx, batch_content in enumerate(reversed_batches, 1):
@@ -4589,6 +5603,17 @@ def send_to_ntfy(
                 f"{report_type_en} ({actual_batch_num}/{total_batches})"
             )
 
+        if outbox is not None:
+            outbox.enqueue(
+                group, "ntfy", idx, total_batches, report_type,
+                headers={k: v for k, v in current_headers.items() if k != "Authorization"},
+                data=batch_content, use_proxy=bool(proxy_url),
+                interval=interval, account_label=account_label,
+                batch_label=f"{actual_batch_num}/{total_batches}",
+                fingerprint=fingerprint,
+            )
+            continue
+
         try:
             response = requests.post(
                 url,
@@ -4602,8 +5627,6 @@ def send_to_ntfy(
                 print(f"{log_prefix}第 {actual_batch_num}/{total_batches} 批次发送成功 [{report_type}]")
                 success_count += 1
                 if idx < total_batches:
-                    # 公共服务器建议 2-3 秒，自托管可以更短
-                    interval = 2 if "ntfy.sh" in server_url else 1
                     time.sleep(interval)
             elif response.status_code == 429:
                 print(
@@ -4647,8 +5670,13 @@ def send_to_ntfy(
         except Exception as e:
             print(f"{log_prefix}第 {actual_batch_num}/{total_batches} 批次发送异常 [{report_type}]：{e}")
 
+    if outbox is not None:
+        print(f"{log_prefix}{total_batches} 个批次已写入发件箱 [{report_type}]")
+        return True
+
     # 判断整体发送是否成功
     if success_count == total_batches:
+        record_push_fingerprint("ntfy", account_label, fingerprint, report_type)
         print(f"{log_prefix}所有 {total_batches} 批次发送完成 [{report_type}]")
         return True
     elif success_count > 0:
@@ -4667,6 +5695,7 @@ def send_to_bark(
     proxy_url: Optional[str] = None,
     mode: str = "daily",
     account_label: str = "",
+    outbox: Optional["NotificationOutbox"] = None,
 ) -> bool:
     """发送到Bark（支持分批发送，使用 markdown 格式）"""
     # 日志前缀
@@ -4703,12 +5732,22 @@ def send_to_bark(
     total_batches = len(batches)
     print(f"{log_prefix}消息分为 {total_batches} 批次发送 [{report_type}]")
 
+    # 内容去重
+    duplicate, fingerprint = check_push_duplicate(
+        "bark", account_label, batches, report_type, log_prefix
+    )
+    if duplicate:
+        return True
+
     # 反转批次顺序，使得在Bark客户端显示时顺序正确
     # Bark显示最新消息在上面，所以我们从最后一批开始推送
     reversed_batches = list(reversed(batches))
 
     print(f"{log_prefix}将按反向顺序推送（最后批次先推送），确保客户端显示顺序正确")
 
+    # 启用发件箱时只入队，由后台线程负责投递和重试
+    group = outbox.new_group("bark", account_label) if outbox is not None else ""
+
     # 逐批发送（反向顺序）
     success_count = 0
     for idx, batch_content in enumerate(reversed_batches, 1):
@@ -4736,6 +5775,17 @@ def send_to_bark(
             "action": "none",  # 点击推送跳到 APP 不弹出弹框,方便阅读
         }
 
+        if outbox is not None:
+            outbox.enqueue(
+                group, "bark", idx, total_batches, report_type,
+                json_payload={k: v for k, v in payload.items() if k != "device_key"},
+                use_proxy=bool(proxy_url),
+                interval=CONFIG["BATCH_SEND_INTERVAL"], account_label=account_label,
+                batch_label=f"{actual_batch_num}/{total_batches}",
+                fingerprint=fingerprint,
+            )
+            continue
+
         try:
             response = requests.post(
                 api_endpoint,
@@ -4774,8 +5824,13 @@ def send_to_bark(
         except Exception as e:
             print(f"{log_prefix}第 {actual_batch_num}/{total_batches} 批次发送异常 [{report_type}]：{e}")
 
+    if outbox is not None:
+        print(f"{log_prefix}{total_batches} 个批次已写入发件箱 [{report_type}]")
+        return True
+
     # 判断整体发送是否成功
     if success_count == total_batches:
+        record_push_fingerprint("bark", account_label, fingerprint, report_type)
         print(f"{log_prefix}所有 {total_batches} 批次发送完成 [{report_type}]")
         return True
     elif success_count > 0:
@@ -4812,6 +5867,7 @@ def send_to_slack(
     proxy_url: Optional[str] = None,
     mode: str = "daily",
     account_label: str = "",
+    outbox: Optional["NotificationOutbox"] = None,
 ) -> bool:
     """发送到Slack（支持分批发送，使用 mrkdwn 格式）"""
     headers = {"Content-Type": "application/json"}
@@ -4834,6 +5890,16 @@ def send_to_slack(
 
     print(f"{log_prefix}消息分为 {len(batches)} 批次发送 [{report_type}]")
 
+    # 内容去重
+    duplicate, fingerprint = check_push_duplicate(
+        "slack", account_label, batches, report_type, log_prefix
+    )
+    if duplicate:
+        return True
+
+    # 启用发件箱时只入队，由后台线程负责投递和重试
+    group = outbox.new_group("slack", account_label) if outbox is not None else ""
+
     # 逐批发送
     for i, batch_content in enumerate(batches, 1):
         # 转换 Markdown 到 mrkdwn 格式
@@ -4849,6 +5915,15 @@ def send_to_slack(
             "text": mrkdwn_content
         }
 
+        if outbox is not None:
+            outbox.enqueue(
+                group, "slack", i, len(batches), report_type,
+                headers=headers, json_payload=payload, use_proxy=bool(proxy_url),
+                interval=CONFIG["BATCH_SEND_INTERVAL"], account_label=account_label,
+                fingerprint=fingerprint,
+            )
+            continue
+
         try:
             response = requests.post(
                 webhook_url, headers=headers, json=payload, proxies=proxies, timeout=30
@@ -4870,6 +5945,11 @@ def send_to_slack(
             print(f"{log_prefix}第 {i}/{len(batches)} 批次发送出错 [{report_type}]：{e}")
             return False
 
+    if outbox is not None:
+        print(f"{log_prefix}{len(batches)} 个批次已写入发件箱 [{report_type}]")
+        return True
+
+    record_push_fingerprint("slack", account_label, fingerprint, report_type)
     print(f"{log_prefix}所有 {len(batches)} 批次发送完成 [{report_type}]")
     return True
 
@@ -5398,6 +6478,11 @@ class NewsAnalyzer:
 
     def run(self) -> None:
         """执行分析流程"""
+        # 发件箱：先启动后台投递线程，续投上次运行遗留的消息
+        outbox = get_notification_outbox() if CONFIG["ENABLE_NOTIFICATION"] else None
+        if outbox is not None:
+            outbox.start()
+
         try:
             self._initialize_and_check_config()
 
@@ -5410,6 +6495,11 @@ class NewsAnalyzer:
         except Exception as e:
             print(f"分析流程执行出错: {e}")
             raise
+        finally:
+            if outbox is not None:
+                outbox.close()
+            if _smtp_session_manager is not None:
+                _smtp_session_manager.close_all()
 
 
 def main():
@@ -5,36 +5,127 @@ TrendRadar MCP Server - FastMCP 2.0 实现
 支持 stdio 和 HTTP 两种传输模式。
 """
 
+import importlib
 import json
-from typing import List, Optional, Dict
+import os
+from threading import Lock, Thread
+from typing import Callable, List, Optional, Dict
 
 from fastmcp import FastMCP
+from starlette.requests import Request
+from starlette.responses import PlainTextResponse
 
-from .tools.data_query import DataQueryTools
-from .tools.analytics import AnalyticsTools
-from .tools.search_tools import SearchTools
-from .tools.config_mgmt import ConfigManagementTools
-from .tools.system import SystemManagementTools
+from .services.executor_service import configure_tool_executor, get_tool_executor
+from .services.metrics_service import collect_metrics, enable_process_snapshots, render_prometheus
+from .services.shared_store import configure_shared_store
 from .utils.date_parser import DateParser
 from .utils.errors import MCPError
+from .utils.response import OUTPUT_FORMATS, configure_response_format, encode_response
 
 
 # 创建 FastMCP 2.0 应用
 mcp = FastMCP('trendradar-news')
 
-# 全局工具实例（在第一次请求时初始化）
-_tools_instances = {}
+# 工具实现模块（键 -> (模块, 类名)），第一次调用对应工具时才导入并创建实例，
+# 缩短 stdio 模式下每个会话启动服务器的冷启动时间
+TOOL_CLASSES = {
+    'data': ('.tools.data_query', 'DataQueryTools'),
+    'analytics': ('.tools.analytics', 'AnalyticsTools'),
+    'search': ('.tools.search_tools', 'SearchTools'),
+    'config': ('.tools.config_mgmt', 'ConfigManagementTools'),
+    'system': ('.tools.system', 'SystemManagementTools'),
+}
+
+# HTTP 多进程模式下主进程传给服务进程的启动参数（环境变量，JSON）
+WORKER_SETTINGS_ENV = 'TRENDRADAR_MCP_WORKER_SETTINGS'
+
+
+class LazyToolRegistry:
+    """按需加载的工具实例（单例）"""
+
+    def __init__(self):
+        self.project_root: Optional[str] = None
+        self._instances: Dict = {}
+        self._lock = Lock()
+
+    def configure(self, project_root: Optional[str]) -> None:
+        """设置项目根目录（只在还没有创建任何工具实例时生效）"""
+        with self._lock:
+            if not self._instances:
+                self.project_root = project_root
+
+    def __getitem__(self, key: str):
+        instance = self._instances.get(key)
+        if instance is None:
+            with self._lock:
+                instance = self._instances.get(key)
+                if instance is None:
+                    module_name, class_name = TOOL_CLASSES[key]
+                    module = importlib.import_module(module_name, __package__)
+                    instance = getattr(module, class_name)(self.project_root)
+                    self._instances[key] = instance
+        return instance
+
+    @property
+    def loaded(self) -> List[str]:
+        """已创建实例的工具键"""
+        return list(self._instances)
+
+
+# 全局工具实例（第一次调用对应工具时初始化）
+_tools_instances = LazyToolRegistry()
+
+
+def _get_tools(project_root: Optional[str] = None) -> LazyToolRegistry:
+    """获取工具实例注册表（单例模式，项目根目录以第一次传入的为准）"""
+    if project_root is not None:
+        _tools_instances.configure(project_root)
+    return _tools_instances
 
 
-def _get_tools(project_root: Optional[str] = None):
-    """获取或创建工具实例（单例模式）"""
-    if not _tools_instances:
-        _tools_instances['data'] = DataQueryTools(project_root)
-        _tools_instances['analytics'] = AnalyticsTools(project_root)
-        _tools_instances['search'] = SearchTools(project_root)
-        _tools_instances['config'] = ConfigManagementTools(project_root)
-        _tools_instances['system'] = SystemManagementTools(project_root)
-    return _tools_instances
+# 单进程模式下延后启动的后台预热：第一次工具调用返回后才启动，
+# 避免预热的导入和解析与服务器启动、会话初始化争抢 GIL（None 表示无需启动或已启动）
+_deferred_warmup: Optional[Callable[[], None]] = None
+
+
+def _start_warmup(project_root: Optional[str]) -> None:
+    """导入预热服务并启动后台预热（导入较重，应在后台线程中调用）"""
+    from .services.warmup_service import get_warmup_service
+
+    get_warmup_service(project_root).start()
+
+
+def _defer_warmup(project_root: Optional[str]) -> None:
+    """登记延后启动的预热，由第一次工具调用结束时在后台线程中启动"""
+    global _deferred_warmup
+
+    def start():
+        Thread(target=_start_warmup, args=(project_root,), name='mcp-warmup-start', daemon=True).start()
+
+    _deferred_warmup = start
+
+
+async def _run_tool(tool_name: str, func, *args, **kwargs) -> Dict:
+    """在工具线程池中执行同步工具方法，避免阻塞事件循环"""
+    global _deferred_warmup
+    try:
+        return await get_tool_executor().run(tool_name, func, *args, **kwargs)
+    finally:
+        # 工具调用都在事件循环线程中结束，取出并清空后启动，保证只启动一次
+        start, _deferred_warmup = _deferred_warmup, None
+        if start is not None:
+            start()
+
+
+def _encode(result: Dict, output_format: Optional[str] = None) -> str:
+    """按调用方指定（或服务器默认）的输出格式序列化工具结果"""
+    try:
+        return encode_response(result, output_format)
+    except MCPError as e:
+        return encode_response({
+            "success": False,
+            "error": e.to_dict()
+        })
 
 
 # ==================== 日期解析工具（优先调用）====================
@@ -92,20 +183,20 @@ async def resolve_date_range(
     """
     try:
         result = DateParser.resolve_date_range_expression(expression)
-        return json.dumps(result, ensure_ascii=False, indent=2)
+        return _encode(result)
     except MCPError as e:
-        return json.dumps({
+        return _encode({
             "success": False,
             "error": e.to_dict()
-        }, ensure_ascii=False, indent=2)
+        })
     except Exception as e:
-        return json.dumps({
+        return _encode({
             "success": False,
             "error": {
                 "code": "INTERNAL_ERROR",
                 "message": str(e)
             }
-        }, ensure_ascii=False, indent=2)
+        })
 
 
 # ==================== 数据查询工具 ====================
@@ -114,7 +205,8 @@ async def resolve_date_range(
 async def get_latest_news(
     platforms: Optional[List[str]] = None,
     limit: int = 50,
-    include_url: bool = False
+    include_url: bool = False,
+    output_format: Optional[str] = None
 ) -> str:
     """
     获取最新一批爬取的新闻数据，快速了解当前热点
@@ -127,6 +219,10 @@ async def get_latest_news(
         limit: 返回条数限制，默认50，最大1000
                注意：实际返回数量可能少于请求值，取决于当前可用的新闻总数
         include_url: 是否包含URL链接，默认False（节省token）
+        output_format: 输出格式（可选），默认使用服务器启动参数 --output-format（通常为 pretty）
+            - "pretty": 缩进 JSON
+            - "compact": 无缩进 JSON
+            - "table": 紧凑 JSON，新闻列表编码为 {"fields": [...], "rows": [[...]]}，体积最小
 
     Returns:
         JSON格式的新闻列表
@@ -144,8 +240,8 @@ async def get_latest_news(
     **注意**：如果用户询问"为什么只显示了部分"，说明他们需要完整数据
     """
     tools = _get_tools()
-    result = tools['data'].get_latest_news(platforms=platforms, limit=limit, include_url=include_url)
-    return json.dumps(result, ensure_ascii=False, indent=2)
+    result = await _run_tool('get_latest_news', tools['data'].get_latest_news, platforms=platforms, limit=limit, include_url=include_url)
+    return _encode(result, output_format)
 
 
 @mcp.tool
@@ -169,8 +265,8 @@ async def get_trending_topics(
         JSON格式的关注词频率统计列表
     """
     tools = _get_tools()
-    result = tools['data'].get_trending_topics(top_n=top_n, mode=mode)
-    return json.dumps(result, ensure_ascii=False, indent=2)
+    result = await _run_tool('get_trending_topics', tools['data'].get_trending_topics, top_n=top_n, mode=mode)
+    return _encode(result)
 
 
 @mcp.tool
@@ -178,7 +274,9 @@ async def get_news_by_date(
     date_query: Optional[str] = None,
     platforms: Optional[List[str]] = None,
     limit: int = 50,
-    include_url: bool = False
+    include_url: bool = False,
+    cursor: Optional[str] = None,
+    output_format: Optional[str] = None
 ) -> str:
     """
     获取指定日期的新闻数据，用于历史数据分析和对比
@@ -195,6 +293,14 @@ async def get_news_by_date(
         limit: 返回条数限制，默认50，最大1000
                注意：实际返回数量可能少于请求值，取决于指定日期的新闻总数
         include_url: 是否包含URL链接，默认False（节省token）
+        cursor: 分页游标（可选）
+                - 第一页不传；结果中 pagination.has_more 为 true 时，
+                  将 pagination.next_cursor 原样传入即可获取下一页
+                - 翻页时除 limit 外的其他参数需保持不变
+        output_format: 输出格式（可选），默认使用服务器启动参数 --output-format（通常为 pretty）
+            - "pretty": 缩进 JSON
+            - "compact": 无缩进 JSON
+            - "table": 紧凑 JSON，新闻列表编码为 {"fields": [...], "rows": [[...]]}，体积最小
 
     Returns:
         JSON格式的新闻列表，包含标题、平台、排名等信息
@@ -212,13 +318,15 @@ async def get_news_by_date(
     **注意**：如果用户询问"为什么只显示了部分"，说明他们需要完整数据
     """
     tools = _get_tools()
-    result = tools['data'].get_news_by_date(
+    result = await _run_tool(
+        'get_news_by_date', tools['data'].get_news_by_date,
         date_query=date_query,
         platforms=platforms,
         limit=limit,
-        include_url=include_url
+        include_url=include_url,
+        cursor=cursor
     )
-    return json.dumps(result, ensure_ascii=False, indent=2)
+    return _encode(result, output_format)
 
 
 
@@ -254,7 +362,7 @@ async def analyze_topic_trend(
                     - **格式**: {"start": "YYYY-MM-DD", "end": "YYYY-MM-DD"}
                     - **获取方式**: 调用 resolve_date_range 工具解析自然语言日期
                     - **默认**: 不指定时默认分析最近7天
-        granularity: 时间粒度（trend模式），默认"day"（仅支持 day，因为底层数据按天聚合）
+        granularity: 时间粒度（trend模式），默认"day"；支持 "hour" 及 "15min"、"30m"、"6h" 等任意时间桶（基于每次爬取的快照，时间桶过多时自动降采样）
         threshold: 热度突增倍数阈值（viral模式），默认3.0
         time_window: 检测时间窗口小时数（viral模式），默认24
         lookahead_hours: 预测未来小时数（predict模式），默认6
@@ -275,7 +383,8 @@ async def analyze_topic_trend(
         2. analyze_topic_trend(topic="特斯拉", analysis_type="lifecycle", date_range=...)
     """
     tools = _get_tools()
-    result = tools['analytics'].analyze_topic_trend_unified(
+    result = await _run_tool(
+        'analyze_topic_trend', tools['analytics'].analyze_topic_trend_unified,
         topic=topic,
         analysis_type=analysis_type,
         date_range=date_range,
@@ -285,7 +394,7 @@ async def analyze_topic_trend(
         lookahead_hours=lookahead_hours,
         confidence_threshold=confidence_threshold
     )
-    return json.dumps(result, ensure_ascii=False, indent=2)
+    return _encode(result)
 
 
 @mcp.tool
@@ -309,6 +418,7 @@ async def analyze_data_insights(
                     - **格式**: {"start": "YYYY-MM-DD", "end": "YYYY-MM-DD"}
                     - **示例**: {"start": "2025-01-01", "end": "2025-01-07"}
                     - **重要**: 必须是对象格式，不能传递整数
+                    - platform_activity / keyword_cooccur 模式不传时默认今天
         min_frequency: 最小共现频次（keyword_cooccur模式），默认3
         top_n: 返回TOP N结果（keyword_cooccur模式），默认20
 
@@ -319,16 +429,18 @@ async def analyze_data_insights(
         - analyze_data_insights(insight_type="platform_compare", topic="人工智能")
         - analyze_data_insights(insight_type="platform_activity", date_range={"start": "2025-01-01", "end": "2025-01-07"})
         - analyze_data_insights(insight_type="keyword_cooccur", min_frequency=5, top_n=15)
+        - analyze_data_insights(insight_type="keyword_cooccur", date_range={"start": "2025-01-01", "end": "2025-01-07"})
     """
     tools = _get_tools()
-    result = tools['analytics'].analyze_data_insights_unified(
+    result = await _run_tool(
+        'analyze_data_insights', tools['analytics'].analyze_data_insights_unified,
         insight_type=insight_type,
         topic=topic,
         date_range=date_range,
         min_frequency=min_frequency,
         top_n=top_n
     )
-    return json.dumps(result, ensure_ascii=False, indent=2)
+    return _encode(result)
 
 
 @mcp.tool
@@ -338,7 +450,9 @@ async def analyze_sentiment(
     date_range: Optional[Dict[str, str]] = None,
     limit: int = 50,
     sort_by_weight: bool = True,
-    include_url: bool = False
+    include_url: bool = False,
+    cursor: Optional[str] = None,
+    output_format: Optional[str] = None
 ) -> str:
     """
     分析新闻的情感倾向和热度趋势
@@ -363,6 +477,14 @@ async def analyze_sentiment(
                因此实际返回数量可能少于请求的 limit 值
         sort_by_weight: 是否按热度权重排序，默认True
         include_url: 是否包含URL链接，默认False（节省token）
+        cursor: 分页游标（可选）
+                - 第一页不传；结果中 pagination.has_more 为 true 时，
+                  将 pagination.next_cursor 原样传入即可获取下一页
+                - 翻页时除 limit 外的其他参数需保持不变
+        output_format: 输出格式（可选），默认使用服务器启动参数 --output-format（通常为 pretty）
+            - "pretty": 缩进 JSON
+            - "compact": 无缩进 JSON
+            - "table": 紧凑 JSON，新闻列表编码为 {"fields": [...], "rows": [[...]]}，体积最小
 
     Returns:
         JSON格式的分析结果，包含情感分布、热度趋势和相关新闻
@@ -384,15 +506,17 @@ async def analyze_sentiment(
     - 仅在用户明确要求"总结"或"挑重点"时才进行筛选
     """
     tools = _get_tools()
-    result = tools['analytics'].analyze_sentiment(
+    result = await _run_tool(
+        'analyze_sentiment', tools['analytics'].analyze_sentiment,
         topic=topic,
         platforms=platforms,
         date_range=date_range,
         limit=limit,
         sort_by_weight=sort_by_weight,
-        include_url=include_url
+        include_url=include_url,
+        cursor=cursor
     )
-    return json.dumps(result, ensure_ascii=False, indent=2)
+    return _encode(result, output_format)
 
 
 @mcp.tool
@@ -400,7 +524,8 @@ async def find_similar_news(
     reference_title: str,
     threshold: float = 0.6,
     limit: int = 50,
-    include_url: bool = False
+    include_url: bool = False,
+    output_format: Optional[str] = None
 ) -> str:
     """
     查找与指定新闻标题相似的其他新闻
@@ -412,6 +537,10 @@ async def find_similar_news(
         limit: 返回条数限制，默认50，最大100
                注意：实际返回数量取决于相似度匹配结果，可能少于请求值
         include_url: 是否包含URL链接，默认False（节省token）
+        output_format: 输出格式（可选），默认使用服务器启动参数 --output-format（通常为 pretty）
+            - "pretty": 缩进 JSON
+            - "compact": 无缩进 JSON
+            - "table": 紧凑 JSON，新闻列表编码为 {"fields": [...], "rows": [[...]]}，体积最小
 
     Returns:
         JSON格式的相似新闻列表，包含相似度分数
@@ -422,13 +551,14 @@ async def find_similar_news(
     - 仅在用户明确要求"总结"或"挑重点"时才进行筛选
     """
     tools = _get_tools()
-    result = tools['analytics'].find_similar_news(
+    result = await _run_tool(
+        'find_similar_news', tools['analytics'].find_similar_news,
         reference_title=reference_title,
         threshold=threshold,
         limit=limit,
         include_url=include_url
     )
-    return json.dumps(result, ensure_ascii=False, indent=2)
+    return _encode(result, output_format)
 
 
 @mcp.tool
@@ -450,11 +580,12 @@ async def generate_summary_report(
         JSON格式的摘要报告，包含Markdown格式内容
     """
     tools = _get_tools()
-    result = tools['analytics'].generate_summary_report(
+    result = await _run_tool(
+        'generate_summary_report', tools['analytics'].generate_summary_report,
         report_type=report_type,
         date_range=date_range
     )
-    return json.dumps(result, ensure_ascii=False, indent=2)
+    return _encode(result)
 
 
 # ==================== 智能检索工具 ====================
@@ -468,7 +599,9 @@ async def search_news(
     limit: int = 50,
     sort_by: str = "relevance",
     threshold: float = 0.6,
-    include_url: bool = False
+    include_url: bool = False,
+    cursor: Optional[str] = None,
+    output_format: Optional[str] = None
 ) -> str:
     """
     统一搜索接口，支持多种搜索模式
@@ -501,6 +634,14 @@ async def search_news(
         threshold: 相似度阈值（仅fuzzy模式有效），0-1之间，默认0.6
                    注意：阈值越高匹配越严格，返回结果越少
         include_url: 是否包含URL链接，默认False（节省token）
+        cursor: 分页游标（可选）
+                - 第一页不传；结果中 pagination.has_more 为 true 时，
+                  将 pagination.next_cursor 原样传入即可获取下一页
+                - 翻页时除 limit 外的其他参数需保持不变
+        output_format: 输出格式（可选），默认使用服务器启动参数 --output-format（通常为 pretty）
+            - "pretty": 缩进 JSON
+            - "compact": 无缩进 JSON
+            - "table": 紧凑 JSON，新闻列表编码为 {"fields": [...], "rows": [[...]]}，体积最小
 
     Returns:
         JSON格式的搜索结果，包含标题、平台、排名等信息
@@ -525,7 +666,8 @@ async def search_news(
     - 仅在用户明确要求"总结"或"挑重点"时才进行筛选
     """
     tools = _get_tools()
-    result = tools['search'].search_news_unified(
+    result = await _run_tool(
+        'search_news', tools['search'].search_news_unified,
         query=query,
         search_mode=search_mode,
         date_range=date_range,
@@ -533,9 +675,10 @@ async def search_news(
         limit=limit,
         sort_by=sort_by,
         threshold=threshold,
-        include_url=include_url
+        include_url=include_url,
+        cursor=cursor
     )
-    return json.dumps(result, ensure_ascii=False, indent=2)
+    return _encode(result, output_format)
 
 
 @mcp.tool
@@ -544,7 +687,9 @@ async def search_related_news_history(
     time_preset: str = "yesterday",
     threshold: float = 0.4,
     limit: int = 50,
-    include_url: bool = False
+    include_url: bool = False,
+    cursor: Optional[str] = None,
+    output_format: Optional[str] = None
 ) -> str:
     """
     基于种子新闻，在历史数据中搜索相关新闻
@@ -562,6 +707,14 @@ async def search_related_news_history(
         limit: 返回条数限制，默认50，最大100
                注意：实际返回数量取决于相关性匹配结果，可能少于请求值
         include_url: 是否包含URL链接，默认False（节省token）
+        cursor: 分页游标（可选）
+                - 第一页不传；结果中 pagination.has_more 为 true 时，
+                  将 pagination.next_cursor 原样传入即可获取下一页
+                - 翻页时除 limit 外的其他参数需保持不变
+        output_format: 输出格式（可选），默认使用服务器启动参数 --output-format（通常为 pretty）
+            - "pretty": 缩进 JSON
+            - "compact": 无缩进 JSON
+            - "table": 紧凑 JSON，新闻列表编码为 {"fields": [...], "rows": [[...]]}，体积最小
 
     Returns:
         JSON格式的相关新闻列表，包含相关性分数和时间分布
@@ -572,14 +725,16 @@ async def search_related_news_history(
     - 仅在用户明确要求"总结"或"挑重点"时才进行筛选
     """
     tools = _get_tools()
-    result = tools['search'].search_related_news_history(
+    result = await _run_tool(
+        'search_related_news_history', tools['search'].search_related_news_history,
         reference_text=reference_text,
         time_preset=time_preset,
         threshold=threshold,
         limit=limit,
-        include_url=include_url
+        include_url=include_url,
+        cursor=cursor
     )
-    return json.dumps(result, ensure_ascii=False, indent=2)
+    return _encode(result, output_format)
 
 
 # ==================== 配置与系统管理工具 ====================
@@ -603,8 +758,8 @@ async def get_current_config(
         JSON格式的配置信息
     """
     tools = _get_tools()
-    result = tools['config'].get_current_config(section=section)
-    return json.dumps(result, ensure_ascii=False, indent=2)
+    result = await _run_tool('get_current_config', tools['config'].get_current_config, section=section)
+    return _encode(result)
 
 
 @mcp.tool
@@ -612,14 +767,41 @@ async def get_system_status() -> str:
     """
     获取系统运行状态和健康检查信息
 
-    返回系统版本、数据统计、缓存状态等信息
+    返回系统版本、数据统计、缓存状态等信息，warmup 字段为启动预热的状态和进度
 
     Returns:
         JSON格式的系统状态信息
     """
     tools = _get_tools()
-    result = tools['system'].get_system_status()
-    return json.dumps(result, ensure_ascii=False, indent=2)
+    result = await _run_tool('get_system_status', tools['system'].get_system_status)
+    return _encode(result)
+
+
+@mcp.tool
+async def get_metrics(view: str = 'summary') -> str:
+    """
+    获取服务器运行指标（每个工具的调用次数、延迟、错误数，单次调用读取的文件/字节/日期数，缓存命中率）
+
+    Args:
+        view: 指标视图
+              - "summary": 按工具汇总（默认），延迟为 p50/p95/p99 毫秒估计值
+              - "prometheus": Prometheus 文本格式（HTTP 模式下也可直接抓取 /metrics）
+
+    Returns:
+        JSON格式的指标信息
+    """
+    tools = _get_tools()
+    result = await _run_tool('get_metrics', tools['system'].get_metrics, view=view)
+    return _encode(result)
+
+
+@mcp.custom_route('/metrics', methods=['GET'])
+async def metrics_endpoint(request: Request) -> PlainTextResponse:
+    """Prometheus 抓取端点（HTTP 模式，多进程模式下返回所有服务进程的合计）"""
+    return PlainTextResponse(
+        render_prometheus(collect_metrics()),
+        media_type='text/plain; version=0.0.4; charset=utf-8'
+    )
 
 
 @mcp.tool
@@ -629,23 +811,21 @@ async def trigger_crawl(
     include_url: bool = False
 ) -> str:
     """
-    手动触发一次爬取任务（可选持久化）
+    手动触发一次爬取任务（后台执行，立即返回任务ID；可选持久化）
 
     Args:
         platforms: 指定平台ID列表，如 ['zhihu', 'weibo', 'douyin']
                    - 不指定时：使用 config.yaml 中配置的所有平台
                    - 支持的平台来自 config/config.yaml 的 platforms 配置
                    - 每个平台都有对应的name字段（如"知乎"、"微博"），方便AI识别
-                   - 注意：失败的平台会在返回结果的 failed_platforms 字段中列出
-        save_to_local: 是否保存到本地 output 目录，默认 False
+        save_to_local: 是否在爬取完成后保存到本地 output 目录，默认 False
         include_url: 是否包含URL链接，默认False（节省token）
 
     Returns:
-        JSON格式的任务状态信息，包含：
-        - platforms: 成功爬取的平台列表
-        - failed_platforms: 失败的平台列表（如有）
-        - total_news: 爬取的新闻总数
-        - data: 新闻数据
+        JSON格式的任务信息，包含：
+        - job_id: 任务ID，用于 get_crawl_status / cancel_crawl
+        - status: pending（排队中，同一时间只运行一个爬取任务）或 running
+        - platforms: 各平台的爬取状态
 
     Examples:
         - 临时爬取: trigger_crawl(platforms=['zhihu'])
@@ -653,17 +833,101 @@ async def trigger_crawl(
         - 使用默认平台: trigger_crawl()  # 爬取config.yaml中配置的所有平台
     """
     tools = _get_tools()
-    result = tools['system'].trigger_crawl(platforms=platforms, save_to_local=save_to_local, include_url=include_url)
-    return json.dumps(result, ensure_ascii=False, indent=2)
+    result = await _run_tool('trigger_crawl', tools['system'].trigger_crawl, platforms=platforms, save_to_local=save_to_local, include_url=include_url)
+    return _encode(result)
+
+
+@mcp.tool
+async def get_crawl_status(
+    job_id: Optional[str] = None,
+    since: int = 0,
+    output_format: Optional[str] = None
+) -> str:
+    """
+    查询爬取任务的进度和已完成平台的新闻（每个平台完成后即可获取）
+
+    Args:
+        job_id: trigger_crawl 返回的任务ID，不指定时列出最近的任务
+        since: 只返回第 since 个之后完成的平台的新闻，默认 0（全部）
+               轮询时传入上次返回的 next_since，避免重复获取
+        output_format: 输出格式（可选），默认使用服务器启动参数 --output-format（通常为 pretty）
+
+    Returns:
+        JSON格式的任务状态，包含：
+        - status: pending / running / completed / failed / cancelled
+        - progress: 已完成平台数和总数
+        - platforms: 各平台状态（pending / running / success / failed / cancelled）
+        - data: 新完成平台的新闻
+        - next_since: 下次轮询使用的 since
+        - failed_platforms: 失败的平台列表
+        - saved_files: 保存的文件路径（save_to_local 且任务完成时）
+
+    Examples:
+        - get_crawl_status(job_id='crawl_20251020120000_a1b2c3')
+        - get_crawl_status(job_id='crawl_20251020120000_a1b2c3', since=3)
+    """
+    tools = _get_tools()
+    result = await _run_tool('get_crawl_status', tools['system'].get_crawl_status, job_id=job_id, since=since)
+    return _encode(result, output_format)
+
+
+@mcp.tool
+async def cancel_crawl(job_id: str) -> str:
+    """
+    取消爬取任务
+
+    排队中的任务直接取消；运行中的任务在当前平台完成后停止，已完成平台的结果仍可查询，
+    但不会保存到本地。
+
+    Args:
+        job_id: trigger_crawl 返回的任务ID
+
+    Returns:
+        JSON格式的任务状态
+    """
+    tools = _get_tools()
+    result = await _run_tool('cancel_crawl', tools['system'].cancel_crawl, job_id=job_id)
+    return _encode(result)
 
 
 # ==================== 启动入口 ====================
 
+def create_worker_app():
+    """
+    HTTP 多进程模式下服务进程的应用工厂（由 uvicorn 在每个服务进程中调用）
+
+    服务进程以共享存储读取方运行，直接映射主进程导出的索引和汇总表；
+    多个进程之间无法共享 MCP 会话，因此使用无状态 HTTP。
+    """
+    settings = json.loads(os.environ.get(WORKER_SETTINGS_ENV, '{}'))
+    project_root = settings.get('project_root')
+
+    from .services.parser_service import ParserService
+    from .services.warmup_service import get_warmup_service
+
+    configure_shared_store('reader')
+    _get_tools(project_root)
+    # 各服务进程定期写入指标快照，/metrics 合并所有进程
+    enable_process_snapshots(ParserService(project_root).project_root / 'output')
+    if settings.get('workers'):
+        configure_tool_executor(settings['workers'])
+    configure_response_format(settings.get('output_format', 'pretty'), settings.get('omit_defaults', False))
+    # 预热和共享文件导出由主进程负责
+    get_warmup_service(project_root).start(enabled=False)
+
+    return mcp.http_app(path='/mcp', stateless_http=True)
+
+
 def run_server(
     project_root: Optional[str] = None,
     transport: str = 'stdio',
     host: str = '0.0.0.0',
-    port: int = 3333
+    port: int = 3333,
+    workers: Optional[int] = None,
+    output_format: str = 'pretty',
+    omit_defaults: bool = False,
+    warmup: bool = True,
+    processes: int = 1
 ):
     """
     启动 MCP 服务器
@@ -673,10 +937,39 @@ def run_server(
         transport: 传输模式，'stdio' 或 'http'
         host: HTTP模式的监听地址，默认 0.0.0.0
         port: HTTP模式的监听端口，默认 3333
+        workers: 工具执行线程池大小，默认 8
+        output_format: 工具响应的默认输出格式（pretty/compact/table），默认 pretty
+        omit_defaults: 是否省略响应中的默认值字段（None、空字符串、空列表、空字典）
+        warmup: 是否在后台预热缓存和索引（还受 config.yaml 的 mcp.warmup.enabled 控制），
+            单进程模式下在第一次工具调用后启动
+        processes: HTTP 模式的服务进程数，大于 1 时启用多进程模式：主进程只负责构建并导出
+            共享索引和汇总表，服务进程以只读方式映射这些文件（使用无状态 HTTP）
     """
-    # 初始化工具实例
+    multiprocess = transport == 'http' and processes > 1
+    # 记录项目根目录（工具实现在第一次调用时加载）
     _get_tools(project_root)
 
+    # 初始化工具执行线程池
+    if workers:
+        configure_tool_executor(workers)
+    executor = get_tool_executor()
+
+    # 设置默认响应格式
+    configure_response_format(output_format, omit_defaults)
+
+    # 后台预热缓存和索引（不阻塞服务就绪，进度见 get_system_status）
+    # 单进程模式下预热延后到第一次工具调用之后（服务器已在服务），不拖慢启动；
+    # 多进程模式下主进程是共享存储的唯一写入方，不对外服务，立即预热全部历史并定期导出新快照
+    if multiprocess:
+        from .services.warmup_service import get_warmup_service
+
+        configure_shared_store('writer')
+        warmup_service = get_warmup_service(project_root)
+        warmup_service.start(enabled=warmup, shared_writer=True)
+        warmup_status = warmup_service.get_status()
+    elif warmup:
+        _defer_warmup(project_root)
+
     # 打印启动信息
     print()
     print("=" * 60)
@@ -690,11 +983,21 @@ def run_server(
     elif transport == 'http':
         print(f"  协议: MCP over HTTP (生产环境)")
         print(f"  服务器监听: {host}:{port}")
+        print(f"  指标端点: http://{host}:{port}/metrics")
 
     if project_root:
         print(f"  项目目录: {project_root}")
     else:
         print("  项目目录: 当前目录")
+    print(f"  工具线程池: {executor.max_workers} 个线程（工具模块在首次调用时加载）")
+    print(f"  响应格式: {output_format}{'（省略默认值字段）' if omit_defaults else ''}")
+    if multiprocess:
+        print(f"  服务进程: {processes} 个（共享只读索引，无状态 HTTP）")
+        print(f"  后台预热: 全部历史，每 {warmup_status['config']['refresh_interval']:g} 秒检查新快照")
+    elif warmup:
+        print("  后台预热: 第一次工具调用后按 mcp.warmup 配置启动（进度见 get_system_status）")
+    else:
+        print("  后台预热: 已关闭")
 
     print()
     print("  已注册的工具:")
@@ -720,13 +1023,32 @@ def run_server(
     print("    === 配置与系统管理 ===")
     print("    11. get_current_config      - 获取当前系统配置")
     print("    12. get_system_status       - 获取系统运行状态")
-    print("    13. trigger_crawl           - 手动触发爬取任务")
+    print("    13. get_metrics             - 获取运行指标（调用次数/延迟/缓存命中率）")
+    print("    14. trigger_crawl           - 手动触发爬取任务（后台执行）")
+    print("    15. get_crawl_status        - 查询爬取任务进度和结果")
+    print("    16. cancel_crawl            - 取消爬取任务")
     print("=" * 60)
     print()
 
     # 根据传输模式运行服务器
     if transport == 'stdio':
         mcp.run(transport='stdio')
+    elif multiprocess:
+        import uvicorn
+
+        os.environ[WORKER_SETTINGS_ENV] = json.dumps({
+            'project_root': project_root,
+            'workers': workers,
+            'output_format': output_format,
+            'omit_defaults': omit_defaults,
+        })
+        uvicorn.run(
+            'mcp_server.server:create_worker_app',
+            factory=True,
+            host=host,
+            port=port,
+            workers=processes
+        )
     elif transport == 'http':
         # HTTP 模式（生产推荐）
         mcp.run(
@@ -770,6 +1092,34 @@ if __name__ == '__main__':
         '--project-root',
         help='项目根目录路径'
     )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=None,
+        help='工具执行线程池大小，默认 8'
+    )
+    parser.add_argument(
+        '--output-format',
+        choices=list(OUTPUT_FORMATS),
+        default='pretty',
+        help='工具响应的默认输出格式：pretty (默认，缩进 JSON)、compact (无缩进) 或 table (列式表格)'
+    )
+    parser.add_argument(
+        '--omit-defaults',
+        action='store_true',
+        help='省略响应中的默认值字段（None、空字符串、空列表、空字典）'
+    )
+    parser.add_argument(
+        '--processes',
+        type=int,
+        default=1,
+        help='HTTP模式的服务进程数，默认 1；大于 1 时各进程共享主进程构建的只读索引'
+    )
+    parser.add_argument(
+        '--no-warmup',
+        action='store_true',
+        help='启动时不在后台预热缓存和索引'
+    )
 
     args = parser.parse_args()
 
@@ -777,5 +1127,10 @@ if __name__ == '__main__':
         project_root=args.project_root,
         transport=args.transport,
         host=args.host,
-        port=args.port
+        port=args.port,
+        workers=args.workers,
+        output_format=args.output_format,
+        omit_defaults=args.omit_defaults,
+        warmup=not args.no_warmup,
+        processes=args.processes
     )
@@ -1,23 +1,202 @@
 """
 缓存服务
 
-实现TTL缓存机制，提升数据访问性能。
+实现带容量上限的 LRU + TTL 缓存机制，提升数据访问性能。
+
+- 按键前缀（如 "search"、"read_all_titles"）划分命名空间，每个命名空间独立限制条目数和字节数
+- 条目大小按对象图近似估算（sys.getsizeof 递归求和）
+- 超出上限时按最近最少使用（LRU）顺序淘汰
+- 后台线程定期清理过期条目
 """
 
+import sys
 import time
-from typing import Any, Optional
-from threading import Lock
+from collections import OrderedDict
+from threading import Event, Lock, Thread
+from typing import Any, Dict, Optional
+
+
+# 默认容量配置
+DEFAULT_MAX_ENTRIES = 2048
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024  # 256MB
+DEFAULT_TTL = 3600  # 未指定 TTL 的条目由后台清理的默认存活时间（秒）
+DEFAULT_SWEEP_INTERVAL = 60  # 后台清理间隔（秒）
+NO_EXPIRY = float("inf")  # 永不过期，只会被 LRU 淘汰
+
+# 命名空间级别的容量限制（未列出的命名空间只受全局上限约束）
+DEFAULT_NAMESPACE_LIMITS = {
+    # 整天解析结果体积大，限制数量和总字节
+    "read_all_titles": {"max_entries": 64, "max_bytes": 160 * 1024 * 1024},
+    "search": {"max_entries": 256, "max_bytes": 32 * 1024 * 1024},
+    "latest_news": {"max_entries": 128, "max_bytes": 16 * 1024 * 1024},
+    "news_by_date": {"max_entries": 128, "max_bytes": 32 * 1024 * 1024},
+    "trending_topics": {"max_entries": 128, "max_bytes": 8 * 1024 * 1024},
+}
+
+
+def estimate_size(value: Any, max_objects: int = 200000) -> int:
+    """
+    估算对象占用的内存字节数
+
+    递归累加容器及其元素的 sys.getsizeof，同一对象只计算一次。
+    遍历对象数超过 max_objects 时按已遍历部分的平均值外推。
+
+    Args:
+        value: 待估算对象
+        max_objects: 最多遍历的对象数
+
+    Returns:
+        近似字节数
+    """
+    seen = set()
+    stack = [value]
+    total = 0
+    visited = 0
+    pending_estimate = 0
+
+    while stack:
+        obj = stack.pop()
+        obj_id = id(obj)
+        if obj_id in seen:
+            continue
+        seen.add(obj_id)
+
+        if visited >= max_objects:
+            pending_estimate += 1
+            continue
+
+        visited += 1
+        total += sys.getsizeof(obj)
+
+        if isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            stack.extend(obj)
+
+    if pending_estimate and visited:
+        total += int(total / visited * pending_estimate)
+    return total
+
+
+class _CacheEntry:
+    """缓存条目"""
+
+    __slots__ = ("value", "timestamp", "size", "ttl", "namespace")
+
+    def __init__(self, value: Any, size: int, ttl: Optional[int], namespace: str):
+        self.value = value
+        self.timestamp = time.time()
+        self.size = size
+        self.ttl = ttl
+        self.namespace = namespace
 
 
 class CacheService:
     """缓存服务类"""
 
-    def __init__(self):
-        """初始化缓存服务"""
-        self._cache = {}
-        self._timestamps = {}
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        namespace_limits: Optional[Dict[str, Dict[str, int]]] = None,
+        default_ttl: int = DEFAULT_TTL,
+        sweep_interval: Optional[int] = DEFAULT_SWEEP_INTERVAL,
+    ):
+        """
+        初始化缓存服务
+
+        Args:
+            max_entries: 全局最大条目数
+            max_bytes: 全局最大字节数（近似）
+            namespace_limits: 命名空间容量限制 {namespace: {"max_entries": n, "max_bytes": n}}
+            default_ttl: set 时未指定 ttl 的条目，后台清理使用的存活时间（秒）
+            sweep_interval: 后台清理间隔（秒），None 表示不启动后台清理线程
+        """
+        self._cache: "OrderedDict[str, _CacheEntry]" = OrderedDict()
         self._lock = Lock()
 
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.namespace_limits = (
+            namespace_limits if namespace_limits is not None
+            else dict(DEFAULT_NAMESPACE_LIMITS)
+        )
+        self.default_ttl = default_ttl
+        self.sweep_interval = sweep_interval
+
+        self._total_bytes = 0
+        self._namespace_entries: Dict[str, int] = {}
+        self._namespace_bytes: Dict[str, int] = {}
+
+        # 统计计数
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+        self._rejections = 0
+        self._namespace_hits: Dict[str, int] = {}
+        self._namespace_misses: Dict[str, int] = {}
+        self._namespace_evictions: Dict[str, int] = {}
+        self._namespace_expirations: Dict[str, int] = {}
+
+        self._sweeper: Optional[Thread] = None
+        self._stop_event = Event()
+
+    @staticmethod
+    def _namespace_of(key: str) -> str:
+        """缓存键的命名空间（第一个冒号之前的部分）"""
+        return key.split(":", 1)[0]
+
+    # --- 内部方法（调用方需持有锁） ---
+    def _remove(self, key: str) -> Optional[_CacheEntry]:
+        entry = self._cache.pop(key, None)
+        if entry is not None:
+            ns = entry.namespace
+            self._total_bytes -= entry.size
+            self._namespace_entries[ns] -= 1
+            self._namespace_bytes[ns] -= entry.size
+        return entry
+
+    def _is_expired(self, entry: _CacheEntry, now: float, ttl: Optional[int] = None) -> bool:
+        effective_ttl = ttl if ttl is not None else (entry.ttl or self.default_ttl)
+        return now - entry.timestamp >= effective_ttl
+
+    def _evict_namespace(self, namespace: str) -> None:
+        """命名空间超限时，按 LRU 顺序淘汰该命名空间内的条目"""
+        limits = self.namespace_limits.get(namespace)
+        if not limits:
+            return
+        max_entries = limits.get("max_entries")
+        max_bytes = limits.get("max_bytes")
+
+        for key in list(self._cache.keys()):
+            over_entries = max_entries is not None and self._namespace_entries.get(namespace, 0) > max_entries
+            over_bytes = max_bytes is not None and self._namespace_bytes.get(namespace, 0) > max_bytes
+            if not over_entries and not over_bytes:
+                break
+            if self._cache[key].namespace == namespace:
+                self._remove(key)
+                self._count_eviction(namespace)
+
+    def _evict_global(self) -> None:
+        """全局超限时，按 LRU 顺序淘汰"""
+        while self._cache and (
+            len(self._cache) > self.max_entries or self._total_bytes > self.max_bytes
+        ):
+            oldest_key = next(iter(self._cache))
+            entry = self._remove(oldest_key)
+            self._count_eviction(entry.namespace)
+
+    def _count_eviction(self, namespace: str) -> None:
+        self._evictions += 1
+        self._namespace_evictions[namespace] = self._namespace_evictions.get(namespace, 0) + 1
+
+    def _count_expiration(self, namespace: str) -> None:
+        self._expirations += 1
+        self._namespace_expirations[namespace] = self._namespace_expirations.get(namespace, 0) + 1
+
+    # --- 公共接口 ---
     def get(self, key: str, ttl: int = 900) -> Optional[Any]:
         """
         获取缓存数据
@@ -29,28 +208,55 @@ class CacheService:
         Returns:
             缓存的值，如果不存在或已过期则返回None
         """
+        namespace = self._namespace_of(key)
         with self._lock:
-            if key in self._cache:
+            entry = self._cache.get(key)
+            if entry is not None:
                 # 检查是否过期
-                if time.time() - self._timestamps[key] < ttl:
-                    return self._cache[key]
+                if not self._is_expired(entry, time.time(), ttl):
+                    self._cache.move_to_end(key)
+                    self._hits += 1
+                    self._namespace_hits[namespace] = self._namespace_hits.get(namespace, 0) + 1
+                    return entry.value
                 else:
                     # 已过期，删除缓存
-                    del self._cache[key]
-                    del self._timestamps[key]
+                    self._remove(key)
+                    self._count_expiration(namespace)
+            self._misses += 1
+            self._namespace_misses[namespace] = self._namespace_misses.get(namespace, 0) + 1
         return None
 
-    def set(self, key: str, value: Any) -> None:
+    def set(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
         """
         设置缓存数据
 
         Args:
             key: 缓存键
             value: 缓存值
+            ttl: 条目存活时间（秒），供后台清理使用；None 表示使用 default_ttl
         """
+        namespace = self._namespace_of(key)
+        size = estimate_size(value)
+
         with self._lock:
-            self._cache[key] = value
-            self._timestamps[key] = time.time()
+            self._remove(key)
+
+            limits = self.namespace_limits.get(namespace, {})
+            max_bytes = min(self.max_bytes, limits.get("max_bytes", self.max_bytes))
+            if size > max_bytes:
+                # 单个条目超过上限，不缓存
+                self._rejections += 1
+                return
+
+            self._cache[key] = _CacheEntry(value, size, ttl, namespace)
+            self._total_bytes += size
+            self._namespace_entries[namespace] = self._namespace_entries.get(namespace, 0) + 1
+            self._namespace_bytes[namespace] = self._namespace_bytes.get(namespace, 0) + size
+
+            self._evict_namespace(namespace)
+            self._evict_global()
+
+        self._ensure_sweeper()
 
     def delete(self, key: str) -> bool:
         """
@@ -63,24 +269,38 @@ class CacheService:
             是否成功删除
         """
         with self._lock:
-            if key in self._cache:
-                del self._cache[key]
-                del self._timestamps[key]
-                return True
-        return False
+            return self._remove(key) is not None
+
+    def delete_prefix(self, prefix: str) -> int:
+        """
+        删除指定前缀的所有缓存
+
+        Args:
+            prefix: 缓存键前缀
+
+        Returns:
+            删除的条目数量
+        """
+        with self._lock:
+            keys = [key for key in self._cache if key.startswith(prefix)]
+            for key in keys:
+                self._remove(key)
+            return len(keys)
 
     def clear(self) -> None:
         """清空所有缓存"""
         with self._lock:
             self._cache.clear()
-            self._timestamps.clear()
+            self._total_bytes = 0
+            self._namespace_entries.clear()
+            self._namespace_bytes.clear()
 
-    def cleanup_expired(self, ttl: int = 900) -> int:
+    def cleanup_expired(self, ttl: Optional[int] = None) -> int:
         """
         清理过期缓存
 
         Args:
-            ttl: 存活时间（秒）
+            ttl: 存活时间（秒），None 表示按各条目自身的 TTL 判断
 
         Returns:
             清理的条目数量
@@ -88,16 +308,43 @@ class CacheService:
         with self._lock:
             current_time = time.time()
             expired_keys = [
-                key for key, timestamp in self._timestamps.items()
-                if current_time - timestamp >= ttl
+                key for key, entry in self._cache.items()
+                if self._is_expired(entry, current_time, ttl)
             ]
 
             for key in expired_keys:
-                del self._cache[key]
-                del self._timestamps[key]
+                self._count_expiration(self._remove(key).namespace)
 
             return len(expired_keys)
 
+    # --- 后台清理 ---
+    def _ensure_sweeper(self) -> None:
+        """首次写入时启动后台清理线程"""
+        if self.sweep_interval is None or (self._sweeper and self._sweeper.is_alive()):
+            return
+        with self._lock:
+            if self._sweeper and self._sweeper.is_alive():
+                return
+            self._stop_event.clear()
+            self._sweeper = Thread(
+                target=self._sweep_loop, name="cache-sweeper", daemon=True
+            )
+            self._sweeper.start()
+
+    def _sweep_loop(self) -> None:
+        while not self._stop_event.wait(self.sweep_interval):
+            try:
+                self.cleanup_expired()
+            except Exception as e:
+                print(f"缓存清理失败: {e}")
+
+    def stop_sweeper(self) -> None:
+        """停止后台清理线程"""
+        self._stop_event.set()
+        if self._sweeper:
+            self._sweeper.join(timeout=1)
+            self._sweeper = None
+
     def get_stats(self) -> dict:
         """
         获取缓存统计信息
@@ -106,16 +353,44 @@ class CacheService:
             统计信息字典
         """
         with self._lock:
+            now = time.time()
+            timestamps = [entry.timestamp for entry in self._cache.values()]
+            lookups = self._hits + self._misses
+
+            namespaces = {}
+            all_namespaces = (
+                set(self._namespace_entries) | set(self._namespace_hits) | set(self._namespace_misses)
+                | set(self._namespace_evictions) | set(self._namespace_expirations)
+            )
+            for ns in sorted(all_namespaces):
+                limits = self.namespace_limits.get(ns, {})
+                ns_hits = self._namespace_hits.get(ns, 0)
+                ns_misses = self._namespace_misses.get(ns, 0)
+                namespaces[ns] = {
+                    "entries": self._namespace_entries.get(ns, 0),
+                    "bytes": self._namespace_bytes.get(ns, 0),
+                    "max_entries": limits.get("max_entries"),
+                    "max_bytes": limits.get("max_bytes"),
+                    "hits": ns_hits,
+                    "misses": ns_misses,
+                    "evictions": self._namespace_evictions.get(ns, 0),
+                    "expirations": self._namespace_expirations.get(ns, 0),
+                }
+
             return {
                 "total_entries": len(self._cache),
-                "oldest_entry_age": (
-                    time.time() - min(self._timestamps.values())
-                    if self._timestamps else 0
-                ),
-                "newest_entry_age": (
-                    time.time() - max(self._timestamps.values())
-                    if self._timestamps else 0
-                )
+                "total_bytes": self._total_bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": round(self._hits / lookups, 4) if lookups else 0,
+                "evictions": self._evictions,
+                "expirations": self._expirations,
+                "rejections": self._rejections,
+                "oldest_entry_age": now - min(timestamps) if timestamps else 0,
+                "newest_entry_age": now - max(timestamps) if timestamps else 0,
+                "namespaces": namespaces,
             }
 
 
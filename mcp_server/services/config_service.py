@@ -0,0 +1,278 @@
+"""
+配置服务
+
+main.py 和 MCP Server 共用的配置读取入口。原先各处自行打开并解析 YAML
+（平台校验在每次工具调用时都要解析一次 config.yaml），这里统一为：
+
+- 按文件路径缓存解析结果，用 (mtime_ns, size) 判断文件是否变化，
+  未变化时只需要一次 stat，修改后下一次读取自动重新解析
+- 解析结果是不可变的配置快照：字典和列表被冻结，调用方不能修改共享的配置，
+  但仍是 dict / list 的子类，可以直接序列化为 JSON
+- 常用字段（平台列表、爬虫配置）提供类型化的访问方式
+
+本模块只依赖标准库和 PyYAML，main.py 可以直接导入。
+"""
+
+from dataclasses import dataclass, field
+from pathlib import Path
+from threading import Lock
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import yaml
+
+from ..utils.errors import FileParseError
+
+
+def _readonly(self, *args, **kwargs):
+    raise TypeError(f"{type(self).__name__} 是只读的配置快照，请先调用 thaw() 复制")
+
+
+class FrozenDict(dict):
+    """只读字典（配置快照中的所有字典）"""
+
+    __slots__ = ()
+    __setitem__ = __delitem__ = __ior__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+
+    def __reduce_ex__(self, protocol):
+        return (type(self), (dict(self),))
+
+
+class FrozenList(list):
+    """只读列表（配置快照中的所有列表）"""
+
+    __slots__ = ()
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _readonly
+    append = extend = insert = pop = remove = clear = sort = reverse = _readonly
+
+    def __reduce_ex__(self, protocol):
+        return (type(self), (list(self),))
+
+
+def freeze(value: Any) -> Any:
+    """递归把字典和列表转换为只读版本"""
+    if isinstance(value, dict):
+        return FrozenDict((key, freeze(item)) for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return FrozenList(freeze(item) for item in value)
+    return value
+
+
+def thaw(value: Any) -> Any:
+    """递归复制为普通的可修改字典和列表"""
+    if isinstance(value, dict):
+        return {key: thaw(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [thaw(item) for item in value]
+    return value
+
+
+@dataclass(frozen=True)
+class PlatformConfig:
+    """平台配置"""
+
+    id: str
+    name: str
+
+
+@dataclass(frozen=True)
+class CrawlerConfig:
+    """爬虫配置"""
+
+    enable_crawler: bool = True
+    request_interval: int = 100
+    use_proxy: bool = False
+    default_proxy: Optional[str] = None
+
+    @property
+    def proxy_url(self) -> Optional[str]:
+        """启用代理时的代理地址"""
+        return self.default_proxy if self.use_proxy else None
+
+
+@dataclass(frozen=True)
+class ConfigSnapshot:
+    """一次解析得到的不可变配置快照"""
+
+    path: str
+    data: FrozenDict
+    mtime_ns: int
+    size: int
+    _typed: Dict[str, Any] = field(default_factory=dict, repr=False, compare=False)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self.data.get(key, default)
+
+    def section(self, key: str) -> FrozenDict:
+        """获取一个配置节，缺失或不是字典时返回空字典"""
+        value = self.data.get(key)
+        return value if isinstance(value, dict) else FrozenDict()
+
+    @property
+    def platforms(self) -> Tuple[PlatformConfig, ...]:
+        """platforms 配置（忽略没有 id 的条目）"""
+        platforms = self._typed.get("platforms")
+        if platforms is None:
+            platforms = tuple(
+                PlatformConfig(id=p["id"], name=p.get("name") or p["id"])
+                for p in (self.data.get("platforms") or [])
+                if isinstance(p, dict) and "id" in p
+            )
+            self._typed["platforms"] = platforms
+        return platforms
+
+    @property
+    def platform_ids(self) -> List[str]:
+        return [platform.id for platform in self.platforms]
+
+    @property
+    def crawler(self) -> CrawlerConfig:
+        """crawler 配置（缺失的字段使用默认值）"""
+        crawler = self._typed.get("crawler")
+        if crawler is None:
+            section = self.section("crawler")
+            defaults = CrawlerConfig()
+            crawler = CrawlerConfig(
+                enable_crawler=section.get("enable_crawler", defaults.enable_crawler),
+                request_interval=section.get("request_interval", defaults.request_interval),
+                use_proxy=section.get("use_proxy", defaults.use_proxy),
+                default_proxy=section.get("default_proxy", defaults.default_proxy),
+            )
+            self._typed["crawler"] = crawler
+        return crawler
+
+    @property
+    def version(self) -> Tuple[int, int]:
+        """文件版本标识，文件变化后不同"""
+        return (self.mtime_ns, self.size)
+
+    def to_dict(self) -> Dict:
+        """复制为普通的可修改字典"""
+        return thaw(self.data)
+
+
+class ConfigService:
+    """配置服务类"""
+
+    def __init__(self, project_root: str = None):
+        """
+        初始化配置服务
+
+        Args:
+            project_root: 项目根目录
+        """
+        if project_root is None:
+            self.project_root = Path(__file__).parent.parent.parent
+        else:
+            self.project_root = Path(project_root)
+        self.config_dir = self.project_root / "config"
+
+        self._snapshots: Dict[str, ConfigSnapshot] = {}
+        self._lock = Lock()
+
+        # 统计计数
+        self._hits = 0
+        self._loads = 0
+        self._reloads = 0
+        self._errors = 0
+
+    def load(self, config_path: Union[str, Path]) -> ConfigSnapshot:
+        """
+        读取配置文件（文件未变化时返回缓存的快照）
+
+        Args:
+            config_path: 配置文件路径，相对路径按当前工作目录解析
+
+        Returns:
+            配置快照
+
+        Raises:
+            FileParseError: 配置文件不存在或解析失败
+        """
+        path = Path(config_path)
+        key = str(path.absolute())
+        try:
+            stat = path.stat()
+        except OSError:
+            with self._lock:
+                self._errors += 1
+            raise FileParseError(str(config_path), "配置文件不存在")
+
+        with self._lock:
+            cached = self._snapshots.get(key)
+            if cached is not None and cached.version == (stat.st_mtime_ns, stat.st_size):
+                self._hits += 1
+                return cached
+
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    data = yaml.safe_load(f)
+            except Exception as e:
+                self._errors += 1
+                raise FileParseError(str(config_path), str(e))
+
+            if data is None:
+                data = {}
+            if not isinstance(data, dict):
+                self._errors += 1
+                raise FileParseError(str(config_path), "配置文件顶层必须是字典")
+
+            snapshot = ConfigSnapshot(
+                path=key,
+                data=freeze(data),
+                mtime_ns=stat.st_mtime_ns,
+                size=stat.st_size,
+            )
+            self._snapshots[key] = snapshot
+            self._loads += 1
+            if cached is not None:
+                self._reloads += 1
+            return snapshot
+
+    def get_config(self) -> ConfigSnapshot:
+        """读取 config/config.yaml"""
+        return self.load(self.config_dir / "config.yaml")
+
+    def get_tracking_config(self) -> ConfigSnapshot:
+        """读取 config/commercial_space_tracking.yaml"""
+        return self.load(self.config_dir / "commercial_space_tracking.yaml")
+
+    def get_stats(self) -> Dict:
+        """
+        获取配置服务统计信息
+
+        Returns:
+            统计信息字典
+        """
+        with self._lock:
+            return {
+                "files": sorted(self._snapshots),
+                "hits": self._hits,
+                "loads": self._loads,
+                "reloads": self._reloads,
+                "errors": self._errors,
+            }
+
+
+# 全局配置服务实例（按项目根目录区分）
+_global_config_services: Dict[str, ConfigService] = {}
+_global_config_services_lock = Lock()
+
+
+def get_config_service(project_root: str = None) -> ConfigService:
+    """
+    获取全局配置服务实例
+
+    Args:
+        project_root: 项目根目录
+
+    Returns:
+        对应项目根目录的配置服务实例
+    """
+    key = str(ConfigService(project_root).project_root)
+    with _global_config_services_lock:
+        service = _global_config_services.get(key)
+        if service is None:
+            service = ConfigService(project_root)
+            _global_config_services[key] = service
+        return service
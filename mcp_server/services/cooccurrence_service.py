@@ -0,0 +1,161 @@
+"""
+关键词共现引擎
+
+为关键词分配整数 ID，并为每个关键词维护标题 ID 倒排表（升序）：
+
+- 共现计数一次遍历完成：每条标题只对去重后的关键词 ID 两两计数，
+  文档频次低于 min_frequency 的关键词不可能组成达标的词对，提前剔除
+- 词对样本标题通过两个倒排表求交集得到，不再重新分词
+- 可以逐天追加标题，支持多天窗口
+
+共现次数定义为同时包含两个关键词的标题数（同一标题出现在不同平台、不同日期时分别计数）。
+"""
+
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from ..utils.keywords import extract_title_keywords
+
+
+class CooccurrenceEngine:
+    """稀疏关键词共现引擎"""
+
+    def __init__(self):
+        self.keywords: List[str] = []
+        self.keyword_ids: Dict[str, int] = {}
+        self.titles: List[str] = []
+        self.postings: List[List[int]] = []  # 关键词 ID -> 标题 ID 列表（升序）
+        self._title_keywords: List[Tuple[int, ...]] = []  # 标题 ID -> 去重后的关键词 ID
+
+    def add_title(self, title: str, keywords: Optional[Iterable[str]] = None) -> int:
+        """
+        追加一条标题
+
+        Args:
+            title: 标题文本
+            keywords: 关键词列表，None 时使用共享分词器提取
+
+        Returns:
+            标题 ID
+        """
+        if keywords is None:
+            keywords = extract_title_keywords(title)
+
+        title_id = len(self.titles)
+        self.titles.append(title)
+
+        keyword_ids = []
+        seen = set()
+        for kw in keywords:
+            if kw in seen:
+                continue
+            seen.add(kw)
+            kw_id = self.keyword_ids.get(kw)
+            if kw_id is None:
+                kw_id = len(self.keywords)
+                self.keyword_ids[kw] = kw_id
+                self.keywords.append(kw)
+                self.postings.append([])
+            self.postings[kw_id].append(title_id)
+            keyword_ids.append(kw_id)
+
+        self._title_keywords.append(tuple(keyword_ids))
+        return title_id
+
+    def add_titles(self, all_titles: Dict) -> None:
+        """
+        追加一天的标题（read_all_titles_for_date 返回的 {platform_id: {title: info}} 结构）
+
+        Args:
+            all_titles: 按平台分组的标题
+        """
+        for titles in all_titles.values():
+            for title in titles.keys():
+                self.add_title(title)
+
+    def keyword_frequency(self, keyword: str) -> int:
+        """包含该关键词的标题数"""
+        kw_id = self.keyword_ids.get(keyword)
+        return len(self.postings[kw_id]) if kw_id is not None else 0
+
+    def top_pairs(self, min_frequency: int = 1, top_n: int = 20) -> List[Tuple[str, str, int]]:
+        """
+        获取共现次数最高的关键词对
+
+        Args:
+            min_frequency: 最小共现次数
+            top_n: 返回数量
+
+        Returns:
+            [(关键词1, 关键词2, 共现次数)]，关键词对内按字符串排序；
+            次数相同时按词对首次出现的先后排序
+        """
+        keyword_count = len(self.keywords)
+        active = [len(posting) >= min_frequency for posting in self.postings]
+
+        pair_counts = Counter()
+        for keyword_ids in self._title_keywords:
+            ids = [kw_id for kw_id in keyword_ids if active[kw_id]]
+            if len(ids) < 2:
+                continue
+            ids.sort()
+            for i, first in enumerate(ids):
+                base = first * keyword_count
+                for second in ids[i + 1:]:
+                    pair_counts[base + second] += 1
+
+        # sorted 是稳定排序，同频次的词对保持首次出现的顺序
+        ranked = sorted(
+            ((key, count) for key, count in pair_counts.items() if count >= min_frequency),
+            key=lambda item: item[1],
+            reverse=True
+        )[:top_n]
+
+        pairs = []
+        for key, count in ranked:
+            kw1, kw2 = sorted((self.keywords[key // keyword_count], self.keywords[key % keyword_count]))
+            pairs.append((kw1, kw2, count))
+        return pairs
+
+    def sample_titles(self, keyword1: str, keyword2: str, limit: int = 3) -> List[str]:
+        """
+        获取同时包含两个关键词的标题（倒排表求交集）
+
+        Args:
+            keyword1: 关键词1
+            keyword2: 关键词2
+            limit: 最多返回数量
+
+        Returns:
+            标题列表（按追加顺序）
+        """
+        id1 = self.keyword_ids.get(keyword1)
+        id2 = self.keyword_ids.get(keyword2)
+        if id1 is None or id2 is None:
+            return []
+
+        shorter, longer = self.postings[id1], self.postings[id2]
+        if len(shorter) > len(longer):
+            shorter, longer = longer, shorter
+        longer_set = set(longer)
+
+        samples = []
+        for title_id in shorter:
+            if title_id in longer_set:
+                samples.append(self.titles[title_id])
+                if len(samples) >= limit:
+                    break
+        return samples
+
+    def get_stats(self) -> Dict:
+        """
+        获取引擎统计信息
+
+        Returns:
+            统计信息字典
+        """
+        return {
+            "titles": len(self.titles),
+            "keywords": len(self.keywords),
+            "postings": sum(len(posting) for posting in self.postings),
+        }
@@ -0,0 +1,601 @@
+"""
+爬取任务服务
+
+trigger_crawl 原先在一次工具调用中同步爬完所有平台，客户端要等最后一个平台结束才能拿到结果。
+这里改为后台任务：
+
+- start() 立即返回任务，后台线程逐个平台爬取（复用 main.py 的 DataFetcher）
+- 每个平台结束后即可通过 get() 查看进度，并按 since 偏移增量获取新完成平台的新闻
+- cancel() 在平台之间生效（正在进行的单个请求不会被中断），已完成平台的结果保留
+- 同一时间只运行一个任务，其余任务排队（pending），避免对数据源并发请求
+- HTTP 多进程模式下任务状态写入 output/.crawl_jobs/，任意服务进程都能查询和取消
+"""
+
+import json
+import os
+import random
+import sys
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from threading import Event, Lock
+from typing import Dict, List, Optional, Tuple
+
+from ..utils.errors import CrawlTaskError, DataNotFoundError
+from ..utils.validators import validate_platforms
+from .config_service import ConfigSnapshot, get_config_service
+from .parser_service import ParserService
+from .shared_store import get_shared_store_role
+
+
+JOB_STATES = ("pending", "running", "completed", "failed", "cancelled")
+FINISHED_STATES = ("completed", "failed", "cancelled")
+MAX_FINISHED_JOBS = 20  # 内存中保留的已结束任务数
+JOBS_DIR_NAME = ".crawl_jobs"  # 多进程模式下的任务状态目录（位于 output 目录）
+
+_crawler_module = None
+_crawler_module_lock = Lock()
+
+
+def load_crawler_module(project_root: Path):
+    """
+    导入 main.py（首次调用时导入，之后复用）
+
+    导入 main.py 不会读取配置；爬取时显式传入请求间隔和代理，不会访问 main.CONFIG。
+    仍把 CONFIG_PATH 默认指向项目的 config/config.yaml，万一用到配置时
+    不依赖服务器进程的当前目录。
+
+    Args:
+        project_root: 项目根目录
+
+    Returns:
+        main 模块
+    """
+    global _crawler_module
+    with _crawler_module_lock:
+        if _crawler_module is None:
+            os.environ.setdefault("CONFIG_PATH", str(project_root / "config" / "config.yaml"))
+            if str(project_root) not in sys.path:
+                sys.path.insert(0, str(project_root))
+            import main
+            _crawler_module = main
+        return _crawler_module
+
+
+def _format_timestamp(timestamp: Optional[float]) -> Optional[str]:
+    if timestamp is None:
+        return None
+    return datetime.fromtimestamp(timestamp).strftime("%Y-%m-%d %H:%M:%S")
+
+
+class CrawlJob:
+    """单个爬取任务"""
+
+    def __init__(
+        self,
+        job_id: str,
+        targets: List[Tuple[str, str]],
+        save_to_local: bool,
+        include_url: bool,
+        request_interval: int,
+        proxy_url: Optional[str] = None
+    ):
+        self.job_id = job_id
+        self.targets = targets  # [(平台ID, 平台名称)]
+        self.save_to_local = save_to_local
+        self.include_url = include_url
+        self.request_interval = request_interval
+        self.proxy_url = proxy_url
+
+        self.state = "pending"
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.current: Optional[str] = None
+        self.results: Dict[str, Dict] = {}
+        self.failed_ids: List[str] = []
+        self.completed: List[str] = []  # 按完成顺序的平台 ID（成功或失败），since 偏移基于此
+        self.crawl_time: Optional[str] = None
+        self.saved_files: Optional[Dict[str, str]] = None
+        self.save_error: Optional[str] = None
+        self.error: Optional[Dict] = None
+        self.cancel_event = Event()
+
+    @property
+    def id_to_name(self) -> Dict[str, str]:
+        return {platform_id: name for platform_id, name in self.targets}
+
+    def _platform_status(self, platform_id: str) -> str:
+        if platform_id in self.results:
+            return "success"
+        if platform_id in self.failed_ids:
+            return "failed"
+        if platform_id == self.current:
+            return "running"
+        if self.state in FINISHED_STATES:
+            return "cancelled"
+        return "pending"
+
+    def _news_items(self, platform_ids: List[str]) -> List[Dict]:
+        id_to_name = self.id_to_name
+        news_data = []
+        for platform_id in platform_ids:
+            for title, info in self.results.get(platform_id, {}).items():
+                news_item = {
+                    "platform_id": platform_id,
+                    "platform_name": id_to_name.get(platform_id, platform_id),
+                    "title": title,
+                    "ranks": info["ranks"]
+                }
+                if self.include_url:
+                    news_item["url"] = info.get("url", "")
+                    news_item["mobile_url"] = info.get("mobileUrl", "")
+                news_data.append(news_item)
+        return news_data
+
+    def to_dict(self, since: Optional[int] = None) -> Dict:
+        """
+        任务状态
+
+        Args:
+            since: 返回第 since 个之后完成的平台的新闻（completed 顺序），None 表示不返回新闻
+
+        Returns:
+            状态字典
+        """
+        total = len(self.targets)
+        result = {
+            "job_id": self.job_id,
+            "status": self.state,
+            "created_at": _format_timestamp(self.created_at),
+            "started_at": _format_timestamp(self.started_at),
+            "finished_at": _format_timestamp(self.finished_at),
+            "progress": {
+                "completed": len(self.completed),
+                "total": total,
+                "percent": round(len(self.completed) * 100 / total, 1) if total else 100.0,
+            },
+            "current_platform": self.current,
+            "platforms": [
+                {
+                    "id": platform_id,
+                    "name": name,
+                    "status": self._platform_status(platform_id),
+                    "news_count": len(self.results.get(platform_id, {})),
+                }
+                for platform_id, name in self.targets
+            ],
+            "failed_platforms": list(self.failed_ids),
+            "total_news": sum(len(titles) for titles in self.results.values()),
+            "save_to_local": self.save_to_local,
+        }
+        if since is not None:
+            since = max(0, since)
+            result["since"] = since
+            result["next_since"] = len(self.completed)
+            result["data"] = self._news_items(self.completed[since:])
+        if self.crawl_time:
+            result["crawl_time"] = self.crawl_time
+        if self.saved_files:
+            result["saved_files"] = dict(self.saved_files)
+        if self.save_error:
+            result["save_error"] = self.save_error
+        if self.error:
+            result["failure"] = dict(self.error)
+        return result
+
+    def to_state(self) -> Dict:
+        """导出完整状态（多进程模式下写入任务状态文件）"""
+        return {
+            "job_id": self.job_id,
+            "targets": [list(target) for target in self.targets],
+            "save_to_local": self.save_to_local,
+            "include_url": self.include_url,
+            "request_interval": self.request_interval,
+            "state": self.state,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "current": self.current,
+            "results": self.results,
+            "failed_ids": self.failed_ids,
+            "completed": self.completed,
+            "crawl_time": self.crawl_time,
+            "saved_files": self.saved_files,
+            "save_error": self.save_error,
+            "error": self.error,
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict) -> "CrawlJob":
+        job = cls(
+            state["job_id"],
+            [tuple(target) for target in state["targets"]],
+            state["save_to_local"],
+            state["include_url"],
+            state["request_interval"]
+        )
+        for key in (
+            "state", "created_at", "started_at", "finished_at", "current", "results",
+            "failed_ids", "completed", "crawl_time", "saved_files", "save_error", "error"
+        ):
+            setattr(job, key, state[key])
+        return job
+
+
+class CrawlJobService:
+    """爬取任务服务类"""
+
+    def __init__(self, project_root: str = None):
+        """
+        初始化爬取任务服务
+
+        Args:
+            project_root: 项目根目录
+        """
+        self.parser = ParserService(project_root)
+        self.project_root = self.parser.project_root
+        self.jobs_dir = self.project_root / "output" / JOBS_DIR_NAME
+
+        self._lock = Lock()
+        self._jobs: "OrderedDict[str, CrawlJob]" = OrderedDict()
+        # 单线程：同一时间只运行一个任务，其余排队
+        self._runner = ThreadPoolExecutor(max_workers=1, thread_name_prefix="crawl-job")
+
+    @property
+    def _persist_enabled(self) -> bool:
+        """多进程模式下服务进程之间通过任务状态文件共享任务"""
+        return get_shared_store_role() == "reader"
+
+    def _load_crawl_config(self) -> ConfigSnapshot:
+        """读取平台列表、请求间隔和代理配置"""
+        config = get_config_service(self.project_root).get_config()
+        if not config.platforms:
+            raise CrawlTaskError(
+                "配置文件中没有平台配置",
+                suggestion="请检查 config/config.yaml 中的 platforms 配置"
+            )
+        return config
+
+    def start(
+        self,
+        platforms: Optional[List[str]] = None,
+        save_to_local: bool = False,
+        include_url: bool = False
+    ) -> CrawlJob:
+        """
+        创建爬取任务并放入后台队列
+
+        Args:
+            platforms: 平台ID列表，为空则爬取所有配置的平台
+            save_to_local: 完成后是否保存到 output 目录
+            include_url: 返回的新闻是否包含 URL
+
+        Returns:
+            新建的任务
+
+        Raises:
+            InvalidParameterError: 平台不支持
+            CrawlTaskError: 平台配置缺失或指定的平台不存在
+        """
+        platforms = validate_platforms(platforms)
+        crawl_config = self._load_crawl_config()
+        all_platforms = crawl_config.platforms
+
+        if platforms:
+            target_platforms = [p for p in all_platforms if p.id in platforms]
+            if not target_platforms:
+                raise CrawlTaskError(
+                    f"指定的平台不存在: {platforms}",
+                    suggestion=f"可用平台: {crawl_config.platform_ids}"
+                )
+        else:
+            target_platforms = all_platforms
+
+        job = CrawlJob(
+            job_id=f"crawl_{datetime.now().strftime('%Y%m%d%H%M%S')}_{uuid.uuid4().hex[:6]}",
+            targets=[(p.id, p.name) for p in target_platforms],
+            save_to_local=save_to_local,
+            include_url=include_url,
+            request_interval=crawl_config.crawler.request_interval,
+            proxy_url=crawl_config.crawler.proxy_url
+        )
+        with self._lock:
+            self._jobs[job.job_id] = job
+            self._prune()
+        self._persist(job)
+        self._runner.submit(self._run, job)
+        print(f"创建爬取任务 {job.job_id}，平台: {[name for _, name in job.targets]}")
+        return job
+
+    def get(self, job_id: str) -> CrawlJob:
+        """
+        获取任务
+
+        Raises:
+            DataNotFoundError: 任务不存在
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if job is not None:
+            return job
+
+        if self._persist_enabled:
+            try:
+                with open(self.jobs_dir / f"{job_id}.json", "r", encoding="utf-8") as f:
+                    return CrawlJob.from_state(json.load(f))
+            except (OSError, ValueError, KeyError):
+                pass
+
+        raise DataNotFoundError(
+            f"爬取任务不存在: {job_id}",
+            suggestion=f"请检查任务ID，已结束的任务只保留最近 {MAX_FINISHED_JOBS} 个"
+        )
+
+    def describe(self, job: CrawlJob, since: Optional[int] = None) -> Dict:
+        """
+        获取任务状态（与后台线程的更新互斥）
+
+        Args:
+            job: 任务
+            since: 返回第 since 个之后完成的平台的新闻，None 表示不返回新闻
+
+        Returns:
+            状态字典
+        """
+        with self._lock:
+            return job.to_dict(since)
+
+    def list_jobs(self) -> List[Dict]:
+        """列出当前进程中的任务状态（最新的在前，不含新闻）"""
+        with self._lock:
+            return [job.to_dict() for job in reversed(self._jobs.values())]
+
+    def cancel(self, job_id: str) -> CrawlJob:
+        """
+        取消任务（排队中的任务直接取消，运行中的任务在当前平台结束后停止）
+
+        Raises:
+            DataNotFoundError: 任务不存在
+        """
+        job = self.get(job_id)
+        if job.state in FINISHED_STATES:
+            return job
+
+        with self._lock:
+            local = job_id in self._jobs
+        if local:
+            job.cancel_event.set()
+        else:
+            # 任务在其他服务进程中运行，通过标记文件通知
+            try:
+                self.jobs_dir.mkdir(parents=True, exist_ok=True)
+                (self.jobs_dir / f"{job_id}.cancel").touch()
+            except OSError as e:
+                raise CrawlTaskError(f"取消任务失败: {e}")
+        return job
+
+    def _cancel_requested(self, job: CrawlJob) -> bool:
+        if not job.cancel_event.is_set() and self._persist_enabled:
+            if (self.jobs_dir / f"{job.job_id}.cancel").exists():
+                job.cancel_event.set()
+        return job.cancel_event.is_set()
+
+    def _prune(self) -> None:
+        """只保留最近 MAX_FINISHED_JOBS 个已结束的任务（调用方需持有锁）"""
+        finished = [job_id for job_id, job in self._jobs.items() if job.state in FINISHED_STATES]
+        for job_id in finished[:max(0, len(finished) - MAX_FINISHED_JOBS)]:
+            del self._jobs[job_id]
+            if self._persist_enabled:
+                for suffix in (".json", ".cancel"):
+                    (self.jobs_dir / f"{job_id}{suffix}").unlink(missing_ok=True)
+
+    def _persist(self, job: CrawlJob) -> None:
+        """多进程模式下原子写入任务状态文件"""
+        if not self._persist_enabled:
+            return
+        path = self.jobs_dir / f"{job.job_id}.json"
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        try:
+            self.jobs_dir.mkdir(parents=True, exist_ok=True)
+            with self._lock:
+                state = job.to_state()
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(state, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            print(f"Warning: 写入爬取任务状态 {path} 失败: {e}")
+
+    def _run(self, job: CrawlJob) -> None:
+        """在后台线程中执行任务"""
+        if self._cancel_requested(job):
+            self._finish(job, "cancelled")
+            return
+
+        with self._lock:
+            job.state = "running"
+            job.started_at = time.time()
+        self._persist(job)
+
+        try:
+            crawler = load_crawler_module(self.project_root)
+            fetcher = crawler.DataFetcher(job.proxy_url)
+
+            for i, (platform_id, name) in enumerate(job.targets):
+                if self._cancel_requested(job):
+                    break
+                with self._lock:
+                    job.current = platform_id
+                # 每次只爬一个平台，完成即可被查询到
+                results, _, _ = fetcher.crawl_websites([(platform_id, name)], job.request_interval)
+                with self._lock:
+                    if platform_id in results:
+                        job.results[platform_id] = results[platform_id]
+                    else:
+                        job.failed_ids.append(platform_id)
+                    job.completed.append(platform_id)
+                    job.current = None
+                self._persist(job)
+
+                # 请求间隔（与 DataFetcher.crawl_websites 相同的随机抖动），取消时立即结束等待
+                if i < len(job.targets) - 1:
+                    actual_interval = max(50, job.request_interval + random.randint(-10, 20))
+                    if job.cancel_event.wait(actual_interval / 1000):
+                        break
+
+            job.crawl_time = crawler.get_beijing_time().strftime("%Y-%m-%d %H:%M:%S")
+            if self._cancel_requested(job):
+                self._finish(job, "cancelled")
+                return
+            if job.save_to_local:
+                self._save(job, crawler)
+            self._finish(job, "completed")
+
+        except Exception as e:
+            print(f"爬取任务 {job.job_id} 失败: {e}")
+            job.error = {"code": "CRAWL_TASK_ERROR", "message": str(e)}
+            self._finish(job, "failed")
+
+    def _finish(self, job: CrawlJob, state: str) -> None:
+        with self._lock:
+            job.state = state
+            job.current = None
+            job.finished_at = time.time()
+            self._prune()
+        self._persist(job)
+        if self._persist_enabled:
+            (self.jobs_dir / f"{job.job_id}.cancel").unlink(missing_ok=True)
+
+    def _save(self, job: CrawlJob, crawler) -> None:
+        """按 main.py 的格式保存 txt，并生成简化的 HTML 报告"""
+        try:
+            now = crawler.get_beijing_time()
+            date_folder = now.strftime("%Y年%m月%d日")
+            time_filename = now.strftime("%H时%M分")
+
+            txt_dir = self.project_root / "output" / date_folder / "txt"
+            html_dir = self.project_root / "output" / date_folder / "html"
+            crawler.ensure_directory_exists(str(txt_dir))
+            crawler.ensure_directory_exists(str(html_dir))
+
+            txt_file_path = crawler.save_titles_to_file(
+                job.results, job.id_to_name, job.failed_ids,
+                file_path=str(txt_dir / f"{time_filename}.txt")
+            )
+            html_file_path = html_dir / f"{time_filename}.html"
+            with open(html_file_path, "w", encoding="utf-8") as f:
+                f.write(_generate_simple_html(job.results, job.id_to_name, job.failed_ids, now, crawler.html_escape))
+
+            print(f"数据已保存到:")
+            print(f"  TXT: {txt_file_path}")
+            print(f"  HTML: {html_file_path}")
+            job.saved_files = {"txt": str(txt_file_path), "html": str(html_file_path)}
+        except Exception as e:
+            print(f"保存文件失败: {e}")
+            job.save_error = str(e)
+
+
+def _generate_simple_html(results: Dict, id_to_name: Dict, failed_ids: List, now, html_escape) -> str:
+    """生成简化的 HTML 报告"""
+    html = """<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>MCP 爬取结果</title>
+    <style>
+        body { font-family: Arial, sans-serif; margin: 20px; background: #f5f5f5; }
+        .container { max-width: 900px; margin: 0 auto; background: white; padding: 20px; border-radius: 8px; }
+        h1 { color: #333; border-bottom: 2px solid #4CAF50; padding-bottom: 10px; }
+        .platform { margin-bottom: 30px; }
+        .platform-name { background: #4CAF50; color: white; padding: 10px; border-radius: 5px; margin-bottom: 10px; }
+        .news-item { padding: 8px; border-bottom: 1px solid #eee; }
+        .rank { color: #666; font-weight: bold; margin-right: 10px; }
+        .title { color: #333; }
+        .link { color: #1976D2; text-decoration: none; margin-left: 10px; font-size: 0.9em; }
+        .link:hover { text-decoration: underline; }
+        .failed { background: #ffebee; padding: 10px; border-radius: 5px; margin-top: 20px; }
+        .failed h3 { color: #c62828; margin-top: 0; }
+        .timestamp { color: #666; font-size: 0.9em; text-align: right; margin-top: 20px; }
+    </style>
+</head>
+<body>
+    <div class="container">
+        <h1>MCP 爬取结果</h1>
+"""
+
+    # 添加时间戳
+    html += f'        <p class="timestamp">爬取时间: {now.strftime("%Y-%m-%d %H:%M:%S")}</p>\n\n'
+
+    # 遍历每个平台
+    for platform_id, titles_data in results.items():
+        platform_name = id_to_name.get(platform_id, platform_id)
+        html += f'        <div class="platform">\n'
+        html += f'            <div class="platform-name">{platform_name}</div>\n'
+
+        # 排序标题
+        sorted_items = []
+        for title, info in titles_data.items():
+            ranks = info.get("ranks", [])
+            url = info.get("url", "")
+            mobile_url = info.get("mobileUrl", "")
+            rank = ranks[0] if ranks else 999
+            sorted_items.append((rank, title, url, mobile_url))
+
+        sorted_items.sort(key=lambda x: x[0])
+
+        # 显示新闻
+        for rank, title, url, mobile_url in sorted_items:
+            html += f'            <div class="news-item">\n'
+            html += f'                <span class="rank">{rank}.</span>\n'
+            html += f'                <span class="title">{html_escape(title)}</span>\n'
+            if url:
+                html += f'                <a class="link" href="{html_escape(url)}" target="_blank">链接</a>\n'
+            if mobile_url and mobile_url != url:
+                html += f'                <a class="link" href="{html_escape(mobile_url)}" target="_blank">移动版</a>\n'
+            html += '            </div>\n'
+
+        html += '        </div>\n\n'
+
+    # 失败的平台
+    if failed_ids:
+        html += '        <div class="failed">\n'
+        html += '            <h3>请求失败的平台</h3>\n'
+        html += '            <ul>\n'
+        for platform_id in failed_ids:
+            html += f'                <li>{html_escape(platform_id)}</li>\n'
+        html += '            </ul>\n'
+        html += '        </div>\n'
+
+    html += """    </div>
+</body>
+</html>"""
+
+    return html
+
+
+# 全局爬取任务服务实例（按项目根目录区分）
+_global_crawl_services: Dict[str, CrawlJobService] = {}
+_global_crawl_services_lock = Lock()
+
+
+def get_crawl_service(project_root: str = None) -> CrawlJobService:
+    """
+    获取全局爬取任务服务实例
+
+    Args:
+        project_root: 项目根目录
+
+    Returns:
+        对应项目根目录的爬取任务服务实例
+    """
+    key = str(ParserService(project_root).project_root)
+    with _global_crawl_services_lock:
+        service = _global_crawl_services.get(key)
+        if service is None:
+            service = CrawlJobService(project_root)
+            _global_crawl_services[key] = service
+        return service
@@ -10,8 +10,17 @@ from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple
 
 from .cache_service import get_cache
+from .config_service import get_config_service
+from .index_service import get_search_index
 from .parser_service import ParserService
+from .rollup_service import get_rollup_service
+from .shared_store import get_shared_store_status
+from .timeseries_service import get_timeseries_service
+from .tracking_index_service import get_tracking_index
+from .warmup_service import get_warmup_service
 from ..utils.errors import DataNotFoundError
+from ..utils.keywords import get_keyword_tokenizer
+from ..utils.pagination import TopKCollector
 
 
 class DataService:
@@ -97,7 +106,7 @@ class DataService:
         result = news_list[:limit]
 
         # 缓存结果
-        self.cache.set(cache_key, result)
+        self.cache.set(cache_key, result, ttl=900)
 
         return result
 
@@ -131,9 +140,35 @@ class DataService:
             ...     limit=20
             ... )
         """
+        return self.get_news_page(target_date, platforms, limit, include_url)["news"]
+
+    def get_news_page(
+        self,
+        target_date: datetime,
+        platforms: Optional[List[str]] = None,
+        limit: int = 50,
+        include_url: bool = False,
+        after: Optional[tuple] = None
+    ) -> Dict:
+        """
+        按指定日期分页获取新闻（按排名升序，同排名按遍历顺序）
+
+        Args:
+            target_date: 目标日期
+            platforms: 平台ID列表,None表示所有平台
+            limit: 每页条数
+            include_url: 是否包含URL链接,默认False(节省token)
+            after: 上一页最后一条的排序键 (rank, 位置)，None 表示第一页
+
+        Returns:
+            {"news": 新闻列表, "total": 总条数, "has_more": 是否还有下一页, "last_key": 本页最后一条的排序键}
+
+        Raises:
+            DataNotFoundError: 数据不存在
+        """
         # 尝试从缓存获取
         date_str = target_date.strftime("%Y-%m-%d")
-        cache_key = f"news_by_date:{date_str}:{','.join(platforms or [])}:{limit}:{include_url}"
+        cache_key = f"news_by_date:{date_str}:{','.join(platforms or [])}:{limit}:{include_url}:{after}"
         cached = self.cache.get(cache_key, ttl=1800)  # 30分钟缓存
         if cached:
             return cached
@@ -144,40 +179,47 @@ class DataService:
             platform_ids=platforms
         )
 
-        # 转换为新闻列表
-        news_list = []
+        # 只保留当前页的候选，新闻字典在分页之后再生成
+        collector = TopKCollector(limit, after)
+        total = 0
         for platform_id, titles in all_titles.items():
-            platform_name = id_to_name.get(platform_id, platform_id)
-
             for title, info in titles.items():
-                # 计算平均排名
-                avg_rank = sum(info["ranks"]) / len(info["ranks"]) if info["ranks"] else 0
-
-                news_item = {
-                    "title": title,
-                    "platform": platform_id,
-                    "platform_name": platform_name,
-                    "rank": info["ranks"][0] if info["ranks"] else 0,
-                    "avg_rank": round(avg_rank, 2),
-                    "count": len(info["ranks"]),
-                    "date": date_str
-                }
+                rank = info["ranks"][0] if info["ranks"] else 0
+                collector.add((rank, total), (platform_id, title, info))
+                total += 1
 
-                # 条件性添加 URL 字段
-                if include_url:
-                    news_item["url"] = info.get("url", "")
-                    news_item["mobileUrl"] = info.get("mobileUrl", "")
+        news_list = []
+        page = collector.page()
+        for _, (platform_id, title, info) in page:
+            # 计算平均排名
+            avg_rank = sum(info["ranks"]) / len(info["ranks"]) if info["ranks"] else 0
+
+            news_item = {
+                "title": title,
+                "platform": platform_id,
+                "platform_name": id_to_name.get(platform_id, platform_id),
+                "rank": info["ranks"][0] if info["ranks"] else 0,
+                "avg_rank": round(avg_rank, 2),
+                "count": len(info["ranks"]),
+                "date": date_str
+            }
 
-                news_list.append(news_item)
+            # 条件性添加 URL 字段
+            if include_url:
+                news_item["url"] = info.get("url", "")
+                news_item["mobileUrl"] = info.get("mobileUrl", "")
 
-        # 按排名排序
-        news_list.sort(key=lambda x: x["rank"])
+            news_list.append(news_item)
 
-        # 限制返回数量
-        result = news_list[:limit]
+        result = {
+            "news": news_list,
+            "total": total,
+            "has_more": collector.has_more,
+            "last_key": page[-1][0] if page else None
+        }
 
         # 缓存结果(历史数据缓存更久)
-        self.cache.set(cache_key, result)
+        self.cache.set(cache_key, result, ttl=1800)
 
         return result
 
@@ -213,38 +255,35 @@ class DataService:
         # 收集所有匹配的新闻
         results = []
         platform_distribution = Counter()
+        index = get_search_index(self.parser.project_root)
 
         # 遍历日期范围
         current_date = start_date
         while current_date <= end_date:
             try:
-                all_titles, id_to_name, _ = self.parser.read_all_titles_for_date(
-                    date=current_date,
-                    platform_ids=platforms
-                )
+                # 通过倒排索引查找包含关键词的标题
+                hits, id_to_name = index.search(keyword, current_date, platforms)
 
-                # 搜索包含关键词的标题
-                for platform_id, titles in all_titles.items():
+                for info in hits:
+                    platform_id = info["platform_id"]
                     platform_name = id_to_name.get(platform_id, platform_id)
 
-                    for title, info in titles.items():
-                        if keyword.lower() in title.lower():
-                            # 计算平均排名
-                            avg_rank = sum(info["ranks"]) / len(info["ranks"]) if info["ranks"] else 0
-
-                            results.append({
-                                "title": title,
-                                "platform": platform_id,
-                                "platform_name": platform_name,
-                                "ranks": info["ranks"],
-                                "count": len(info["ranks"]),
-                                "avg_rank": round(avg_rank, 2),
-                                "url": info.get("url", ""),
-                                "mobileUrl": info.get("mobileUrl", ""),
-                                "date": current_date.strftime("%Y-%m-%d")
-                            })
-
-                            platform_distribution[platform_id] += 1
+                    # 计算平均排名
+                    avg_rank = sum(info["ranks"]) / len(info["ranks"]) if info["ranks"] else 0
+
+                    results.append({
+                        "title": info["title"],
+                        "platform": platform_id,
+                        "platform_name": platform_name,
+                        "ranks": info["ranks"],
+                        "count": len(info["ranks"]),
+                        "avg_rank": round(avg_rank, 2),
+                        "url": info.get("url", ""),
+                        "mobileUrl": info.get("mobileUrl", ""),
+                        "date": current_date.strftime("%Y-%m-%d")
+                    })
+
+                    platform_distribution[platform_id] += 1
 
             except DataNotFoundError:
                 # 该日期没有数据,继续下一天
@@ -396,7 +435,7 @@ class DataService:
         }
 
         # 缓存结果
-        self.cache.set(cache_key, result)
+        self.cache.set(cache_key, result, ttl=1800)
 
         return result
 
@@ -421,14 +460,15 @@ class DataService:
         Raises:
             FileParseError: 配置文件解析错误
         """
-        # 尝试从缓存获取
-        cache_key = f"config:{section}"
+        # 配置文件未修改时配置服务直接返回缓存的快照，缓存键带上快照版本，
+        # 修改配置后不会再返回旧结果
+        config = get_config_service(self.parser.project_root).get_config()
+        config_data = config.data
+        cache_key = f"config:{section}:{config.mtime_ns}:{config.size}"
         cached = self.cache.get(cache_key, ttl=3600)  # 1小时缓存
         if cached:
             return cached
 
-        # 解析配置文件
-        config_data = self.parser.parse_yaml_config()
         word_groups = self.parser.parse_frequency_words()
 
         # 根据section返回对应配置
@@ -491,7 +531,7 @@ class DataService:
             result = {}
 
         # 缓存结果
-        self.cache.set(cache_key, result)
+        self.cache.set(cache_key, result, ttl=3600)
 
         return result
 
@@ -600,5 +640,13 @@ class DataService:
                 "latest_record": latest_record.strftime("%Y-%m-%d") if latest_record else None,
             },
             "cache": self.cache.get_stats(),
+            "search_index": get_search_index(self.parser.project_root).get_stats(),
+            "keyword_rollups": get_rollup_service(self.parser.project_root).get_stats(),
+            "timeseries": get_timeseries_service(self.parser.project_root).get_stats(),
+            "tracking_index": get_tracking_index(self.parser.project_root).get_stats(),
+            "config": get_config_service(self.parser.project_root).get_stats(),
+            "keyword_tokenizer": get_keyword_tokenizer().get_stats(),
+            "warmup": get_warmup_service(self.parser.project_root).get_status(),
+            "shared_store": get_shared_store_status(self.parser.project_root / "output"),
             "health": "healthy"
         }
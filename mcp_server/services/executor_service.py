@@ -0,0 +1,266 @@
+"""
+工具执行服务
+
+MCP 工具函数声明为 async，但实际的数据读取和分析都是同步的 CPU/磁盘密集操作。
+直接在事件循环中执行会阻塞 HTTP 传输下的所有其他请求，因此统一放到有界线程池中执行：
+
+- 全局线程池限制总并发
+- 每个工具独立的并发上限和排队上限，避免单个慢工具占满线程池
+- 超时后立即向调用方返回错误，后台线程执行完毕后才释放该工具的并发名额
+- 记录调用次数、排队、耗时、超时等指标，并写入指标服务（耗时直方图、单次调用读取量）
+"""
+
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+from typing import Any, Callable, Dict, Optional
+
+from ..utils.errors import MCPError, ServerBusyError, ToolTimeoutError
+from .metrics_service import get_metrics_registry, track_request_usage
+
+
+# 默认执行参数
+DEFAULT_MAX_WORKERS = 8
+DEFAULT_TOOL_LIMIT = {"concurrency": 4, "max_queue": 32, "timeout": 60}
+
+# 各工具的执行参数（未列出的工具使用 DEFAULT_TOOL_LIMIT）
+TOOL_LIMITS = {
+    "search_news": {"concurrency": 4, "max_queue": 32, "timeout": 120},
+    "search_related_news_history": {"concurrency": 2, "max_queue": 16, "timeout": 120},
+    "analyze_topic_trend": {"concurrency": 2, "max_queue": 16, "timeout": 120},
+    "analyze_data_insights": {"concurrency": 2, "max_queue": 16, "timeout": 120},
+    "analyze_sentiment": {"concurrency": 2, "max_queue": 16, "timeout": 120},
+    "find_similar_news": {"concurrency": 2, "max_queue": 16, "timeout": 120},
+    "generate_summary_report": {"concurrency": 2, "max_queue": 16, "timeout": 120},
+    # 爬取本身在 crawl_service 的后台任务中执行，这里只串行化任务的提交（读取配置、校验平台、入队）
+    "trigger_crawl": {"concurrency": 1, "max_queue": 2, "timeout": 300},
+}
+
+
+class _ToolMetrics:
+    """单个工具的执行指标"""
+
+    def __init__(self):
+        self.calls = 0
+        self.completed = 0
+        self.failed = 0
+        self.timeouts = 0
+        self.rejected = 0
+        self.running = 0
+        self.queued = 0
+        self.max_queued = 0
+        self.finished = 0
+        self.total_wait_ms = 0.0
+        self.total_run_ms = 0.0
+        self.max_run_ms = 0.0
+
+    def to_dict(self) -> Dict:
+        started = self.calls - self.rejected
+        return {
+            "calls": self.calls,
+            "completed": self.completed,
+            "failed": self.failed,
+            "timeouts": self.timeouts,
+            "rejected": self.rejected,
+            "running": self.running,
+            "queued": self.queued,
+            "max_queued": self.max_queued,
+            "avg_wait_ms": round(self.total_wait_ms / started, 2) if started else 0,
+            "avg_run_ms": round(self.total_run_ms / self.finished, 2) if self.finished else 0,
+            "max_run_ms": round(self.max_run_ms, 2),
+        }
+
+
+class ToolExecutor:
+    """工具执行器"""
+
+    def __init__(
+        self,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        tool_limits: Optional[Dict[str, Dict[str, Any]]] = None,
+    ):
+        """
+        初始化工具执行器
+
+        Args:
+            max_workers: 线程池大小（所有工具共享）
+            tool_limits: 各工具的 {concurrency, max_queue, timeout} 配置
+        """
+        self.max_workers = max_workers
+        self.tool_limits = tool_limits if tool_limits is not None else dict(TOOL_LIMITS)
+        self._pool = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="mcp-tool"
+        )
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._metrics: Dict[str, _ToolMetrics] = {}
+        self._lock = Lock()
+
+    def get_limit(self, tool_name: str) -> Dict[str, Any]:
+        """获取工具的执行参数"""
+        return {**DEFAULT_TOOL_LIMIT, **self.tool_limits.get(tool_name, {})}
+
+    def _get_semaphore(self, tool_name: str) -> asyncio.Semaphore:
+        semaphore = self._semaphores.get(tool_name)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.get_limit(tool_name)["concurrency"])
+            self._semaphores[tool_name] = semaphore
+        return semaphore
+
+    def _get_metrics(self, tool_name: str) -> _ToolMetrics:
+        with self._lock:
+            metrics = self._metrics.get(tool_name)
+            if metrics is None:
+                metrics = _ToolMetrics()
+                self._metrics[tool_name] = metrics
+            return metrics
+
+    async def run(self, tool_name: str, func: Callable[..., Dict], *args, **kwargs) -> Dict:
+        """
+        在线程池中执行同步工具函数
+
+        Args:
+            tool_name: 工具名称（用于并发限制和指标统计）
+            func: 同步工具函数，返回结果字典
+            *args, **kwargs: 传给 func 的参数
+
+        Returns:
+            工具结果字典；排队已满或超时时返回统一格式的错误字典
+        """
+        limit = self.get_limit(tool_name)
+        metrics = self._get_metrics(tool_name)
+        semaphore = self._get_semaphore(tool_name)
+        loop = asyncio.get_running_loop()
+
+        registry = get_metrics_registry()
+        metrics.calls += 1
+        if semaphore.locked() and metrics.queued >= limit["max_queue"]:
+            metrics.rejected += 1
+            registry.record_tool_call(tool_name, "rejected")
+            return {
+                "success": False,
+                "error": ServerBusyError(tool_name, metrics.queued).to_dict()
+            }
+
+        enqueued_at = time.perf_counter()
+        metrics.queued += 1
+        metrics.max_queued = max(metrics.max_queued, metrics.queued)
+        try:
+            await semaphore.acquire()
+        finally:
+            metrics.queued -= 1
+
+        started_at = time.perf_counter()
+        metrics.total_wait_ms += (started_at - enqueued_at) * 1000
+        metrics.running += 1
+        usage_holder = {}
+
+        def call() -> Dict:
+            # 在工作线程中统计本次调用读取的文件和日期
+            with track_request_usage() as usage:
+                usage_holder["usage"] = usage
+                return func(*args, **kwargs)
+
+        def on_done(_future) -> None:
+            # 在事件循环线程中释放名额，保证超时后仍在运行的任务继续占用并发名额
+            elapsed_ms = (time.perf_counter() - started_at) * 1000
+            metrics.running -= 1
+            metrics.finished += 1
+            metrics.total_run_ms += elapsed_ms
+            metrics.max_run_ms = max(metrics.max_run_ms, elapsed_ms)
+            semaphore.release()
+            registry.record_tool_run(
+                tool_name, elapsed_ms / 1000, started_at - enqueued_at, usage_holder.get("usage")
+            )
+
+        future = loop.run_in_executor(self._pool, call)
+        future.add_done_callback(on_done)
+
+        try:
+            result = await asyncio.wait_for(asyncio.shield(future), timeout=limit["timeout"])
+        except asyncio.TimeoutError:
+            metrics.timeouts += 1
+            registry.record_tool_call(tool_name, "timeout")
+            return {
+                "success": False,
+                "error": ToolTimeoutError(tool_name, limit["timeout"]).to_dict()
+            }
+        except MCPError as e:
+            metrics.failed += 1
+            registry.record_tool_call(tool_name, "error")
+            return {
+                "success": False,
+                "error": e.to_dict()
+            }
+        except Exception as e:
+            metrics.failed += 1
+            registry.record_tool_call(tool_name, "error")
+            return {
+                "success": False,
+                "error": {
+                    "code": "INTERNAL_ERROR",
+                    "message": str(e)
+                }
+            }
+
+        if isinstance(result, dict) and result.get("success") is False:
+            metrics.failed += 1
+            registry.record_tool_call(tool_name, "error")
+        else:
+            metrics.completed += 1
+            registry.record_tool_call(tool_name, "success")
+        return result
+
+    def get_stats(self) -> Dict:
+        """
+        获取执行器统计信息
+
+        Returns:
+            统计信息字典
+        """
+        with self._lock:
+            tools = {name: m.to_dict() for name, m in sorted(self._metrics.items())}
+        return {
+            "max_workers": self.max_workers,
+            "running": sum(t["running"] for t in tools.values()),
+            "queued": sum(t["queued"] for t in tools.values()),
+            "tools": tools,
+        }
+
+    def shutdown(self, wait: bool = False) -> None:
+        """关闭线程池"""
+        self._pool.shutdown(wait=wait)
+
+
+# 全局执行器实例
+_global_executor = None
+
+
+def get_tool_executor() -> ToolExecutor:
+    """
+    获取全局工具执行器实例
+
+    Returns:
+        全局工具执行器实例
+    """
+    global _global_executor
+    if _global_executor is None:
+        _global_executor = ToolExecutor()
+    return _global_executor
+
+
+def configure_tool_executor(max_workers: int) -> ToolExecutor:
+    """
+    按指定线程数重建全局工具执行器（在服务器启动前调用）
+
+    Args:
+        max_workers: 线程池大小
+
+    Returns:
+        新的全局工具执行器实例
+    """
+    global _global_executor
+    if _global_executor is not None:
+        _global_executor.shutdown(wait=False)
+    _global_executor = ToolExecutor(max_workers=max_workers)
+    return _global_executor
@@ -0,0 +1,821 @@
+"""
+标题倒排索引服务
+
+关键词搜索原先需要解析日期范围内每一天的所有 txt 文件并逐条做子串判断，
+耗时随历史数据线性增长。这里按天维护字符 n-gram 倒排索引（中文标题无需分词）：
+
+- 每天一个索引段：文档为 (平台ID, 标题)，postings 为 bigram -> 文档ID 列表，
+  同时保存排名、链接等结果所需字段，命中后无需再解析 txt 文件
+- 索引段以 JSON 持久化到 output/.search_index/，进程重启后直接加载
+- 失效判断与 ParserService 一致：历史日期比较目录 mtime，今天比较 txt 文件清单；
+  有新快照落盘时只为新增标题提取 n-gram
+- 查询时取关键词的 bigram，对 postings 求交集得到候选，再用子串判断校验候选
+- 另有字符级 postings（记录每个字符在标题中的出现次数），用于相似度搜索的预筛选：
+  按字符多重集合计算的 Dice 系数是 SequenceMatcher.ratio() 的上界（即 quick_ratio），
+  上界低于阈值的标题不可能匹配，无需再计算 ratio
+- 多进程模式下由写入进程额外导出内存映射的共享索引段（见 shared_store），
+  服务进程直接映射共享文件，不再各自持有一份索引
+- 查询已是最新的索引段时不加锁；构建和增量更新按日期加锁，
+  不同日期可以并行构建，同一日期只构建一次。增量更新只追加文档，且文档字段
+  先于 postings 写入，并发查询最多看不到正在追加的标题
+"""
+
+import json
+import os
+from collections import Counter, OrderedDict
+from datetime import datetime
+from pathlib import Path
+from threading import Lock
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from ..utils.errors import DataNotFoundError
+from .metrics_service import record_day_access, record_file_read
+from .parser_service import ParserService
+from .shared_store import (
+    SharedFile,
+    SharedFileWriter,
+    get_shared_store_role,
+    max_days_for_role,
+    path_identity,
+)
+
+
+INDEX_VERSION = 3
+SHARED_ORDER_SHIFT = 32  # 共享索引段中遍历顺序编码为 平台顺序 << 32 | 平台内序号
+NGRAM_SIZE = 2
+CHAR_COUNT_BITS = 8  # 字符 postings 中出现次数占用的低位数
+CHAR_COUNT_MASK = (1 << CHAR_COUNT_BITS) - 1
+DEFAULT_MAX_SEGMENTS = 128  # 内存中保留的索引段数量（按 LRU 淘汰）
+MAX_INTERSECT_POSTINGS = 4  # 只对最短的若干个 postings 求交集，其余交给子串校验
+
+
+def extract_ngrams(text: str, n: int = NGRAM_SIZE) -> set:
+    """
+    提取文本的字符 n-gram 集合
+
+    Args:
+        text: 文本（调用方负责统一大小写）
+        n: gram 长度
+
+    Returns:
+        n-gram 集合；文本短于 n 时为空集合
+    """
+    return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+
+class _SegmentQueries:
+    """索引段查询逻辑（内存索引段和共享索引段共用）
+
+    子类需要提供 docs、order、postings、char_postings、lengths、irregular 属性，
+    以及 platform_of / title_of 方法
+    """
+
+    def _substring_candidates(self, keyword_lower: str):
+        """对关键词的 bigram postings 求交集，得到可能包含关键词的文档"""
+        grams = extract_ngrams(keyword_lower)
+        if grams:
+            postings = []
+            for gram in grams:
+                posting = self.postings.get(gram)
+                if not posting:
+                    return []
+                postings.append(posting)
+            postings.sort(key=len)
+            candidates = set(postings[0])
+            for posting in postings[1:MAX_INTERSECT_POSTINGS]:
+                candidates.intersection_update(posting)
+                if not candidates:
+                    return []
+        else:
+            # 单字符关键词没有 bigram，直接校验全部文档（仍无需解析文件）
+            candidates = range(len(self.docs))
+        return candidates
+
+    def _filter_and_sort(self, doc_ids: Iterable[int], platforms: Optional[List[str]]) -> List[int]:
+        if platforms:
+            doc_ids = [doc_id for doc_id in doc_ids if self.platform_of(doc_id) in platforms]
+        return sorted(doc_ids, key=self.order.__getitem__)
+
+    def search(self, keyword_lower: str, platforms: Optional[List[str]] = None) -> List[int]:
+        """
+        查找标题包含关键词的文档
+
+        Args:
+            keyword_lower: 小写关键词
+            platforms: 平台过滤列表
+
+        Returns:
+            命中的文档ID列表（按原始遍历顺序）
+        """
+        candidates = self._substring_candidates(keyword_lower)
+
+        hits = []
+        for doc_id in candidates:
+            if platforms and self.platform_of(doc_id) not in platforms:
+                continue
+            if keyword_lower in self.title_of(doc_id).lower():
+                hits.append(doc_id)
+
+        hits.sort(key=self.order.__getitem__)
+        return hits
+
+    def similar(
+        self,
+        text: str,
+        threshold: float,
+        platforms: Optional[List[str]] = None,
+        substrings: Iterable[str] = (),
+        case_sensitive: bool = False
+    ) -> List[int]:
+        """
+        相似度预筛选：找出可能与 text 相似度达到阈值的文档
+
+        返回的是候选集合的超集，调用方仍需计算真实相似度：
+        - SequenceMatcher(None, text, title).ratio() >= threshold 的文档一定在结果中
+          （case_sensitive=False 时按小写文本比较）
+        - 小写标题包含 text 或 substrings 中任一字符串的文档一定在结果中
+
+        Args:
+            text: 参考文本
+            threshold: 相似度阈值
+            platforms: 平台过滤列表
+            substrings: 需要额外保留的子串（如分词后的关键词）
+            case_sensitive: 调用方是否按原始大小写计算相似度
+
+        Returns:
+            候选文档ID列表（按原始遍历顺序）
+        """
+        text_lower = text.lower()
+        if threshold <= 0 or (case_sensitive and (len(text_lower) != len(text) or "Σ" in text)):
+            return self._filter_and_sort(range(len(self.docs)), platforms)
+
+        # 累加每个文档与参考文本共有的字符数（按多重集合取较小出现次数）
+        overlap: Dict[int, int] = {}
+        for char, text_count in Counter(text_lower).items():
+            for packed in self.char_postings.get(char, ()):
+                doc_id = packed >> CHAR_COUNT_BITS
+                count = packed & CHAR_COUNT_MASK
+                overlap[doc_id] = overlap.get(doc_id, 0) + (text_count if text_count < count else count)
+
+        # Dice 上界: 2 * 共有字符数 / 总长度 >= ratio()
+        text_length = len(text_lower)
+        lengths = self.lengths
+        candidates = {
+            doc_id for doc_id, common in overlap.items()
+            if 2.0 * common / (text_length + lengths[doc_id]) >= threshold
+        }
+
+        for substring in [text_lower] + [s.lower() for s in substrings]:
+            for doc_id in self._substring_candidates(substring):
+                if doc_id not in candidates and substring in self.title_of(doc_id).lower():
+                    candidates.add(doc_id)
+
+        candidates.update(self.irregular)
+
+        return self._filter_and_sort(candidates, platforms)
+
+
+class _DaySegment(_SegmentQueries):
+    """单日索引段"""
+
+    def __init__(self, date_folder: str):
+        self.date_folder = date_folder
+        self.manifest: Tuple = ()
+        self.dir_mtime_ns = 0
+        self.id_to_name: Dict[str, str] = {}
+        # 文档列表，下标即文档ID: (platform_id, title, ranks, url, mobileUrl)
+        self.docs: List[Tuple] = []
+        # 文档在 read_all_titles_for_date 结果中的遍历顺序: (平台顺序, 平台内序号)
+        self.order: List[Tuple[int, int]] = []
+        self.postings: Dict[str, List[int]] = {}
+        # 字符 -> [文档ID << CHAR_COUNT_BITS | 出现次数]
+        self.char_postings: Dict[str, List[int]] = {}
+        # 小写标题长度，用于计算相似度上界
+        self.lengths: List[int] = []
+        # 无法精确估计上界的文档（小写规则特殊或单字符出现次数溢出），总是作为候选
+        self.irregular: List[int] = []
+        self.platform_order: Dict[str, int] = {}
+        self.platform_counts: Dict[str, int] = {}
+        self._doc_ids: Optional[Dict[Tuple[str, str], int]] = None
+
+    def _get_doc_ids(self) -> Dict[Tuple[str, str], int]:
+        if self._doc_ids is None:
+            self._doc_ids = {(doc[0], doc[1]): doc_id for doc_id, doc in enumerate(self.docs)}
+        return self._doc_ids
+
+    def update(self, all_titles: Dict, id_to_name: Dict) -> int:
+        """
+        用整天的解析结果更新索引段
+
+        已有标题只刷新排名等字段，新标题追加为新文档并提取 n-gram。
+
+        Returns:
+            新增文档数
+        """
+        doc_ids = self._get_doc_ids()
+        self.id_to_name = dict(id_to_name)
+        added = 0
+
+        for platform_id, titles in all_titles.items():
+            if platform_id not in self.platform_order:
+                self.platform_order[platform_id] = len(self.platform_order)
+                self.platform_counts[platform_id] = 0
+            platform_rank = self.platform_order[platform_id]
+
+            for title, info in titles.items():
+                ranks = list(info.get("ranks", []))
+                doc_id = doc_ids.get((platform_id, title))
+                if doc_id is not None:
+                    if len(self.docs[doc_id][2]) != len(ranks):
+                        self.docs[doc_id] = (
+                            platform_id, title, ranks,
+                            info.get("url", ""), info.get("mobileUrl", "")
+                        )
+                    continue
+
+                doc_id = len(self.docs)
+                doc_ids[(platform_id, title)] = doc_id
+                self.docs.append(
+                    (platform_id, title, ranks, info.get("url", ""), info.get("mobileUrl", ""))
+                )
+                self.order.append((platform_rank, self.platform_counts[platform_id]))
+                self.platform_counts[platform_id] += 1
+
+                title_lower = title.lower()
+                for gram in extract_ngrams(title_lower):
+                    posting = self.postings.get(gram)
+                    if posting is None:
+                        self.postings[gram] = [doc_id]
+                    else:
+                        posting.append(doc_id)
+
+                self.lengths.append(len(title_lower))
+                # 小写后长度变化或含上下文相关的大写字母（Σ）时，原始大小写下的上界不成立
+                irregular = len(title_lower) != len(title) or "Σ" in title
+                for char, count in Counter(title_lower).items():
+                    if count > CHAR_COUNT_MASK:
+                        irregular = True
+                        count = CHAR_COUNT_MASK
+                    packed = (doc_id << CHAR_COUNT_BITS) | count
+                    posting = self.char_postings.get(char)
+                    if posting is None:
+                        self.char_postings[char] = [packed]
+                    else:
+                        posting.append(packed)
+                if irregular:
+                    self.irregular.append(doc_id)
+                added += 1
+
+        return added
+
+    def platform_of(self, doc_id: int) -> str:
+        return self.docs[doc_id][0]
+
+    def title_of(self, doc_id: int) -> str:
+        return self.docs[doc_id][1]
+
+    def to_state(self) -> Dict:
+        return {
+            "version": INDEX_VERSION,
+            "date_folder": self.date_folder,
+            "manifest": [list(entry) for entry in self.manifest],
+            "dir_mtime_ns": self.dir_mtime_ns,
+            "id_to_name": self.id_to_name,
+            "docs": [list(doc) for doc in self.docs],
+            "order": [list(entry) for entry in self.order],
+            "postings": self.postings,
+            "char_postings": self.char_postings,
+            "lengths": self.lengths,
+            "irregular": self.irregular,
+            "platform_order": self.platform_order,
+            "platform_counts": self.platform_counts,
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict) -> "_DaySegment":
+        segment = cls(state["date_folder"])
+        segment.manifest = tuple(tuple(entry) for entry in state["manifest"])
+        segment.dir_mtime_ns = state["dir_mtime_ns"]
+        segment.id_to_name = state["id_to_name"]
+        segment.docs = [tuple(doc) for doc in state["docs"]]
+        segment.order = [tuple(entry) for entry in state["order"]]
+        segment.postings = state["postings"]
+        segment.char_postings = state["char_postings"]
+        segment.lengths = state["lengths"]
+        segment.irregular = state["irregular"]
+        segment.platform_order = state["platform_order"]
+        segment.platform_counts = state["platform_counts"]
+        return segment
+
+    def export_shared(self, path: Path) -> None:
+        """导出为共享索引段文件（内存映射格式）"""
+        platforms = sorted(self.platform_order, key=self.platform_order.__getitem__)
+        rank_offsets = [0]
+        ranks = []
+        for doc in self.docs:
+            ranks.extend(doc[2])
+            rank_offsets.append(len(ranks))
+
+        writer = SharedFileWriter()
+        writer.add_strings("platforms", platforms)
+        writer.add_array("doc_platforms", (self.platform_order[doc[0]] for doc in self.docs))
+        writer.add_strings("titles", (doc[1] for doc in self.docs))
+        writer.add_array("rank_offsets", rank_offsets)
+        writer.add_array("ranks", ranks)
+        writer.add_strings("urls", (doc[3] or "" for doc in self.docs))
+        writer.add_strings("mobile_urls", (doc[4] or "" for doc in self.docs))
+        writer.add_array(
+            "order",
+            ((platform_rank << SHARED_ORDER_SHIFT) | position for platform_rank, position in self.order),
+            "Q"
+        )
+        writer.add_postings("postings", self.postings)
+        writer.add_postings("char_postings", self.char_postings)
+        writer.add_array("lengths", self.lengths)
+        writer.add_array("irregular", self.irregular)
+        writer.write(path, {
+            "index_version": INDEX_VERSION,
+            "date_folder": self.date_folder,
+            "manifest": [list(entry) for entry in self.manifest],
+            "dir_mtime_ns": self.dir_mtime_ns,
+            "id_to_name": self.id_to_name,
+        })
+
+
+class _MappedDocs:
+    """共享索引段的文档列表，按下标解码为 (platform_id, title, ranks, url, mobileUrl)"""
+
+    def __init__(self, shared: SharedFile):
+        self.platforms = list(shared.strings("platforms"))
+        self.doc_platforms = shared.array("doc_platforms")
+        self.titles = shared.strings("titles")
+        self.rank_offsets = shared.array("rank_offsets")
+        self.ranks = shared.array("ranks")
+        self.urls = shared.strings("urls")
+        self.mobile_urls = shared.strings("mobile_urls")
+
+    def __len__(self) -> int:
+        return len(self.titles)
+
+    def __getitem__(self, doc_id: int) -> Tuple:
+        return (
+            self.platforms[self.doc_platforms[doc_id]],
+            self.titles[doc_id],
+            self.ranks[self.rank_offsets[doc_id]:self.rank_offsets[doc_id + 1]].tolist(),
+            self.urls[doc_id],
+            self.mobile_urls[doc_id],
+        )
+
+
+class _MappedSegment(_SegmentQueries):
+    """共享索引段（只读，内存映射）"""
+
+    def __init__(self, shared: SharedFile):
+        meta = shared.meta
+        if meta.get("index_version") != INDEX_VERSION:
+            raise ValueError("索引版本不匹配")
+        self.identity = shared.identity
+        self.mapped_bytes = shared.mapped_bytes
+        self.date_folder = meta["date_folder"]
+        self.manifest = tuple(tuple(entry) for entry in meta["manifest"])
+        self.dir_mtime_ns = meta["dir_mtime_ns"]
+        self.id_to_name = meta["id_to_name"]
+        self.docs = _MappedDocs(shared)
+        self.order = shared.array("order")
+        self.postings = shared.postings("postings")
+        self.char_postings = shared.postings("char_postings")
+        self.lengths = shared.array("lengths")
+        self.irregular = shared.array("irregular")
+
+    def platform_of(self, doc_id: int) -> str:
+        return self.docs.platforms[self.docs.doc_platforms[doc_id]]
+
+    def title_of(self, doc_id: int) -> str:
+        return self.docs.titles[doc_id]
+
+
+class SearchIndexService:
+    """标题倒排索引服务类"""
+
+    def __init__(self, project_root: str = None, max_segments: int = DEFAULT_MAX_SEGMENTS):
+        """
+        初始化索引服务
+
+        Args:
+            project_root: 项目根目录
+            max_segments: 内存中保留的索引段数量
+        """
+        self.parser = ParserService(project_root)
+        self.index_dir = self.parser.project_root / "output" / ".search_index"
+        self.max_segments = max_segments
+
+        self._segments: "OrderedDict[str, _DaySegment]" = OrderedDict()
+        # _lock 只保护 LRU 和统计计数，构建索引段时持有对应日期的构建锁
+        self._lock = Lock()
+        self._build_locks: Dict[str, Lock] = {}
+
+        # 统计计数
+        self._queries = 0
+        self._similar_queries = 0
+        self._similar_scanned = 0
+        self._similar_candidates = 0
+        self._disk_loads = 0
+        self._builds = 0
+        self._incremental_updates = 0
+        self._indexed_titles = 0
+        self._shared_opens = 0
+        self._shared_exports = 0
+        self._private_builds = 0
+        # 写入进程已确认导出的版本: date_folder -> (manifest, dir_mtime_ns)
+        self._exported: Dict[str, Tuple] = {}
+
+    def _segment_path(self, date_folder: str) -> Path:
+        return self.index_dir / f"{date_folder}.json"
+
+    def _shared_path(self, date_folder: str) -> Path:
+        return self.index_dir / f"{date_folder}.shared"
+
+    def _load_segment(self, date_folder: str) -> Optional[_DaySegment]:
+        """从磁盘加载索引段，版本不匹配或文件损坏时返回 None"""
+        path = self._segment_path(date_folder)
+        if not path.exists():
+            return None
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+                record_file_read("index", os.fstat(f.fileno()).st_size)
+            if state.get("version") != INDEX_VERSION:
+                return None
+            with self._lock:
+                self._disk_loads += 1
+            return _DaySegment.from_state(state)
+        except Exception as e:
+            print(f"Warning: 加载索引段 {path} 失败: {e}")
+            return None
+
+    def _save_segment(self, segment: _DaySegment) -> None:
+        """原子写入索引段"""
+        path = self._segment_path(segment.date_folder)
+        tmp_path = path.with_suffix(".tmp")
+        try:
+            self.index_dir.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(segment.to_state(), f, ensure_ascii=False, separators=(",", ":"))
+            os.replace(tmp_path, path)
+        except Exception as e:
+            print(f"Warning: 保存索引段 {path} 失败: {e}")
+
+        if get_shared_store_role() == "writer":
+            self._export_shared(segment)
+
+    def _export_shared(self, segment: _DaySegment) -> None:
+        """导出共享索引段（仅写入进程）"""
+        path = self._shared_path(segment.date_folder)
+        try:
+            segment.export_shared(path)
+            self._exported[segment.date_folder] = (tuple(segment.manifest), segment.dir_mtime_ns)
+            with self._lock:
+                self._shared_exports += 1
+        except Exception as e:
+            print(f"Warning: 导出共享索引段 {path} 失败: {e}")
+
+    def _remember(self, date_folder: str, segment) -> None:
+        """放入内存 LRU（写入进程只保留少量日期）"""
+        with self._lock:
+            self._segments[date_folder] = segment
+            self._segments.move_to_end(date_folder)
+            max_segments = max_days_for_role(self.max_segments)
+            while len(self._segments) > max_segments:
+                self._segments.popitem(last=False)
+
+    def _lookup(self, date_folder: str):
+        """取内存中的索引段（命中时移到 LRU 末尾）"""
+        with self._lock:
+            segment = self._segments.get(date_folder)
+            if segment is not None:
+                self._segments.move_to_end(date_folder)
+            return segment
+
+    def _build_lock(self, date_folder: str) -> Lock:
+        with self._lock:
+            lock = self._build_locks.get(date_folder)
+            if lock is None:
+                lock = self._build_locks[date_folder] = Lock()
+            return lock
+
+    def _open_shared(self, date_folder: str) -> Optional[_MappedSegment]:
+        """映射共享索引段（文件未变化时复用已映射的版本），文件不存在或损坏时返回 None"""
+        path = self._shared_path(date_folder)
+        identity = path_identity(path)
+        if identity is None:
+            return None
+
+        with self._lock:
+            current = self._segments.get(date_folder)
+        if isinstance(current, _MappedSegment) and current.identity == identity:
+            return current
+        try:
+            segment = _MappedSegment(SharedFile(path))
+        except Exception as e:
+            print(f"Warning: 映射共享索引段 {path} 失败: {e}")
+            return None
+        with self._lock:
+            self._shared_opens += 1
+        return segment
+
+    def _get_shared_segment(
+        self,
+        date_folder: str,
+        txt_dir: Path,
+        is_today: bool,
+        dir_mtime_ns: int
+    ) -> Optional[_MappedSegment]:
+        """获取最新的共享索引段（读取方），不存在或已过期时返回 None"""
+        segment = self._open_shared(date_folder)
+        if segment is None:
+            return None
+        if is_today:
+            if segment.manifest != self.parser.scan_txt_manifest(txt_dir):
+                return None
+        elif segment.dir_mtime_ns != dir_mtime_ns:
+            return None
+
+        self._remember(date_folder, segment)
+        return segment
+
+    def _get_segment(self, date: datetime) -> _DaySegment:
+        """
+        获取指定日期的最新索引段
+
+        Raises:
+            DataNotFoundError: 数据不存在
+        """
+        date_folder = self.parser.get_date_folder_name(date)
+        txt_dir = self.parser.project_root / "output" / date_folder / "txt"
+        if not txt_dir.exists():
+            raise DataNotFoundError(
+                f"未找到 {date_folder} 的数据目录",
+                suggestion="请先运行爬虫或检查日期是否正确"
+            )
+        record_day_access(date_folder)
+
+        is_today = (date is None) or (date.date() == datetime.now().date())
+        dir_mtime_ns = txt_dir.stat().st_mtime_ns
+
+        # 读取方优先使用写入进程导出的共享索引段，过期或缺失时才在进程内构建（不落盘）
+        reader = get_shared_store_role() == "reader"
+        if reader:
+            shared = self._get_shared_segment(date_folder, txt_dir, is_today, dir_mtime_ns)
+            if shared is not None:
+                return shared
+
+        # 内存中的索引段仍是最新时直接返回，不需要构建锁
+        segment = self._lookup(date_folder)
+        if isinstance(segment, _DaySegment):
+            if not is_today and segment.dir_mtime_ns == dir_mtime_ns:
+                return segment
+            manifest = self.parser.scan_txt_manifest(txt_dir)
+            if segment.manifest == manifest:
+                segment.dir_mtime_ns = dir_mtime_ns
+                return segment
+
+        with self._build_lock(date_folder):
+            return self._build_segment(date, date_folder, txt_dir, is_today, dir_mtime_ns, reader)
+
+    def _build_segment(
+        self,
+        date: datetime,
+        date_folder: str,
+        txt_dir: Path,
+        is_today: bool,
+        dir_mtime_ns: int,
+        reader: bool
+    ) -> _DaySegment:
+        """加载、增量更新或重建索引段（调用方持有该日期的构建锁）"""
+        # 等待构建锁期间其他线程可能已经完成了构建，重新检查一次
+        segment = self._lookup(date_folder)
+        if isinstance(segment, _MappedSegment):
+            segment = None
+        if segment is None:
+            segment = self._load_segment(date_folder)
+            if segment is not None:
+                self._remember(date_folder, segment)
+        if segment is not None and not is_today and segment.dir_mtime_ns == dir_mtime_ns:
+            return segment
+
+        manifest = self.parser.scan_txt_manifest(txt_dir)
+        if segment is not None and segment.manifest == manifest:
+            segment.dir_mtime_ns = dir_mtime_ns
+            return segment
+
+        # 只新增了快照时在原索引段上追加，否则在新索引段上重建后替换
+        all_titles, id_to_name, _ = self.parser.read_all_titles_for_date(date=date)
+        incremental = segment is not None and manifest[:len(segment.manifest)] == segment.manifest
+        if not incremental:
+            segment = _DaySegment(date_folder)
+
+        added = segment.update(all_titles, id_to_name)
+        segment.manifest = manifest
+        segment.dir_mtime_ns = dir_mtime_ns
+        with self._lock:
+            if incremental:
+                self._incremental_updates += 1
+            else:
+                self._builds += 1
+            self._indexed_titles += added
+            if reader:
+                self._private_builds += 1
+        if not reader:
+            self._save_segment(segment)
+
+        self._remember(date_folder, segment)
+        return segment
+
+    def search(
+        self,
+        keyword: str,
+        date: datetime,
+        platforms: Optional[List[str]] = None
+    ) -> Tuple[List[Dict], Dict[str, str]]:
+        """
+        在指定日期的标题中查找包含关键词的新闻（不区分大小写）
+
+        Args:
+            keyword: 搜索关键词
+            date: 日期
+            platforms: 平台过滤列表，None 表示所有平台
+
+        Returns:
+            (hits, id_to_name) 元组
+            - hits: [{platform_id, title, ranks, url, mobileUrl}]，顺序与逐条扫描
+              read_all_titles_for_date 结果一致
+            - id_to_name: {platform_id: platform_name}
+
+        Raises:
+            DataNotFoundError: 该日期没有数据
+        """
+        with self._lock:
+            self._queries += 1
+        segment = self._get_segment(date)
+        doc_ids = segment.search(keyword.lower(), platforms)
+        return self._to_hits(segment, doc_ids), segment.id_to_name
+
+    def count(
+        self,
+        keyword: str,
+        date: Optional[datetime],
+        sample_size: int = 0
+    ) -> Tuple[int, List[str]]:
+        """
+        统计指定日期标题包含关键词的新闻条数（不区分大小写，同一标题在不同平台分别计数）
+
+        Args:
+            keyword: 关键词
+            date: 日期，None 表示今天
+            sample_size: 返回的样本标题数
+
+        Returns:
+            (count, sample_titles) 元组
+
+        Raises:
+            DataNotFoundError: 该日期没有数据
+        """
+        with self._lock:
+            self._queries += 1
+        segment = self._get_segment(date)
+        doc_ids = segment.search(keyword.lower())
+        samples = [segment.title_of(doc_id) for doc_id in doc_ids[:sample_size]]
+        return len(doc_ids), samples
+
+    def similar_candidates(
+        self,
+        text: str,
+        date: Optional[datetime],
+        threshold: float,
+        platforms: Optional[List[str]] = None,
+        substrings: Iterable[str] = (),
+        case_sensitive: bool = False
+    ) -> Tuple[List[Dict], Dict[str, str]]:
+        """
+        获取指定日期中可能与 text 相似的新闻（相似度计算前的预筛选）
+
+        Args:
+            text: 参考文本
+            date: 日期，None 表示今天
+            threshold: SequenceMatcher 相似度阈值
+            platforms: 平台过滤列表
+            substrings: 包含其中任一子串的标题也作为候选
+            case_sensitive: 调用方是否按原始大小写计算相似度
+
+        Returns:
+            (candidates, id_to_name) 元组，candidates 格式同 search()
+
+        Raises:
+            DataNotFoundError: 该日期没有数据
+        """
+        segment = self._get_segment(date)
+        doc_ids = segment.similar(text, threshold, platforms, substrings, case_sensitive)
+        with self._lock:
+            self._similar_queries += 1
+            self._similar_scanned += len(segment.docs)
+            self._similar_candidates += len(doc_ids)
+        return self._to_hits(segment, doc_ids), segment.id_to_name
+
+    @staticmethod
+    def _to_hits(segment: _DaySegment, doc_ids: List[int]) -> List[Dict]:
+        hits = []
+        for doc_id in doc_ids:
+            platform_id, title, ranks, url, mobile_url = segment.docs[doc_id]
+            hits.append({
+                "platform_id": platform_id,
+                "title": title,
+                "ranks": list(ranks),
+                "url": url,
+                "mobileUrl": mobile_url,
+            })
+        return hits
+
+    def warm(self, date: datetime) -> None:
+        """
+        预热指定日期的索引段（加载到内存，必要时构建并落盘），供启动预热使用
+
+        Args:
+            date: 日期
+
+        Raises:
+            DataNotFoundError: 该日期没有数据
+        """
+        segment = self._get_segment(date)
+        if get_shared_store_role() == "writer":
+            with self._build_lock(segment.date_folder):
+                self._ensure_shared(segment)
+
+    def _ensure_shared(self, segment: _DaySegment) -> None:
+        """写入进程确认共享索引段与内存索引段一致，否则重新导出"""
+        version = (tuple(segment.manifest), segment.dir_mtime_ns)
+        if self._exported.get(segment.date_folder) == version:
+            return
+        shared = self._open_shared(segment.date_folder)
+        if shared is not None and (shared.manifest, shared.dir_mtime_ns) == version:
+            self._exported[segment.date_folder] = version
+        else:
+            self._export_shared(segment)
+
+    def get_stats(self) -> Dict:
+        """
+        获取索引统计信息
+
+        Returns:
+            统计信息字典
+        """
+        with self._lock:
+            return {
+                "segments_in_memory": len(self._segments),
+                "shared_segments_mapped": sum(
+                    1 for s in self._segments.values() if isinstance(s, _MappedSegment)
+                ),
+                "shared_mapped_bytes": sum(
+                    s.mapped_bytes for s in self._segments.values() if isinstance(s, _MappedSegment)
+                ),
+                "max_segments": self.max_segments,
+                "documents_in_memory": sum(
+                    len(s.docs) for s in self._segments.values() if isinstance(s, _DaySegment)
+                ),
+                "queries": self._queries,
+                "similar_queries": self._similar_queries,
+                "similar_candidate_rate": (
+                    round(self._similar_candidates / self._similar_scanned, 4)
+                    if self._similar_scanned else 0
+                ),
+                "disk_loads": self._disk_loads,
+                "builds": self._builds,
+                "incremental_updates": self._incremental_updates,
+                "indexed_titles": self._indexed_titles,
+                "shared_opens": self._shared_opens,
+                "shared_exports": self._shared_exports,
+                "private_builds": self._private_builds,
+            }
+
+
+# 全局索引实例（按项目根目录区分）
+_global_indexes: Dict[str, SearchIndexService] = {}
+_global_indexes_lock = Lock()
+
+
+def get_search_index(project_root: str = None) -> SearchIndexService:
+    """
+    获取全局索引服务实例
+
+    Args:
+        project_root: 项目根目录
+
+    Returns:
+        对应项目根目录的索引服务实例
+    """
+    key = str(project_root) if project_root is not None else ""
+    with _global_indexes_lock:
+        index = _global_indexes.get(key)
+        if index is None:
+            index = SearchIndexService(project_root)
+            _global_indexes[key] = index
+        return index
@@ -0,0 +1,513 @@
+"""
+指标服务
+
+收集服务器运行指标，输出为 Prometheus 文本格式（HTTP 模式的 /metrics 端点）
+或摘要字典（get_metrics 工具）：
+
+- 每个工具的调用次数（按结果 success / error / timeout / rejected 区分）、
+  执行耗时和排队耗时直方图
+- 每次工具调用读取的文件数、字节数和涉及的日期数（直方图），用于定位热点日期范围
+- 按文件类型（txt 快照、索引段、汇总表、时间序列）累计的读取文件数和字节数
+- 缓存各命名空间的命中、未命中、淘汰、过期次数以及条目数和字节数
+
+单次调用的读取量通过线程局部变量统计：工具执行器在工作线程中开启统计，
+解析和加载代码调用 record_file_read / record_day_access 累加到当前调用上。
+
+HTTP 多进程模式下各服务进程定期把自己的指标写入 output/.metrics/，
+抓取时合并所有存活进程的指标（计数和直方图求和）。
+"""
+
+import json
+import math
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from pathlib import Path
+from threading import Lock
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from .cache_service import get_cache
+
+
+# 直方图桶上界
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+DAYS_BUCKETS = (0, 1, 2, 3, 7, 14, 30, 90, 180, 365)
+FILES_BUCKETS = (0, 1, 5, 10, 50, 100, 500, 1000, 5000, 10000)
+BYTES_BUCKETS = (0, 64 << 10, 256 << 10, 1 << 20, 4 << 20, 16 << 20, 64 << 20, 256 << 20, 1 << 30)
+
+METRICS_FLUSH_INTERVAL = 5  # 多进程模式下写入指标快照的间隔（秒）
+
+# 指标名称 -> (类型, 说明)
+METRIC_DEFINITIONS = {
+    "trendradar_tool_calls_total": ("counter", "工具调用次数（按结果区分）"),
+    "trendradar_tool_duration_seconds": ("histogram", "工具执行耗时（秒，不含排队）"),
+    "trendradar_tool_queue_seconds": ("histogram", "工具排队等待耗时（秒）"),
+    "trendradar_request_days_loaded": ("histogram", "单次工具调用涉及的日期数"),
+    "trendradar_request_files_read": ("histogram", "单次工具调用读取的文件数"),
+    "trendradar_request_bytes_read": ("histogram", "单次工具调用读取的字节数"),
+    "trendradar_files_read_total": ("counter", "读取的文件数（按文件类型区分）"),
+    "trendradar_bytes_read_total": ("counter", "读取的字节数（按文件类型区分）"),
+    "trendradar_cache_hits_total": ("counter", "缓存命中次数"),
+    "trendradar_cache_misses_total": ("counter", "缓存未命中次数"),
+    "trendradar_cache_evictions_total": ("counter", "缓存淘汰次数"),
+    "trendradar_cache_expirations_total": ("counter", "缓存过期清理次数"),
+    "trendradar_cache_entries": ("gauge", "缓存条目数"),
+    "trendradar_cache_bytes": ("gauge", "缓存占用字节数（近似）"),
+}
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+class Histogram:
+    """累积分桶直方图"""
+
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # 最后一个为 +Inf 桶
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def merge(self, other: "Histogram") -> None:
+        for i, count in enumerate(other.counts):
+            self.counts[i] += count
+        self.sum += other.sum
+        self.count += other.count
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        估算分位数（桶内线性插值，与 Prometheus histogram_quantile 一致）
+
+        Returns:
+            分位数估计值，没有样本时返回 None
+        """
+        if not self.count:
+            return None
+        rank = q * self.count
+        cumulative = 0
+        for i, count in enumerate(self.counts):
+            if cumulative + count >= rank and count:
+                if i == len(self.buckets):
+                    return self.buckets[-1] if self.buckets else None
+                lower = self.buckets[i - 1] if i > 0 else 0.0
+                upper = self.buckets[i]
+                return lower + (upper - lower) * (rank - cumulative) / count
+            cumulative += count
+        return self.buckets[-1] if self.buckets else None
+
+    def to_state(self) -> Dict:
+        return {"buckets": list(self.buckets), "counts": list(self.counts), "sum": self.sum, "count": self.count}
+
+    @classmethod
+    def from_state(cls, state: Dict) -> "Histogram":
+        histogram = cls(state["buckets"])
+        histogram.counts = list(state["counts"])
+        histogram.sum = state["sum"]
+        histogram.count = state["count"]
+        return histogram
+
+
+class RequestUsage:
+    """单次工具调用的读取量"""
+
+    __slots__ = ("days", "files", "bytes")
+
+    def __init__(self):
+        self.days = set()
+        self.files = 0
+        self.bytes = 0
+
+
+_request_local = threading.local()
+
+
+@contextmanager
+def track_request_usage() -> Iterator[RequestUsage]:
+    """
+    在当前线程中统计一次工具调用的读取量
+
+    Yields:
+        RequestUsage，调用结束后包含涉及的日期、读取的文件数和字节数
+    """
+    usage = RequestUsage()
+    previous = getattr(_request_local, "usage", None)
+    _request_local.usage = usage
+    try:
+        yield usage
+    finally:
+        _request_local.usage = previous
+
+
+def _labels(**labels) -> Labels:
+    return tuple(sorted(labels.items()))
+
+
+class MetricsRegistry:
+    """指标注册表"""
+
+    def __init__(self):
+        self._lock = Lock()
+        self._counters: Dict[Tuple[str, Labels], float] = {}
+        self._histograms: Dict[Tuple[str, Labels], Histogram] = {}
+        self.started_at = time.time()
+
+    def inc(self, name: str, value: float = 1, **labels) -> None:
+        """累加计数器"""
+        key = (name, _labels(**labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name: str, value: float, buckets: Sequence[float], **labels) -> None:
+        """记录直方图样本"""
+        key = (name, _labels(**labels))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram(buckets)
+            histogram.observe(value)
+
+    def record_tool_call(self, tool: str, outcome: str) -> None:
+        """
+        记录一次工具调用的结果
+
+        Args:
+            tool: 工具名称
+            outcome: success / error / timeout / rejected
+        """
+        self.inc("trendradar_tool_calls_total", tool=tool, outcome=outcome)
+
+    def record_tool_run(
+        self,
+        tool: str,
+        duration: float,
+        queue_wait: float,
+        usage: Optional[RequestUsage] = None
+    ) -> None:
+        """
+        记录一次工具执行的耗时和读取量（执行结束时调用，超时的调用在后台线程结束后记录）
+
+        Args:
+            tool: 工具名称
+            duration: 执行耗时（秒）
+            queue_wait: 排队耗时（秒）
+            usage: 读取量统计
+        """
+        self.observe("trendradar_tool_duration_seconds", duration, LATENCY_BUCKETS, tool=tool)
+        self.observe("trendradar_tool_queue_seconds", queue_wait, LATENCY_BUCKETS, tool=tool)
+        if usage is not None:
+            self.observe("trendradar_request_days_loaded", len(usage.days), DAYS_BUCKETS, tool=tool)
+            self.observe("trendradar_request_files_read", usage.files, FILES_BUCKETS, tool=tool)
+            self.observe("trendradar_request_bytes_read", usage.bytes, BYTES_BUCKETS, tool=tool)
+
+    def to_state(self) -> Dict:
+        """
+        导出当前进程的全部指标（包括缓存统计）
+
+        Returns:
+            {"counters": [[名称, 标签, 值]], "gauges": [...], "histograms": [[名称, 标签, 状态]]}
+        """
+        with self._lock:
+            counters = [[name, list(labels), value] for (name, labels), value in self._counters.items()]
+            histograms = [
+                [name, list(labels), histogram.to_state()]
+                for (name, labels), histogram in self._histograms.items()
+            ]
+
+        gauges = []
+        for namespace, stats in get_cache().get_stats()["namespaces"].items():
+            labels = [["namespace", namespace]]
+            for field in ("hits", "misses", "evictions", "expirations"):
+                counters.append([f"trendradar_cache_{field}_total", labels, stats.get(field, 0)])
+            gauges.append(["trendradar_cache_entries", labels, stats["entries"]])
+            gauges.append(["trendradar_cache_bytes", labels, stats["bytes"]])
+
+        return {"counters": counters, "gauges": gauges, "histograms": histograms}
+
+
+def merge_states(states: List[Dict]) -> Dict:
+    """
+    合并多个进程的指标（计数、当前值和直方图均求和）
+
+    Args:
+        states: MetricsRegistry.to_state() 结果列表
+
+    Returns:
+        合并后的 {"counters": {(名称, 标签): 值}, "gauges": {...}, "histograms": {(名称, 标签): Histogram}}
+    """
+    merged = {"counters": {}, "gauges": {}, "histograms": {}}
+    for state in states:
+        for kind in ("counters", "gauges"):
+            for name, labels, value in state[kind]:
+                key = (name, tuple(tuple(pair) for pair in labels))
+                merged[kind][key] = merged[kind].get(key, 0) + value
+        for name, labels, histogram_state in state["histograms"]:
+            key = (name, tuple(tuple(pair) for pair in labels))
+            histogram = Histogram.from_state(histogram_state)
+            if key in merged["histograms"]:
+                merged["histograms"][key].merge(histogram)
+            else:
+                merged["histograms"][key] = histogram
+    return merged
+
+
+def _escape_label_value(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: Labels, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(labels) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape_label_value(str(value))}"' for key, value in pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    if isinstance(value, float):
+        if math.isinf(value):
+            return "+Inf" if value > 0 else "-Inf"
+        if value.is_integer():
+            return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+def render_prometheus(merged: Dict) -> str:
+    """
+    渲染为 Prometheus 文本格式（0.0.4）
+
+    Args:
+        merged: merge_states() 的结果
+
+    Returns:
+        Prometheus 文本
+    """
+    by_name: Dict[str, List] = {}
+    for kind in ("counters", "gauges", "histograms"):
+        for (name, labels), value in merged[kind].items():
+            by_name.setdefault(name, []).append((labels, value))
+
+    lines = []
+    for name in sorted(by_name):
+        metric_type, help_text = METRIC_DEFINITIONS.get(name, ("untyped", ""))
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {metric_type}")
+        for labels, value in sorted(by_name[name], key=lambda item: item[0]):
+            if isinstance(value, Histogram):
+                cumulative = 0
+                for bound, count in zip(value.buckets, value.counts):
+                    cumulative += count
+                    lines.append(f"{name}_bucket{_format_labels(labels, ('le', _format_value(float(bound))))} {cumulative}")
+                lines.append(f"{name}_bucket{_format_labels(labels, ('le', '+Inf'))} {value.count}")
+                lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(value.sum)}")
+                lines.append(f"{name}_count{_format_labels(labels)} {value.count}")
+            else:
+                lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+    return "\n".join(lines) + "\n"
+
+
+def summarize(merged: Dict) -> Dict:
+    """
+    生成便于阅读的指标摘要（get_metrics 工具使用）
+
+    Args:
+        merged: merge_states() 的结果
+
+    Returns:
+        {"tools": {工具: {...}}, "files_read": {...}, "cache": {命名空间: {...}}}
+    """
+    tools: Dict[str, Dict] = {}
+
+    def tool_entry(labels: Labels) -> Dict:
+        tool = dict(labels).get("tool", "")
+        return tools.setdefault(tool, {"calls": {}, "total_calls": 0})
+
+    for (name, labels), value in merged["counters"].items():
+        if name == "trendradar_tool_calls_total":
+            entry = tool_entry(labels)
+            entry["calls"][dict(labels)["outcome"]] = int(value)
+            entry["total_calls"] += int(value)
+
+    for (name, labels), histogram in merged["histograms"].items():
+        if not histogram.count:
+            continue
+        entry = tool_entry(labels)
+        if name == "trendradar_tool_duration_seconds":
+            entry["latency_ms"] = {
+                "avg": round(histogram.sum / histogram.count * 1000, 2),
+                "p50": round(histogram.quantile(0.5) * 1000, 2),
+                "p95": round(histogram.quantile(0.95) * 1000, 2),
+                "p99": round(histogram.quantile(0.99) * 1000, 2),
+            }
+        elif name == "trendradar_tool_queue_seconds":
+            entry["avg_queue_ms"] = round(histogram.sum / histogram.count * 1000, 2)
+        elif name == "trendradar_request_days_loaded":
+            entry["avg_days_loaded"] = round(histogram.sum / histogram.count, 2)
+        elif name == "trendradar_request_files_read":
+            entry["avg_files_read"] = round(histogram.sum / histogram.count, 2)
+        elif name == "trendradar_request_bytes_read":
+            entry["avg_bytes_read"] = int(histogram.sum / histogram.count)
+
+    files_read: Dict[str, Dict] = {}
+    cache: Dict[str, Dict] = {}
+    for kind in ("counters", "gauges"):
+        for (name, labels), value in merged[kind].items():
+            label_map = dict(labels)
+            if name in ("trendradar_files_read_total", "trendradar_bytes_read_total"):
+                field = "files" if name == "trendradar_files_read_total" else "bytes"
+                files_read.setdefault(label_map["kind"], {})[field] = int(value)
+            elif name.startswith("trendradar_cache_"):
+                field = name[len("trendradar_cache_"):].replace("_total", "")
+                cache.setdefault(label_map["namespace"], {})[field] = int(value)
+
+    for stats in cache.values():
+        lookups = stats.get("hits", 0) + stats.get("misses", 0)
+        stats["hit_rate"] = round(stats.get("hits", 0) / lookups, 4) if lookups else 0
+
+    return {
+        "tools": {name: tools[name] for name in sorted(tools)},
+        "files_read": files_read,
+        "cache": {name: cache[name] for name in sorted(cache)},
+    }
+
+
+# 全局指标注册表
+_global_registry = MetricsRegistry()
+
+
+def get_metrics_registry() -> MetricsRegistry:
+    """获取全局指标注册表"""
+    return _global_registry
+
+
+def record_file_read(kind: str, size: int) -> None:
+    """
+    记录一次文件读取（同时累加到当前工具调用上）
+
+    Args:
+        kind: 文件类型，如 txt / index / rollup / timeseries
+        size: 字节数
+    """
+    _global_registry.inc("trendradar_files_read_total", kind=kind)
+    _global_registry.inc("trendradar_bytes_read_total", size, kind=kind)
+    usage = getattr(_request_local, "usage", None)
+    if usage is not None:
+        usage.files += 1
+        usage.bytes += size
+
+
+def record_day_access(date_folder: str) -> None:
+    """
+    记录当前工具调用访问了某天的数据
+
+    Args:
+        date_folder: 日期目录名
+    """
+    usage = getattr(_request_local, "usage", None)
+    if usage is not None:
+        usage.days.add(date_folder)
+
+
+class MetricsSnapshotStore:
+    """多进程模式下各进程的指标快照（output/.metrics/<pid>.json）"""
+
+    def __init__(self, metrics_dir: Path):
+        self.metrics_dir = metrics_dir
+        self._flusher: Optional[threading.Thread] = None
+
+    def flush(self) -> None:
+        """写入当前进程的指标快照"""
+        path = self.metrics_dir / f"{os.getpid()}.json"
+        tmp_path = path.with_suffix(".tmp")
+        try:
+            self.metrics_dir.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(_global_registry.to_state(), f, ensure_ascii=False, separators=(",", ":"))
+            os.replace(tmp_path, path)
+        except Exception as e:
+            print(f"Warning: 写入指标快照 {path} 失败: {e}")
+
+    def start(self, interval: float = METRICS_FLUSH_INTERVAL) -> None:
+        """启动后台线程定期写入快照"""
+        if self._flusher is not None:
+            return
+
+        def loop() -> None:
+            while True:
+                time.sleep(interval)
+                self.flush()
+
+        self._flusher = threading.Thread(target=loop, name="metrics-flusher", daemon=True)
+        self._flusher.start()
+
+    def collect(self) -> List[Dict]:
+        """
+        读取所有存活进程的指标快照（当前进程使用实时数据），并删除已退出进程的快照
+
+        Returns:
+            各进程的 MetricsRegistry.to_state() 结果
+        """
+        states = [_global_registry.to_state()]
+        if not self.metrics_dir.exists():
+            return states
+        for path in self.metrics_dir.glob("*.json"):
+            try:
+                pid = int(path.stem)
+            except ValueError:
+                continue
+            if pid == os.getpid():
+                continue
+            try:
+                os.kill(pid, 0)
+            except ProcessLookupError:
+                path.unlink(missing_ok=True)
+                continue
+            except PermissionError:
+                pass
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    states.append(json.load(f))
+            except (OSError, ValueError):
+                continue
+        return states
+
+
+_snapshot_store: Optional[MetricsSnapshotStore] = None
+
+
+def enable_process_snapshots(output_dir: Path) -> MetricsSnapshotStore:
+    """
+    启用多进程指标快照（服务进程启动时调用）
+
+    Args:
+        output_dir: output 目录
+
+    Returns:
+        快照存储
+    """
+    global _snapshot_store
+    if _snapshot_store is None:
+        _snapshot_store = MetricsSnapshotStore(output_dir / ".metrics")
+        _snapshot_store.start()
+    return _snapshot_store
+
+
+def collect_metrics() -> Dict:
+    """
+    收集指标（多进程模式下合并所有服务进程）
+
+    Returns:
+        merge_states() 的结果
+    """
+    if _snapshot_store is not None:
+        _snapshot_store.flush()
+        states = _snapshot_store.collect()
+    else:
+        states = [_global_registry.to_state()]
+    return merge_states(states)
@@ -4,15 +4,16 @@
 提供txt格式新闻数据和YAML配置文件的解析功能。
 """
 
+import os
 import re
 from pathlib import Path
 from typing import Dict, List, Tuple, Optional
 from datetime import datetime
 
-import yaml
-
 from ..utils.errors import FileParseError, DataNotFoundError
-from .cache_service import get_cache
+from .cache_service import NO_EXPIRY, get_cache
+from .config_service import get_config_service
+from .metrics_service import record_day_access, record_file_read
 
 
 class ParserService:
@@ -76,6 +77,7 @@ class ParserService:
         try:
             with open(file_path, "r", encoding="utf-8") as f:
                 content = f.read()
+                record_file_read("txt", os.fstat(f.fileno()).st_size)
                 sections = content.split("\n\n")
 
                 for section in sections:
@@ -157,6 +159,25 @@ class ParserService:
             date = datetime.now()
         return date.strftime("%Y年%m月%d日")
 
+    @staticmethod
+    def scan_txt_manifest(txt_dir: Path) -> Tuple[Tuple[str, int, int], ...]:
+        """
+        生成目录下 txt 文件的清单
+
+        Args:
+            txt_dir: txt 目录
+
+        Returns:
+            按文件名排序的 ((文件名, mtime_ns, 文件大小), ...)
+        """
+        entries = []
+        with os.scandir(txt_dir) as it:
+            for entry in it:
+                if entry.name.endswith(".txt") and entry.is_file():
+                    stat = entry.stat()
+                    entries.append((entry.name, stat.st_mtime_ns, stat.st_size))
+        return tuple(sorted(entries))
+
     def read_all_titles_for_date(
         self,
         date: datetime = None,
@@ -165,6 +186,11 @@ class ParserService:
         """
         读取指定日期的所有标题文件（带缓存）
 
+        缓存失效由目录状态驱动，而不是固定 TTL：
+        - 历史日期：目录 mtime 不变（没有增删文件）即直接使用缓存，直到被 LRU 淘汰
+        - 今天：比较 txt 文件清单（文件名、mtime、大小），有新快照落盘时立即刷新，
+          且只解析新增的文件并合并到已有结果中
+
         Args:
             date: 日期对象，默认为今天
             platform_ids: 平台ID列表，None表示所有平台
@@ -183,17 +209,6 @@ class ParserService:
         platform_key = ','.join(sorted(platform_ids)) if platform_ids else 'all'
         cache_key = f"read_all_titles:{date_str}:{platform_key}"
 
-        # 尝试从缓存获取
-        # 对于历史数据（非今天），使用更长的缓存时间（1小时）
-        # 对于今天的数据，使用较短的缓存时间（15分钟），因为可能有新数据
-        is_today = (date is None) or (date.date() == datetime.now().date())
-        ttl = 900 if is_today else 3600  # 15分钟 vs 1小时
-
-        cached = self.cache.get(cache_key, ttl=ttl)
-        if cached:
-            return cached
-
-        # 缓存未命中，读取文件
         date_folder = self.get_date_folder_name(date)
         txt_dir = self.project_root / "output" / date_folder / "txt"
 
@@ -202,21 +217,49 @@ class ParserService:
                 f"未找到 {date_folder} 的数据目录",
                 suggestion="请先运行爬虫或检查日期是否正确"
             )
+        record_day_access(date_folder)
 
-        all_titles = {}
-        id_to_name = {}
-        all_timestamps = {}
+        is_today = (date is None) or (date.date() == datetime.now().date())
+        dir_mtime_ns = txt_dir.stat().st_mtime_ns
 
-        # 读取所有txt文件
-        txt_files = sorted(txt_dir.glob("*.txt"))
+        # 尝试从缓存获取（条目不按时间过期，由目录清单判断是否失效）
+        cached = self.cache.get(cache_key, ttl=NO_EXPIRY)
+        if cached and not is_today and cached["dir_mtime_ns"] == dir_mtime_ns:
+            return cached["result"]
 
-        if not txt_files:
+        manifest = self.scan_txt_manifest(txt_dir)
+        if cached and cached["manifest"] == manifest:
+            cached["dir_mtime_ns"] = dir_mtime_ns
+            return cached["result"]
+
+        if not manifest:
             raise DataNotFoundError(
                 f"{date_folder} 没有数据文件",
                 suggestion="请等待爬虫任务完成"
             )
 
-        for txt_file in txt_files:
+        # 已有文件均未变化、只是新增了快照时，只解析新增文件
+        old_manifest = cached["manifest"] if cached else ()
+        if old_manifest and manifest[:len(old_manifest)] == old_manifest:
+            base_titles, base_id_to_name, base_timestamps = cached["result"]
+            all_titles = {
+                platform_id: {
+                    title: dict(info, ranks=list(info["ranks"]))
+                    for title, info in titles.items()
+                }
+                for platform_id, titles in base_titles.items()
+            }
+            id_to_name = dict(base_id_to_name)
+            all_timestamps = dict(base_timestamps)
+            files_to_parse = manifest[len(old_manifest):]
+        else:
+            all_titles = {}
+            id_to_name = {}
+            all_timestamps = {}
+            files_to_parse = manifest
+
+        for file_name, mtime_ns, _ in files_to_parse:
+            txt_file = txt_dir / file_name
             try:
                 titles_by_id, file_id_to_name = self.parse_txt_file(txt_file)
 
@@ -240,7 +283,7 @@ class ParserService:
                             all_titles[platform_id][title] = info.copy()
 
                 # 记录文件时间戳
-                all_timestamps[txt_file.name] = txt_file.stat().st_mtime
+                all_timestamps[file_name] = mtime_ns / 1e9
 
             except Exception as e:
                 # 忽略单个文件的解析错误，继续处理其他文件
@@ -253,39 +296,33 @@ class ParserService:
                 suggestion="请检查数据文件格式或重新运行爬虫"
             )
 
-        # 缓存结果
+        # 缓存结果及对应的目录清单
         result = (all_titles, id_to_name, all_timestamps)
-        self.cache.set(cache_key, result)
+        self.cache.set(
+            cache_key,
+            {"manifest": manifest, "dir_mtime_ns": dir_mtime_ns, "result": result},
+            ttl=NO_EXPIRY,
+        )
 
         return result
 
     def parse_yaml_config(self, config_path: str = None) -> dict:
         """
-        解析YAML配置文件
+        解析YAML配置文件（通过配置服务读取，文件未修改时返回缓存的结果）
 
         Args:
             config_path: 配置文件路径，默认为 config/config.yaml
 
         Returns:
-            配置字典
+            只读的配置字典（需要修改时先用 config_service.thaw 复制）
 
         Raises:
             FileParseError: 配置文件解析错误
         """
+        config_service = get_config_service(self.project_root)
         if config_path is None:
-            config_path = self.project_root / "config" / "config.yaml"
-        else:
-            config_path = Path(config_path)
-
-        if not config_path.exists():
-            raise FileParseError(str(config_path), "配置文件不存在")
-
-        try:
-            with open(config_path, "r", encoding="utf-8") as f:
-                config_data = yaml.safe_load(f)
-            return config_data
-        except Exception as e:
-            raise FileParseError(str(config_path), str(e))
+            return config_service.get_config().data
+        return config_service.load(config_path).data
 
     def parse_frequency_words(self, words_file: str = None) -> List[Dict]:
         """
@@ -0,0 +1,529 @@
+"""
+关键词汇总服务
+
+趋势、爆火检测、预测等分析只需要每天（或每个快照）的关键词计数，
+却每次都要重新读取整天的标题并逐条提取关键词。这里按天维护汇总表：
+
+- 日汇总：关键词 -> 出现次数，以及每个关键词的前 3 条样本标题
+  （计数和样本顺序与逐条遍历 read_all_titles_for_date 结果完全一致）
+- 快照汇总：快照文件名 -> {关键词: 出现次数}，只统计该快照中出现的标题
+- 汇总表持久化到 output/.rollups/，失效判断与 ParserService 一致：
+  历史日期比较目录 mtime，今天比较 txt 文件清单；有新快照时只为新增文件生成快照汇总
+- 汇总表记录分词词典签名，词典变化后整体重建
+- 多进程模式下由写入进程额外导出内存映射的共享汇总表（见 shared_store），
+  服务进程只在访问时解码需要的部分，并且只在内存中保留少量最近使用的日期
+"""
+
+import json
+import os
+from collections import Counter, OrderedDict
+from datetime import datetime
+from pathlib import Path
+from threading import Lock
+from typing import Dict, List, Optional
+
+from ..utils.errors import DataNotFoundError
+from ..utils.keywords import extract_title_keywords, get_keyword_tokenizer
+from .metrics_service import record_day_access, record_file_read
+from .parser_service import ParserService
+from .shared_store import (
+    SharedFile,
+    SharedFileWriter,
+    get_shared_store_role,
+    max_days_for_role,
+    path_identity,
+)
+
+
+ROLLUP_VERSION = 3
+SAMPLE_SIZE = 3  # 每个关键词保留的样本标题数
+DEFAULT_MAX_DAYS = 64  # 内存中保留的日汇总数量（按 LRU 淘汰）
+SHARED_READER_MAX_DAYS = 8  # 读取方内存中保留的共享汇总表数量（解码后的数据为进程私有）
+
+
+class _DayRollup:
+    """单日汇总表"""
+
+    def __init__(self, date_folder: str):
+        self.date_folder = date_folder
+        self.tokenizer_signature = ""
+        self.manifest: tuple = ()
+        self.dir_mtime_ns = 0
+        self.title_count = 0
+        self.keyword_counts: Counter = Counter()
+        self.keyword_samples: Dict[str, List[str]] = {}
+        self.snapshots: Dict[str, Dict[str, int]] = {}
+
+    def rebuild_day(self, all_titles: Dict) -> None:
+        """按整天解析结果重新统计日汇总"""
+        keyword_counts = Counter()
+        keyword_samples: Dict[str, List[str]] = {}
+        title_count = 0
+
+        for _, titles in all_titles.items():
+            for title in titles.keys():
+                title_count += 1
+                keywords = extract_title_keywords(title)
+                keyword_counts.update(keywords)
+                for kw in keywords:
+                    samples = keyword_samples.get(kw)
+                    if samples is None:
+                        keyword_samples[kw] = [title]
+                    elif len(samples) < SAMPLE_SIZE:
+                        samples.append(title)
+
+        self.keyword_counts = keyword_counts
+        self.keyword_samples = keyword_samples
+        self.title_count = title_count
+
+    def to_state(self) -> Dict:
+        return {
+            "version": ROLLUP_VERSION,
+            "date_folder": self.date_folder,
+            "tokenizer_signature": self.tokenizer_signature,
+            "manifest": [list(entry) for entry in self.manifest],
+            "dir_mtime_ns": self.dir_mtime_ns,
+            "title_count": self.title_count,
+            "keyword_counts": dict(self.keyword_counts),
+            "keyword_samples": self.keyword_samples,
+            "snapshots": self.snapshots,
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict) -> "_DayRollup":
+        rollup = cls(state["date_folder"])
+        rollup.tokenizer_signature = state["tokenizer_signature"]
+        rollup.manifest = tuple(tuple(entry) for entry in state["manifest"])
+        rollup.dir_mtime_ns = state["dir_mtime_ns"]
+        rollup.title_count = state["title_count"]
+        rollup.keyword_counts = Counter(state["keyword_counts"])
+        rollup.keyword_samples = state["keyword_samples"]
+        rollup.snapshots = state["snapshots"]
+        return rollup
+
+    def export_shared(self, path: Path) -> None:
+        """导出为共享汇总表文件（内存映射格式）"""
+        # 关键词表：日汇总的关键词（保持插入顺序），其后追加只在快照汇总中出现的关键词
+        keywords = list(self.keyword_counts)
+        keyword_ids = {kw: i for i, kw in enumerate(keywords)}
+        snapshot_offsets = [0]
+        snapshot_keywords = []
+        snapshot_counts = []
+        for counts in self.snapshots.values():
+            for kw, count in counts.items():
+                kw_id = keyword_ids.get(kw)
+                if kw_id is None:
+                    kw_id = keyword_ids[kw] = len(keywords)
+                    keywords.append(kw)
+                snapshot_keywords.append(kw_id)
+                snapshot_counts.append(count)
+            snapshot_offsets.append(len(snapshot_keywords))
+
+        sample_offsets = [0]
+        sample_titles = []
+        for kw in self.keyword_counts:
+            sample_titles.extend(self.keyword_samples.get(kw, ()))
+            sample_offsets.append(len(sample_titles))
+
+        writer = SharedFileWriter()
+        writer.add_strings("keywords", keywords)
+        writer.add_array("counts", self.keyword_counts.values())
+        writer.add_array("sample_offsets", sample_offsets, "Q")
+        writer.add_strings("sample_titles", sample_titles)
+        writer.add_strings("snapshot_names", self.snapshots)
+        writer.add_array("snapshot_offsets", snapshot_offsets, "Q")
+        writer.add_array("snapshot_keywords", snapshot_keywords)
+        writer.add_array("snapshot_counts", snapshot_counts)
+        writer.write(path, {
+            "rollup_version": ROLLUP_VERSION,
+            "date_folder": self.date_folder,
+            "tokenizer_signature": self.tokenizer_signature,
+            "manifest": [list(entry) for entry in self.manifest],
+            "dir_mtime_ns": self.dir_mtime_ns,
+            "title_count": self.title_count,
+        })
+
+
+class _MappedRollup:
+    """共享汇总表（只读，内存映射；各部分在首次访问时解码）"""
+
+    def __init__(self, shared: SharedFile):
+        meta = shared.meta
+        if meta.get("rollup_version") != ROLLUP_VERSION:
+            raise ValueError("汇总表版本不匹配")
+        self.identity = shared.identity
+        self.mapped_bytes = shared.mapped_bytes
+        self.date_folder = meta["date_folder"]
+        self.tokenizer_signature = meta["tokenizer_signature"]
+        self.manifest = tuple(tuple(entry) for entry in meta["manifest"])
+        self.dir_mtime_ns = meta["dir_mtime_ns"]
+        self.title_count = meta["title_count"]
+        self._shared = shared
+        self._keyword_counts: Optional[Counter] = None
+        self._keyword_samples: Optional[Dict[str, List[str]]] = None
+        self._snapshots: Optional[Dict[str, Dict[str, int]]] = None
+
+    @property
+    def keyword_counts(self) -> Counter:
+        if self._keyword_counts is None:
+            keywords = self._shared.strings("keywords")
+            counts = self._shared.array("counts")
+            self._keyword_counts = Counter(dict(zip(keywords, counts)))
+        return self._keyword_counts
+
+    @property
+    def keyword_samples(self) -> Dict[str, List[str]]:
+        if self._keyword_samples is None:
+            keywords = self._shared.strings("keywords")
+            offsets = self._shared.array("sample_offsets")
+            titles = self._shared.strings("sample_titles")
+            self._keyword_samples = {
+                keywords[i]: [titles[j] for j in range(offsets[i], offsets[i + 1])]
+                for i in range(len(offsets) - 1)
+            }
+        return self._keyword_samples
+
+    @property
+    def snapshots(self) -> Dict[str, Dict[str, int]]:
+        if self._snapshots is None:
+            keywords = self._shared.strings("keywords")
+            names = self._shared.strings("snapshot_names")
+            offsets = self._shared.array("snapshot_offsets")
+            snapshot_keywords = self._shared.array("snapshot_keywords")
+            snapshot_counts = self._shared.array("snapshot_counts")
+            self._snapshots = {
+                names[i]: {
+                    keywords[snapshot_keywords[j]]: snapshot_counts[j]
+                    for j in range(offsets[i], offsets[i + 1])
+                }
+                for i in range(len(names))
+            }
+        return self._snapshots
+
+
+class KeywordRollupService:
+    """关键词汇总服务类"""
+
+    def __init__(self, project_root: str = None, max_days: int = DEFAULT_MAX_DAYS):
+        """
+        初始化汇总服务
+
+        Args:
+            project_root: 项目根目录
+            max_days: 内存中保留的日汇总数量
+        """
+        self.parser = ParserService(project_root)
+        self.rollup_dir = self.parser.project_root / "output" / ".rollups"
+        self.max_days = max_days
+
+        self._days: "OrderedDict[str, _DayRollup]" = OrderedDict()
+        self._lock = Lock()
+
+        # 统计计数
+        self._lookups = 0
+        self._disk_loads = 0
+        self._builds = 0
+        self._snapshot_files_parsed = 0
+        self._shared_opens = 0
+        self._shared_exports = 0
+        self._private_builds = 0
+        # 写入进程已确认导出的版本: date_folder -> (签名, manifest, dir_mtime_ns)
+        self._exported: Dict[str, tuple] = {}
+
+    def _rollup_path(self, date_folder: str) -> Path:
+        return self.rollup_dir / f"{date_folder}.json"
+
+    def _shared_path(self, date_folder: str) -> Path:
+        return self.rollup_dir / f"{date_folder}.shared"
+
+    def _load(self, date_folder: str) -> Optional[_DayRollup]:
+        """从磁盘加载汇总表，版本不匹配或文件损坏时返回 None"""
+        path = self._rollup_path(date_folder)
+        if not path.exists():
+            return None
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+                record_file_read("rollup", os.fstat(f.fileno()).st_size)
+            if state.get("version") != ROLLUP_VERSION:
+                return None
+            self._disk_loads += 1
+            return _DayRollup.from_state(state)
+        except Exception as e:
+            print(f"Warning: 加载汇总表 {path} 失败: {e}")
+            return None
+
+    def _save(self, rollup: _DayRollup) -> None:
+        """原子写入汇总表"""
+        path = self._rollup_path(rollup.date_folder)
+        tmp_path = path.with_suffix(".tmp")
+        try:
+            self.rollup_dir.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(rollup.to_state(), f, ensure_ascii=False, separators=(",", ":"))
+            os.replace(tmp_path, path)
+        except Exception as e:
+            print(f"Warning: 保存汇总表 {path} 失败: {e}")
+
+        if get_shared_store_role() == "writer":
+            self._export_shared(rollup)
+
+    @staticmethod
+    def _version_of(rollup) -> tuple:
+        return (rollup.tokenizer_signature, tuple(rollup.manifest), rollup.dir_mtime_ns)
+
+    def _export_shared(self, rollup: _DayRollup) -> None:
+        """导出共享汇总表（仅写入进程）"""
+        path = self._shared_path(rollup.date_folder)
+        try:
+            rollup.export_shared(path)
+            self._exported[rollup.date_folder] = self._version_of(rollup)
+            self._shared_exports += 1
+        except Exception as e:
+            print(f"Warning: 导出共享汇总表 {path} 失败: {e}")
+
+    def _open_shared(self, date_folder: str) -> Optional[_MappedRollup]:
+        """映射共享汇总表（文件未变化时复用已映射的版本），文件不存在或损坏时返回 None"""
+        path = self._shared_path(date_folder)
+        identity = path_identity(path)
+        if identity is None:
+            return None
+
+        current = self._days.get(date_folder)
+        if isinstance(current, _MappedRollup) and current.identity == identity:
+            return current
+        try:
+            rollup = _MappedRollup(SharedFile(path))
+        except Exception as e:
+            print(f"Warning: 映射共享汇总表 {path} 失败: {e}")
+            return None
+        self._shared_opens += 1
+        return rollup
+
+    def _ensure_shared(self, rollup: _DayRollup) -> None:
+        """写入进程确认共享汇总表与内存汇总表一致，否则重新导出"""
+        version = self._version_of(rollup)
+        if self._exported.get(rollup.date_folder) == version:
+            return
+        shared = self._open_shared(rollup.date_folder)
+        if shared is not None and self._version_of(shared) == version:
+            self._exported[rollup.date_folder] = version
+        else:
+            self._export_shared(rollup)
+
+    def _remember(self, date_folder: str, rollup) -> None:
+        """放入内存 LRU（写入进程和读取方只保留少量日期）"""
+        self._days[date_folder] = rollup
+        self._days.move_to_end(date_folder)
+        max_days = max_days_for_role(self.max_days, SHARED_READER_MAX_DAYS)
+        while len(self._days) > max_days:
+            self._days.popitem(last=False)
+
+    def _build_snapshot(self, txt_file: Path) -> Dict[str, int]:
+        """统计单个快照文件中的关键词"""
+        titles_by_id, _ = self.parser.parse_txt_file(txt_file)
+        counts = Counter()
+        for titles in titles_by_id.values():
+            for title in titles.keys():
+                counts.update(extract_title_keywords(title))
+        self._snapshot_files_parsed += 1
+        return dict(counts)
+
+    def _get_day(self, date: Optional[datetime]) -> _DayRollup:
+        """
+        获取指定日期的最新汇总表
+
+        Raises:
+            DataNotFoundError: 数据不存在
+        """
+        date_folder = self.parser.get_date_folder_name(date)
+        txt_dir = self.parser.project_root / "output" / date_folder / "txt"
+        if not txt_dir.exists():
+            raise DataNotFoundError(
+                f"未找到 {date_folder} 的数据目录",
+                suggestion="请先运行爬虫或检查日期是否正确"
+            )
+        record_day_access(date_folder)
+
+        is_today = (date is None) or (date.date() == datetime.now().date())
+        dir_mtime_ns = txt_dir.stat().st_mtime_ns
+        signature = get_keyword_tokenizer().signature
+
+        # 读取方优先使用写入进程导出的共享汇总表，过期或缺失时才在进程内构建（不落盘）
+        reader = get_shared_store_role() == "reader"
+        if reader:
+            shared = self._open_shared(date_folder)
+            if shared is not None and shared.tokenizer_signature == signature and (
+                shared.manifest == self.parser.scan_txt_manifest(txt_dir) if is_today
+                else shared.dir_mtime_ns == dir_mtime_ns
+            ):
+                self._remember(date_folder, shared)
+                return shared
+
+        rollup = self._days.get(date_folder)
+        if isinstance(rollup, _MappedRollup):
+            rollup = None
+        if rollup is None:
+            rollup = self._load(date_folder)
+        if rollup is not None and rollup.tokenizer_signature != signature:
+            # 分词词典已变化，旧的计数不再可用
+            rollup = None
+        if rollup is not None:
+            self._remember(date_folder, rollup)
+            if not is_today and rollup.dir_mtime_ns == dir_mtime_ns:
+                return rollup
+
+        manifest = self.parser.scan_txt_manifest(txt_dir)
+        if rollup is not None and rollup.manifest == manifest:
+            rollup.dir_mtime_ns = dir_mtime_ns
+            return rollup
+
+        # 日汇总基于合并后的整天数据重新统计（解析结果有缓存，今天只解析新增文件）
+        all_titles, _, _ = self.parser.read_all_titles_for_date(date=date)
+
+        if rollup is None or manifest[:len(rollup.manifest)] != rollup.manifest:
+            rollup = _DayRollup(date_folder)
+            rollup.tokenizer_signature = signature
+        rollup.rebuild_day(all_titles)
+
+        # 快照汇总只为新增的快照文件生成
+        current_files = {name for name, _, _ in manifest}
+        rollup.snapshots = {
+            name: counts for name, counts in rollup.snapshots.items() if name in current_files
+        }
+        for file_name, _, _ in manifest:
+            if file_name in rollup.snapshots:
+                continue
+            try:
+                rollup.snapshots[file_name] = self._build_snapshot(txt_dir / file_name)
+            except Exception as e:
+                print(f"Warning: 统计快照 {txt_dir / file_name} 失败: {e}")
+
+        rollup.manifest = manifest
+        rollup.dir_mtime_ns = dir_mtime_ns
+        self._builds += 1
+        if reader:
+            self._private_builds += 1
+        else:
+            self._save(rollup)
+
+        self._remember(date_folder, rollup)
+        return rollup
+
+    def get_keyword_counts(self, date: Optional[datetime] = None) -> Counter:
+        """
+        获取某天的关键词计数
+
+        计数与逐条遍历当天所有标题、累加 extract_title_keywords 结果得到的 Counter 相同
+        （包括键的插入顺序）。返回的是共享对象，调用方不要修改。
+
+        Args:
+            date: 日期，None 表示今天
+
+        Returns:
+            {关键词: 出现次数}
+
+        Raises:
+            DataNotFoundError: 该日期没有数据
+        """
+        with self._lock:
+            self._lookups += 1
+            return self._get_day(date).keyword_counts
+
+    def get_keyword_samples(self, date: Optional[datetime] = None) -> Dict[str, List[str]]:
+        """
+        获取某天每个关键词的样本标题（最多 SAMPLE_SIZE 条，按遍历顺序）
+
+        Args:
+            date: 日期，None 表示今天
+
+        Returns:
+            {关键词: [样本标题]}
+
+        Raises:
+            DataNotFoundError: 该日期没有数据
+        """
+        with self._lock:
+            self._lookups += 1
+            return self._get_day(date).keyword_samples
+
+    def get_snapshot_counts(self, date: Optional[datetime] = None) -> Dict[str, Dict[str, int]]:
+        """
+        获取某天每个快照的关键词计数
+
+        Args:
+            date: 日期，None 表示今天
+
+        Returns:
+            {快照文件名: {关键词: 出现次数}}，按文件名（即时间）排序
+
+        Raises:
+            DataNotFoundError: 该日期没有数据
+        """
+        with self._lock:
+            self._lookups += 1
+            snapshots = self._get_day(date).snapshots
+            return {name: snapshots[name] for name in sorted(snapshots)}
+
+    def warm(self, date: Optional[datetime] = None) -> None:
+        """
+        预热指定日期的关键词汇总（加载到内存，必要时构建并落盘），供启动预热使用
+
+        Args:
+            date: 日期，None 表示今天
+
+        Raises:
+            DataNotFoundError: 该日期没有数据
+        """
+        with self._lock:
+            rollup = self._get_day(date)
+            if get_shared_store_role() == "writer":
+                self._ensure_shared(rollup)
+
+    def get_stats(self) -> Dict:
+        """
+        获取汇总服务统计信息
+
+        Returns:
+            统计信息字典
+        """
+        with self._lock:
+            return {
+                "days_in_memory": len(self._days),
+                "shared_days_mapped": sum(1 for r in self._days.values() if isinstance(r, _MappedRollup)),
+                "shared_mapped_bytes": sum(
+                    r.mapped_bytes for r in self._days.values() if isinstance(r, _MappedRollup)
+                ),
+                "max_days": self.max_days,
+                "lookups": self._lookups,
+                "disk_loads": self._disk_loads,
+                "builds": self._builds,
+                "snapshot_files_parsed": self._snapshot_files_parsed,
+                "shared_opens": self._shared_opens,
+                "shared_exports": self._shared_exports,
+                "private_builds": self._private_builds,
+            }
+
+
+# 全局汇总服务实例（按项目根目录区分）
+_global_rollups: Dict[str, KeywordRollupService] = {}
+_global_rollups_lock = Lock()
+
+
+def get_rollup_service(project_root: str = None) -> KeywordRollupService:
+    """
+    获取全局汇总服务实例
+
+    Args:
+        project_root: 项目根目录
+
+    Returns:
+        对应项目根目录的汇总服务实例
+    """
+    key = str(project_root) if project_root is not None else ""
+    with _global_rollups_lock:
+        rollup = _global_rollups.get(key)
+        if rollup is None:
+            rollup = KeywordRollupService(project_root)
+            _global_rollups[key] = rollup
+        return rollup
@@ -0,0 +1,342 @@
+"""
+共享只读存储
+
+HTTP 多进程模式下，多个服务进程各自解析、加载同一批索引段和汇总表会让内存随进程数成倍增长。
+这里提供一种可直接内存映射（mmap）的只读文件格式：
+
+- 单一写入进程（主进程）构建索引段和汇总表后导出为共享文件，原子替换（临时文件 + os.replace）
+- 服务进程（读取方）只映射文件，查询时按需解码，文件内容由操作系统页缓存在进程间共享
+- 文件被替换后，已映射的旧版本在引用释放前仍然有效，读取方下次访问时重新映射
+
+文件格式（本机字节序）：
+    b"TRSS" | 头部长度 uint32 | 头部 JSON | 对齐到 8 字节 | 各数据段
+头部 JSON 记录元数据和各数据段的偏移，数据段有两种：
+    - 整数数组（typecode 为 I 或 Q）
+    - 字符串表（偏移数组 + UTF-8 数据）
+
+进程角色：
+    - private：单进程（默认），各服务保持原有行为
+    - writer：只构建和导出，不对外服务
+    - reader：优先使用共享文件，不写任何索引文件；共享文件缺失或过期时在进程内临时构建
+"""
+
+import json
+import mmap
+import os
+import struct
+import sys
+import time
+from array import array
+from bisect import bisect_left
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from ..utils.errors import InvalidParameterError
+
+
+SHARED_STORE_VERSION = 1
+SHARED_STORE_ROLES = ("private", "writer", "reader")
+WRITER_STATUS_FILE = ".shared_writer.json"  # 写入进程状态（位于 output 目录）
+# 写入进程导出后即可释放内存中的数据，只保留今天等少量日期用于增量更新
+WRITER_MAX_DAYS = 2
+
+_MAGIC = b"TRSS"
+_PREFIX = struct.Struct("<4sI")
+_ALIGN = 8
+
+_shared_store_settings = {
+    "role": "private",
+}
+
+
+def configure_shared_store(role: str = "private") -> None:
+    """
+    设置当前进程在共享存储中的角色
+
+    Args:
+        role: private / writer / reader
+
+    Raises:
+        InvalidParameterError: 不支持的角色
+    """
+    if role not in SHARED_STORE_ROLES:
+        raise InvalidParameterError(
+            f"不支持的共享存储角色: {role}",
+            suggestion=f"支持的角色: {', '.join(SHARED_STORE_ROLES)}"
+        )
+    _shared_store_settings["role"] = role
+
+
+def get_shared_store_role() -> str:
+    """获取当前进程在共享存储中的角色"""
+    return _shared_store_settings["role"]
+
+
+def max_days_for_role(default: int, reader_max: Optional[int] = None) -> int:
+    """
+    按当前进程角色确定内存中保留的日期数
+
+    Args:
+        default: 单进程模式下的数量
+        reader_max: 读取方的上限（None 表示与单进程模式相同）
+
+    Returns:
+        内存中保留的日期数
+    """
+    role = get_shared_store_role()
+    if role == "writer":
+        return min(default, WRITER_MAX_DAYS)
+    if role == "reader" and reader_max is not None:
+        return min(default, reader_max)
+    return default
+
+
+def _align(size: int) -> int:
+    return (size + _ALIGN - 1) // _ALIGN * _ALIGN
+
+
+class SharedFileWriter:
+    """共享文件写入器"""
+
+    def __init__(self):
+        self._sections: Dict[str, Dict] = {}
+        self._chunks: List[bytes] = []
+        self._size = 0
+
+    def _append(self, data: bytes) -> int:
+        offset = self._size
+        self._chunks.append(data)
+        self._size += len(data)
+        padding = _align(self._size) - self._size
+        if padding:
+            self._chunks.append(b"\0" * padding)
+            self._size += padding
+        return offset
+
+    def add_array(self, name: str, values: Iterable[int], typecode: str = "I") -> None:
+        """
+        添加整数数组
+
+        Args:
+            name: 数据段名称
+            values: 整数序列
+            typecode: I（uint32）或 Q（uint64）
+        """
+        data = array(typecode, values)
+        self._sections[name] = {
+            "kind": "array",
+            "typecode": typecode,
+            "offset": self._append(data.tobytes()),
+            "count": len(data),
+        }
+
+    def add_strings(self, name: str, strings: Iterable[str]) -> None:
+        """
+        添加字符串表
+
+        Args:
+            name: 数据段名称
+            strings: 字符串序列
+        """
+        offsets = array("Q", [0])
+        blob = bytearray()
+        for text in strings:
+            blob += text.encode("utf-8")
+            offsets.append(len(blob))
+        self.add_array(f"{name}.offsets", offsets, "Q")
+        self._sections[name] = {
+            "kind": "strings",
+            "offset": self._append(bytes(blob)),
+            "size": len(blob),
+        }
+
+    def add_postings(self, name: str, postings: Dict[str, Sequence[int]], typecode: str = "I") -> None:
+        """
+        添加按字符串键查找的整数列表（键按字符串排序后存储，查找时二分）
+
+        Args:
+            name: 数据段名称
+            postings: {键: 整数列表}
+            typecode: 整数列表的 typecode
+        """
+        keys = sorted(postings)
+        offsets = array("Q", [0])
+        values = array(typecode)
+        for key in keys:
+            values.extend(postings[key])
+            offsets.append(len(values))
+        self.add_strings(f"{name}.keys", keys)
+        self.add_array(f"{name}.offsets", offsets, "Q")
+        self.add_array(f"{name}.values", values, typecode)
+
+    def write(self, path: Path, meta: Dict) -> None:
+        """
+        原子写入共享文件
+
+        Args:
+            path: 目标路径
+            meta: 元数据（需可 JSON 序列化）
+        """
+        header = json.dumps({
+            "version": SHARED_STORE_VERSION,
+            "byteorder": sys.byteorder,
+            "meta": meta,
+            "sections": self._sections,
+        }, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        data_start = _align(_PREFIX.size + len(header))
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # 临时文件带进程号，避免多个进程同时写入同一个临时文件
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(_PREFIX.pack(_MAGIC, len(header)))
+            f.write(header)
+            f.write(b"\0" * (data_start - _PREFIX.size - len(header)))
+            for chunk in self._chunks:
+                f.write(chunk)
+        os.replace(tmp_path, path)
+
+
+class StringTable(Sequence):
+    """内存映射的字符串表（按下标解码）"""
+
+    def __init__(self, offsets: memoryview, blob: memoryview):
+        self._offsets = offsets
+        self._blob = blob
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, index: int) -> str:
+        if index < 0:
+            index += len(self)
+        return str(self._blob[self._offsets[index]:self._offsets[index + 1]], "utf-8")
+
+
+class PostingTable:
+    """内存映射的 {字符串键: 整数列表} 表"""
+
+    def __init__(self, keys: StringTable, offsets: memoryview, values: memoryview):
+        self._keys = keys
+        self._offsets = offsets
+        self._values = values
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def get(self, key: str, default=None):
+        """
+        查找键对应的整数列表
+
+        Returns:
+            整数列表（只读 memoryview），键不存在时返回 default
+        """
+        index = bisect_left(self._keys, key)
+        if index < len(self._keys) and self._keys[index] == key:
+            return self._values[self._offsets[index]:self._offsets[index + 1]]
+        return default
+
+
+class SharedFile:
+    """只读映射的共享文件"""
+
+    def __init__(self, path: Path):
+        """
+        映射共享文件
+
+        Args:
+            path: 文件路径
+
+        Raises:
+            ValueError: 文件格式、版本或字节序不匹配
+        """
+        with open(path, "rb") as f:
+            stat = os.fstat(f.fileno())
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        # 用于判断路径上的文件是否已被替换
+        self.identity = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+        view = memoryview(self._mmap)
+        magic, header_size = _PREFIX.unpack_from(view, 0)
+        if magic != _MAGIC:
+            raise ValueError("不是共享存储文件")
+        header = json.loads(str(view[_PREFIX.size:_PREFIX.size + header_size], "utf-8"))
+        if header.get("version") != SHARED_STORE_VERSION or header.get("byteorder") != sys.byteorder:
+            raise ValueError("共享存储文件版本或字节序不匹配")
+
+        self.meta: Dict = header["meta"]
+        self._sections: Dict[str, Dict] = header["sections"]
+        self._data = view[_align(_PREFIX.size + header_size):]
+
+    def array(self, name: str) -> memoryview:
+        """获取整数数组（只读 memoryview）"""
+        section = self._sections[name]
+        size = array(section["typecode"]).itemsize
+        start = section["offset"]
+        return self._data[start:start + section["count"] * size].cast(section["typecode"])
+
+    def strings(self, name: str) -> StringTable:
+        """获取字符串表"""
+        section = self._sections[name]
+        start = section["offset"]
+        return StringTable(self.array(f"{name}.offsets"), self._data[start:start + section["size"]])
+
+    def postings(self, name: str) -> PostingTable:
+        """获取 {字符串键: 整数列表} 表"""
+        return PostingTable(
+            self.strings(f"{name}.keys"),
+            self.array(f"{name}.offsets"),
+            self.array(f"{name}.values")
+        )
+
+    @property
+    def mapped_bytes(self) -> int:
+        return len(self._mmap)
+
+
+def path_identity(path: Path) -> Optional[tuple]:
+    """获取路径上文件的标识（inode, mtime, 大小），文件不存在时返回 None"""
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+
+def write_writer_status(output_dir: Path, status: Dict) -> None:
+    """
+    记录写入进程状态，供读取方在 get_system_status 中展示
+
+    Args:
+        output_dir: output 目录
+        status: 状态字典
+    """
+    path = output_dir / WRITER_STATUS_FILE
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"pid": os.getpid(), "updated_at": time.time(), **status}, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+    except Exception as e:
+        print(f"Warning: 写入共享存储状态 {path} 失败: {e}")
+
+
+def get_shared_store_status(output_dir: Path) -> Dict:
+    """
+    获取共享存储状态
+
+    Args:
+        output_dir: output 目录
+
+    Returns:
+        {"role": 当前进程角色, "writer": 写入进程最近一次记录的状态或 None}
+    """
+    role = get_shared_store_role()
+    writer = None
+    if role != "private":
+        try:
+            with open(output_dir / WRITER_STATUS_FILE, "r", encoding="utf-8") as f:
+                writer = json.load(f)
+        except (OSError, ValueError):
+            writer = None
+    return {"role": role, "writer": writer}
@@ -0,0 +1,481 @@
+"""
+快照时间序列服务
+
+每次爬取都会生成一个快照文件（HH时MM分.txt），但按天合并后的数据丢失了
+"某条标题在哪个时刻出现、排名多少"的信息。这里按天保存快照级别的时间序列：
+
+- 快照列表：(文件名, 当天第几分钟)
+- 标题出现记录：(平台ID, 标题) -> [(快照序号, 排名)]
+- 各快照中每个平台的标题数
+- 以 JSON 持久化到 output/.timeseries/，失效判断与 ParserService 一致，有新快照时只解析新增文件
+  （解析失败的快照不计入清单，之后的查询会重试）
+  （多进程模式下只由写入进程落盘，服务进程只读取）
+
+话题查询先通过倒排索引找到包含话题的标题，再按出现记录聚合到任意大小的时间桶，
+时间桶过多时自动放大桶大小（降采样）。
+"""
+
+import json
+import os
+import re
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from pathlib import Path
+from threading import Lock
+from typing import Dict, List, Optional, Tuple
+
+from ..utils.errors import DataNotFoundError
+from .index_service import get_search_index
+from .metrics_service import record_day_access, record_file_read
+from .parser_service import ParserService
+from .shared_store import get_shared_store_role, max_days_for_role
+
+
+TIMESERIES_VERSION = 2
+DEFAULT_MAX_DAYS = 64  # 内存中保留的日时间序列数量（按 LRU 淘汰）
+DEFAULT_MAX_POINTS = 500  # 单次查询返回的最大时间桶数量，超过时降采样
+SAMPLE_SIZE = 3  # 每个时间桶保留的样本标题数
+# 降采样时优先使用的桶大小（分钟）
+DOWNSAMPLE_BUCKETS = (10, 15, 20, 30, 60, 120, 180, 240, 360, 480, 720, 1440, 2880, 10080)
+
+# 快照文件名格式: HH时MM分.txt
+SNAPSHOT_NAME_PATTERN = re.compile(r'(\d{1,2})时(\d{1,2})分')
+
+
+def snapshot_minute(file_name: str, mtime: Optional[float] = None) -> Optional[int]:
+    """
+    解析快照文件对应的当天分钟数
+
+    Args:
+        file_name: 快照文件名（HH时MM分.txt）
+        mtime: 文件修改时间，文件名无法解析时使用
+
+    Returns:
+        0-1439 的分钟数，无法确定时返回 None
+    """
+    match = SNAPSHOT_NAME_PATTERN.match(file_name)
+    if match:
+        hour, minute = int(match.group(1)), int(match.group(2))
+        if hour < 24 and minute < 60:
+            return hour * 60 + minute
+    if mtime is not None:
+        moment = datetime.fromtimestamp(mtime)
+        return moment.hour * 60 + moment.minute
+    return None
+
+
+class _DaySeries:
+    """单日快照时间序列"""
+
+    def __init__(self, date_folder: str):
+        self.date_folder = date_folder
+        self.manifest: tuple = ()
+        self.dir_mtime_ns = 0
+        # [(文件名, 当天分钟数)]，按加入顺序（重试成功的快照排在后面）
+        self.snapshots: List[Tuple[str, int]] = []
+        # (platform_id, title) -> [(快照序号, 排名)]
+        self.appearances: Dict[Tuple[str, str], List[Tuple[int, int]]] = {}
+        # 每个快照中各平台的标题数: [{platform_id: count}]
+        self.platform_counts: List[Dict[str, int]] = []
+
+    def add_snapshot(self, file_name: str, minute: int, titles_by_id: Dict) -> None:
+        """追加一个快照的数据"""
+        snapshot_index = len(self.snapshots)
+        self.snapshots.append((file_name, minute))
+        counts = {}
+        for platform_id, titles in titles_by_id.items():
+            counts[platform_id] = len(titles)
+            for title, info in titles.items():
+                ranks = info.get("ranks") or [1]
+                key = (platform_id, title)
+                entry = self.appearances.get(key)
+                if entry is None:
+                    self.appearances[key] = [(snapshot_index, ranks[0])]
+                else:
+                    entry.append((snapshot_index, ranks[0]))
+        self.platform_counts.append(counts)
+
+    def to_state(self) -> Dict:
+        return {
+            "version": TIMESERIES_VERSION,
+            "date_folder": self.date_folder,
+            "manifest": [list(entry) for entry in self.manifest],
+            "dir_mtime_ns": self.dir_mtime_ns,
+            "snapshots": [list(snapshot) for snapshot in self.snapshots],
+            # JSON 不支持元组键，出现记录保存为 [平台ID, 标题, [[快照序号, 排名], ...]]
+            "appearances": [
+                [platform_id, title, [list(point) for point in points]]
+                for (platform_id, title), points in self.appearances.items()
+            ],
+            "platform_counts": self.platform_counts,
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict) -> "_DaySeries":
+        series = cls(state["date_folder"])
+        series.manifest = tuple(tuple(entry) for entry in state["manifest"])
+        series.dir_mtime_ns = state["dir_mtime_ns"]
+        series.snapshots = [tuple(snapshot) for snapshot in state["snapshots"]]
+        series.appearances = {
+            (platform_id, title): [tuple(point) for point in points]
+            for platform_id, title, points in state["appearances"]
+        }
+        series.platform_counts = state["platform_counts"]
+        return series
+
+
+def parse_bucket_minutes(granularity: str) -> Optional[int]:
+    """
+    解析时间粒度为分钟数
+
+    支持 "hour"、"day"，以及 "15min"、"30m"、"2h"、"6hour"、"1d" 这样的任意桶大小。
+
+    Args:
+        granularity: 时间粒度字符串
+
+    Returns:
+        桶大小（分钟），无法解析时返回 None
+    """
+    value = granularity.strip().lower()
+    if value == "hour":
+        return 60
+    if value == "day":
+        return 24 * 60
+    match = re.match(r'^(\d+)\s*(m|min|mins|minute|minutes|h|hour|hours|d|day|days)$', value)
+    if not match:
+        return None
+    amount = int(match.group(1))
+    if amount <= 0:
+        return None
+    unit = match.group(2)
+    if unit.startswith("m"):
+        return amount
+    if unit.startswith("h"):
+        return amount * 60
+    return amount * 24 * 60
+
+
+class TimeSeriesService:
+    """快照时间序列服务类"""
+
+    def __init__(self, project_root: str = None, max_days: int = DEFAULT_MAX_DAYS):
+        """
+        初始化时间序列服务
+
+        Args:
+            project_root: 项目根目录
+            max_days: 内存中保留的日时间序列数量
+        """
+        self.parser = ParserService(project_root)
+        self.index = get_search_index(self.parser.project_root)
+        self.series_dir = self.parser.project_root / "output" / ".timeseries"
+        self.max_days = max_days
+
+        self._days: "OrderedDict[str, _DaySeries]" = OrderedDict()
+        self._lock = Lock()
+
+        # 统计计数
+        self._queries = 0
+        self._disk_loads = 0
+        self._builds = 0
+        self._snapshot_files_parsed = 0
+
+    def _series_path(self, date_folder: str) -> Path:
+        return self.series_dir / f"{date_folder}.json"
+
+    def _load(self, date_folder: str) -> Optional[_DaySeries]:
+        """从磁盘加载时间序列，版本不匹配或文件损坏时返回 None"""
+        path = self._series_path(date_folder)
+        if not path.exists():
+            return None
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+                record_file_read("timeseries", os.fstat(f.fileno()).st_size)
+            if state.get("version") != TIMESERIES_VERSION:
+                return None
+            self._disk_loads += 1
+            return _DaySeries.from_state(state)
+        except Exception as e:
+            print(f"Warning: 加载时间序列 {path} 失败: {e}")
+            return None
+
+    def _save(self, series: _DaySeries) -> None:
+        """原子写入时间序列"""
+        path = self._series_path(series.date_folder)
+        tmp_path = path.with_suffix(".tmp")
+        try:
+            self.series_dir.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(series.to_state(), f, ensure_ascii=False, separators=(",", ":"))
+            os.replace(tmp_path, path)
+        except Exception as e:
+            print(f"Warning: 保存时间序列 {path} 失败: {e}")
+
+    def _remember(self, date_folder: str, series: _DaySeries) -> None:
+        """放入内存 LRU（写入进程只保留少量日期）"""
+        self._days[date_folder] = series
+        self._days.move_to_end(date_folder)
+        max_days = max_days_for_role(self.max_days)
+        while len(self._days) > max_days:
+            self._days.popitem(last=False)
+
+    def _get_day(self, date: Optional[datetime]) -> _DaySeries:
+        """
+        获取指定日期的最新时间序列
+
+        Raises:
+            DataNotFoundError: 数据不存在
+        """
+        date_folder = self.parser.get_date_folder_name(date)
+        txt_dir = self.parser.project_root / "output" / date_folder / "txt"
+        if not txt_dir.exists():
+            raise DataNotFoundError(
+                f"未找到 {date_folder} 的数据目录",
+                suggestion="请先运行爬虫或检查日期是否正确"
+            )
+        record_day_access(date_folder)
+
+        is_today = (date is None) or (date.date() == datetime.now().date())
+        dir_mtime_ns = txt_dir.stat().st_mtime_ns
+
+        series = self._days.get(date_folder)
+        if series is None:
+            series = self._load(date_folder)
+        if series is not None:
+            self._remember(date_folder, series)
+            if not is_today and series.dir_mtime_ns == dir_mtime_ns:
+                return series
+
+        manifest = self.parser.scan_txt_manifest(txt_dir)
+        if series is not None and series.manifest == manifest:
+            series.dir_mtime_ns = dir_mtime_ns
+            return series
+
+        if not manifest:
+            raise DataNotFoundError(
+                f"{date_folder} 没有数据文件",
+                suggestion="请等待爬虫任务完成"
+            )
+
+        # 已加入的快照都未变化、只是新增了快照（或有上次解析失败的快照）时在原序列上追加，否则重建
+        known = set(series.manifest) if series is not None else set()
+        if series is not None and known.issubset(manifest):
+            new_files = [entry for entry in manifest if entry not in known]
+        else:
+            series = _DaySeries(date_folder)
+            new_files = manifest
+
+        # 清单只记录成功加入的快照，解析失败的快照在之后的查询中重试
+        added = []
+        for entry in new_files:
+            file_name, mtime_ns, _ = entry
+            txt_file = txt_dir / file_name
+            try:
+                titles_by_id, _ = self.parser.parse_txt_file(txt_file)
+            except Exception as e:
+                print(f"Warning: 解析文件 {txt_file} 失败: {e}")
+                continue
+            minute = snapshot_minute(file_name, mtime_ns / 1e9)
+            series.add_snapshot(file_name, minute, titles_by_id)
+            added.append(entry)
+            self._snapshot_files_parsed += 1
+
+        series.manifest = tuple(sorted(series.manifest + tuple(added)))
+        # 有快照解析失败时不记录目录修改时间，历史日期也会在下次查询时重新检查
+        series.dir_mtime_ns = dir_mtime_ns if len(added) == len(new_files) else 0
+        self._builds += 1
+        if get_shared_store_role() != "reader":
+            self._save(series)
+
+        self._remember(date_folder, series)
+        return series
+
+    def topic_series(
+        self,
+        topic: str,
+        start_date: datetime,
+        end_date: datetime,
+        bucket_minutes: int = 60,
+        max_points: int = DEFAULT_MAX_POINTS
+    ) -> Dict:
+        """
+        按时间桶统计话题在各快照中的出现情况
+
+        每个时间桶统计：
+        - count: 桶内出现过的包含话题的不同标题数（不同平台分别计数）
+        - appearances: 桶内所有快照中包含话题的标题出现次数之和
+        - snapshots: 桶内快照数
+        - best_rank / avg_rank: 桶内这些标题的最高排名和平均排名
+
+        Args:
+            topic: 话题关键词（不区分大小写的子串匹配）
+            start_date: 开始日期
+            end_date: 结束日期（包含当天）
+            bucket_minutes: 时间桶大小（分钟）
+            max_points: 最大时间桶数量，超过时按整数倍放大桶大小
+
+        Returns:
+            {"bucket_minutes", "downsampled", "points": [...]}，points 覆盖整个日期范围，
+            没有快照的时间桶 snapshots 为 0
+        """
+        range_start = datetime(start_date.year, start_date.month, start_date.day)
+        range_end = datetime(end_date.year, end_date.month, end_date.day) + timedelta(days=1)
+        total_minutes = int((range_end - range_start).total_seconds() // 60)
+
+        requested_minutes = bucket_minutes
+        if total_minutes // bucket_minutes > max_points:
+            # 降采样：取不小于所需大小、且是原桶大小整数倍的常用桶大小
+            min_minutes = bucket_minutes * -(-total_minutes // (bucket_minutes * max_points))
+            bucket_minutes = next(
+                (size for size in DOWNSAMPLE_BUCKETS
+                 if size >= min_minutes and size % requested_minutes == 0),
+                min_minutes
+            )
+        bucket_count = -(-total_minutes // bucket_minutes)
+
+        buckets = [
+            {"titles": set(), "appearances": 0, "snapshots": 0, "rank_sum": 0, "best_rank": None, "samples": []}
+            for _ in range(bucket_count)
+        ]
+
+        topic_lower = topic.lower()
+        current_date = range_start
+        with self._lock:
+            self._queries += 1
+            while current_date < range_end:
+                day_offset = int((current_date - range_start).total_seconds() // 60)
+                try:
+                    series = self._get_day(current_date)
+                    hits, _ = self.index.search(topic_lower, current_date)
+                except DataNotFoundError:
+                    current_date += timedelta(days=1)
+                    continue
+
+                snapshot_buckets = [
+                    (day_offset + minute) // bucket_minutes if minute is not None else None
+                    for _, minute in series.snapshots
+                ]
+                for bucket_index in snapshot_buckets:
+                    if bucket_index is not None:
+                        buckets[bucket_index]["snapshots"] += 1
+
+                for hit in hits:
+                    key = (hit["platform_id"], hit["title"])
+                    for snapshot_index, rank in series.appearances.get(key, ()):
+                        bucket_index = snapshot_buckets[snapshot_index]
+                        if bucket_index is None:
+                            continue
+                        bucket = buckets[bucket_index]
+                        if key not in bucket["titles"]:
+                            bucket["titles"].add(key)
+                            if len(bucket["samples"]) < SAMPLE_SIZE:
+                                bucket["samples"].append(hit["title"])
+                        bucket["appearances"] += 1
+                        bucket["rank_sum"] += rank
+                        if bucket["best_rank"] is None or rank < bucket["best_rank"]:
+                            bucket["best_rank"] = rank
+
+                current_date += timedelta(days=1)
+
+        points = []
+        for i, bucket in enumerate(buckets):
+            moment = range_start + timedelta(minutes=i * bucket_minutes)
+            appearances = bucket["appearances"]
+            points.append({
+                "time": moment.strftime("%Y-%m-%d %H:%M"),
+                "count": len(bucket["titles"]),
+                "appearances": appearances,
+                "snapshots": bucket["snapshots"],
+                "best_rank": bucket["best_rank"],
+                "avg_rank": round(bucket["rank_sum"] / appearances, 2) if appearances else None,
+                "sample_titles": bucket["samples"],
+            })
+
+        return {
+            "bucket_minutes": bucket_minutes,
+            "requested_bucket_minutes": requested_minutes,
+            "downsampled": bucket_minutes != requested_minutes,
+            "points": points,
+        }
+
+    def platform_hourly_activity(self, date: Optional[datetime]) -> Dict[str, Dict[int, int]]:
+        """
+        统计某天各平台在每个小时内出现在多少个快照中
+
+        Args:
+            date: 日期，None 表示今天
+
+        Returns:
+            {platform_id: {hour: 快照数}}
+
+        Raises:
+            DataNotFoundError: 该日期没有数据
+        """
+        with self._lock:
+            self._queries += 1
+            series = self._get_day(date)
+            activity: Dict[str, Dict[int, int]] = {}
+            for (_, minute), counts in zip(series.snapshots, series.platform_counts):
+                if minute is None:
+                    continue
+                hour = minute // 60
+                for platform_id, count in counts.items():
+                    if count:
+                        hours = activity.setdefault(platform_id, {})
+                        hours[hour] = hours.get(hour, 0) + 1
+            return activity
+
+    def warm(self, date: Optional[datetime] = None) -> None:
+        """
+        预热指定日期的快照时间序列（加载到内存，必要时构建并落盘），供启动预热使用
+
+        Args:
+            date: 日期，None 表示今天
+
+        Raises:
+            DataNotFoundError: 该日期没有数据
+        """
+        with self._lock:
+            self._get_day(date)
+
+    def get_stats(self) -> Dict:
+        """
+        获取时间序列服务统计信息
+
+        Returns:
+            统计信息字典
+        """
+        with self._lock:
+            return {
+                "days_in_memory": len(self._days),
+                "max_days": self.max_days,
+                "queries": self._queries,
+                "disk_loads": self._disk_loads,
+                "builds": self._builds,
+                "snapshot_files_parsed": self._snapshot_files_parsed,
+            }
+
+
+# 全局时间序列服务实例（按项目根目录区分）
+_global_series: Dict[str, TimeSeriesService] = {}
+_global_series_lock = Lock()
+
+
+def get_timeseries_service(project_root: str = None) -> TimeSeriesService:
+    """
+    获取全局时间序列服务实例
+
+    Args:
+        project_root: 项目根目录
+
+    Returns:
+        对应项目根目录的时间序列服务实例
+    """
+    key = str(project_root) if project_root is not None else ""
+    with _global_series_lock:
+        series = _global_series.get(key)
+        if series is None:
+            series = TimeSeriesService(project_root)
+            _global_series[key] = series
+        return series
@@ -0,0 +1,269 @@
+"""
+追踪关键词匹配索引服务
+
+商业航天追踪的检索和提醒原先每次都要读取范围内每一天的全部标题，再逐条逐个关键词匹配。
+这里按天预先计算匹配结果，只保存命中追踪关键词的标题（通常只占千分之一左右）：
+
+- 每天一份：(平台ID, 标题, 排名, URL, 移动端URL, 命中的关键词 ID)
+- 匹配器指纹（关键词及优先级）变化时自动重建
+- 持久化到 output/.tracking_index/，失效判断与 ParserService 一致
+  （多进程模式下服务进程只读取，不落盘）
+- 今天有新快照时只对新出现的标题执行匹配
+"""
+
+import json
+import os
+from collections import OrderedDict
+from datetime import datetime
+from pathlib import Path
+from threading import Lock
+from typing import Dict, List, Optional, Tuple
+
+from ..utils.errors import DataNotFoundError
+from ..utils.keyword_matcher import TieredKeywordMatcher
+from .metrics_service import record_day_access, record_file_read
+from .parser_service import ParserService
+from .shared_store import get_shared_store_role, max_days_for_role
+
+
+TRACKING_INDEX_VERSION = 1
+DEFAULT_MAX_DAYS = 366  # 内存中保留的日匹配结果数量（每天只有少量命中标题）
+
+# (平台ID, 标题, 排名列表, URL, 移动端URL, 命中的关键词 ID)
+MatchItem = Tuple[str, str, List[int], str, str, Tuple[int, ...]]
+
+
+class _DayMatches:
+    """单日匹配结果"""
+
+    def __init__(self, date_folder: str, fingerprint: str):
+        self.date_folder = date_folder
+        self.fingerprint = fingerprint
+        self.manifest: tuple = ()
+        self.dir_mtime_ns = 0
+        self.id_to_name: Dict[str, str] = {}
+        self.items: List[MatchItem] = []
+        self.titles_total = 0
+        # 标题 -> 命中的关键词 ID（只为今天保留在内存中，用于增量更新）
+        self.memo: Optional[Dict[str, Tuple[int, ...]]] = None
+
+    def to_state(self) -> Dict:
+        return {
+            "version": TRACKING_INDEX_VERSION,
+            "date_folder": self.date_folder,
+            "fingerprint": self.fingerprint,
+            "manifest": self.manifest,
+            "dir_mtime_ns": self.dir_mtime_ns,
+            "id_to_name": self.id_to_name,
+            "titles_total": self.titles_total,
+            "items": self.items,
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict) -> "_DayMatches":
+        day = cls(state["date_folder"], state["fingerprint"])
+        day.manifest = tuple(tuple(entry) for entry in state["manifest"])
+        day.dir_mtime_ns = state["dir_mtime_ns"]
+        day.id_to_name = state["id_to_name"]
+        day.titles_total = state["titles_total"]
+        day.items = [
+            (platform_id, title, ranks, url, mobile_url, tuple(keyword_ids))
+            for platform_id, title, ranks, url, mobile_url, keyword_ids in state["items"]
+        ]
+        return day
+
+
+class TrackingIndexService:
+    """追踪关键词匹配索引服务类"""
+
+    def __init__(self, project_root: str = None, max_days: int = DEFAULT_MAX_DAYS):
+        """
+        初始化匹配索引服务
+
+        Args:
+            project_root: 项目根目录
+            max_days: 内存中保留的日匹配结果数量
+        """
+        self.parser = ParserService(project_root)
+        self.index_dir = self.parser.project_root / "output" / ".tracking_index"
+        self.max_days = max_days
+
+        self._days: "OrderedDict[str, _DayMatches]" = OrderedDict()
+        self._lock = Lock()
+
+        # 统计计数
+        self._queries = 0
+        self._disk_loads = 0
+        self._builds = 0
+        self._titles_matched = 0
+
+    def _index_path(self, date_folder: str) -> Path:
+        return self.index_dir / f"{date_folder}.json"
+
+    def _load(self, date_folder: str, fingerprint: str) -> Optional[_DayMatches]:
+        """从磁盘加载匹配结果，版本或匹配器不一致、文件损坏时返回 None"""
+        path = self._index_path(date_folder)
+        if not path.exists():
+            return None
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+                record_file_read("tracking_index", os.fstat(f.fileno()).st_size)
+            if state.get("version") != TRACKING_INDEX_VERSION or state.get("fingerprint") != fingerprint:
+                return None
+            self._disk_loads += 1
+            return _DayMatches.from_state(state)
+        except Exception as e:
+            print(f"Warning: 加载追踪匹配索引 {path} 失败: {e}")
+            return None
+
+    def _save(self, day: _DayMatches) -> None:
+        """原子写入匹配结果"""
+        path = self._index_path(day.date_folder)
+        tmp_path = path.with_suffix(".tmp")
+        try:
+            self.index_dir.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(day.to_state(), f, ensure_ascii=False, separators=(",", ":"))
+            os.replace(tmp_path, path)
+        except Exception as e:
+            print(f"Warning: 保存追踪匹配索引 {path} 失败: {e}")
+
+    def _remember(self, date_folder: str, day: _DayMatches) -> None:
+        """放入内存 LRU"""
+        self._days[date_folder] = day
+        self._days.move_to_end(date_folder)
+        max_days = max_days_for_role(self.max_days)
+        while len(self._days) > max_days:
+            self._days.popitem(last=False)
+
+    def _get_day(self, date: Optional[datetime], matcher: TieredKeywordMatcher) -> _DayMatches:
+        """
+        获取指定日期的最新匹配结果
+
+        Raises:
+            DataNotFoundError: 数据不存在
+        """
+        date_folder = self.parser.get_date_folder_name(date)
+        txt_dir = self.parser.project_root / "output" / date_folder / "txt"
+        if not txt_dir.exists():
+            raise DataNotFoundError(
+                f"未找到 {date_folder} 的数据目录",
+                suggestion="请先运行爬虫或检查日期是否正确"
+            )
+        record_day_access(date_folder)
+
+        is_today = (date is None) or (date.date() == datetime.now().date())
+        dir_mtime_ns = txt_dir.stat().st_mtime_ns
+
+        day = self._days.get(date_folder)
+        if day is None or day.fingerprint != matcher.fingerprint:
+            day = self._load(date_folder, matcher.fingerprint)
+        if day is not None:
+            self._remember(date_folder, day)
+            if not is_today and day.dir_mtime_ns == dir_mtime_ns:
+                return day
+
+        manifest = self.parser.scan_txt_manifest(txt_dir)
+        if day is not None and day.manifest == manifest:
+            day.dir_mtime_ns = dir_mtime_ns
+            return day
+
+        # 标题合并（排名、URL）沿用 ParserService 的结果，今天只匹配新出现的标题
+        all_titles, id_to_name, _ = self.parser.read_all_titles_for_date(date=date)
+        memo = (day.memo if day is not None else None) or {}
+
+        rebuilt = _DayMatches(date_folder, matcher.fingerprint)
+        for platform_id, titles in all_titles.items():
+            for title, info in titles.items():
+                keyword_ids = memo.get(title)
+                if keyword_ids is None:
+                    keyword_ids = matcher.match(title)
+                    memo[title] = keyword_ids
+                    self._titles_matched += 1
+                if keyword_ids:
+                    rebuilt.items.append((
+                        platform_id,
+                        title,
+                        list(info.get("ranks", [])),
+                        info.get("url", ""),
+                        info.get("mobileUrl", ""),
+                        keyword_ids
+                    ))
+                rebuilt.titles_total += 1
+
+        rebuilt.id_to_name = dict(id_to_name)
+        rebuilt.manifest = manifest
+        rebuilt.dir_mtime_ns = dir_mtime_ns
+        rebuilt.memo = memo if is_today else None
+        self._builds += 1
+        if get_shared_store_role() != "reader":
+            self._save(rebuilt)
+
+        self._remember(date_folder, rebuilt)
+        return rebuilt
+
+    def get_matches(
+        self,
+        date: Optional[datetime],
+        matcher: TieredKeywordMatcher
+    ) -> Tuple[List[MatchItem], Dict[str, str]]:
+        """
+        获取指定日期命中追踪关键词的标题
+
+        Args:
+            date: 日期，None 表示今天
+            matcher: 追踪关键词匹配器
+
+        Returns:
+            (命中标题列表, 平台ID到名称的映射)
+
+        Raises:
+            DataNotFoundError: 该日期没有数据
+        """
+        with self._lock:
+            self._queries += 1
+            day = self._get_day(date, matcher)
+            return list(day.items), dict(day.id_to_name)
+
+    def get_stats(self) -> Dict:
+        """
+        获取匹配索引统计信息
+
+        Returns:
+            统计信息字典
+        """
+        with self._lock:
+            return {
+                "days_in_memory": len(self._days),
+                "max_days": self.max_days,
+                "matched_titles_in_memory": sum(len(day.items) for day in self._days.values()),
+                "queries": self._queries,
+                "disk_loads": self._disk_loads,
+                "builds": self._builds,
+                "titles_matched": self._titles_matched,
+            }
+
+
+# 全局匹配索引服务实例（按项目根目录区分）
+_global_tracking_indexes: Dict[str, TrackingIndexService] = {}
+_global_tracking_indexes_lock = Lock()
+
+
+def get_tracking_index(project_root: str = None) -> TrackingIndexService:
+    """
+    获取全局追踪关键词匹配索引服务实例
+
+    Args:
+        project_root: 项目根目录
+
+    Returns:
+        对应项目根目录的匹配索引服务实例
+    """
+    key = str(ParserService(project_root).project_root)
+    with _global_tracking_indexes_lock:
+        service = _global_tracking_indexes.get(key)
+        if service is None:
+            service = TrackingIndexService(project_root)
+            _global_tracking_indexes[key] = service
+        return service
@@ -0,0 +1,327 @@
+"""
+启动预热服务
+
+MCP 服务器启动后，每类查询第一次执行时都要解析当天的快照文件、构建索引和汇总表。
+这里在后台线程中预先完成这些工作，不阻塞服务就绪：
+
+- 按 config.yaml 的 mcp.warmup 配置，预热最近 N 个有数据的日期（包含今天）
+- 每个日期依次预热：解析缓存 -> 标题倒排索引 -> 关键词汇总 -> 快照时间序列
+- 从最新的日期开始，优先保证最常用的数据
+- 进度和状态通过 get_system_status 的 warmup 字段查看
+- 多进程模式下由主进程（共享存储写入方）运行：预热全部历史并导出共享文件，
+  之后按固定间隔重新检查，及时导出新快照，状态同时写入共享存储状态文件
+"""
+
+import re
+import time
+from datetime import datetime
+from threading import Event, Lock, Thread
+from typing import Callable, Dict, List, Optional, Tuple
+
+from ..utils.errors import DataNotFoundError
+from .parser_service import ParserService
+from .shared_store import get_shared_store_role, write_writer_status
+
+
+DEFAULT_WARMUP_CONFIG = {
+    "enabled": True,
+    "days": 7,
+    "search_index": True,
+    "keyword_rollups": True,
+    "timeseries": True,
+    "refresh_interval": 60,
+}
+
+MAX_RECORDED_ERRORS = 20
+
+_DATE_FOLDER_PATTERN = re.compile(r'(\d{4})年(\d{2})月(\d{2})日$')
+
+
+class WarmupService:
+    """启动预热服务类"""
+
+    def __init__(self, project_root: str = None):
+        """
+        初始化预热服务
+
+        Args:
+            project_root: 项目根目录
+        """
+        self.parser = ParserService(project_root)
+        self.project_root = self.parser.project_root
+
+        self._lock = Lock()
+        self._thread: Optional[Thread] = None
+        self._state = "pending"
+        self._config: Dict = dict(DEFAULT_WARMUP_CONFIG)
+        self._dates: List[str] = []
+        self._total_steps = 0
+        self._completed_steps = 0
+        self._current: Optional[str] = None
+        self._started_at: Optional[float] = None
+        self._finished_at: Optional[float] = None
+        self._errors: List[str] = []
+        self._days_override: Optional[int] = None
+        self._refresh_interval = 0.0
+        self._refreshes = 0
+        self._stop = Event()
+        self._finished = Event()
+        # 定期重新检查时跳过目录未变化的历史日期: 日期 -> txt 目录 mtime
+        self._dir_mtimes: Dict[datetime, int] = {}
+
+    def load_config(self) -> Dict:
+        """
+        读取 config.yaml 中的 mcp.warmup 配置（缺失的字段使用默认值）
+
+        Returns:
+            预热配置字典
+        """
+        config = dict(DEFAULT_WARMUP_CONFIG)
+        try:
+            config_data = self.parser.parse_yaml_config() or {}
+            warmup_config = (config_data.get("mcp") or {}).get("warmup") or {}
+            for key in config:
+                if key in warmup_config:
+                    config[key] = warmup_config[key]
+        except Exception as e:
+            print(f"Warning: 读取预热配置失败，使用默认配置: {e}")
+
+        for key, cast in (("days", int), ("refresh_interval", float)):
+            try:
+                config[key] = max(cast(0), cast(config[key]))
+            except (TypeError, ValueError):
+                config[key] = DEFAULT_WARMUP_CONFIG[key]
+        return config
+
+    def _select_dates(self, days: Optional[int]) -> List[datetime]:
+        """选取最近 days 个有数据的日期（不晚于今天，None 表示全部），按从新到旧排序"""
+        output_dir = self.project_root / "output"
+        if not output_dir.exists() or (days is not None and days <= 0):
+            return []
+
+        today = datetime.now().date()
+        dates = []
+        for entry in output_dir.iterdir():
+            match = _DATE_FOLDER_PATTERN.match(entry.name)
+            if not match or not (entry / "txt").is_dir():
+                continue
+            try:
+                date = datetime(int(match.group(1)), int(match.group(2)), int(match.group(3)))
+            except ValueError:
+                continue
+            if date.date() <= today:
+                dates.append(date)
+
+        dates.sort(reverse=True)
+        return dates if days is None else dates[:days]
+
+    def _stages(self, config: Dict) -> List[Tuple[str, Callable[[datetime], None]]]:
+        """按配置生成每个日期需要执行的预热步骤"""
+        # 索引、汇总表和时间序列服务在预热线程中才导入，不计入服务器启动时间
+        from .index_service import get_search_index
+        from .rollup_service import get_rollup_service
+        from .timeseries_service import get_timeseries_service
+
+        stages = []
+        # 写入进程不对外服务，无需填充自己的解析缓存
+        if get_shared_store_role() != "writer":
+            stages.append(("parse", lambda date: self.parser.read_all_titles_for_date(date=date)))
+        if config["search_index"]:
+            stages.append(("search_index", get_search_index(self.project_root).warm))
+        if config["keyword_rollups"]:
+            stages.append(("keyword_rollups", get_rollup_service(self.project_root).warm))
+        if config["timeseries"]:
+            stages.append(("timeseries", get_timeseries_service(self.project_root).warm))
+        return stages
+
+    def start(self, enabled: bool = True, shared_writer: bool = False) -> bool:
+        """
+        启动后台预热（已启动或配置禁用时不做任何事）
+
+        Args:
+            enabled: 为 False 时只把状态记为 disabled（对应命令行 --no-warmup）
+            shared_writer: 是否作为共享存储写入方运行：预热全部历史日期，
+                首轮完成后按 refresh_interval 定期重新检查（不受 enabled 配置影响）
+
+        Returns:
+            是否启动了新的预热线程
+        """
+        with self._lock:
+            if self._thread is not None:
+                return False
+
+            self._config = self.load_config()
+            if shared_writer:
+                self._config["enabled"] = True
+                self._days_override = None
+                self._refresh_interval = self._config["refresh_interval"]
+            else:
+                self._days_override = self._config["days"]
+            if not enabled and not shared_writer:
+                self._config["enabled"] = False
+            if not self._config["enabled"]:
+                self._state = "disabled"
+                return False
+
+            self._state = "running"
+            self._started_at = time.time()
+            self._thread = Thread(target=self._run, name="mcp-warmup", daemon=True)
+            self._thread.start()
+            return True
+
+    def _run(self) -> None:
+        try:
+            stages = self._stages(self._config)
+            dates = self._select_dates(self._days_override)
+            with self._lock:
+                self._dates = [date.strftime("%Y-%m-%d") for date in dates]
+                self._total_steps = len(dates) * len(stages)
+
+            for date in dates:
+                self._warm_date(date, stages, count_progress=True)
+                self._publish()
+
+            with self._lock:
+                self._state = "completed"
+        except Exception as e:
+            self._record_error(str(e))
+            with self._lock:
+                self._state = "failed"
+        finally:
+            with self._lock:
+                self._current = None
+                self._finished_at = time.time()
+            self._publish()
+            self._finished.set()
+
+        if self._state == "completed" and self._refresh_interval > 0:
+            self._refresh_loop(stages)
+
+    def _txt_dir_mtime(self, date: datetime) -> Optional[int]:
+        txt_dir = self.project_root / "output" / self.parser.get_date_folder_name(date) / "txt"
+        try:
+            return txt_dir.stat().st_mtime_ns
+        except OSError:
+            return None
+
+    def _warm_date(self, date: datetime, stages, count_progress: bool = False) -> None:
+        date_str = date.strftime("%Y-%m-%d")
+        self._dir_mtimes[date] = self._txt_dir_mtime(date)
+        for stage_name, warm in stages:
+            with self._lock:
+                self._current = f"{date_str} {stage_name}"
+            try:
+                warm(date)
+            except DataNotFoundError:
+                pass
+            except Exception as e:
+                self._record_error(f"{date_str} {stage_name}: {e}")
+            if count_progress:
+                with self._lock:
+                    self._completed_steps += 1
+        with self._lock:
+            self._current = None
+
+    def _refresh_loop(self, stages) -> None:
+        """定期重新检查（历史日期只比较目录 mtime，开销很小），导出新快照和新日期"""
+        while not self._stop.wait(self._refresh_interval):
+            try:
+                today = datetime.now().date()
+                for date in self._select_dates(self._days_override):
+                    if date.date() != today and self._dir_mtimes.get(date) == self._txt_dir_mtime(date):
+                        continue
+                    self._warm_date(date, stages)
+                with self._lock:
+                    self._refreshes += 1
+            except Exception as e:
+                self._record_error(f"refresh: {e}")
+            self._publish()
+
+    def stop(self) -> None:
+        """停止定期重新检查（不会中断正在进行的一轮）"""
+        self._stop.set()
+
+    def _publish(self) -> None:
+        """写入进程把状态记录到共享存储状态文件"""
+        if get_shared_store_role() == "writer":
+            write_writer_status(self.project_root / "output", {"warmup": self.get_status()})
+
+    def _record_error(self, message: str) -> None:
+        print(f"Warning: 预热失败 {message}")
+        with self._lock:
+            if len(self._errors) < MAX_RECORDED_ERRORS:
+                self._errors.append(message)
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        等待首轮预热结束（不等待之后的定期重新检查）
+
+        Args:
+            timeout: 最长等待秒数，None 表示一直等待
+
+        Returns:
+            首轮预热是否已结束
+        """
+        if self._thread is None:
+            return True
+        return self._finished.wait(timeout)
+
+    def get_status(self) -> Dict:
+        """
+        获取预热状态
+
+        Returns:
+            状态字典：state 为 pending（未启动）/ disabled / running / completed / failed，
+            ready 表示预热已结束（不论成功与否，服务本身始终可用）
+        """
+        with self._lock:
+            if self._finished_at is not None and self._started_at is not None:
+                elapsed = self._finished_at - self._started_at
+            elif self._started_at is not None:
+                elapsed = time.time() - self._started_at
+            else:
+                elapsed = 0.0
+
+            return {
+                "state": self._state,
+                "ready": self._state in ("disabled", "completed", "failed"),
+                "config": dict(self._config),
+                "dates": list(self._dates),
+                "progress": {
+                    "completed_steps": self._completed_steps,
+                    "total_steps": self._total_steps,
+                    "percent": (
+                        round(self._completed_steps * 100 / self._total_steps, 1)
+                        if self._total_steps else (100.0 if self._state == "completed" else 0.0)
+                    ),
+                },
+                "current": self._current,
+                "refresh_interval": self._refresh_interval,
+                "refreshes": self._refreshes,
+                "elapsed_seconds": round(elapsed, 3),
+                "errors": list(self._errors),
+            }
+
+
+# 全局预热服务实例（按项目根目录区分）
+_global_warmups: Dict[str, WarmupService] = {}
+_global_warmups_lock = Lock()
+
+
+def get_warmup_service(project_root: str = None) -> WarmupService:
+    """
+    获取全局预热服务实例
+
+    Args:
+        project_root: 项目根目录
+
+    Returns:
+        对应项目根目录的预热服务实例
+    """
+    key = str(ParserService(project_root).project_root)
+    with _global_warmups_lock:
+        service = _global_warmups.get(key)
+        if service is None:
+            service = WarmupService(project_root)
+            _global_warmups[key] = service
+        return service
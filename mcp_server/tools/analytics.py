@@ -4,13 +4,16 @@
 提供热度趋势分析、平台对比、关键词共现、情感分析等高级分析功能。
 """
 
-import re
 from collections import Counter, defaultdict
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional
 from difflib import SequenceMatcher
 
+from ..services.cooccurrence_service import CooccurrenceEngine
 from ..services.data_service import DataService
+from ..services.index_service import get_search_index
+from ..services.rollup_service import get_rollup_service
+from ..services.timeseries_service import get_timeseries_service, parse_bucket_minutes
 from ..utils.validators import (
     validate_platforms,
     validate_limit,
@@ -19,6 +22,8 @@ from ..utils.validators import (
     validate_date_range
 )
 from ..utils.errors import MCPError, InvalidParameterError, DataNotFoundError
+from ..utils.keywords import extract_title_keywords
+from ..utils.pagination import TopKCollector, decode_cursor, pagination_info, query_fingerprint
 
 
 def calculate_news_weight(news_data: Dict, rank_threshold: int = 5) -> float:
@@ -104,6 +109,7 @@ class AnalyticsTools:
                 - "keyword_cooccur": 关键词共现分析（分析关键词同时出现的模式）
             topic: 话题关键词（可选，platform_compare模式适用）
             date_range: 日期范围，格式: {"start": "YYYY-MM-DD", "end": "YYYY-MM-DD"}
+                       （platform_activity / keyword_cooccur 模式，默认今天）
             min_frequency: 最小共现频次（keyword_cooccur模式），默认3
             top_n: 返回TOP N结果（keyword_cooccur模式），默认20
 
@@ -136,7 +142,8 @@ class AnalyticsTools:
             else:  # keyword_cooccur
                 return self.analyze_keyword_cooccurrence(
                     min_frequency=min_frequency,
-                    top_n=top_n
+                    top_n=top_n,
+                    date_range=date_range
                 )
 
         except MCPError as e:
@@ -177,7 +184,7 @@ class AnalyticsTools:
             date_range: 日期范围（trend和lifecycle模式），可选
                        - **格式**: {"start": "YYYY-MM-DD", "end": "YYYY-MM-DD"}
                        - **默认**: 不指定时默认分析最近7天
-            granularity: 时间粒度（trend模式），默认"day"（hour/day）
+            granularity: 时间粒度（trend模式），默认"day"，支持 "hour" 或 "15min"、"6h" 等任意时间桶
             threshold: 热度突增倍数阈值（viral模式），默认3.0
             time_window: 检测时间窗口小时数（viral模式），默认24
             lookahead_hours: 预测未来小时数（predict模式），默认6
@@ -255,7 +262,11 @@ class AnalyticsTools:
             date_range: 日期范围（可选）
                        - **格式**: {"start": "YYYY-MM-DD", "end": "YYYY-MM-DD"}
                        - **默认**: 不指定时默认分析最近7天
-            granularity: 时间粒度，仅支持 day（天）
+            granularity: 时间粒度
+                       - "day": 按天统计（默认）
+                       - "hour": 按小时统计（基于每次爬取的快照）
+                       - 任意桶大小，如 "15min"、"30m"、"6h"、"2d"
+                       - 时间桶超过 500 个时自动放大桶大小（降采样）
 
         Returns:
             趋势分析结果字典
@@ -288,12 +299,12 @@ class AnalyticsTools:
             # 验证参数
             topic = validate_keyword(topic)
 
-            # 验证粒度参数（只支持day）
-            if granularity != "day":
-                from ..utils.errors import InvalidParameterError
+            # 验证粒度参数
+            bucket_minutes = parse_bucket_minutes(granularity)
+            if bucket_minutes is None:
                 raise InvalidParameterError(
                     f"不支持的粒度参数: {granularity}",
-                    suggestion="当前仅支持 'day' 粒度，因为底层数据按天聚合"
+                    suggestion="支持 'day'、'hour' 或 '15min'、'30m'、'6h' 这样的时间桶大小"
                 )
 
             # 处理日期范围（不指定时默认最近7天）
@@ -306,30 +317,26 @@ class AnalyticsTools:
                 end_date = datetime.now()
                 start_date = end_date - timedelta(days=6)
 
+            # 小于一天的粒度基于快照时间序列统计
+            if granularity != "day":
+                return self._get_topic_trend_by_snapshot(
+                    topic, start_date, end_date, granularity, bucket_minutes
+                )
+
             # 收集趋势数据
             trend_data = []
             current_date = start_date
+            index = get_search_index(self.data_service.parser.project_root)
 
             while current_date <= end_date:
                 try:
-                    all_titles, _, _ = self.data_service.parser.read_all_titles_for_date(
-                        date=current_date
-                    )
-
-                    # 统计该时间点的话题出现次数
-                    count = 0
-                    matched_titles = []
-
-                    for _, titles in all_titles.items():
-                        for title in titles.keys():
-                            if topic.lower() in title.lower():
-                                count += 1
-                                matched_titles.append(title)
+                    # 统计该时间点的话题出现次数（通过倒排索引，无需遍历标题）
+                    count, matched_titles = index.count(topic, current_date, sample_size=3)
 
                     trend_data.append({
                         "date": current_date.strftime("%Y-%m-%d"),
                         "count": count,
-                        "sample_titles": matched_titles[:3]  # 只保留前3个样本
+                        "sample_titles": matched_titles  # 只保留前3个样本
                     })
 
                 except DataNotFoundError:
@@ -399,6 +406,68 @@ class AnalyticsTools:
                 }
             }
 
+    def _get_topic_trend_by_snapshot(
+        self,
+        topic: str,
+        start_date: datetime,
+        end_date: datetime,
+        granularity: str,
+        bucket_minutes: int
+    ) -> Dict:
+        """
+        基于快照时间序列的话题趋势（小时或任意时间桶）
+
+        Args:
+            topic: 话题关键词
+            start_date: 开始日期
+            end_date: 结束日期
+            granularity: 用户请求的时间粒度
+            bucket_minutes: 时间桶大小（分钟）
+
+        Returns:
+            趋势分析结果字典（结构与按天统计一致，trend_data 以 time 标识时间桶）
+        """
+        series = get_timeseries_service(self.data_service.parser.project_root).topic_series(
+            topic, start_date, end_date, bucket_minutes=bucket_minutes
+        )
+        trend_data = series["points"]
+
+        counts = [item["count"] for item in trend_data]
+        first_non_zero = next((c for c in counts if c > 0), 0)
+        last_count = counts[-1] if counts else 0
+        change_rate = ((last_count - first_non_zero) / first_non_zero) * 100 if first_non_zero > 0 else 0
+        max_count = max(counts) if counts else 0
+        peak_time = trend_data[counts.index(max_count)]["time"] if max_count > 0 else None
+
+        result = {
+            "success": True,
+            "topic": topic,
+            "date_range": {
+                "start": start_date.strftime("%Y-%m-%d"),
+                "end": end_date.strftime("%Y-%m-%d"),
+                "total_days": (end_date - start_date).days + 1
+            },
+            "granularity": granularity,
+            "bucket_minutes": series["bucket_minutes"],
+            "trend_data": trend_data,
+            "statistics": {
+                "total_mentions": sum(counts),
+                "average_mentions": round(sum(counts) / len(counts), 2) if counts else 0,
+                "peak_count": max_count,
+                "peak_time": peak_time,
+                "change_rate": round(change_rate, 2)
+            },
+            "trend_direction": "上升" if change_rate > 10 else "下降" if change_rate < -10 else "稳定"
+        }
+
+        if series["downsampled"]:
+            result["note"] = (
+                f"时间桶数量过多，已从 {series['requested_bucket_minutes']} 分钟"
+                f"降采样为 {series['bucket_minutes']} 分钟"
+            )
+
+        return result
+
     def compare_platforms(
         self,
         topic: Optional[str] = None,
@@ -526,14 +595,19 @@ class AnalyticsTools:
     def analyze_keyword_cooccurrence(
         self,
         min_frequency: int = 3,
-        top_n: int = 20
+        top_n: int = 20,
+        date_range: Optional[Dict[str, str]] = None
     ) -> Dict:
         """
         关键词共现分析 - 分析哪些关键词经常同时出现
 
+        共现次数为同时包含两个关键词的标题数，由共现引擎一次遍历统计，
+        样本标题通过倒排表求交集获得。
+
         Args:
             min_frequency: 最小共现频次
             top_n: 返回TOP N关键词对
+            date_range: 日期范围（可选，默认今天）
 
         Returns:
             关键词共现分析结果
@@ -543,12 +617,14 @@ class AnalyticsTools:
             - "分析一下哪些关键词经常一起出现"
             - "看看'人工智能'经常和哪些词一起出现"
             - "找出今天新闻中的关键词关联"
+            - "分析最近一周的关键词共现"
 
             代码调用示例：
             >>> tools = AnalyticsTools()
             >>> result = tools.analyze_keyword_cooccurrence(
             ...     min_frequency=5,
-            ...     top_n=15
+            ...     top_n=15,
+            ...     date_range={"start": "2025-11-01", "end": "2025-11-07"}
             ... )
             >>> print(result['cooccurrence_pairs'])
         """
@@ -557,53 +633,43 @@ class AnalyticsTools:
             min_frequency = validate_limit(min_frequency, default=3, max_limit=100)
             top_n = validate_top_n(top_n, default=20)
 
-            # 读取今天的数据
-            all_titles, _, _ = self.data_service.parser.read_all_titles_for_date()
+            date_range_tuple = validate_date_range(date_range)
 
-            # 关键词共现统计
-            cooccurrence = Counter()
-            keyword_titles = defaultdict(list)
+            # 确定日期范围
+            if date_range_tuple:
+                start_date, end_date = date_range_tuple
+            else:
+                start_date = end_date = datetime.now()
 
-            for platform_id, titles in all_titles.items():
-                for title in titles.keys():
-                    # 提取关键词
-                    keywords = self._extract_keywords(title)
-
-                    # 记录每个关键词出现的标题
-                    for kw in keywords:
-                        keyword_titles[kw].append(title)
-
-                    # 计算两两共现
-                    if len(keywords) >= 2:
-                        for i, kw1 in enumerate(keywords):
-                            for kw2 in keywords[i+1:]:
-                                # 统一排序，避免重复
-                                pair = tuple(sorted([kw1, kw2]))
-                                cooccurrence[pair] += 1
-
-            # 过滤低频共现
-            filtered_pairs = [
-                (pair, count) for pair, count in cooccurrence.items()
-                if count >= min_frequency
-            ]
-
-            # 排序并取TOP N
-            top_pairs = sorted(filtered_pairs, key=lambda x: x[1], reverse=True)[:top_n]
+            # 逐天把标题加入共现引擎
+            engine = CooccurrenceEngine()
+            days_with_data = 0
+            current_date = start_date
+            while current_date <= end_date:
+                try:
+                    all_titles, _, _ = self.data_service.parser.read_all_titles_for_date(
+                        date=current_date
+                    )
+                    engine.add_titles(all_titles)
+                    days_with_data += 1
+                except DataNotFoundError:
+                    pass
+                current_date += timedelta(days=1)
+
+            if days_with_data == 0:
+                raise DataNotFoundError(
+                    f"未找到 {start_date.strftime('%Y-%m-%d')} 至 {end_date.strftime('%Y-%m-%d')} 的新闻数据",
+                    suggestion="请先运行爬虫或检查日期范围是否正确"
+                )
 
             # 构建结果
             result_pairs = []
-            for (kw1, kw2), count in top_pairs:
-                # 找出同时包含两个关键词的标题样本
-                titles_with_both = [
-                    title for title in keyword_titles[kw1]
-                    if kw2 in self._extract_keywords(title)
-                ]
-
+            for kw1, kw2, count in engine.top_pairs(min_frequency, top_n):
                 result_pairs.append({
                     "keyword1": kw1,
                     "keyword2": kw2,
                     "cooccurrence_count": count,
-                    "sample_titles": titles_with_both[:3]
+                    "sample_titles": engine.sample_titles(kw1, kw2, limit=3)
                 })
 
             return {
@@ -611,6 +677,11 @@ class AnalyticsTools:
                 "cooccurrence_pairs": result_pairs,
                 "total_pairs": len(result_pairs),
                 "min_frequency": min_frequency,
+                "date_range": {
+                    "start": start_date.strftime("%Y-%m-%d"),
+                    "end": end_date.strftime("%Y-%m-%d")
+                },
+                "total_titles": len(engine.titles),
                 "generated_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
             }
 
@@ -635,7 +706,8 @@ class AnalyticsTools:
         date_range: Optional[Dict[str, str]] = None,
         limit: int = 50,
         sort_by_weight: bool = True,
-        include_url: bool = False
+        include_url: bool = False,
+        cursor: Optional[str] = None
     ) -> Dict:
         """
         情感倾向分析 - 生成用于 AI 情感分析的结构化提示词
@@ -650,6 +722,7 @@ class AnalyticsTools:
             limit: 返回新闻数量限制，默认50，最大100
             sort_by_weight: 是否按权重排序，默认True（推荐）
             include_url: 是否包含URL链接，默认False（节省token）
+            cursor: 分页游标（可选），传入上一页返回的 pagination.next_cursor 获取下一页
 
         Returns:
             包含 AI 提示词和新闻数据的结构化结果
@@ -691,8 +764,17 @@ class AnalyticsTools:
                 # 默认今天
                 start_date = end_date = datetime.now()
 
-            # 收集新闻数据（支持多天）
-            all_news_items = []
+            fingerprint = query_fingerprint(
+                "analyze_sentiment", topic=topic, platforms=platforms,
+                start=start_date.strftime("%Y-%m-%d"), end=end_date.strftime("%Y-%m-%d"),
+                sort_by_weight=sort_by_weight, include_url=include_url
+            )
+            after_key, _ = decode_cursor(cursor, fingerprint)
+
+            # 收集新闻数据（支持多天）。同一平台的同一标题只保留一次，多天出现时合并 ranks，
+            # 这里只保存紧凑的 [平台名, 标题, ranks, 日期, url, mobileUrl]，当前页再生成字典
+            unique_news: Dict[str, list] = {}
+            total_items = 0
             current_date = start_date
 
             while current_date <= end_date:
@@ -701,6 +783,7 @@ class AnalyticsTools:
                         date=current_date,
                         platform_ids=platforms
                     )
+                    date_str = current_date.strftime("%Y-%m-%d")
 
                     # 收集该日期的新闻
                     for platform_id, titles in all_titles.items():
@@ -710,20 +793,18 @@ class AnalyticsTools:
                             if topic and topic.lower() not in title.lower():
                                 continue
 
-                            news_item = {
-                                "platform": platform_name,
-                                "title": title,
-                                "ranks": info.get("ranks", []),
-                                "count": len(info.get("ranks", [])),
-                                "date": current_date.strftime("%Y-%m-%d")
-                            }
-
-                            # 条件性添加 URL 字段
-                            if include_url:
-                                news_item["url"] = info.get("url", "")
-                                news_item["mobileUrl"] = info.get("mobileUrl", "")
-
-                            all_news_items.append(news_item)
+                            total_items += 1
+                            ranks = info.get("ranks", [])
+                            key = f"{platform_name}::{title}"
+                            entry = unique_news.get(key)
+                            if entry is None:
+                                # 复制 ranks，避免合并时修改解析缓存中的列表
+                                unique_news[key] = [
+                                    platform_name, title, list(ranks), date_str,
+                                    info.get("url", ""), info.get("mobileUrl", "")
+                                ]
+                            else:
+                                entry[2].extend(ranks)
 
                 except DataNotFoundError:
                     # 该日期没有数据，继续下一天
@@ -732,36 +813,38 @@ class AnalyticsTools:
                 # 下一天
                 current_date += timedelta(days=1)
 
-            if not all_news_items:
+            if not unique_news:
                 time_desc = "今天" if start_date == end_date else f"{start_date.strftime('%Y-%m-%d')} 至 {end_date.strftime('%Y-%m-%d')}"
                 raise DataNotFoundError(
                     f"未找到相关新闻（{time_desc}）",
                     suggestion="请尝试其他话题、日期范围或平台"
                 )
 
-            # 去重（同一标题只保留一次）
-            unique_news = {}
-            for item in all_news_items:
-                key = f"{item['platform']}::{item['title']}"
-                if key not in unique_news:
-                    unique_news[key] = item
+            # 排序键：按权重降序（可选），再按首次出现顺序
+            collector = TopKCollector(limit, after_key)
+            for position, entry in enumerate(unique_news.values()):
+                if sort_by_weight:
+                    weight = calculate_news_weight({"ranks": entry[2], "count": len(entry[2])})
+                    collector.add((-weight, position), entry)
                 else:
-                    # 合并 ranks（如果同一新闻在多天出现）
-                    existing = unique_news[key]
-                    existing["ranks"].extend(item["ranks"])
-                    existing["count"] = len(existing["ranks"])
-
-            deduplicated_news = list(unique_news.values())
+                    collector.add((position,), entry)
+
+            selected_news = []
+            for _, (platform_name, title, ranks, date_str, url, mobile_url) in collector.page():
+                news_item = {
+                    "platform": platform_name,
+                    "title": title,
+                    "ranks": ranks,
+                    "count": len(ranks),
+                    "date": date_str
+                }
 
-            # 按权重排序（如果启用）
-            if sort_by_weight:
-                deduplicated_news.sort(
-                    key=lambda x: calculate_news_weight(x),
-                    reverse=True
-                )
+                # 条件性添加 URL 字段
+                if include_url:
+                    news_item["url"] = url
+                    news_item["mobileUrl"] = mobile_url
 
-            # 限制返回数量
-            selected_news = deduplicated_news[:limit]
+                selected_news.append(news_item)
 
             # 生成 AI 提示词
             ai_prompt = self._create_sentiment_analysis_prompt(
@@ -779,10 +862,10 @@ class AnalyticsTools:
                 "success": True,
                 "method": "ai_prompt_generation",
                 "summary": {
-                    "total_found": len(deduplicated_news),
+                    "total_found": len(unique_news),
                     "returned_count": len(selected_news),
                     "requested_limit": limit,
-                    "duplicates_removed": len(all_news_items) - len(deduplicated_news),
+                    "duplicates_removed": total_items - len(unique_news),
                     "topic": topic,
                     "time_range": time_range_desc,
                     "platforms": list(set(item["platform"] for item in selected_news)),
@@ -790,14 +873,15 @@ class AnalyticsTools:
                 },
                 "ai_prompt": ai_prompt,
                 "news_sample": selected_news,
+                "pagination": pagination_info(collector, fingerprint),
                 "usage_note": "请将 ai_prompt 字段的内容发送给 AI 进行情感分析"
             }
 
             # 如果返回数量少于请求数量，增加提示
-            if len(selected_news) < limit and len(deduplicated_news) >= limit:
+            if len(selected_news) < limit and len(unique_news) >= limit and after_key is None:
                 result["note"] = "返回数量少于请求数量是因为去重逻辑（同一标题在不同平台只保留一次）"
-            elif len(deduplicated_news) < limit:
-                result["note"] = f"在指定时间范围内仅找到 {len(deduplicated_news)} 条匹配的新闻"
+            elif len(unique_news) < limit:
+                result["note"] = f"在指定时间范围内仅找到 {len(unique_news)} 条匹配的新闻"
 
             return result
 
@@ -953,36 +1037,38 @@ class AnalyticsTools:
 
             limit = validate_limit(limit, default=50)
 
-            # 读取数据
-            all_titles, id_to_name, _ = self.data_service.parser.read_all_titles_for_date()
+            # 读取数据：通过索引预筛选出相似度上界达到阈值的候选标题
+            index = get_search_index(self.data_service.parser.project_root)
+            candidates, id_to_name = index.similar_candidates(
+                reference_title, None, threshold, case_sensitive=True
+            )
 
             # 计算相似度
             similar_items = []
 
-            for platform_id, titles in all_titles.items():
-                platform_name = id_to_name.get(platform_id, platform_id)
-
-                for title, info in titles.items():
-                    if title == reference_title:
-                        continue
+            for info in candidates:
+                title = info["title"]
+                if title == reference_title:
+                    continue
 
-                    # 计算相似度
-                    similarity = self._calculate_similarity(reference_title, title)
+                # 计算相似度
+                similarity = self._calculate_similarity(reference_title, title)
 
-                    if similarity >= threshold:
-                        news_item = {
-                            "title": title,
-                            "platform": platform_id,
-                            "platform_name": platform_name,
-                            "similarity": round(similarity, 3),
-                            "rank": info["ranks"][0] if info["ranks"] else 0
-                        }
+                if similarity >= threshold:
+                    platform_id = info["platform_id"]
+                    news_item = {
+                        "title": title,
+                        "platform": platform_id,
+                        "platform_name": id_to_name.get(platform_id, platform_id),
+                        "similarity": round(similarity, 3),
+                        "rank": info["ranks"][0] if info["ranks"] else 0
+                    }
 
-                        # 条件性添加 URL 字段
-                        if include_url:
-                            news_item["url"] = info.get("url", "")
+                    # 条件性添加 URL 字段
+                    if include_url:
+                        news_item["url"] = info.get("url", "")
 
-                        similar_items.append(news_item)
+                    similar_items.append(news_item)
 
             # 按相似度排序
             similar_items.sort(key=lambda x: x["similarity"], reverse=True)
@@ -1380,12 +1466,14 @@ class AnalyticsTools:
             })
 
             # 遍历日期范围
+            timeseries = get_timeseries_service(self.data_service.parser.project_root)
             current_date = start_date
             while current_date <= end_date:
                 try:
                     all_titles, id_to_name, timestamps = self.data_service.parser.read_all_titles_for_date(
                         date=current_date
                     )
+                    hourly_activity = timeseries.platform_hourly_activity(current_date)
 
                     for platform_id, titles in all_titles.items():
                         platform_name = id_to_name.get(platform_id, platform_id)
@@ -1396,13 +1484,10 @@ class AnalyticsTools:
                         # 统计更新次数（基于文件数量）
                         platform_activity[platform_name]["total_updates"] += len(timestamps)
 
-                        # 统计时间分布（基于文件名中的时间）
-                        for filename in timestamps.keys():
-                            # 解析文件名中的小时（格式：HHMM.txt）
-                            match = re.match(r'(\d{2})(\d{2})\.txt', filename)
-                            if match:
-                                hour = int(match.group(1))
-                                platform_activity[platform_name]["hourly_distribution"][hour] += 1
+                        # 统计时间分布（该平台在每个小时内出现在多少个快照中）
+                        platform_activity[platform_name]["hourly_distribution"].update(
+                            hourly_activity.get(platform_id, {})
+                        )
 
                 except DataNotFoundError:
                     pass
@@ -1510,18 +1595,11 @@ class AnalyticsTools:
             # 收集话题历史数据
             lifecycle_data = []
             current_date = start_date
+            index = get_search_index(self.data_service.parser.project_root)
             while current_date <= end_date:
                 try:
-                    all_titles, _, _ = self.data_service.parser.read_all_titles_for_date(
-                        date=current_date
-                    )
-
-                    # 统计该日的话题出现次数
-                    count = 0
-                    for _, titles in all_titles.items():
-                        for title in titles.keys():
-                            if topic.lower() in title.lower():
-                                count += 1
+                    # 统计该日的话题出现次数（通过倒排索引，无需遍历标题）
+                    count, _ = index.count(topic, current_date)
 
                     lifecycle_data.append({
                         "date": current_date.strftime("%Y-%m-%d"),
@@ -1659,37 +1737,17 @@ class AnalyticsTools:
 
             time_window = validate_limit(time_window, default=24, max_limit=72)
 
-            # 读取当前和之前的数据
-            current_all_titles, _, _ = self.data_service.parser.read_all_titles_for_date()
+            # 读取当前的关键词频率（来自按天汇总表）
+            rollups = get_rollup_service(self.data_service.parser.project_root)
+            current_keywords = rollups.get_keyword_counts()
+            current_keyword_titles = rollups.get_keyword_samples()
 
-            # 读取昨天的数据作为基准
+            # 读取昨天的关键词频率作为基准
             yesterday = datetime.now() - timedelta(days=1)
             try:
-                previous_all_titles, _, _ = self.data_service.parser.read_all_titles_for_date(
-                    date=yesterday
-                )
+                previous_keywords = rollups.get_keyword_counts(yesterday)
             except DataNotFoundError:
-                previous_all_titles = {}
-
-            # 统计当前的关键词频率
-            current_keywords = Counter()
-            current_keyword_titles = defaultdict(list)
-
-            for _, titles in current_all_titles.items():
-                for title in titles.keys():
-                    keywords = self._extract_keywords(title)
-                    current_keywords.update(keywords)
-
-                    for kw in keywords:
-                        current_keyword_titles[kw].append(title)
-
-            # 统计之前的关键词频率
-            previous_keywords = Counter()
-
-            for _, titles in previous_all_titles.items():
-                for title in titles.keys():
-                    keywords = self._extract_keywords(title)
-                    previous_keywords.update(keywords)
+                previous_keywords = Counter()
 
             # 检测异常热度
             viral_topics = []
@@ -1795,23 +1853,15 @@ class AnalyticsTools:
                     suggestion="推荐值：0.6-0.8"
                 )
 
-            # 收集最近3天的数据用于预测
+            # 收集最近3天的数据用于预测（来自按天汇总表）
+            rollups = get_rollup_service(self.data_service.parser.project_root)
             keyword_trends = defaultdict(list)
 
             for days_ago in range(3, 0, -1):
                 date = datetime.now() - timedelta(days=days_ago)
 
                 try:
-                    all_titles, _, _ = self.data_service.parser.read_all_titles_for_date(
-                        date=date
-                    )
-
-                    # 统计关键词
-                    keywords_count = Counter()
-                    for _, titles in all_titles.items():
-                        for title in titles.keys():
-                            keywords = self._extract_keywords(title)
-                            keywords_count.update(keywords)
+                    keywords_count = rollups.get_keyword_counts(date)
 
                     # 记录每个关键词的历史数据
                     for keyword, count in keywords_count.items():
@@ -1822,18 +1872,8 @@ class AnalyticsTools:
 
             # 添加今天的数据
             try:
-                all_titles, _, _ = self.data_service.parser.read_all_titles_for_date()
-
-                keywords_count = Counter()
-                keyword_titles = defaultdict(list)
-
-                for _, titles in all_titles.items():
-                    for title in titles.keys():
-                        keywords = self._extract_keywords(title)
-                        keywords_count.update(keywords)
-
-                        for kw in keywords:
-                            keyword_titles[kw].append(title)
+                keywords_count = rollups.get_keyword_counts()
+                keyword_titles = rollups.get_keyword_samples()
 
                 for keyword, count in keywords_count.items():
                     keyword_trends[keyword].append(count)
@@ -1922,7 +1962,7 @@ class AnalyticsTools:
 
     def _extract_keywords(self, title: str, min_length: int = 2) -> List[str]:
         """
-        从标题中提取关键词（简单实现）
+        从标题中提取关键词（词典最大匹配，未覆盖的片段整体保留，结果有全局缓存）
 
         Args:
             title: 标题文本
@@ -1931,22 +1971,7 @@ class AnalyticsTools:
         Returns:
             关键词列表
         """
-        # 移除URL和特殊字符
-        title = re.sub(r'http[s]?://\S+', '', title)
-        title = re.sub(r'[^\w\s]', ' ', title)
-
-        # 简单分词（按空格和常见分隔符）
-        words = re.split(r'[\s，。！？、]+', title)
-
-        # 过滤停用词和短词
-        stopwords = {'的', '了', '在', '是', '我', '有', '和', '就', '不', '人', '都', '一', '一个', '上', '也', '很', '到', '说', '要', '去', '你', '会', '着', '没有', '看', '好', '自己', '这'}
-
-        keywords = [
-            word.strip() for word in words
-            if word.strip() and len(word.strip()) >= min_length and word.strip() not in stopwords
-        ]
-
-        return keywords
+        return extract_title_keywords(title, min_length)
 
     def _calculate_similarity(self, text1: str, text2: str) -> float:
         """
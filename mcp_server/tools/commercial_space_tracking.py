@@ -2,6 +2,9 @@
 商业航天全网追踪工具
 
 提供商业航天相关新闻的优先级追踪、检索和提醒功能。
+
+追踪配置通过配置服务读取，追踪关键词编译为分层多关键词匹配器（配置文件修改后
+自动重新编译），检索和提醒只读取追踪匹配索引中按天预先匹配好的标题。
 """
 
 import re
@@ -9,9 +12,15 @@ from datetime import datetime, time, timedelta
 from typing import Dict, List, Optional, Tuple
 from pathlib import Path
 
+from ..services.config_service import get_config_service
 from ..services.data_service import DataService
 from ..services.parser_service import ParserService
+from ..services.tracking_index_service import get_tracking_index
 from ..utils.errors import MCPError, InvalidParameterError
+from ..utils.keyword_matcher import TieredKeywordMatcher
+
+
+REMINDER_MATCH_LIMIT = 10  # 提醒时段返回的今日匹配新闻条数
 
 
 class CommercialSpaceTracking:
@@ -26,33 +35,63 @@ class CommercialSpaceTracking:
         """
         self.parser = ParserService(project_root)
         self.data_service = DataService(project_root)
-        self.config = self._load_tracking_config()
-
-    def _load_tracking_config(self) -> Dict:
+        self.config_service = get_config_service(self.parser.project_root)
+        self.match_index = get_tracking_index(self.parser.project_root)
+        # (配置快照版本, 配置, 匹配器)，整体替换，避免并发调用时配置和匹配器不一致
+        self._state: Optional[Tuple[Optional[Tuple[int, int]], Dict, TieredKeywordMatcher]] = None
+
+    @property
+    def config(self) -> Dict:
+        """当前追踪配置（配置文件修改后自动重新加载）"""
+        return self._refresh_config()[1]
+
+    @property
+    def matcher(self) -> TieredKeywordMatcher:
+        """当前配置对应的追踪关键词匹配器"""
+        return self._refresh_config()[2]
+
+    def _refresh_config(self) -> Tuple[Optional[Tuple[int, int]], Dict, TieredKeywordMatcher]:
+        """配置快照变化时重新加载配置并重新编译匹配器"""
+        config, version = self._load_tracking_config()
+        state = self._state
+        if state is None or state[0] != version:
+            state = (version, config, self._build_matcher(config))
+            self._state = state
+        return state
+
+    def _load_tracking_config(self) -> Tuple[Dict, Optional[Tuple[int, int]]]:
         """
         加载商业航天追踪配置
 
         Returns:
-            配置字典
+            (只读的配置字典, 配置快照版本)，加载失败时版本为 None
         """
-        config_file = self.parser.project_root / "config" / "commercial_space_tracking.yaml"
+        config_file = self.config_service.config_dir / "commercial_space_tracking.yaml"
 
         if not config_file.exists():
             return {
                 "enabled": False,
                 "error": "配置文件不存在"
-            }
+            }, None
 
         try:
-            import yaml
-            with open(config_file, 'r', encoding='utf-8') as f:
-                config = yaml.safe_load(f)
-            return config
+            snapshot = self.config_service.get_tracking_config()
+            return snapshot.data, snapshot.version
         except Exception as e:
             return {
                 "enabled": False,
                 "error": f"配置文件加载失败: {str(e)}"
-            }
+            }, None
+
+    @staticmethod
+    def _build_matcher(config: Dict) -> TieredKeywordMatcher:
+        """把核心关键词和拓展关键词编译为分层匹配器（默认优先级分别为 1 和 2）"""
+        keyword_priorities = config.get("keyword_priorities", {}) or {}
+        tiers = []
+        for key, default_priority in (("core_keywords", 1), ("extended_keywords", 2)):
+            keyword_data = keyword_priorities.get(key, {}) or {}
+            tiers.append((key, keyword_data.get("priority", default_priority), keyword_data.get("keywords", []) or []))
+        return TieredKeywordMatcher(tiers)
 
     def get_tracking_config(self) -> Dict:
         """
@@ -137,12 +176,7 @@ class CommercialSpaceTracking:
             }
 
         try:
-            # 获取所有关键词
-            core_keywords = self.config.get("keyword_priorities", {}).get("core_keywords", {}).get("keywords", [])
-            extended_keywords = self.config.get("keyword_priorities", {}).get("extended_keywords", {}).get("keywords", [])
-            all_keywords = core_keywords + extended_keywords
-
-            if not all_keywords:
+            if not len(self.matcher):
                 return {
                     "success": False,
                     "error": {
@@ -168,43 +202,13 @@ class CommercialSpaceTracking:
                     }
                 start_date = end_date = latest
 
-            # 收集所有匹配的新闻
+            # 收集所有匹配的新闻（只读取预先匹配好的标题）
             all_matches = []
             current_date = start_date
 
             while current_date <= end_date:
                 try:
-                    all_titles, id_to_name, _ = self.data_service.parser.read_all_titles_for_date(
-                        date=current_date
-                    )
-
-                    for platform_id, titles in all_titles.items():
-                        platform_name = id_to_name.get(platform_id, platform_id)
-
-                        for title, info in titles.items():
-                            # 检查是否匹配任何关键词
-                            match_result = self._check_keyword_match(title, all_keywords, core_keywords)
-
-                            if match_result["matched"]:
-                                news_item = {
-                                    "title": title,
-                                    "platform": platform_id,
-                                    "platform_name": platform_name,
-                                    "date": current_date.strftime("%Y-%m-%d"),
-                                    "matched_keywords": match_result["matched_keywords"],
-                                    "priority": match_result["priority"],
-                                    "ranks": info.get("ranks", []),
-                                    "count": len(info.get("ranks", [])),
-                                    "rank": info["ranks"][0] if info["ranks"] else 999
-                                }
-
-                                # 条件性添加 URL 字段
-                                if include_url:
-                                    news_item["url"] = info.get("url", "")
-                                    news_item["mobileUrl"] = info.get("mobileUrl", "")
-
-                                all_matches.append(news_item)
-
+                    all_matches.extend(self._collect_matches(current_date, include_url))
                 except Exception:
                     # 该日期没有数据，继续下一天
                     pass
@@ -261,40 +265,52 @@ class CommercialSpaceTracking:
                 }
             }
 
-    def _check_keyword_match(
-        self,
-        title: str,
-        all_keywords: List[str],
-        core_keywords: List[str]
-    ) -> Dict:
+    def _collect_matches(self, date: datetime, include_url: bool) -> List[Dict]:
         """
-        检查标题是否匹配关键词
+        读取指定日期预先匹配好的新闻
+
+        Raises:
+            DataNotFoundError: 该日期没有数据
+        """
+        items, id_to_name = self.match_index.get_matches(date, self.matcher)
+        date_str = date.strftime("%Y-%m-%d")
+        matches = []
+        for platform_id, title, ranks, url, mobile_url, keyword_ids in items:
+            news_item = {
+                "title": title,
+                "platform": platform_id,
+                "platform_name": id_to_name.get(platform_id, platform_id),
+                "date": date_str,
+                "matched_keywords": [self.matcher.keywords[keyword_id] for keyword_id in keyword_ids],
+                "priority": self.matcher.priority_of(keyword_ids),
+                "ranks": ranks,
+                "count": len(ranks),
+                "rank": ranks[0] if ranks else 999
+            }
+
+            # 条件性添加 URL 字段
+            if include_url:
+                news_item["url"] = url
+                news_item["mobileUrl"] = mobile_url
+
+            matches.append(news_item)
+        return matches
+
+    def _check_keyword_match(self, title: str) -> Dict:
+        """
+        检查标题是否匹配追踪关键词
 
         Args:
             title: 新闻标题
-            all_keywords: 所有关键词列表
-            core_keywords: 核心关键词列表
 
         Returns:
             匹配结果字典
         """
-        title_lower = title.lower()
-        matched_keywords = []
-        priority = 99  # 默认低优先级
-
-        for keyword in all_keywords:
-            if keyword.lower() in title_lower:
-                matched_keywords.append(keyword)
-                # 核心关键词优先级更高
-                if keyword in core_keywords:
-                    priority = min(priority, 1)
-                else:
-                    priority = min(priority, 2)
-
+        keyword_ids = self.matcher.match(title)
         return {
-            "matched": len(matched_keywords) > 0,
-            "matched_keywords": matched_keywords,
-            "priority": priority
+            "matched": bool(keyword_ids),
+            "matched_keywords": [self.matcher.keywords[keyword_id] for keyword_id in keyword_ids],
+            "priority": self.matcher.priority_of(keyword_ids)
         }
 
     def get_spacex_highlights(
@@ -440,7 +456,8 @@ class CommercialSpaceTracking:
                         "success": True,
                         "is_reminder_time": True,
                         "reminder": reminder,
-                        "current_time": current_time.strftime("%Y-%m-%d %H:%M:%S")
+                        "current_time": current_time.strftime("%Y-%m-%d %H:%M:%S"),
+                        "matches": self._reminder_matches(current_time)
                     }
 
             except Exception:
@@ -453,6 +470,19 @@ class CommercialSpaceTracking:
             "current_time": current_time.strftime("%Y-%m-%d %H:%M:%S")
         }
 
+    def _reminder_matches(self, current_time: datetime) -> Dict:
+        """提醒时段当天已匹配的新闻（按优先级和排名取前 REMINDER_MATCH_LIMIT 条）"""
+        try:
+            matches = self._collect_matches(current_time, include_url=True)
+        except Exception:
+            matches = []
+        matches.sort(key=lambda x: (x.get("priority", 99), x.get("rank", 999)))
+        return {
+            "total": len(matches),
+            "core_count": sum(1 for item in matches if item["priority"] <= 1),
+            "top": matches[:REMINDER_MATCH_LIMIT]
+        }
+
     def get_quick_reference(self) -> Dict:
         """
         获取商业航天追踪快速参考清单
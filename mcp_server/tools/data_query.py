@@ -17,6 +17,7 @@ from ..utils.validators import (
     validate_date_query
 )
 from ..utils.errors import MCPError
+from ..utils.pagination import decode_cursor, encode_cursor, query_fingerprint
 
 
 class DataQueryTools:
@@ -213,7 +214,8 @@ class DataQueryTools:
         date_query: Optional[str] = None,
         platforms: Optional[List[str]] = None,
         limit: Optional[int] = None,
-        include_url: bool = False
+        include_url: bool = False,
+        cursor: Optional[str] = None
     ) -> Dict:
         """
         按日期查询新闻，支持自然语言日期
@@ -226,6 +228,7 @@ class DataQueryTools:
             platforms: 平台ID列表，如 ['zhihu', 'weibo']
             limit: 返回条数限制，默认50
             include_url: 是否包含URL链接，默认False（节省token）
+            cursor: 分页游标（可选），传入上一页返回的 pagination.next_cursor 获取下一页
 
         Returns:
             新闻列表字典
@@ -251,20 +254,34 @@ class DataQueryTools:
             platforms = validate_platforms(platforms)
             limit = validate_limit(limit, default=50)
 
+            # 游标指纹使用解析后的日期，自然语言日期跨天后旧游标自动失效
+            fingerprint = query_fingerprint(
+                "get_news_by_date", date=target_date.strftime("%Y-%m-%d"),
+                platforms=platforms, include_url=include_url
+            )
+            after_key, _ = decode_cursor(cursor, fingerprint)
+
             # 获取数据
-            news_list = self.data_service.get_news_by_date(
+            page = self.data_service.get_news_page(
                 target_date=target_date,
                 platforms=platforms,
                 limit=limit,
-                include_url=include_url
+                include_url=include_url,
+                after=after_key
             )
+            news_list = page["news"]
 
             return {
                 "news": news_list,
                 "total": len(news_list),
+                "total_available": page["total"],
                 "date": target_date.strftime("%Y-%m-%d"),
                 "date_query": date_query,
                 "platforms": platforms,
+                "pagination": {
+                    "has_more": page["has_more"],
+                    "next_cursor": encode_cursor(fingerprint, page["last_key"]) if page["has_more"] else None
+                },
                 "success": True
             }
 
@@ -11,6 +11,9 @@ from difflib import SequenceMatcher
 from typing import Dict, List, Optional, Tuple
 
 from ..services.data_service import DataService
+from ..services.index_service import get_search_index
+from ..utils.keywords import extract_match_tokens, extract_title_keywords
+from ..utils.pagination import TopKCollector, decode_cursor, pagination_info, query_fingerprint
 from ..utils.validators import validate_keyword, validate_limit
 from ..utils.errors import MCPError, InvalidParameterError, DataNotFoundError
 
@@ -26,14 +29,6 @@ class SearchTools:
             project_root: 项目根目录
         """
         self.data_service = DataService(project_root)
-        # 中文停用词列表
-        self.stopwords = {
-            '的', '了', '在', '是', '我', '有', '和', '就', '不', '人', '都', '一',
-            '一个', '上', '也', '很', '到', '说', '要', '去', '你', '会', '着', '没有',
-            '看', '好', '自己', '这', '那', '来', '被', '与', '为', '对', '将', '从',
-            '以', '及', '等', '但', '或', '而', '于', '中', '由', '可', '可以', '已',
-            '已经', '还', '更', '最', '再', '因为', '所以', '如果', '虽然', '然而'
-        }
 
     def search_news_unified(
         self,
@@ -44,7 +39,8 @@ class SearchTools:
         limit: int = 50,
         sort_by: str = "relevance",
         threshold: float = 0.6,
-        include_url: bool = False
+        include_url: bool = False,
+        cursor: Optional[str] = None
     ) -> Dict:
         """
         统一新闻搜索工具 - 整合多种搜索模式
@@ -68,6 +64,7 @@ class SearchTools:
                 - "date": 按日期排序
             threshold: 相似度阈值（仅fuzzy模式有效），0-1之间，默认0.6
             include_url: 是否包含URL链接，默认False（节省token）
+            cursor: 分页游标（可选），传入上一页返回的 pagination.next_cursor 获取下一页
 
         Returns:
             搜索结果字典，包含匹配的新闻列表
@@ -120,32 +117,63 @@ class SearchTools:
                 # 使用最新可用日期
                 start_date = end_date = latest
 
-            # 收集所有匹配的新闻
-            all_matches = []
+            fingerprint = query_fingerprint(
+                "search_news", query=query, search_mode=search_mode,
+                start=start_date.strftime("%Y-%m-%d"), end=end_date.strftime("%Y-%m-%d"),
+                platforms=platforms, sort_by=sort_by, threshold=threshold, include_url=include_url
+            )
+            after_key, cursor_total = decode_cursor(cursor, fingerprint)
+
+            # 排序键：(排序字段, 日期序号, 当天内位置)，与原先"按遍历顺序稳定排序"一致
+            if sort_by == "weight":
+                from .analytics import calculate_news_weight
+
+            collector = TopKCollector(limit, after_key)
+            total_found = 0
             current_date = start_date
 
+            # 按日期倒序翻页时，比游标更新的日期已全部返回过，直接跳过
+            if sort_by == "date" and after_key is not None:
+                skip_after = -after_key[0]
+            else:
+                skip_after = None
+
             while current_date <= end_date:
-                try:
-                    all_titles, id_to_name, timestamps = self.data_service.parser.read_all_titles_for_date(
-                        date=current_date,
-                        platform_ids=platforms
-                    )
+                date_ordinal = current_date.toordinal()
+                if skip_after is not None and date_ordinal > skip_after:
+                    current_date += timedelta(days=1)
+                    continue
 
+                try:
                     # 根据搜索模式执行不同的搜索逻辑
                     if search_mode == "keyword":
+                        # 关键词模式走倒排索引，无需解析整天数据
                         matches = self._search_by_keyword_mode(
-                            query, all_titles, id_to_name, current_date, include_url
+                            query, platforms, current_date, include_url
                         )
                     elif search_mode == "fuzzy":
+                        # 模糊模式先用索引预筛选候选，再计算相似度
                         matches = self._search_by_fuzzy_mode(
-                            query, all_titles, id_to_name, current_date, threshold, include_url
+                            query, platforms, current_date, threshold, include_url
                         )
                     else:  # entity
+                        all_titles, id_to_name, timestamps = self.data_service.parser.read_all_titles_for_date(
+                            date=current_date,
+                            platform_ids=platforms
+                        )
                         matches = self._search_by_entity_mode(
                             query, all_titles, id_to_name, current_date, include_url
                         )
 
-                    all_matches.extend(matches)
+                    total_found += len(matches)
+                    for position, match in enumerate(matches):
+                        if sort_by == "relevance":
+                            primary = -match.get("similarity_score", 1.0)
+                        elif sort_by == "weight":
+                            primary = -calculate_news_weight(match)
+                        else:
+                            primary = -date_ordinal
+                        collector.add((primary, date_ordinal, position), match)
 
                 except DataNotFoundError:
                     # 该日期没有数据，继续下一天
@@ -153,7 +181,10 @@ class SearchTools:
 
                 current_date += timedelta(days=1)
 
-            if not all_matches:
+            if skip_after is not None and cursor_total is not None:
+                total_found = cursor_total
+
+            if total_found == 0:
                 # 获取可用日期范围用于错误提示
                 earliest, latest = self.data_service.get_available_date_range()
 
@@ -183,17 +214,8 @@ class SearchTools:
                 }
                 return result
 
-            # 统一排序逻辑
-            if sort_by == "relevance":
-                all_matches.sort(key=lambda x: x.get("similarity_score", 1.0), reverse=True)
-            elif sort_by == "weight":
-                from .analytics import calculate_news_weight
-                all_matches.sort(key=lambda x: calculate_news_weight(x), reverse=True)
-            elif sort_by == "date":
-                all_matches.sort(key=lambda x: x.get("date", ""), reverse=True)
-
-            # 限制返回数量
-            results = all_matches[:limit]
+            # 当前页（只保留了排序键最小的 limit 条）
+            results = [match for _, match in collector.page()]
 
             # 构建时间范围描述（正确判断是否为今天）
             if start_date.date() == datetime.now().date() and start_date == end_date:
@@ -206,7 +228,7 @@ class SearchTools:
             result = {
                 "success": True,
                 "summary": {
-                    "total_found": len(all_matches),
+                    "total_found": total_found,
                     "returned_count": len(results),
                     "requested_limit": limit,
                     "search_mode": search_mode,
@@ -215,13 +237,14 @@ class SearchTools:
                     "time_range": time_range_desc,
                     "sort_by": sort_by
                 },
-                "results": results
+                "results": results,
+                "pagination": pagination_info(collector, fingerprint, total_found)
             }
 
             if search_mode == "fuzzy":
                 result["summary"]["threshold"] = threshold
-                if len(all_matches) < limit:
-                    result["note"] = f"模糊搜索模式下，相似度阈值 {threshold} 仅匹配到 {len(all_matches)} 条结果"
+                if total_found < limit:
+                    result["note"] = f"模糊搜索模式下，相似度阈值 {threshold} 仅匹配到 {total_found} 条结果"
 
             return result
 
@@ -242,57 +265,54 @@ class SearchTools:
     def _search_by_keyword_mode(
         self,
         query: str,
-        all_titles: Dict,
-        id_to_name: Dict,
+        platforms: Optional[List[str]],
         current_date: datetime,
         include_url: bool
     ) -> List[Dict]:
         """
-        关键词搜索模式（精确匹配）
+        关键词搜索模式（精确匹配，基于倒排索引）
 
         Args:
             query: 搜索关键词
-            all_titles: 所有标题字典
-            id_to_name: 平台ID到名称映射
+            platforms: 平台过滤列表
             current_date: 当前日期
 
         Returns:
             匹配的新闻列表
+
+        Raises:
+            DataNotFoundError: 该日期没有数据
         """
         matches = []
-        query_lower = query.lower()
-
-        for platform_id, titles in all_titles.items():
-            platform_name = id_to_name.get(platform_id, platform_id)
-
-            for title, info in titles.items():
-                # 精确包含判断
-                if query_lower in title.lower():
-                    news_item = {
-                        "title": title,
-                        "platform": platform_id,
-                        "platform_name": platform_name,
-                        "date": current_date.strftime("%Y-%m-%d"),
-                        "similarity_score": 1.0,  # 精确匹配，相似度为1
-                        "ranks": info.get("ranks", []),
-                        "count": len(info.get("ranks", [])),
-                        "rank": info["ranks"][0] if info["ranks"] else 999
-                    }
+        index = get_search_index(self.data_service.parser.project_root)
+        hits, id_to_name = index.search(query, current_date, platforms)
+
+        for info in hits:
+            platform_id = info["platform_id"]
+            news_item = {
+                "title": info["title"],
+                "platform": platform_id,
+                "platform_name": id_to_name.get(platform_id, platform_id),
+                "date": current_date.strftime("%Y-%m-%d"),
+                "similarity_score": 1.0,  # 精确匹配，相似度为1
+                "ranks": info["ranks"],
+                "count": len(info["ranks"]),
+                "rank": info["ranks"][0] if info["ranks"] else 999
+            }
 
-                    # 条件性添加 URL 字段
-                    if include_url:
-                        news_item["url"] = info.get("url", "")
-                        news_item["mobileUrl"] = info.get("mobileUrl", "")
+            # 条件性添加 URL 字段
+            if include_url:
+                news_item["url"] = info.get("url", "")
+                news_item["mobileUrl"] = info.get("mobileUrl", "")
 
-                    matches.append(news_item)
+            matches.append(news_item)
 
         return matches
 
     def _search_by_fuzzy_mode(
         self,
         query: str,
-        all_titles: Dict,
-        id_to_name: Dict,
+        platforms: Optional[List[str]],
         current_date: datetime,
         threshold: float,
         include_url: bool
@@ -300,43 +320,57 @@ class SearchTools:
         """
         模糊搜索模式（使用相似度算法）
 
+        先通过索引排除不可能匹配的标题，只对候选计算 _fuzzy_match：
+        - 相似度分支：字符级 Dice 上界低于阈值的标题被排除
+        - 包含分支和关键词重合分支：只保留包含查询或任一查询关键词的标题
+
         Args:
             query: 搜索内容
-            all_titles: 所有标题字典
-            id_to_name: 平台ID到名称映射
+            platforms: 平台过滤列表
             current_date: 当前日期
             threshold: 相似度阈值
 
         Returns:
             匹配的新闻列表
+
+        Raises:
+            DataNotFoundError: 该日期没有数据
         """
         matches = []
+        index = get_search_index(self.data_service.parser.project_root)
+        candidates, id_to_name = index.similar_candidates(
+            query,
+            current_date,
+            threshold,
+            platforms=platforms,
+            substrings=self._extract_keywords(query)
+        )
+
+        for info in candidates:
+            title = info["title"]
+
+            # 模糊匹配
+            is_match, similarity = self._fuzzy_match(query, title, threshold)
+
+            if is_match:
+                platform_id = info["platform_id"]
+                news_item = {
+                    "title": title,
+                    "platform": platform_id,
+                    "platform_name": id_to_name.get(platform_id, platform_id),
+                    "date": current_date.strftime("%Y-%m-%d"),
+                    "similarity_score": round(similarity, 4),
+                    "ranks": info["ranks"],
+                    "count": len(info["ranks"]),
+                    "rank": info["ranks"][0] if info["ranks"] else 999
+                }
 
-        for platform_id, titles in all_titles.items():
-            platform_name = id_to_name.get(platform_id, platform_id)
-
-            for title, info in titles.items():
-                # 模糊匹配
-                is_match, similarity = self._fuzzy_match(query, title, threshold)
-
-                if is_match:
-                    news_item = {
-                        "title": title,
-                        "platform": platform_id,
-                        "platform_name": platform_name,
-                        "date": current_date.strftime("%Y-%m-%d"),
-                        "similarity_score": round(similarity, 4),
-                        "ranks": info.get("ranks", []),
-                        "count": len(info.get("ranks", [])),
-                        "rank": info["ranks"][0] if info["ranks"] else 999
-                    }
-
-                    # 条件性添加 URL 字段
-                    if include_url:
-                        news_item["url"] = info.get("url", "")
-                        news_item["mobileUrl"] = info.get("mobileUrl", "")
+                # 条件性添加 URL 字段
+                if include_url:
+                    news_item["url"] = info.get("url", "")
+                    news_item["mobileUrl"] = info.get("mobileUrl", "")
 
-                    matches.append(news_item)
+                matches.append(news_item)
 
         return matches
 
@@ -441,29 +475,17 @@ class SearchTools:
 
     def _extract_keywords(self, text: str, min_length: int = 2) -> List[str]:
         """
-        从文本中提取关键词
+        从文本中提取用于匹配的词元（与分析工具共用分词器和缓存）
 
         Args:
             text: 输入文本
             min_length: 最小词长
 
         Returns:
-            关键词列表
+            词元列表（含 bigram，只用于匹配，不直接展示）
         """
-        # 移除URL和特殊字符
-        text = re.sub(r'http[s]?://\S+', '', text)
         text = re.sub(r'\[.*?\]', '', text)  # 移除方括号内容
-
-        # 使用正则表达式分词（中文和英文）
-        words = re.findall(r'[\w]+', text)
-
-        # 过滤停用词和短词
-        keywords = [
-            word for word in words
-            if word and len(word) >= min_length and word not in self.stopwords
-        ]
-
-        return keywords
+        return extract_match_tokens(text, min_length)
 
     def _calculate_keyword_overlap(self, keywords1: List[str], keywords2: List[str]) -> float:
         """
@@ -499,7 +521,8 @@ class SearchTools:
         end_date: Optional[datetime] = None,
         threshold: float = 0.4,
         limit: int = 50,
-        include_url: bool = False
+        include_url: bool = False,
+        cursor: Optional[str] = None
     ) -> Dict:
         """
         在历史数据中搜索与给定新闻相关的新闻
@@ -516,6 +539,7 @@ class SearchTools:
             threshold: 相似度阈值 (0-1之间)，默认0.4
             limit: 返回条数限制，默认50
             include_url: 是否包含URL链接，默认False（节省token）
+            cursor: 分页游标（可选），传入上一页返回的 pagination.next_cursor 获取下一页
 
         Returns:
             搜索结果字典，包含相关新闻列表
@@ -563,8 +587,9 @@ class SearchTools:
                     suggestion="请使用 'yesterday', 'last_week', 'last_month' 或 'custom'"
                 )
 
-            # 提取参考文本的关键词
+            # 提取参考文本的关键词（匹配用词元，以及结果中展示的关键词）
             reference_keywords = self._extract_keywords(reference_text)
+            reference_display_keywords = set(extract_title_keywords(reference_text))
 
             if not reference_keywords:
                 raise InvalidParameterError(
@@ -572,54 +597,92 @@ class SearchTools:
                     suggestion="请提供更详细的文本内容"
                 )
 
-            # 收集所有相关新闻
-            all_related_news = []
+            fingerprint = query_fingerprint(
+                "search_related_news_history", reference_text=reference_text,
+                start=search_start.strftime("%Y-%m-%d"), end=search_end.strftime("%Y-%m-%d"),
+                threshold=threshold, include_url=include_url
+            )
+            after_key, _ = decode_cursor(cursor, fingerprint)
+
+            # 收集相关新闻：当前页只保留 limit 条，统计信息流式累加
+            collector = TopKCollector(limit, after_key)
+            total_found = 0
+            similarity_sum = 0.0
+            platform_distribution = Counter()
+            date_distribution = Counter()
             current_date = search_start
+            index = get_search_index(self.data_service.parser.project_root)
+
+            # 综合相似度 = 70% 关键词重合 + 30% 文本相似度。没有共同关键词的标题只能靠文本相似度
+            # 达到阈值，因此候选只需包含：含任一参考关键词的标题 + 文本相似度上界不低于
+            # threshold / 0.3 的标题（减去极小值以抵消浮点误差）
+            ratio_threshold = threshold / 0.3 - 1e-9
 
             while current_date <= search_end:
                 try:
-                    # 读取该日期的数据
-                    all_titles, id_to_name, _ = self.data_service.parser.read_all_titles_for_date(current_date)
-
-                    # 搜索相关新闻
-                    for platform_id, titles in all_titles.items():
-                        platform_name = id_to_name.get(platform_id, platform_id)
-
-                        for title, info in titles.items():
-                            # 计算标题相似度
-                            title_similarity = self._calculate_similarity(reference_text, title)
-
-                            # 提取标题关键词
-                            title_keywords = self._extract_keywords(title)
-
-                            # 计算关键词重合度
-                            keyword_overlap = self._calculate_keyword_overlap(
-                                reference_keywords,
-                                title_keywords
-                            )
-
-                            # 综合相似度 (70% 关键词重合 + 30% 文本相似度)
-                            combined_score = keyword_overlap * 0.7 + title_similarity * 0.3
-
-                            if combined_score >= threshold:
-                                news_item = {
-                                    "title": title,
-                                    "platform": platform_id,
-                                    "platform_name": platform_name,
-                                    "date": current_date.strftime("%Y-%m-%d"),
-                                    "similarity_score": round(combined_score, 4),
-                                    "keyword_overlap": round(keyword_overlap, 4),
-                                    "text_similarity": round(title_similarity, 4),
-                                    "common_keywords": list(set(reference_keywords) & set(title_keywords)),
-                                    "rank": info["ranks"][0] if info["ranks"] else 0
-                                }
-
-                                # 条件性添加 URL 字段
-                                if include_url:
-                                    news_item["url"] = info.get("url", "")
-                                    news_item["mobileUrl"] = info.get("mobileUrl", "")
-
-                                all_related_news.append(news_item)
+                    # 通过索引获取该日期的候选新闻
+                    candidates, id_to_name = index.similar_candidates(
+                        reference_text,
+                        current_date,
+                        ratio_threshold,
+                        substrings=reference_keywords
+                    )
+
+                    # 搜索相关新闻（排序键：相似度降序，再按日期和当天内位置）
+                    date_ordinal = current_date.toordinal()
+                    position = 0
+                    for info in candidates:
+                        title = info["title"]
+                        platform_id = info["platform_id"]
+
+                        # 计算标题相似度
+                        title_similarity = self._calculate_similarity(reference_text, title)
+
+                        # 提取标题关键词
+                        title_keywords = self._extract_keywords(title)
+
+                        # 计算关键词重合度
+                        keyword_overlap = self._calculate_keyword_overlap(
+                            reference_keywords,
+                            title_keywords
+                        )
+
+                        # 综合相似度 (70% 关键词重合 + 30% 文本相似度)
+                        combined_score = keyword_overlap * 0.7 + title_similarity * 0.3
+
+                        if combined_score >= threshold:
+                            score = round(combined_score, 4)
+                            date_str = current_date.strftime("%Y-%m-%d")
+                            total_found += 1
+                            similarity_sum += score
+                            platform_distribution[platform_id] += 1
+                            date_distribution[date_str] += 1
+
+                            key = (-score, date_ordinal, position)
+                            position += 1
+                            if not collector.accepts(key):
+                                continue
+
+                            news_item = {
+                                "title": title,
+                                "platform": platform_id,
+                                "platform_name": id_to_name.get(platform_id, platform_id),
+                                "date": date_str,
+                                "similarity_score": score,
+                                "keyword_overlap": round(keyword_overlap, 4),
+                                "text_similarity": round(title_similarity, 4),
+                                "common_keywords": list(
+                                    reference_display_keywords & set(extract_title_keywords(title))
+                                ),
+                                "rank": info["ranks"][0] if info["ranks"] else 0
+                            }
+
+                            # 条件性添加 URL 字段
+                            if include_url:
+                                news_item["url"] = info.get("url", "")
+                                news_item["mobileUrl"] = info.get("mobileUrl", "")
+
+                            collector.add(key, news_item)
 
                 except DataNotFoundError:
                     # 该日期没有数据，继续下一天
@@ -631,7 +694,7 @@ class SearchTools:
                 # 移动到下一天
                 current_date += timedelta(days=1)
 
-            if not all_related_news:
+            if total_found == 0:
                 return {
                     "success": True,
                     "results": [],
@@ -645,20 +708,13 @@ class SearchTools:
                     "message": "未找到相关新闻"
                 }
 
-            # 按相似度排序
-            all_related_news.sort(key=lambda x: x["similarity_score"], reverse=True)
-
-            # 限制返回数量
-            results = all_related_news[:limit]
-
-            # 统计信息
-            platform_distribution = Counter([news["platform"] for news in all_related_news])
-            date_distribution = Counter([news["date"] for news in all_related_news])
+            # 当前页（按相似度排序）
+            results = [news for _, news in collector.page()]
 
             result = {
                 "success": True,
                 "summary": {
-                    "total_found": len(all_related_news),
+                    "total_found": total_found,
                     "returned_count": len(results),
                     "requested_limit": limit,
                     "threshold": threshold,
@@ -671,18 +727,16 @@ class SearchTools:
                     }
                 },
                 "results": results,
+                "pagination": pagination_info(collector, fingerprint),
                 "statistics": {
                     "platform_distribution": dict(platform_distribution),
                     "date_distribution": dict(date_distribution),
-                    "avg_similarity": round(
-                        sum([news["similarity_score"] for news in all_related_news]) / len(all_related_news),
-                        4
-                    ) if all_related_news else 0.0
+                    "avg_similarity": round(similarity_sum / total_found, 4)
                 }
             }
 
-            if len(all_related_news) < limit:
-                result["note"] = f"相关性阈值 {threshold} 下仅找到 {len(all_related_news)} 条相关新闻"
+            if total_found < limit:
+                result["note"] = f"相关性阈值 {threshold} 下仅找到 {total_found} 条相关新闻"
 
             return result
 
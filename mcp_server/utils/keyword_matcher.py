@@ -0,0 +1,103 @@
+"""
+分层多关键词匹配器
+
+把若干组带优先级的关键词编译为一个正则，一次扫描找出标题中出现的所有关键词
+（不区分大小写的子串匹配，结果与逐个关键词 `keyword.lower() in title.lower()` 一致）：
+
+- 先用普通的多选正则判断标题是否包含任何关键词，绝大多数标题在这一步被排除
+- 命中时再用前瞻正则在每个位置找最长的关键词（允许重叠），
+  并补上被它包含的较短关键词（如 "Mars Mission" 命中时 "Mars" 也算命中）
+"""
+
+import hashlib
+import json
+import re
+from typing import Dict, List, Optional, Sequence, Tuple
+
+
+DEFAULT_PRIORITY = 99  # 未命中任何关键词时的优先级
+
+
+class TieredKeywordMatcher:
+    """分层多关键词匹配器"""
+
+    def __init__(self, tiers: Sequence[Tuple[str, int, Sequence[str]]]):
+        """
+        编译匹配器
+
+        Args:
+            tiers: [(层级名称, 优先级, 关键词列表)]，优先级数值越小越优先；
+                同一关键词出现在多个层级时取最高优先级
+        """
+        self.keywords: List[str] = []
+        self.priorities: List[int] = []
+        self.tiers: List[str] = []
+        keyword_ids: Dict[str, int] = {}
+
+        for tier_name, priority, keywords in tiers:
+            for keyword in keywords:
+                if not isinstance(keyword, str) or not keyword:
+                    continue
+                keyword_id = keyword_ids.get(keyword)
+                if keyword_id is None:
+                    keyword_ids[keyword] = len(self.keywords)
+                    self.keywords.append(keyword)
+                    self.priorities.append(priority)
+                    self.tiers.append(tier_name)
+                elif priority < self.priorities[keyword_id]:
+                    self.priorities[keyword_id] = priority
+                    self.tiers[keyword_id] = tier_name
+
+        # 小写形式 -> 小写形式被它包含的所有关键词 ID
+        ids_by_lowered: Dict[str, List[int]] = {}
+        for keyword_id, keyword in enumerate(self.keywords):
+            ids_by_lowered.setdefault(keyword.lower(), []).append(keyword_id)
+        self._contained: Dict[str, Tuple[int, ...]] = {
+            lowered: tuple(sorted(
+                keyword_id
+                for other, ids in ids_by_lowered.items() if other in lowered
+                for keyword_id in ids
+            ))
+            for lowered in ids_by_lowered
+        }
+
+        self._prefilter: Optional[re.Pattern] = None
+        self._scanner: Optional[re.Pattern] = None
+        if ids_by_lowered:
+            # 长的在前，保证每个位置取到最长的关键词
+            alternatives = "|".join(
+                re.escape(lowered) for lowered in sorted(ids_by_lowered, key=len, reverse=True)
+            )
+            self._prefilter = re.compile(alternatives)
+            self._scanner = re.compile(f"(?=({alternatives}))")
+
+        self.fingerprint = hashlib.sha1(
+            json.dumps([self.keywords, self.priorities], ensure_ascii=False).encode("utf-8")
+        ).hexdigest()[:16]
+
+    def __len__(self) -> int:
+        return len(self.keywords)
+
+    def match(self, title: str) -> Tuple[int, ...]:
+        """
+        找出标题中出现的所有关键词
+
+        Args:
+            title: 标题
+
+        Returns:
+            命中的关键词 ID（按配置顺序），未命中时为空元组
+        """
+        if self._prefilter is None:
+            return ()
+        lowered = title.lower()
+        if self._prefilter.search(lowered) is None:
+            return ()
+        found = set()
+        for match in self._scanner.finditer(lowered):
+            found.update(self._contained[match.group(1)])
+        return tuple(sorted(found))
+
+    def priority_of(self, keyword_ids: Sequence[int]) -> int:
+        """命中关键词中的最高优先级（数值最小），未命中时为 DEFAULT_PRIORITY"""
+        return min((self.priorities[keyword_id] for keyword_id in keyword_ids), default=DEFAULT_PRIORITY)
@@ -0,0 +1,356 @@
+"""
+标题关键词提取
+
+分析工具、检索工具和按天汇总的关键词统计共用同一个分词器，保证各处结果一致。
+
+中文标题通常没有空格，按空格/标点切分往往会把整条标题当成一个"关键词"。
+这里使用词典 Trie 正向最大匹配分词：
+
+- 词典来自 config/frequency_words.txt（去掉 !/+ 前缀，忽略 @数量、区域标记和 # 注释），
+  多字停用词也放入 Trie，匹配到后直接丢弃
+- 词典未覆盖的连续汉字按单字虚词切开：
+  - 对外展示的关键词（extract_title_keywords）保留整个片段，
+    不会出现"尔街"、"何看"这类半个词的碎片
+  - 用于匹配和检索预筛选的词元（extract_match_tokens）再退化为重叠二元组（bigram），
+    使部分重合的标题也能匹配
+- 英文、数字等非汉字片段整体作为一个词
+- 所有关键词都是原标题的子串（英文词典匹配不区分大小写，但输出保留原文）
+
+分词结果按 (标题, 最小长度, 是否退化为 bigram) 缓存在 LRU 中，所有调用方共享。
+"""
+
+import hashlib
+import os
+import re
+import time
+from functools import lru_cache
+from pathlib import Path
+from threading import Lock
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+# 停用词（多字停用词会加入 Trie，与停用词相同的片段和 bigram 会被丢弃）
+STOPWORDS = frozenset({
+    '的', '了', '在', '是', '我', '有', '和', '就', '不', '人', '都', '一', '一个', '上', '也',
+    '很', '到', '说', '要', '去', '你', '会', '着', '没有', '看', '好', '自己', '这',
+    '那', '来', '被', '与', '为', '对', '将', '从', '以', '及', '等', '但', '或', '而',
+    '于', '中', '由', '可', '可以', '已', '已经', '还', '更', '最', '再', '因为', '所以',
+    '如果', '虽然', '然而'
+})
+
+# 切分词典未覆盖的连续汉字时使用的单字虚词
+FUNCTION_CHARS = frozenset('的了是在和与及等被把将对为也都就还又吗呢吧啊着过这那之而或但于让给向我你他她它们')
+
+DEFAULT_CACHE_SIZE = 200_000  # 分词结果缓存条数
+DICTIONARY_CHECK_INTERVAL = 5.0  # 检查词典文件是否变化的最小间隔（秒）
+
+DEFAULT_DICTIONARY_PATH = Path(__file__).parent.parent.parent / "config" / "frequency_words.txt"
+
+_URL_PATTERN = re.compile(r'http[s]?://\S+')
+_WORD_RUN_PATTERN = re.compile(r'\w+')
+
+_ASCII_LOWER = str.maketrans('ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz')
+_TERMINAL = ''  # Trie 节点中的词尾标记
+
+
+def _is_cjk(char: str) -> bool:
+    return '\u4e00' <= char <= '\u9fff' or '\u3400' <= char <= '\u4dbf' or '\uf900' <= char <= '\ufaff'
+
+
+def _is_ascii_alnum(char: str) -> bool:
+    return char.isascii() and char.isalnum()
+
+
+def load_dictionary_words(path: Path) -> List[str]:
+    """
+    从 frequency_words.txt 读取词典词
+
+    Args:
+        path: 词典文件路径
+
+    Returns:
+        去重后的词列表（保持文件顺序）
+    """
+    words = []
+    seen = set()
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith(("#", "@")):
+                continue
+            if line.startswith("[") and line.endswith("]"):
+                continue
+            if line.startswith(("!", "+")):
+                line = line[1:].strip()
+            # 含空格等分隔符的词条（如 "Elon Musk"）会被拆成多个片段，按片段收录
+            for part in _WORD_RUN_PATTERN.findall(line):
+                if part not in seen:
+                    seen.add(part)
+                    words.append(part)
+    return words
+
+
+class KeywordTokenizer:
+    """基于词典 Trie 最大匹配 + bigram 退化的关键词分词器"""
+
+    def __init__(self, words: Iterable[str] = (), cache_size: int = DEFAULT_CACHE_SIZE):
+        """
+        初始化分词器
+
+        Args:
+            words: 词典词
+            cache_size: 分词结果 LRU 缓存条数
+        """
+        self.words = sorted({w for w in words if w})
+        self._trie: Dict = {}
+        self._max_word_length = 1
+
+        for word in self.words:
+            self._insert(word, keep=True)
+        dictionary = set(self.words)
+        for word in STOPWORDS:
+            if len(word) > 1 and word not in dictionary:
+                self._insert(word, keep=False)
+
+        digest = hashlib.sha1("\n".join(self.words).encode("utf-8")).hexdigest()[:16]
+        self.signature = digest
+        self._cached_tokenize = lru_cache(maxsize=cache_size)(self._tokenize)
+
+    def _insert(self, word: str, keep: bool) -> None:
+        node = self._trie
+        for char in word.translate(_ASCII_LOWER):
+            node = node.setdefault(char, {})
+        # keep=False 表示停用词：匹配后丢弃
+        node[_TERMINAL] = node.get(_TERMINAL, False) or keep
+        self._max_word_length = max(self._max_word_length, len(word))
+
+    def _longest_match(self, run: str, lowered: str, start: int) -> Tuple[int, bool]:
+        """
+        在 run[start:] 上查找最长词典匹配
+
+        Returns:
+            (匹配长度, 是否保留)，没有匹配时长度为 0
+        """
+        # 英文/数字开头的词不能从英文单词中间开始匹配
+        if _is_ascii_alnum(run[start]) and start > 0 and _is_ascii_alnum(run[start - 1]):
+            return 0, False
+
+        node = self._trie
+        best_length = 0
+        best_keep = False
+        end_limit = min(len(run), start + self._max_word_length)
+        for pos in range(start, end_limit):
+            node = node.get(lowered[pos])
+            if node is None:
+                break
+            keep = node.get(_TERMINAL)
+            if keep is None:
+                continue
+            end = pos + 1
+            # 英文/数字结尾的词不能截断英文单词（如 "AI" 不匹配 "AIGC" 的前半部分）
+            if _is_ascii_alnum(run[end - 1]) and end < len(run) and _is_ascii_alnum(run[end]):
+                continue
+            best_length = end - start
+            best_keep = keep
+        return best_length, best_keep
+
+    @staticmethod
+    def _fallback(chars: str, gram: int, min_length: int, ngrams: bool, out: List[str]) -> None:
+        """未被词典覆盖的连续汉字：按虚词切开，ngrams 为 True 时再生成重叠 n 元组"""
+        piece_start = 0
+        for i in range(len(chars) + 1):
+            if i < len(chars) and chars[i] not in FUNCTION_CHARS:
+                continue
+            piece = chars[piece_start:i]
+            piece_start = i + 1
+            if not ngrams or len(piece) <= gram:
+                if len(piece) >= min_length and piece not in STOPWORDS:
+                    out.append(piece)
+                continue
+            for j in range(len(piece) - gram + 1):
+                token = piece[j:j + gram]
+                if token not in STOPWORDS:
+                    out.append(token)
+
+    def _tokenize(self, text: str, min_length: int, ngrams: bool) -> Tuple[str, ...]:
+        text = _URL_PATTERN.sub(' ', text)
+        gram = max(2, min_length)
+        tokens: List[str] = []
+
+        for match in _WORD_RUN_PATTERN.finditer(text):
+            run = match.group()
+            lowered = run.translate(_ASCII_LOWER)
+            pending_start = -1  # 尚未被词典覆盖的连续汉字起点
+            i = 0
+            length = len(run)
+
+            while i < length:
+                if lowered[i] in self._trie:
+                    matched, keep = self._longest_match(run, lowered, i)
+                else:
+                    matched, keep = 0, False
+                if matched:
+                    if pending_start >= 0:
+                        self._fallback(run[pending_start:i], gram, min_length, ngrams, tokens)
+                        pending_start = -1
+                    word = run[i:i + matched]
+                    if keep and len(word) >= min_length:
+                        tokens.append(word)
+                    i += matched
+                    continue
+
+                if _is_cjk(run[i]):
+                    if pending_start < 0:
+                        pending_start = i
+                    i += 1
+                    continue
+
+                if pending_start >= 0:
+                    self._fallback(run[pending_start:i], gram, min_length, ngrams, tokens)
+                    pending_start = -1
+
+                # 非汉字片段（英文、数字等）整体作为一个词
+                j = i + 1
+                while j < length and not _is_cjk(run[j]):
+                    j += 1
+                word = run[i:j]
+                if len(word) >= min_length and word not in STOPWORDS:
+                    tokens.append(word)
+                i = j
+
+            if pending_start >= 0:
+                self._fallback(run[pending_start:], gram, min_length, ngrams, tokens)
+
+        return tuple(tokens)
+
+    def tokenize(self, text: str, min_length: int = 2) -> List[str]:
+        """
+        提取对外展示的关键词（带缓存），词典未覆盖的片段整体保留
+
+        Args:
+            text: 标题文本
+            min_length: 最小关键词长度
+
+        Returns:
+            关键词列表（按出现顺序，保留重复出现的词）
+        """
+        return list(self._cached_tokenize(text, min_length, False))
+
+    def match_tokens(self, text: str, min_length: int = 2) -> List[str]:
+        """
+        提取用于匹配的词元（带缓存），词典未覆盖的片段退化为 bigram
+
+        Args:
+            text: 标题文本
+            min_length: 最小词元长度
+
+        Returns:
+            词元列表（按出现顺序，保留重复出现的词元）
+        """
+        return list(self._cached_tokenize(text, min_length, True))
+
+    def get_stats(self) -> Dict:
+        """
+        获取分词器统计信息
+
+        Returns:
+            统计信息字典
+        """
+        info = self._cached_tokenize.cache_info()
+        lookups = info.hits + info.misses
+        return {
+            "dictionary_words": len(self.words),
+            "signature": self.signature,
+            "cache_size": info.currsize,
+            "cache_max_size": info.maxsize,
+            "cache_hits": info.hits,
+            "cache_misses": info.misses,
+            "cache_hit_rate": round(info.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+# 全局分词器（词典文件变化时重建）
+_global_tokenizer: Optional[KeywordTokenizer] = None
+_global_tokenizer_mtime_ns: Optional[int] = None
+_global_tokenizer_checked_at = 0.0
+_global_tokenizer_lock = Lock()
+
+
+def _dictionary_path() -> Path:
+    env_path = os.environ.get("FREQUENCY_WORDS_PATH")
+    if env_path:
+        path = Path(env_path)
+        if not path.is_absolute():
+            path = DEFAULT_DICTIONARY_PATH.parent.parent / path
+        return path
+    return DEFAULT_DICTIONARY_PATH
+
+
+def get_keyword_tokenizer() -> KeywordTokenizer:
+    """
+    获取全局分词器
+
+    词典文件每隔 DICTIONARY_CHECK_INTERVAL 秒检查一次 mtime，变化后重建分词器（缓存随之清空）。
+    词典文件不存在时使用只含停用词的分词器。
+
+    Returns:
+        分词器实例
+    """
+    global _global_tokenizer, _global_tokenizer_mtime_ns, _global_tokenizer_checked_at
+
+    tokenizer = _global_tokenizer
+    now = time.monotonic()
+    if tokenizer is not None and now - _global_tokenizer_checked_at < DICTIONARY_CHECK_INTERVAL:
+        return tokenizer
+
+    with _global_tokenizer_lock:
+        if _global_tokenizer is not None and now - _global_tokenizer_checked_at < DICTIONARY_CHECK_INTERVAL:
+            return _global_tokenizer
+
+        path = _dictionary_path()
+        try:
+            mtime_ns = path.stat().st_mtime_ns
+        except OSError:
+            mtime_ns = None
+
+        if _global_tokenizer is None or mtime_ns != _global_tokenizer_mtime_ns:
+            words: List[str] = []
+            if mtime_ns is not None:
+                try:
+                    words = load_dictionary_words(path)
+                except Exception as e:
+                    print(f"Warning: 加载分词词典 {path} 失败: {e}")
+            _global_tokenizer = KeywordTokenizer(words)
+            _global_tokenizer_mtime_ns = mtime_ns
+
+        _global_tokenizer_checked_at = now
+        return _global_tokenizer
+
+
+def extract_title_keywords(title: str, min_length: int = 2) -> List[str]:
+    """
+    从标题中提取对外展示的关键词（词典词、英文数字片段和词典未覆盖的整段汉字）
+
+    Args:
+        title: 标题文本
+        min_length: 最小关键词长度
+
+    Returns:
+        关键词列表（保留重复出现的词）
+    """
+    return get_keyword_tokenizer().tokenize(title, min_length)
+
+
+def extract_match_tokens(title: str, min_length: int = 2) -> List[str]:
+    """
+    从标题中提取用于匹配和检索预筛选的词元（词典未覆盖的汉字退化为 bigram），
+    结果不应直接作为关键词展示给用户
+
+    Args:
+        title: 标题文本
+        min_length: 最小词元长度
+
+    Returns:
+        词元列表（保留重复出现的词元）
+    """
+    return get_keyword_tokenizer().match_tokens(title, min_length)
@@ -0,0 +1,192 @@
+"""
+游标分页工具
+
+查询类工具按"排序键"对结果做稳定排序，排序键在原有排序字段之后附加日期序号和
+遍历位置作为决胜字段，因此第一页与不分页时的结果完全一致。
+
+- 游标（next_cursor）编码上一页最后一条的排序键和查询参数指纹，翻页时只保留排序键
+  严格大于游标的结果，无需记住已返回的条目
+- TopKCollector 只保留排序键最小的 limit 条，单次请求占用的内存与页大小成正比，
+  不再先物化全部匹配结果再整体排序
+"""
+
+import base64
+import hashlib
+import json
+from typing import Any, Dict, List, Optional, Tuple
+
+from .errors import InvalidParameterError
+
+
+CURSOR_VERSION = 1
+
+
+def query_fingerprint(tool: str, **params) -> str:
+    """
+    计算查询参数指纹（不含 limit 和 cursor），用于校验游标与查询是否匹配
+
+    Args:
+        tool: 工具名称
+        **params: 影响结果集合和排序的查询参数
+
+    Returns:
+        16 位十六进制指纹
+    """
+    payload = json.dumps([tool, params], ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def _to_tuple(value: Any) -> Any:
+    if isinstance(value, list):
+        return tuple(_to_tuple(v) for v in value)
+    return value
+
+
+def encode_cursor(fingerprint: str, after_key: tuple, total: Optional[int] = None) -> str:
+    """
+    生成游标
+
+    Args:
+        fingerprint: 查询参数指纹
+        after_key: 当前页最后一条结果的排序键
+        total: 结果总数（部分工具翻页时跳过已返回的日期，需要沿用首页统计的总数）
+
+    Returns:
+        URL 安全的游标字符串
+    """
+    state = {"v": CURSOR_VERSION, "f": fingerprint, "k": list(after_key)}
+    if total is not None:
+        state["t"] = total
+    raw = json.dumps(state, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str], fingerprint: str) -> Tuple[Optional[tuple], Optional[int]]:
+    """
+    解析游标
+
+    Args:
+        cursor: 游标字符串，None 或空字符串表示第一页
+        fingerprint: 当前查询参数指纹
+
+    Returns:
+        (排序键, 结果总数)，第一页时均为 None
+
+    Raises:
+        InvalidParameterError: 游标无效或与当前查询参数不匹配
+    """
+    if not cursor:
+        return None, None
+
+    if not isinstance(cursor, str):
+        raise InvalidParameterError("cursor 必须是字符串")
+
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        state = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8"))
+        version = state["v"]
+        cursor_fingerprint = state["f"]
+        after_key = _to_tuple(state["k"])
+        total = state.get("t")
+    except Exception:
+        raise InvalidParameterError(
+            "无效的 cursor",
+            suggestion="请使用上一页返回的 next_cursor 原样传入"
+        )
+
+    if version != CURSOR_VERSION or cursor_fingerprint != fingerprint:
+        raise InvalidParameterError(
+            "cursor 与当前查询参数不匹配",
+            suggestion="翻页时除 limit 外请保持其他参数不变，或去掉 cursor 从第一页开始"
+        )
+
+    return after_key, total
+
+
+class TopKCollector:
+    """按排序键流式收集一页结果（只保留排序键最小的 limit 条）"""
+
+    def __init__(self, limit: int, after: Optional[tuple] = None):
+        """
+        初始化收集器
+
+        Args:
+            limit: 页大小
+            after: 游标排序键，只收集排序键严格大于它的结果
+        """
+        self.limit = limit
+        self.after = after
+        self.matched = 0  # 游标之后的结果数
+        self._items: List[Tuple[tuple, Any]] = []
+
+    def accepts(self, key: tuple) -> bool:
+        """该排序键是否位于游标之后"""
+        return self.after is None or key > self.after
+
+    def add(self, key: tuple, item: Any) -> None:
+        """
+        加入一条结果（排序键必须唯一）
+
+        Args:
+            key: 排序键
+            item: 结果数据
+        """
+        if not self.accepts(key):
+            return
+        self.matched += 1
+        self._items.append((key, item))
+        # 缓冲区超过两页时截断，摊还复杂度 O(n log k)
+        if len(self._items) >= 2 * self.limit + 16:
+            self._truncate()
+
+    def _truncate(self) -> None:
+        self._items.sort(key=lambda pair: pair[0])
+        del self._items[self.limit:]
+
+    @property
+    def has_more(self) -> bool:
+        return self.matched > self.limit
+
+    def page(self) -> List[Tuple[tuple, Any]]:
+        """
+        获取当前页
+
+        Returns:
+            [(排序键, 结果)]，按排序键升序
+        """
+        self._truncate()
+        return list(self._items)
+
+    def next_cursor(self, fingerprint: str, total: Optional[int] = None) -> Optional[str]:
+        """
+        获取下一页游标
+
+        Args:
+            fingerprint: 查询参数指纹
+            total: 结果总数（可选）
+
+        Returns:
+            游标字符串，没有更多结果时返回 None
+        """
+        if not self.has_more:
+            return None
+        items = self.page()
+        return encode_cursor(fingerprint, items[-1][0], total)
+
+
+def pagination_info(collector: TopKCollector, fingerprint: str, total: Optional[int] = None) -> Dict:
+    """
+    生成响应中的分页信息
+
+    Args:
+        collector: 结果收集器
+        fingerprint: 查询参数指纹
+        total: 结果总数（可选，写入游标供后续页使用）
+
+    Returns:
+        {"has_more": bool, "next_cursor": str 或 None}
+    """
+    return {
+        "has_more": collector.has_more,
+        "next_cursor": collector.next_cursor(fingerprint, total),
+    }
@@ -0,0 +1,173 @@
+"""
+工具响应编码
+
+所有 MCP 工具的返回值都经过这里序列化为 JSON 字符串，支持三种格式：
+
+- pretty：缩进 2 格（默认，与原先一致）
+- compact：无缩进、无多余空格
+- table：在 compact 基础上，把由字典组成的列表编码为列式表格
+  {"fields": [字段名...], "rows": [[值...], ...]}，避免每条结果重复键名
+
+另外可以省略默认值字段（None、空字符串、空列表、空字典）。table 格式下只有整列
+都是默认值时才省略该列，以保持每行长度一致。
+"""
+
+import json
+from typing import Any, Dict, List, Optional
+
+from .errors import InvalidParameterError
+
+
+OUTPUT_FORMATS = ("pretty", "compact", "table")
+TABLE_MIN_ROWS = 2  # 少于该条数的列表保持原样
+
+_response_settings = {
+    "output_format": "pretty",
+    "omit_defaults": False,
+}
+
+
+def _is_default(value: Any) -> bool:
+    return value is None or (isinstance(value, (str, list, dict)) and len(value) == 0)
+
+
+def validate_output_format(output_format: Optional[str]) -> str:
+    """
+    验证输出格式
+
+    Args:
+        output_format: 输出格式，None 表示使用服务器默认格式
+
+    Returns:
+        有效的输出格式
+
+    Raises:
+        InvalidParameterError: 不支持的格式
+    """
+    if output_format is None:
+        return _response_settings["output_format"]
+    if output_format not in OUTPUT_FORMATS:
+        raise InvalidParameterError(
+            f"不支持的输出格式: {output_format}",
+            suggestion=f"支持的格式: {', '.join(OUTPUT_FORMATS)}"
+        )
+    return output_format
+
+
+def configure_response_format(output_format: str = "pretty", omit_defaults: bool = False) -> None:
+    """
+    设置服务器默认的响应格式
+
+    Args:
+        output_format: 默认输出格式
+        omit_defaults: 是否省略默认值字段
+    """
+    _response_settings["output_format"] = validate_output_format(output_format)
+    _response_settings["omit_defaults"] = bool(omit_defaults)
+
+
+def get_response_settings() -> Dict:
+    """获取当前默认响应格式设置"""
+    return dict(_response_settings)
+
+
+def omit_default_fields(value: Any) -> Any:
+    """
+    递归省略字典中的默认值字段
+
+    Args:
+        value: 任意 JSON 兼容对象
+
+    Returns:
+        省略默认值字段后的新对象
+    """
+    if isinstance(value, dict):
+        result = {}
+        for key, item in value.items():
+            item = omit_default_fields(item)
+            if not _is_default(item):
+                result[key] = item
+        return result
+    if isinstance(value, list):
+        return [omit_default_fields(item) for item in value]
+    return value
+
+
+def _encode_table(items: List[Dict], omit_defaults: bool) -> Dict:
+    fields: List[str] = []
+    seen = set()
+    for item in items:
+        for key in item:
+            if key not in seen:
+                seen.add(key)
+                fields.append(key)
+
+    rows = [[to_table(item.get(field), omit_defaults) for field in fields] for item in items]
+
+    if omit_defaults:
+        keep = [i for i in range(len(fields)) if not all(_is_default(row[i]) for row in rows)]
+        if len(keep) < len(fields):
+            fields = [fields[i] for i in keep]
+            rows = [[row[i] for i in keep] for row in rows]
+
+    return {"fields": fields, "rows": rows}
+
+
+def to_table(value: Any, omit_defaults: bool = False) -> Any:
+    """
+    递归把由字典组成的列表转换为列式表格
+
+    Args:
+        value: 任意 JSON 兼容对象
+        omit_defaults: 是否省略默认值字段
+
+    Returns:
+        转换后的新对象
+    """
+    if isinstance(value, dict):
+        result = {}
+        for key, item in value.items():
+            item = to_table(item, omit_defaults)
+            if omit_defaults and _is_default(item):
+                continue
+            result[key] = item
+        return result
+    if isinstance(value, list):
+        if len(value) >= TABLE_MIN_ROWS and all(isinstance(item, dict) for item in value):
+            return _encode_table(value, omit_defaults)
+        return [to_table(item, omit_defaults) for item in value]
+    return value
+
+
+def encode_response(
+    result: Any,
+    output_format: Optional[str] = None,
+    omit_defaults: Optional[bool] = None
+) -> str:
+    """
+    把工具结果序列化为 JSON 字符串
+
+    Args:
+        result: 工具返回的结果
+        output_format: 输出格式，None 表示使用服务器默认格式
+        omit_defaults: 是否省略默认值字段，None 表示使用服务器默认设置
+
+    Returns:
+        JSON 字符串
+
+    Raises:
+        InvalidParameterError: 不支持的输出格式
+    """
+    output_format = validate_output_format(output_format)
+    if omit_defaults is None:
+        omit_defaults = _response_settings["omit_defaults"]
+
+    if output_format == "table":
+        return json.dumps(to_table(result, omit_defaults), ensure_ascii=False, separators=(",", ":"))
+
+    if omit_defaults:
+        result = omit_default_fields(result)
+
+    if output_format == "compact":
+        return json.dumps(result, ensure_ascii=False, separators=(",", ":"))
+    return json.dumps(result, ensure_ascii=False, indent=2)
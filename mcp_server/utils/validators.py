@@ -6,11 +6,10 @@
 
 from datetime import datetime
 from typing import List, Optional
-import os
-import yaml
 
 from .errors import InvalidParameterError
 from .date_parser import DateParser
+from ..services.config_service import get_config_service
 
 
 def get_supported_platforms() -> List[str]:
@@ -23,20 +22,14 @@ def get_supported_platforms() -> List[str]:
     Note:
         - 读取失败时返回空列表，允许所有平台通过（降级策略）
         - 平台列表来自 config/config.yaml 中的 platforms 配置
+        - 通过配置服务读取，文件未修改时不会重新解析
     """
+    config_service = get_config_service()
     try:
-        # 获取 config.yaml 路径（相对于当前文件）
-        current_dir = os.path.dirname(os.path.abspath(__file__))
-        config_path = os.path.join(current_dir, "..", "..", "config", "config.yaml")
-        config_path = os.path.normpath(config_path)
-
-        with open(config_path, 'r', encoding='utf-8') as f:
-            config = yaml.safe_load(f)
-            platforms = config.get('platforms', [])
-            return [p['id'] for p in platforms if 'id' in p]
+        return config_service.get_config().platform_ids
     except Exception as e:
         # 降级方案：返回空列表，允许所有平台
-        print(f"警告：无法加载平台配置 ({config_path}): {e}")
+        print(f"警告：无法加载平台配置 ({config_service.config_dir / 'config.yaml'}): {e}")
         return []
 
 
@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+SMTP 会话复用测试脚本
+
+在本地启动一个最小 SMTP 服务作为替身，验证 SMTPSessionManager：
+- 同一次运行内多封邮件只建立一条连接
+- 连接被服务器断开后自动重连
+- 逐个收件人并发发送时连接数不超过并发数
+"""
+
+import os
+import socketserver
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from email.mime.text import MIMEText
+
+# 添加项目根目录到Python路径，并以项目根目录为工作目录（main 需要读取 config/config.yaml）
+PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, PROJECT_ROOT)
+os.chdir(PROJECT_ROOT)
+
+from main import SMTPSessionManager
+
+
+class FakeSMTPServer(socketserver.ThreadingTCPServer):
+    """本地 SMTP 替身，记录连接数和收到的邮件"""
+
+    allow_reuse_address = True
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), FakeSMTPHandler)
+        self.connections = 0
+        self.messages = []
+        self.active = set()
+        self.lock = threading.Lock()
+
+    @property
+    def port(self) -> int:
+        return self.server_address[1]
+
+    def drop_all(self):
+        """模拟服务器超时断开所有空闲连接"""
+        with self.lock:
+            handlers = list(self.active)
+        for handler in handlers:
+            try:
+                handler.request.shutdown(2)
+            except OSError:
+                pass
+
+
+class FakeSMTPHandler(socketserver.StreamRequestHandler):
+    def reply(self, line: str):
+        self.wfile.write((line + "\r\n").encode())
+
+    def handle(self):
+        server = self.server
+        with server.lock:
+            server.connections += 1
+            server.active.add(self)
+
+        try:
+            self.reply("220 localhost FakeSMTP")
+            rcpts = []
+            while True:
+                raw = self.rfile.readline()
+                if not raw:
+                    break
+                command = raw.decode().strip()
+                upper = command.upper()
+
+                if upper.startswith(("EHLO", "HELO")):
+                    self.reply("250-localhost")
+                    self.reply("250 AUTH PLAIN LOGIN")
+                elif upper.startswith("AUTH"):
+                    self.reply("235 2.7.0 Authentication successful")
+                elif upper.startswith("MAIL FROM"):
+                    rcpts = []
+                    self.reply("250 OK")
+                elif upper.startswith("RCPT TO"):
+                    rcpts.append(command.split(":", 1)[1].strip(" <>"))
+                    self.reply("250 OK")
+                elif upper == "DATA":
+                    self.reply("354 End data with <CR><LF>.<CR><LF>")
+                    while True:
+                        line = self.rfile.readline()
+                        if not line or line in (b".\r\n", b".\n"):
+                            break
+                    with server.lock:
+                        server.messages.append(list(rcpts))
+                    self.reply("250 OK queued")
+                elif upper in ("NOOP", "RSET"):
+                    self.reply("250 OK")
+                elif upper == "QUIT":
+                    self.reply("221 Bye")
+                    break
+                else:
+                    self.reply("502 Command not implemented")
+        except OSError:
+            pass
+        finally:
+            with server.lock:
+                server.active.discard(self)
+
+
+def print_section(title):
+    """打印分节标题"""
+    print("\n" + "=" * 60)
+    print(f"  {title}")
+    print("=" * 60)
+
+
+def start_server() -> FakeSMTPServer:
+    server = FakeSMTPServer()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def build_message(to_addr: str) -> MIMEText:
+    msg = MIMEText("TrendRadar 测试邮件", "plain", "utf-8")
+    msg["From"] = "bot@example.com"
+    msg["To"] = to_addr
+    msg["Subject"] = "TrendRadar"
+    return msg
+
+
+def send(manager: SMTPSessionManager, server: FakeSMTPServer, to_addrs):
+    manager.send_message(
+        "127.0.0.1", server.port, "NONE", "bot@example.com", "secret",
+        build_message(", ".join(to_addrs)), to_addrs=to_addrs,
+    )
+
+
+def test_connection_reuse():
+    """同一次运行内的多封邮件复用一条连接"""
+    print_section("测试1: 连接复用")
+
+    server = start_server()
+    manager = SMTPSessionManager(timeout=5)
+    try:
+        for _ in range(3):
+            send(manager, server, ["a@example.com", "b@example.com"])
+
+        print(f"发送邮件: {len(server.messages)}，服务端连接数: {server.connections}")
+        assert len(server.messages) == 3
+        assert server.connections == 1
+        assert manager.connect_count == 1
+        print("[OK] 3 封邮件只建立 1 条连接")
+    finally:
+        manager.close_all()
+        server.shutdown()
+        server.server_close()
+
+
+def test_reconnect_after_disconnect():
+    """服务器断开连接后自动重连"""
+    print_section("测试2: 断线重连")
+
+    server = start_server()
+    manager = SMTPSessionManager(timeout=5)
+    try:
+        send(manager, server, ["a@example.com"])
+        server.drop_all()
+        send(manager, server, ["a@example.com"])
+
+        print(f"发送邮件: {len(server.messages)}，服务端连接数: {server.connections}")
+        assert len(server.messages) == 2
+        assert server.connections == 2
+        assert manager.connect_count == 2
+        print("[OK] 断线后重新建立连接并发送成功")
+    finally:
+        manager.close_all()
+        server.shutdown()
+        server.server_close()
+
+
+def test_parallel_per_recipient():
+    """逐个收件人并发发送时，连接数不超过并发数"""
+    print_section("测试3: 逐个收件人并发发送")
+
+    server = start_server()
+    manager = SMTPSessionManager(timeout=5)
+    recipients = [f"user{i}@example.com" for i in range(8)]
+    max_workers = 3
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            list(executor.map(lambda r: send(manager, server, [r]), recipients))
+
+        print(f"发送邮件: {len(server.messages)}，服务端连接数: {server.connections}")
+        assert sorted(m[0] for m in server.messages) == sorted(recipients)
+        assert 1 <= server.connections <= max_workers
+        assert manager.connect_count == server.connections
+        print(f"[OK] {len(recipients)} 个收件人共使用 {server.connections} 条连接")
+    finally:
+        manager.close_all()
+        server.shutdown()
+        server.server_close()
+
+
+def main():
+    """主测试函数"""
+    print("\n" + "=" * 60)
+    print("  SMTP 会话复用测试")
+    print("=" * 60)
+
+    try:
+        test_connection_reuse()
+        test_reconnect_after_disconnect()
+        test_parallel_per_recipient()
+
+        print("\n" + "=" * 60)
+        print("  测试完成")
+        print("=" * 60)
+
+    except Exception as e:
+        print(f"\n[ERROR] 测试过程中发生错误: {str(e)}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()